@@ -10,10 +10,37 @@ BLUE='\033[0;34m'
 YELLOW='\033[1;33m'
 NC='\033[0m' # No Color
 
-# 1. 清理旧的构建输出
-echo -e "${BLUE}📁 清理构建目录...${NC}"
-rm -rf dist
-mkdir -p dist
+GAMES="space-shooter platform-jumper fruit-2048 memory-cards snake-game brick-breaker tic-tac-toe minesweeper typing-test physics-pinball down-100-floors"
+
+# 1. 复制核心文件和游戏目录
+# tools/build.py 并行增量复制（按 dist/build-manifest.json 跳过未改动的文件），
+# 压缩 JS/CSS/HTML，为页面引用的 CSS/JS 生成带内容哈希的副本并改写 HTML 引用
+echo -e "${BLUE}🎮 构建 dist（增量复制 + 资源哈希）...${NC}"
+if [ "$1" = "--clean" ]; then
+    BUILD_ARGS="--clean"
+fi
+if command -v python3 > /dev/null 2>&1; then
+    python3 -m tools.build --minify $BUILD_ARGS
+
+    # 首屏体积报告；超出 size-budgets.json 预算时构建失败
+    echo -e "${BLUE}📏 检查首屏体积预算...${NC}"
+    python3 -m tools.sizes
+else
+    echo -e "${YELLOW}⚠️  未找到 python3，回退为完整复制（无资源哈希）${NC}"
+    rm -rf dist
+    mkdir -p dist
+    cp index.html style.css shared-styles.css manifest.json _headers _routes.json worker.js sw.js sw-register.js dist/
+    for game in $GAMES; do
+        echo -e "  ${GREEN}→${NC} $game"
+        cp -r $game dist/
+
+        # 移除测试文件和临时文件
+        find dist/$game -name "*test*.js" -delete 2>/dev/null || true
+        find dist/$game -name "*.png" -delete 2>/dev/null || true
+        find dist/$game -name "test.html" -delete 2>/dev/null || true
+        find dist/$game -name "*-bench.*" -delete 2>/dev/null || true
+    done
+fi
 
 # 2. 生成版本号
 VERSION=$(date +%Y.%m.%d.%H%M)
@@ -22,30 +49,7 @@ echo "📦 版本: $VERSION" > dist/VERSION.txt
 echo "🔖 提交: $GIT_SHA" >> dist/VERSION.txt
 echo -e "${GREEN}✓ 版本: $VERSION${NC}"
 
-# 3. 复制核心文件
-echo -e "${BLUE}📄 复制核心文件...${NC}"
-cp index.html dist/
-cp style.css dist/
-cp shared-styles.css dist/
-cp manifest.json dist/
-cp _headers dist/
-cp _routes.json dist/
-cp worker.js dist/
-
-# 4. 复制游戏目录
-echo -e "${BLUE}🎮 复制游戏目录...${NC}"
-GAMES="space-shooter platform-jumper fruit-2048 memory-cards snake-game brick-breaker tic-tac-toe minesweeper typing-test physics-pinball down-100-floors"
-for game in $GAMES; do
-    echo -e "  ${GREEN}→${NC} $game"
-    cp -r $game dist/
-
-    # 移除测试文件和临时文件
-    find dist/$game -name "*test*.js" -delete 2>/dev/null || true
-    find dist/$game -name "*.png" -delete 2>/dev/null || true
-    find dist/$game -name "test.html" -delete 2>/dev/null || true
-done
-
-# 5. 生成 sitemap
+# 3. 生成 sitemap
 echo -e "${BLUE}🗺️  生成 sitemap...${NC}"
 if [ -f "scripts/generate-sitemap.js" ]; then
     node scripts/generate-sitemap.js
@@ -53,16 +57,7 @@ else
     echo "⚠️  sitemap 脚本不存在，跳过"
 fi
 
-# 6. 生成资源哈希（已禁用 - 会导致游戏目录资源引用失效）
-echo -e "${BLUE}🔐 跳过资源哈希生成...${NC}"
-echo "⚠️  资源哈希已禁用，避免游戏目录资源引用问题"
-# if [ -f "scripts/generate-hashes.js" ]; then
-#     node scripts/generate-hashes.js 2>/dev/null || echo "⚠️  资源哈希生成失败或已跳过"
-# else
-#     echo "⚠️  资源哈希脚本不存在，跳过"
-# fi
-
-# 7. 运行测试（如果配置完成）
+# 4. 运行测试（如果配置完成）
 echo -e "${BLUE}🧪 运行测试...${NC}"
 if npm run test > /dev/null 2>&1; then
     echo -e "${GREEN}✓ 测试通过${NC}"
@@ -70,7 +65,7 @@ else
     echo -e "${YELLOW}⚠️  测试未配置或失败，继续构建${NC}"
 fi
 
-# 8. 生成构建报告
+# 5. 生成构建报告
 echo -e "${BLUE}📊 生成构建报告...${NC}"
 cat > dist/BUILD_REPORT.md << EOF
 # 构建报告
@@ -86,7 +81,7 @@ cat > dist/BUILD_REPORT.md << EOF
 $(du -sh dist/* 2>/dev/null | sort -h || echo "无法获取文件统计")
 EOF
 
-# 9. 显示构建摘要
+# 6. 显示构建摘要
 echo ""
 echo -e "${GREEN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
 echo -e "${GREEN}✅ 构建完成！${NC}"
@@ -101,7 +96,7 @@ echo ""
 echo -e "${BLUE}📂 输出目录: ${YELLOW}./dist${NC}"
 echo ""
 
-# 10. 提示部署命令
+# 7. 提示部署命令
 echo -e "${BLUE}🚀 部署命令:${NC}"
 echo -e "  ${YELLOW}npm run deploy${NC}          - 部署到 Cloudflare"
 echo -e "  ${YELLOW}npm run deploy:production${NC} - 部署到生产环境"
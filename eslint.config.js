@@ -24,6 +24,7 @@ export default [
                 document: 'readonly',
                 console: 'readonly',
                 navigator: 'readonly',
+                location: 'readonly',
                 localStorage: 'readonly',
                 sessionStorage: 'readonly',
                 fetch: 'readonly',
@@ -41,7 +42,22 @@ export default [
             'semi': ['error', 'always']
         }
     },
-    // Node.js环境配置
+    // Service Worker 环境配置（sw.js 是普通脚本，不是模块）
+    {
+        files: ['sw.js'],
+        languageOptions: {
+            sourceType: 'script',
+            globals: {
+                self: 'readonly',
+                caches: 'readonly',
+                Headers: 'readonly',
+                Request: 'readonly',
+                Response: 'readonly',
+                URL: 'readonly'
+            }
+        }
+    },
+        // Node.js环境配置
     {
         files: ['scripts/**/*.js', 'worker.js', 'http-server.js', '*-test.js'],
         languageOptions: {
@@ -35,6 +35,8 @@ class MinesweeperGame {
 
         // 动画配置
         this.animationsEnabled = true;
+        this.numberAnimations = [];
+        this.numberAnimationId = null;
 
         // 游戏状态
         this.state = {
@@ -236,6 +238,7 @@ class MinesweeperGame {
     reset() {
         this.stopTimer();
         this.stopFireworks();
+        this.cancelNumberAnimations();
         this.state.time = 0;
         this.state.gameState = 'ready';
         this.updateTimer();
@@ -578,80 +581,148 @@ class MinesweeperGame {
 
     /**
      * 数字揭示动画 - 从0渐变到目标数字
+     * 所有数字动画由同一个 requestAnimationFrame 循环驱动，delay 用于错开显示
      */
-    animateNumberReveal(cellElement, targetNumber) {
+    animateNumberReveal(cellElement, targetNumber, delay = 0) {
         if (!this.animationsEnabled) {
-            cellElement.textContent = targetNumber;
-            cellElement.classList.add(`number-${targetNumber}`);
-            cellElement.setAttribute('aria-label', `行${cellElement.dataset.r}列${cellElement.dataset.c}，周围${targetNumber}个地雷`);
+            this.finishNumberReveal(cellElement, targetNumber);
             return;
         }
 
+        this.numberAnimations.push({
+            element: cellElement,
+            number: targetNumber,
+            start: performance.now() + delay,
+            step: -1
+        });
+        if (!this.numberAnimationId) {
+            this.numberAnimationId = requestAnimationFrame((now) => this.runNumberAnimations(now));
+        }
+    }
+
+    /**
+     * 数字动画调度：每帧推进所有到期的数字，完成的用交换删除移出队列
+     */
+    runNumberAnimations(now) {
         const duration = 400;
         const steps = 8;
         const stepDuration = duration / steps;
-        let currentStep = 0;
+        const queue = this.numberAnimations;
+
+        for (let i = queue.length - 1; i >= 0; i--) {
+            const anim = queue[i];
+            const elapsed = now - anim.start;
+            if (elapsed < 0) continue;
+
+            const step = Math.floor(elapsed / stepDuration);
+            if (step >= steps) {
+                this.finishNumberReveal(anim.element, anim.number);
+                queue[i] = queue[queue.length - 1];
+                queue.pop();
+                continue;
+            }
+            if (step === anim.step) continue;
 
-        cellElement.classList.add('number-animating');
+            if (anim.step < 0) anim.element.classList.add('number-animating');
+            anim.step = step;
+            anim.element.textContent = Math.floor((anim.number / steps) * (step + 1));
+            anim.element.style.opacity = 0.5 + (0.5 * (step + 1) / steps);
+        }
 
-        const animate = () => {
-            if (currentStep < steps) {
-                const displayNumber = Math.floor((targetNumber / steps) * (currentStep + 1));
-                cellElement.textContent = displayNumber;
-                cellElement.style.opacity = 0.5 + (0.5 * (currentStep + 1) / steps);
-                currentStep++;
-                setTimeout(animate, stepDuration);
-            } else {
-                cellElement.textContent = targetNumber;
-                cellElement.classList.add(`number-${targetNumber}`);
-                cellElement.classList.remove('number-animating');
-                cellElement.style.opacity = '';
-                cellElement.setAttribute('aria-label', `行${cellElement.dataset.r}列${cellElement.dataset.c}，周围${targetNumber}个地雷`);
-            }
-        };
+        this.numberAnimationId = queue.length > 0
+            ? requestAnimationFrame((t) => this.runNumberAnimations(t))
+            : null;
+    }
 
-        animate();
+    finishNumberReveal(cellElement, targetNumber) {
+        const r = Number(cellElement.dataset.r) + 1;
+        const c = Number(cellElement.dataset.c) + 1;
+        cellElement.textContent = targetNumber;
+        cellElement.classList.add(`number-${targetNumber}`);
+        cellElement.classList.remove('number-animating');
+        cellElement.style.opacity = '';
+        cellElement.setAttribute('aria-label', `行${r}列${c}，周围${targetNumber}个地雷`);
+    }
+
+    cancelNumberAnimations() {
+        if (this.numberAnimationId) {
+            cancelAnimationFrame(this.numberAnimationId);
+            this.numberAnimationId = null;
+        }
+        this.numberAnimations.length = 0;
     }
 
     /**
-     * 洪水填充算法
+     * 洪水填充算法：先计算翻开区域，再一次性提交到 DOM
      */
     floodFill(startR, startC) {
-        const cfg = this.config[this.state.difficulty];
-        const queue = [{ r: startR, c: startC }];
+        const { cells, numbers } = this.computeRevealRegion(startR, startC);
+        this.commitReveal(cells, numbers);
+    }
+
+    /**
+     * 计算翻开区域（只改状态，不碰 DOM）
+     * 返回按 BFS 顺序翻开的格子下标 r * cols + c，以及其中的数字格子
+     */
+    computeRevealRegion(startR, startC) {
+        const { rows, cols } = this.config[this.state.difficulty];
+        const grid = this.state.grid;
+        const queue = [startR * cols + startC];
+        const cells = [];
+        const numbers = [];
         let head = 0;
-        let delay = 0;
 
         while (head < queue.length) {
-            const curr = queue[head++];
-
-            for (let dr = -1; dr <= 1; dr++) {
-                for (let dc = -1; dc <= 1; dc++) {
-                    const nr = curr.r + dr, nc = curr.c + dc;
-                    if (nr >= 0 && nr < cfg.rows && nc >= 0 && nc < cfg.cols) {
-                        const neighbor = this.state.grid[nr][nc];
-                        if (!neighbor.isRevealed && !neighbor.isFlagged) {
-                            neighbor.isRevealed = true;
-                            neighbor.element.classList.add('revealed');
-                            this.state.revealedCells++;
-
-                            if (neighbor.adjacent === 0) {
-                                neighbor.element.setAttribute('aria-label', `行${nr + 1}列${nc + 1}，安全`);
-                                queue.push({ r: nr, c: nc });
-                            } else {
-                                // 延迟显示数字以创建波纹效果
-                                const cellInfo = { element: neighbor.element, number: neighbor.adjacent, r: nr, c: nc };
-                                setTimeout(() => {
-                                    this.animateNumberReveal(cellInfo.element, cellInfo.number);
-                                    cellInfo.element.setAttribute('aria-label', `行${cellInfo.r + 1}列${cellInfo.c + 1}，周围${cellInfo.number}个地雷`);
-                                }, delay);
-                                delay += 20;
-                            }
-                        }
+            const index = queue[head++];
+            const r = (index / cols) | 0;
+            const c = index % cols;
+            const rowEnd = r + 1 < rows ? r + 1 : r;
+            const colEnd = c + 1 < cols ? c + 1 : c;
+
+            for (let nr = r > 0 ? r - 1 : 0; nr <= rowEnd; nr++) {
+                for (let nc = c > 0 ? c - 1 : 0; nc <= colEnd; nc++) {
+                    const neighbor = grid[nr][nc];
+                    if (neighbor.isRevealed || neighbor.isFlagged) continue;
+
+                    neighbor.isRevealed = true;
+                    const n = nr * cols + nc;
+                    cells.push(n);
+                    if (neighbor.adjacent === 0) {
+                        queue.push(n);
+                    } else {
+                        numbers.push(n);
                     }
                 }
             }
         }
+
+        this.state.revealedCells += cells.length;
+        return { cells, numbers };
+    }
+
+    /**
+     * 一次性写入翻开结果：循环中只写不读
+     * 数字按顺序每 20ms 错开显示，总错开时间不超过 1 秒，避免大片区域拖得太久
+     */
+    commitReveal(cells, numbers) {
+        const cols = this.config[this.state.difficulty].cols;
+        const grid = this.state.grid;
+
+        for (const index of cells) {
+            const r = (index / cols) | 0;
+            const c = index % cols;
+            const cell = grid[r][c];
+            cell.element.classList.add('revealed');
+            if (cell.adjacent === 0) {
+                cell.element.setAttribute('aria-label', `行${r + 1}列${c + 1}，安全`);
+            }
+        }
+
+        const stagger = Math.min(20, 1000 / numbers.length);
+        numbers.forEach((index, i) => {
+            const cell = grid[(index / cols) | 0][index % cols];
+            this.animateNumberReveal(cell.element, cell.adjacent, i * stagger);
+        });
     }
 
     /**
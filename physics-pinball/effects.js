@@ -0,0 +1,259 @@
+/* 物理弹球游戏 - 粒子与得分飘字特效池 */
+/* 粒子和飘字的精灵来自 render-cache.js 的 RenderCache。
+   定长池：数值字段放在 Float64Array 中，文本 / 颜色等引用放在普通数组里。
+   删除时把最后一个元素搬到空位（交换删除），运行中不再为每个粒子分配对象，
+   也没有 splice 的 O(n) 搬移。池满时丢弃新特效并计入 dropped。 */
+
+class EffectPool {
+    constructor(capacity, fields, refs = []) {
+        this.capacity = capacity;
+        this.count = 0;
+        this.dropped = 0;
+        this.columns = fields.map(name => (this[name] = new Float64Array(capacity)));
+        this.refColumns = refs.map(name => (this[name] = new Array(capacity).fill(null)));
+    }
+
+    // 与数组相同的读法，性能分析脚本读取 animations.particles.length
+    get length() {
+        return this.count;
+    }
+
+    // 返回新槽位下标，池满时返回 -1
+    acquire() {
+        if (this.count === this.capacity) {
+            this.dropped++;
+            return -1;
+        }
+        return this.count++;
+    }
+
+    remove(i) {
+        const last = --this.count;
+        if (i !== last) {
+            for (const column of this.columns) column[i] = column[last];
+            for (const column of this.refColumns) column[i] = column[last];
+        }
+        for (const column of this.refColumns) column[last] = null;
+    }
+
+    clear() {
+        for (const column of this.refColumns) column.fill(null, 0, this.count);
+        this.count = 0;
+    }
+}
+
+// 粒子效果
+class ParticlePool extends EffectPool {
+    constructor(capacity = 1024) {
+        super(capacity, ['x', 'y', 'vx', 'vy', 'life', 'size', 'decay'], ['color']);
+    }
+
+    spawn(x, y, color) {
+        const i = this.acquire();
+        if (i < 0) return;
+        const angle = Math.random() * Math.PI * 2;
+        const speed = 2 + Math.random() * 4;
+        this.x[i] = x;
+        this.y[i] = y;
+        this.vx[i] = Math.cos(angle) * speed;
+        this.vy[i] = Math.sin(angle) * speed;
+        this.life[i] = 1.0;
+        this.size[i] = 3 + Math.random() * 4;
+        this.decay[i] = 0.02 + Math.random() * 0.02;
+        this.color[i] = color;
+    }
+
+    update() {
+        const { x, y, vx, vy, life, size, decay } = this;
+        // 倒序遍历：换到 i 的末尾元素本帧已经更新过
+        for (let i = this.count - 1; i >= 0; i--) {
+            x[i] += vx[i];
+            y[i] += vy[i];
+            vy[i] += 0.1; // 重力
+            life[i] -= decay[i];
+            size[i] *= 0.97;
+            if (life[i] <= 0 || size[i] < 0.5) {
+                this.remove(i);
+            }
+        }
+    }
+
+    // 带光晕的圆点按颜色和半径（0.5 像素一档）预先栅格化，逐帧只贴图
+    draw(ctx, cache) {
+        if (this.count === 0) return;
+        const { x, y, life, size, color } = this;
+        const table = cache.table('particle');
+        ctx.save();
+        let current = null;
+        let sprites = null;
+        for (let i = 0; i < this.count; i++) {
+            if (color[i] !== current) {
+                current = color[i];
+                sprites = table.get(current);
+                if (!sprites) {
+                    sprites = [];
+                    table.set(current, sprites);
+                }
+            }
+            const step = Math.round(size[i] * 2);
+            const sprite = sprites[step] || (sprites[step] = ParticlePool.sprite(cache, current, step / 2));
+            ctx.globalAlpha = life[i];
+            cache.drawSprite(ctx, sprite, x[i], y[i]);
+        }
+        ctx.restore();
+    }
+
+    static sprite(cache, color, radius) {
+        const extent = (radius + ParticlePool.GLOW * 1.5 + 1) * 2;
+        return cache.sprite(`particle:${color}:${radius}`, extent, extent, ctx => {
+            ctx.fillStyle = color;
+            ctx.shadowColor = color;
+            ctx.shadowBlur = ParticlePool.GLOW;
+            ctx.beginPath();
+            ctx.arc(0, 0, radius, 0, Math.PI * 2);
+            ctx.fill();
+        });
+    }
+}
+
+ParticlePool.GLOW = 10;
+
+// 得分飘字动画
+class FloatingScorePool extends EffectPool {
+    constructor(capacity = 128) {
+        super(capacity, ['x', 'y', 'vx', 'vy', 'life', 'scale', 'rotation'], ['text', 'color']);
+    }
+
+    spawn(x, y, text, color = '#ffff00') {
+        const i = this.acquire();
+        if (i < 0) return;
+        this.x[i] = x;
+        this.y[i] = y;
+        this.vx[i] = (Math.random() - 0.5) * 2;
+        this.vy[i] = -3 - Math.random() * 2;
+        this.life[i] = 1.0;
+        this.scale[i] = 0.8;
+        this.rotation[i] = (Math.random() - 0.5) * 0.2;
+        this.text[i] = text;
+        this.color[i] = color;
+    }
+
+    update() {
+        const { x, y, vx, vy, life, scale } = this;
+        for (let i = this.count - 1; i >= 0; i--) {
+            life[i] -= 0.015;
+            y[i] += vy[i];
+            x[i] += vx[i];
+            vy[i] *= 0.98; // 减速
+            scale[i] = 1 + (1 - life[i]) * 0.5; // 逐渐放大
+            if (life[i] <= 0) {
+                this.remove(i);
+            }
+        }
+    }
+
+    // 带阴影和描边的文字按 (颜色, 文本) 栅格化一次，逐帧旋转缩放贴图
+    draw(ctx, cache) {
+        if (this.count === 0) return;
+        const table = cache.table('floating-score');
+        for (let i = 0; i < this.count; i++) {
+            const color = this.color[i];
+            const text = this.text[i];
+            let sprites = table.get(color);
+            if (!sprites) {
+                sprites = new Map();
+                table.set(color, sprites);
+            }
+            let sprite = sprites.get(text);
+            if (!sprite) {
+                sprite = FloatingScorePool.sprite(ctx, cache, text, color);
+                sprites.set(text, sprite);
+            }
+            const scale = this.scale[i];
+            const cos = Math.cos(this.rotation[i]) * scale;
+            const sin = Math.sin(this.rotation[i]) * scale;
+            ctx.save();
+            ctx.globalAlpha = this.life[i];
+            ctx.transform(cos, sin, -sin, cos, this.x[i], this.y[i]);
+            cache.drawSprite(ctx, sprite, 0, 0);
+            ctx.restore();
+        }
+    }
+
+    static sprite(ctx, cache, text, color) {
+        const font = `bold 20px 'Orbitron', monospace`;
+        ctx.save();
+        ctx.font = font;
+        const width = ctx.measureText(text).width;
+        ctx.restore();
+        const pad = 15 * 1.5 + 3;
+        return cache.sprite(`floating-score:${color}:${text}`, width + pad * 2, 20 + pad * 2, spriteCtx => {
+            spriteCtx.shadowColor = color;
+            spriteCtx.shadowBlur = 15;
+            spriteCtx.font = font;
+            spriteCtx.fillStyle = color;
+            spriteCtx.textAlign = 'center';
+            spriteCtx.textBaseline = 'middle';
+            spriteCtx.fillText(text, 0, 0);
+            spriteCtx.strokeStyle = 'rgba(0, 0, 0, 0.5)';
+            spriteCtx.lineWidth = 3;
+            spriteCtx.strokeText(text, 0, 0);
+        });
+    }
+}
+
+// 得分弹出文字
+class ScorePopPool extends EffectPool {
+    constructor(capacity = 64) {
+        super(capacity, ['x', 'y', 'vy', 'life'], ['text']);
+        // life 每帧减 0.02，字号只有 51 档，字体串按档缓存而不是每帧拼接
+        this.fonts = [];
+    }
+
+    spawn(x, y, text) {
+        const i = this.acquire();
+        if (i < 0) return;
+        this.x[i] = x;
+        this.y[i] = y;
+        this.vy[i] = -2;
+        this.life[i] = 1.0;
+        this.text[i] = text;
+    }
+
+    update() {
+        const { y, vy, life } = this;
+        for (let i = this.count - 1; i >= 0; i--) {
+            life[i] -= 0.02;
+            y[i] += vy[i];
+            if (life[i] <= 0) {
+                this.remove(i);
+            }
+        }
+    }
+
+    draw(ctx) {
+        if (this.count === 0) return;
+        ctx.save();
+        ctx.fillStyle = '#ffff00';
+        ctx.textAlign = 'center';
+        ctx.textBaseline = 'middle';
+        let current = null;
+        for (let i = 0; i < this.count; i++) {
+            const life = this.life[i];
+            const step = Math.round((1 - life) * 50);
+            const font = this.fonts[step] ||
+                (this.fonts[step] = `bold ${16 + step * 0.16}px 'Orbitron', monospace`);
+            if (font !== current) {
+                current = font;
+                ctx.font = font;
+            }
+            ctx.globalAlpha = life;
+            ctx.fillText(this.text[i], this.x[i], this.y[i]);
+        }
+        ctx.restore();
+    }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { EffectPool, ParticlePool, FloatingScorePool, ScorePopPool };
+}
@@ -127,11 +127,11 @@ class Ball extends Circle {
         this.trailPoints = [];
     }
 
-    draw(ctx) {
+    draw(ctx, cache) {
         if (!this.active) return;
 
         // 绘制增强轨迹效果
-        this.drawEnhancedTrail(ctx);
+        this.drawEnhancedTrail(ctx, cache);
 
         // 计算球的旋转（基于速度）
         if (this.launched) {
@@ -140,17 +140,26 @@ class Ball extends Circle {
             this.rotation += this.angularVelocity;
         }
 
-        // 保存上下文状态
+        // 球体精灵随球旋转绘制（阴影是圆对称的，旋转后不变）
+        const radius = this.radius;
+        const size = (radius + GameConfig.trail.glowAmount * 1.5 + 2) * 2;
+        const sprite = cache.sprite(`ball:${radius}`, size, size, spriteCtx => Ball.paintSprite(spriteCtx, radius));
         ctx.save();
-
-        // 移动到球的位置并旋转
         ctx.translate(this.position.x, this.position.y);
         ctx.rotate(this.rotation);
+        cache.drawSprite(ctx, sprite, 0, 0);
+        ctx.restore();
+
+        // 更新轨迹
+        this.updateTrail();
+    }
 
+    // 球体：渐变、阴影、条纹、高光和边框，以球心为原点，只栅格化一次
+    static paintSprite(ctx, radius) {
         // 绘制球体 - 增强渐变效果
         const gradient = ctx.createRadialGradient(
-            -this.radius * 0.3, -this.radius * 0.3, 0,
-            0, 0, this.radius
+            -radius * 0.3, -radius * 0.3, 0,
+            0, 0, radius
         );
 
         // 高光效果
@@ -165,7 +174,7 @@ class Ball extends Circle {
         ctx.shadowBlur = GameConfig.trail.glowAmount;
 
         ctx.beginPath();
-        ctx.arc(0, 0, this.radius, 0, Math.PI * 2);
+        ctx.arc(0, 0, radius, 0, Math.PI * 2);
         ctx.fillStyle = gradient;
         ctx.fill();
 
@@ -176,12 +185,12 @@ class Ball extends Circle {
         ctx.strokeStyle = 'rgba(255, 255, 255, 0.6)';
         ctx.lineWidth = 1.5;
         ctx.beginPath();
-        ctx.arc(0, 0, this.radius * 0.7, 0, Math.PI * 1.5);
+        ctx.arc(0, 0, radius * 0.7, 0, Math.PI * 1.5);
         ctx.stroke();
 
         // 绘制高光点
         ctx.beginPath();
-        ctx.arc(-this.radius * 0.3, -this.radius * 0.3, this.radius * 0.2, 0, Math.PI * 2);
+        ctx.arc(-radius * 0.3, -radius * 0.3, radius * 0.2, 0, Math.PI * 2);
         ctx.fillStyle = 'rgba(255, 255, 255, 0.8)';
         ctx.fill();
 
@@ -189,51 +198,46 @@ class Ball extends Circle {
         ctx.strokeStyle = 'rgba(255, 255, 255, 0.9)';
         ctx.lineWidth = 2;
         ctx.beginPath();
-        ctx.arc(0, 0, this.radius, 0, Math.PI * 2);
+        ctx.arc(0, 0, radius, 0, Math.PI * 2);
         ctx.stroke();
-
-        ctx.restore();
-
-        // 更新轨迹
-        this.updateTrail();
     }
 
-    drawEnhancedTrail(ctx) {
+    drawEnhancedTrail(ctx, cache) {
         if (!GameConfig.trail.enabled || this.trailPoints.length < 2) return;
 
-        ctx.save();
+        // 渐变从第一个轨迹点指向球心。换到以这条线为单位 x 轴的坐标系里绘制，
+        // 三层渐变都固定为 (0, 0) → (1, 0)，由缓存复用，不再逐帧创建
+        const origin = this.trailPoints[0];
+        const dx = this.position.x - origin.x;
+        const dy = this.position.y - origin.y;
+        const length2 = dx * dx + dy * dy;
+        if (length2 < 1e-6) return;
 
-        // 绘制多层轨迹以产生发光效果
-        for (let layer = 0; layer < 3; layer++) {
-            ctx.beginPath();
-
-            const trailLength = Math.min(this.trailPoints.length, GameConfig.trail.maxLength);
-
-            for (let i = 0; i < trailLength; i++) {
-                const point = this.trailPoints[i];
-                const progress = i / trailLength;
-                const alpha = progress * (0.5 - layer * 0.15);
+        ctx.save();
+        ctx.transform(dx, dy, -dy, dx, origin.x, origin.y);
 
-                if (i === 0) {
-                    ctx.moveTo(point.x, point.y);
-                } else {
-                    ctx.lineTo(point.x, point.y);
-                }
+        const trailLength = Math.min(this.trailPoints.length, GameConfig.trail.maxLength);
+        ctx.beginPath();
+        for (let i = 0; i < trailLength; i++) {
+            const rx = this.trailPoints[i].x - origin.x;
+            const ry = this.trailPoints[i].y - origin.y;
+            const u = (rx * dx + ry * dy) / length2;
+            const v = (ry * dx - rx * dy) / length2;
+            if (i === 0) {
+                ctx.moveTo(u, v);
+            } else {
+                ctx.lineTo(u, v);
             }
+        }
 
-            // 渐变轨迹颜色
-            const gradient = ctx.createLinearGradient(
-                this.trailPoints[0].x, this.trailPoints[0].y,
-                this.position.x, this.position.y
-            );
-            gradient.addColorStop(0, 'rgba(66, 133, 244, 0)');
-            gradient.addColorStop(1, `rgba(66, 133, 244, ${0.6 - layer * 0.2})`);
-
-            ctx.strokeStyle = gradient;
-            ctx.lineWidth = GameConfig.trail.width + layer * 2;
-            ctx.lineCap = 'round';
-            ctx.lineJoin = 'round';
-            ctx.globalAlpha = 0.7;
+        // 绘制多层轨迹以产生发光效果；线宽换算到单位坐标系
+        const length = Math.sqrt(length2);
+        ctx.lineCap = 'round';
+        ctx.lineJoin = 'round';
+        ctx.globalAlpha = 0.7;
+        for (let layer = 0; layer < 3; layer++) {
+            ctx.strokeStyle = cache.trailGradient(ctx, layer);
+            ctx.lineWidth = (GameConfig.trail.width + layer * 2) / length;
             ctx.stroke();
         }
 
@@ -315,71 +319,84 @@ class Paddle {
         this.hitAnimation = 1;
     }
 
-    draw(ctx) {
+    draw(ctx, cache) {
         const x = this.position.x;
         const y = this.position.y;
+        const w = this.width;
+        const h = this.height;
 
         ctx.save();
 
         // 计算动画偏移
         const animationOffset = Math.sin(this.hitAnimation * Math.PI) * 3;
+        const centerX = x + w / 2;
+        const centerY = y - animationOffset + h / 2;
 
-        // 绘制发光效果
+        // 绘制发光效果：按强度分四档预先栅格化，档内用透明度补足
         if (this.glowIntensity > 0.01) {
-            const glowGradient = ctx.createLinearGradient(
-                x, y,
-                x, y + this.height
-            );
-            glowGradient.addColorStop(0, `rgba(74, 222, 128, ${this.glowIntensity * 0.6})`);
-            glowGradient.addColorStop(1, `rgba(34, 197, 94, ${this.glowIntensity * 0.4})`);
+            const level = Math.min(Paddle.GLOW_LEVELS, Math.ceil(this.glowIntensity * Paddle.GLOW_LEVELS));
+            const intensity = level / Paddle.GLOW_LEVELS;
+            const pad = (20 + intensity * 30) + 4;
+            const glow = cache.sprite(`paddle-glow:${w}x${h}:${level}`, w + pad * 2, h + pad * 2,
+                spriteCtx => Paddle.paintGlow(spriteCtx, w, h, intensity));
+            ctx.globalAlpha = Math.min(1, this.glowIntensity / intensity);
+            cache.drawSprite(ctx, glow, centerX, centerY);
+            ctx.globalAlpha = 1;
+        }
 
-            ctx.shadowColor = `rgba(74, 222, 128, ${this.glowIntensity})`;
-            ctx.shadowBlur = 20 + this.glowIntensity * 30;
+        // 主挡板与高光
+        const body = cache.sprite(`paddle:${w}x${h}`, w, h, spriteCtx => Paddle.paintBody(spriteCtx, w, h));
+        cache.drawSprite(ctx, body, centerX, centerY);
 
-            ctx.fillStyle = glowGradient;
-            ctx.fillRect(x - 4, y - 4 - animationOffset, this.width + 8, this.height + 8);
+        // 边框
+        ctx.strokeStyle = this.glowIntensity > 0.3 ? '#ffffff' : 'rgba(255, 255, 255, 0.8)';
+        ctx.lineWidth = 2 + this.hitAnimation;
+        ctx.strokeRect(x, y - animationOffset, w, h);
+
+        // 发光粒子效果
+        if (this.glowIntensity > 0.3) {
+            this.drawGlowParticles(ctx, x, y);
         }
 
-        // 主挡板渐变
-        const paddleGradient = ctx.createLinearGradient(
-            x, y,
-            x, y + this.height
-        );
+        ctx.restore();
+    }
 
-        const brightness = 1 + this.hitAnimation * 0.5;
-        paddleGradient.addColorStop(0, `rgba(74, 222, 128, ${brightness})`);
-        paddleGradient.addColorStop(0.5, `rgba(34, 197, 94, ${brightness})`);
-        paddleGradient.addColorStop(1, `rgba(22, 163, 74, ${brightness})`);
+    // 主挡板渐变与高光，以挡板中心为原点。亮度 ≥ 1 时 alpha 截断为 1，与命中动画无关
+    static paintBody(ctx, w, h) {
+        const x = -w / 2;
+        const y = -h / 2;
 
-        ctx.shadowBlur = this.glowIntensity * 15;
-        ctx.shadowColor = GameConfig.colors.paddleGlow;
+        const paddleGradient = ctx.createLinearGradient(x, y, x, y + h);
+        paddleGradient.addColorStop(0, 'rgba(74, 222, 128, 1)');
+        paddleGradient.addColorStop(0.5, 'rgba(34, 197, 94, 1)');
+        paddleGradient.addColorStop(1, 'rgba(22, 163, 74, 1)');
         ctx.fillStyle = paddleGradient;
-        ctx.fillRect(x, y - animationOffset, this.width, this.height);
+        ctx.fillRect(x, y, w, h);
 
-        ctx.shadowBlur = 0;
-
-        // 高光效果
-        const highlightGradient = ctx.createLinearGradient(
-            x, y,
-            x, y + this.height * 0.3
-        );
+        const highlightGradient = ctx.createLinearGradient(x, y, x, y + h * 0.3);
         highlightGradient.addColorStop(0, 'rgba(255, 255, 255, 0.4)');
         highlightGradient.addColorStop(1, 'rgba(255, 255, 255, 0)');
-
         ctx.fillStyle = highlightGradient;
-        ctx.fillRect(x, y - animationOffset, this.width, this.height * 0.3);
+        ctx.fillRect(x, y, w, h * 0.3);
+    }
 
-        // 边框
-        ctx.strokeStyle = this.glowIntensity > 0.3 ? '#ffffff' : 'rgba(255, 255, 255, 0.8)';
-        ctx.lineWidth = 2 + this.hitAnimation;
-        ctx.strokeRect(x, y - animationOffset, this.width, this.height);
+    // 发光强度为 intensity 时的外发光和挡板阴影；挡板本体随后被 paintBody 的精灵盖住
+    static paintGlow(ctx, w, h, intensity) {
+        const x = -w / 2;
+        const y = -h / 2;
 
-        // 发光粒子效果
-        if (this.glowIntensity > 0.3) {
-            this.drawGlowParticles(ctx, x, y);
-        }
+        const glowGradient = ctx.createLinearGradient(x, y, x, y + h);
+        glowGradient.addColorStop(0, `rgba(74, 222, 128, ${intensity * 0.6})`);
+        glowGradient.addColorStop(1, `rgba(34, 197, 94, ${intensity * 0.4})`);
+        ctx.shadowColor = `rgba(74, 222, 128, ${intensity})`;
+        ctx.shadowBlur = 20 + intensity * 30;
+        ctx.fillStyle = glowGradient;
+        ctx.fillRect(x - 4, y - 4, w + 8, h + 8);
 
-        ctx.restore();
+        ctx.shadowBlur = intensity * 15;
+        ctx.shadowColor = GameConfig.colors.paddleGlow;
+        ctx.fillStyle = '#22c55e';
+        ctx.fillRect(x, y, w, h);
     }
 
     drawGlowParticles(ctx, x, y) {
@@ -397,6 +414,8 @@ class Paddle {
     }
 }
 
+Paddle.GLOW_LEVELS = 4;
+
 // 反弹器类 - 支持碰撞动画
 class Bumper {
     constructor(x, y, radius, color, scoreValue) {
@@ -428,171 +447,103 @@ class Bumper {
         this.glowIntensity = 1;
     }
 
-    draw(ctx) {
-        ctx.save();
-
-        // 外发光效果
-        if (this.glowIntensity > 0.01) {
-            const glowGradient = ctx.createRadialGradient(
-                this.position.x, this.position.y, 0,
-                this.position.x, this.position.y, this.radius * 2
-            );
-            glowGradient.addColorStop(0, `rgba(239, 68, 68, ${this.glowIntensity * 0.5})`);
-            glowGradient.addColorStop(0.5, `rgba(220, 38, 38, ${this.glowIntensity * 0.3})`);
-            glowGradient.addColorStop(1, 'rgba(220, 38, 38, 0)');
-
-            ctx.fillStyle = glowGradient;
-            ctx.beginPath();
-            ctx.arc(this.position.x, this.position.y, this.radius * 2, 0, Math.PI * 2);
-            ctx.fill();
-        }
+    // 静止的反弹器画在静态层里（drawBase），只有命中动画期间逐帧绘制
+    draw(ctx, cache) {
+        if (this.hitAnimation <= 0 && this.glowIntensity <= 0.01) return;
+        this.drawState(ctx, cache, this.radius, this.hitAnimation, this.glowIntensity);
+    }
 
-        // 主反弹器渐变
-        const bumperGradient = ctx.createRadialGradient(
-            this.position.x - this.radius * 0.3,
-            this.position.y - this.radius * 0.3,
-            0,
-            this.position.x,
-            this.position.y,
-            this.radius
-        );
+    drawBase(ctx, cache) {
+        this.drawState(ctx, cache, this.baseRadius, 0, 0);
+    }
 
-        const brightness = 1 + this.hitAnimation * 0.8;
-        bumperGradient.addColorStop(0, `rgba(255, 255, 255, ${brightness})`);
-        bumperGradient.addColorStop(0.3, `rgba(255, 200, 200, ${brightness})`);
-        bumperGradient.addColorStop(0.7, this.color);
-        bumperGradient.addColorStop(1, '#991b1b');
+    drawState(ctx, cache, radius, hitAnimation, glowIntensity) {
+        const x = this.position.x;
+        const y = this.position.y;
+        const base = this.baseRadius;
+        const scale = radius / base;
 
-        // 阴影效果
-        ctx.shadowColor = 'rgba(239, 68, 68, 0.5)';
-        ctx.shadowBlur = 15 + this.hitAnimation * 20;
-        ctx.shadowOffsetY = 3;
+        ctx.save();
 
-        ctx.beginPath();
-        ctx.arc(this.position.x, this.position.y, this.radius, 0, Math.PI * 2);
-        ctx.fillStyle = bumperGradient;
-        ctx.fill();
+        // 外发光效果：强度 1 的精灵，透明度即强度（渐变各档 alpha 与强度成正比）
+        if (glowIntensity > 0.01) {
+            const glow = cache.sprite(`bumper-glow:${base}`, base * 4, base * 4,
+                spriteCtx => Bumper.paintGlow(spriteCtx, base));
+            ctx.globalAlpha = glowIntensity;
+            cache.drawSprite(ctx, glow, x, y, scale);
+            ctx.globalAlpha = 1;
+        }
 
-        ctx.shadowBlur = 0;
-        ctx.shadowOffsetY = 0;
+        // 主反弹器：渐变和阴影预先栅格化，命中时按半径缩放
+        const size = (base + Bumper.SHADOW_BLUR * 1.5 + 5) * 2;
+        const body = cache.sprite(`bumper:${base}:${this.color}`, size, size,
+            spriteCtx => Bumper.paintBody(spriteCtx, base, this.color));
+        cache.drawSprite(ctx, body, x, y, scale);
 
         // 边框
-        ctx.strokeStyle = this.hitAnimation > 0.5 ? '#ffffff' : 'rgba(255, 255, 255, 0.8)';
-        ctx.lineWidth = 3 + this.hitAnimation * 2;
+        ctx.beginPath();
+        ctx.arc(x, y, radius, 0, Math.PI * 2);
+        ctx.strokeStyle = hitAnimation > 0.5 ? '#ffffff' : 'rgba(255, 255, 255, 0.8)';
+        ctx.lineWidth = 3 + hitAnimation * 2;
         ctx.stroke();
 
         // 内圈装饰
         ctx.beginPath();
-        ctx.arc(this.position.x, this.position.y, this.radius * 0.6, 0, Math.PI * 2);
+        ctx.arc(x, y, radius * 0.6, 0, Math.PI * 2);
         ctx.strokeStyle = 'rgba(255, 255, 255, 0.3)';
         ctx.lineWidth = 2;
         ctx.stroke();
 
         // 分数值显示
-        if (this.glowIntensity > 0.2) {
-            ctx.font = `bold ${this.radius * 0.7}px 'Orbitron', monospace`;
-            ctx.fillStyle = `rgba(255, 255, 255, ${this.glowIntensity})`;
+        if (glowIntensity > 0.2) {
+            ctx.font = `bold ${radius * 0.7}px 'Orbitron', monospace`;
+            ctx.fillStyle = `rgba(255, 255, 255, ${glowIntensity})`;
             ctx.textAlign = 'center';
             ctx.textBaseline = 'middle';
-            ctx.fillText(this.scoreValue.toString(), this.position.x, this.position.y);
+            ctx.fillText(this.scoreValue.toString(), x, y);
         }
 
         ctx.restore();
     }
-}
 
-// 得分飘字动画
-class FloatingScore {
-    constructor(x, y, text, color = '#ffff00') {
-        this.x = x;
-        this.y = y;
-        this.text = text;
-        this.color = color;
-        this.life = 1.0;
-        this.velocity = new Vector2((Math.random() - 0.5) * 2, -3 - Math.random() * 2);
-        this.scale = 0.8;
-        this.rotation = (Math.random() - 0.5) * 0.2;
-    }
+    // 强度为 1 的外发光，以反弹器中心为原点
+    static paintGlow(ctx, radius) {
+        const glowGradient = ctx.createRadialGradient(0, 0, 0, 0, 0, radius * 2);
+        glowGradient.addColorStop(0, 'rgba(239, 68, 68, 0.5)');
+        glowGradient.addColorStop(0.5, 'rgba(220, 38, 38, 0.3)');
+        glowGradient.addColorStop(1, 'rgba(220, 38, 38, 0)');
 
-    update() {
-        this.life -= 0.015;
-        this.y += this.velocity.y;
-        this.x += this.velocity.x;
-        this.velocity.y *= 0.98; // 减速
-        this.scale = 1 + (1 - this.life) * 0.5; // 逐渐放大
+        ctx.fillStyle = glowGradient;
+        ctx.beginPath();
+        ctx.arc(0, 0, radius * 2, 0, Math.PI * 2);
+        ctx.fill();
     }
 
-    draw(ctx) {
-        ctx.save();
-        ctx.globalAlpha = Math.max(0, this.life);
-        ctx.translate(this.x, this.y);
-        ctx.rotate(this.rotation);
-        ctx.scale(this.scale, this.scale);
+    // 主体渐变和阴影。命中时亮度 ≥ 1，rgba 的 alpha 截断为 1，所以渐变与动画无关
+    static paintBody(ctx, radius, color) {
+        const bumperGradient = ctx.createRadialGradient(
+            -radius * 0.3, -radius * 0.3, 0,
+            0, 0, radius
+        );
+        bumperGradient.addColorStop(0, 'rgba(255, 255, 255, 1)');
+        bumperGradient.addColorStop(0.3, 'rgba(255, 200, 200, 1)');
+        bumperGradient.addColorStop(0.7, color);
+        bumperGradient.addColorStop(1, '#991b1b');
 
         // 阴影效果
-        ctx.shadowColor = this.color;
-        ctx.shadowBlur = 15;
-
-        // 绘制文字
-        ctx.font = `bold 20px 'Orbitron', monospace`;
-        ctx.fillStyle = this.color;
-        ctx.textAlign = 'center';
-        ctx.textBaseline = 'middle';
-        ctx.fillText(this.text, 0, 0);
-
-        // 描边
-        ctx.strokeStyle = 'rgba(0, 0, 0, 0.5)';
-        ctx.lineWidth = 3;
-        ctx.strokeText(this.text, 0, 0);
-
-        ctx.restore();
-    }
-
-    isDead() {
-        return this.life <= 0;
-    }
-}
-
-// 粒子效果
-class Particle {
-    constructor(x, y, color) {
-        this.x = x;
-        this.y = y;
-        this.color = color;
-        const angle = Math.random() * Math.PI * 2;
-        const speed = 2 + Math.random() * 4;
-        this.vx = Math.cos(angle) * speed;
-        this.vy = Math.sin(angle) * speed;
-        this.life = 1.0;
-        this.size = 3 + Math.random() * 4;
-        this.decay = 0.02 + Math.random() * 0.02;
-    }
-
-    update() {
-        this.x += this.vx;
-        this.y += this.vy;
-        this.vy += 0.1; // 重力
-        this.life -= this.decay;
-        this.size *= 0.97;
-    }
+        ctx.shadowColor = 'rgba(239, 68, 68, 0.5)';
+        ctx.shadowBlur = Bumper.SHADOW_BLUR;
+        ctx.shadowOffsetY = 3;
 
-    draw(ctx) {
-        ctx.save();
-        ctx.globalAlpha = Math.max(0, this.life);
-        ctx.fillStyle = this.color;
-        ctx.shadowColor = this.color;
-        ctx.shadowBlur = 10;
         ctx.beginPath();
-        ctx.arc(this.x, this.y, this.size, 0, Math.PI * 2);
+        ctx.arc(0, 0, radius, 0, Math.PI * 2);
+        ctx.fillStyle = bumperGradient;
         ctx.fill();
-        ctx.restore();
-    }
-
-    isDead() {
-        return this.life <= 0 || this.size < 0.5;
     }
 }
 
+Bumper.SHADOW_BLUR = 15;
+
 class EnhancedPinballGame {
     constructor() {
         this.canvas = document.getElementById('game-canvas');
@@ -602,8 +553,9 @@ class EnhancedPinballGame {
         }
 
         this.ctx = this.canvas.getContext('2d');
-        this.bgCanvas = document.createElement('canvas');
-        this.bgCtx = this.bgCanvas.getContext('2d');
+        // 离屏渲染缓存：静态层与精灵（见 render-cache.js）
+        this.renderCache = new RenderCache();
+        this.stars = [];
 
         this.width = this.canvas.width;
         this.height = this.canvas.height;
@@ -638,11 +590,11 @@ class EnhancedPinballGame {
             touchX: 0
         };
 
-        // 视觉效果容器
+        // 视觉效果容器（定长特效池，见 effects.js）
         this.animations = {
-            scorePops: [],
-            particles: [],
-            floatingScores: []
+            scorePops: new ScorePopPool(),
+            particles: new ParticlePool(),
+            floatingScores: new FloatingScorePool()
         };
 
         this.soundEnabled = false;
@@ -670,8 +622,14 @@ class EnhancedPinballGame {
         this.resetLevel();
         this.updateUI();
         this.loop = this.loop.bind(this);
+        this.paintStaticLayer = this.paintStaticLayer.bind(this);
         this.animationFrameId = requestAnimationFrame(this.loop);
 
+        // 网页字体晚于精灵加载时，按新字体重新栅格化
+        if (document.fonts && document.fonts.addEventListener) {
+            document.fonts.addEventListener('loadingdone', () => this.renderCache.clearSprites());
+        }
+
         this.announceScreenReaderMessage('物理弹球游戏已加载完成。使用箭头键移动挡板，空格键发射球。');
     }
 
@@ -690,9 +648,10 @@ class EnhancedPinballGame {
         this.width = rect.width;
         this.height = rect.height;
 
-        this.bgCanvas.width = this.width;
-        this.bgCanvas.height = this.height;
-        this.renderBackground();
+        // 尺寸或 DPR 没变时静态层保持不动
+        if (this.renderCache.resize(this.width, this.height, dpr)) {
+            this.createStars();
+        }
 
         this.initWalls();
 
@@ -708,8 +667,8 @@ class EnhancedPinballGame {
         }
     }
 
-    renderBackground() {
-        const ctx = this.bgCtx;
+    // 静态层：背景、网格、星星、墙壁和静止的反弹器，只在缓存过期时重画
+    paintStaticLayer(ctx) {
         const w = this.width;
         const h = this.height;
 
@@ -739,24 +698,41 @@ class EnhancedPinballGame {
             }
         }
 
-        this.drawBackgroundElements();
+        for (const star of this.stars) {
+            ctx.fillStyle = `rgba(255, 255, 255, ${star.alpha})`;
+            ctx.beginPath();
+            ctx.arc(star.x, star.y, star.size, 0, Math.PI * 2);
+            ctx.fill();
+        }
+
+        // 墙壁
+        for (const wall of this.elements.walls) {
+            ctx.fillStyle = wall.color;
+            ctx.fillRect(wall.x, wall.y, wall.w, wall.h);
+
+            ctx.strokeStyle = 'rgba(255, 255, 255, 0.2)';
+            ctx.lineWidth = 1;
+            ctx.strokeRect(wall.x, wall.y, wall.w, wall.h);
+        }
+
+        // 反弹器底座
+        for (const bumper of this.elements.bumpers) {
+            bumper.drawBase(ctx, this.renderCache);
+        }
     }
 
-    drawBackgroundElements() {
-        const ctx = this.bgCtx;
+    createStars() {
         const w = this.width;
         const h = this.height;
 
+        this.stars = [];
         for (let i = 0; i < 15; i++) {
-            const x = Math.random() * w;
-            const y = Math.random() * h;
-            const size = Math.random() * 2 + 1;
-            const alpha = Math.random() * 0.5 + 0.3;
-
-            ctx.fillStyle = `rgba(255, 255, 255, ${alpha})`;
-            ctx.beginPath();
-            ctx.arc(x, y, size, 0, Math.PI * 2);
-            ctx.fill();
+            this.stars.push({
+                x: Math.random() * w,
+                y: Math.random() * h,
+                size: Math.random() * 2 + 1,
+                alpha: Math.random() * 0.5 + 0.3
+            });
         }
     }
 
@@ -807,6 +783,7 @@ class EnhancedPinballGame {
             new Bumper(this.width * 0.7, this.height * 0.3, 25, GameConfig.colors.bumper, GameConfig.scores.bumper),
             new Bumper(this.width * 0.5, this.height * 0.5, 30, GameConfig.colors.bumper, GameConfig.scores.bumper)
         ];
+        this.renderCache.invalidate();
 
         this.spawnBall();
     }
@@ -1115,11 +1092,9 @@ class EnhancedPinballGame {
         };
 
         // 清除所有动画效果
-        this.animations = {
-            scorePops: [],
-            particles: [],
-            floatingScores: []
-        };
+        this.animations.scorePops.clear();
+        this.animations.particles.clear();
+        this.animations.floatingScores.clear();
 
         this.resetLevel();
         this.updateUI();
@@ -1314,27 +1289,27 @@ class EnhancedPinballGame {
     // 添加墙壁碰撞粒子
     addWallHitParticles(x, y) {
         for (let i = 0; i < 5; i++) {
-            this.animations.particles.push(new Particle(x, y, 'rgba(255, 255, 255, 0.6)'));
+            this.animations.particles.spawn(x, y, 'rgba(255, 255, 255, 0.6)');
         }
     }
 
     // 添加挡板击球粒子
     addPaddleHitParticles(x, y) {
         for (let i = 0; i < 8; i++) {
-            this.animations.particles.push(new Particle(x, y, '#4ade80'));
+            this.animations.particles.spawn(x, y, '#4ade80');
         }
     }
 
     // 添加反弹器击球粒子
     addBumperHitParticles(x, y, color) {
         for (let i = 0; i < 12; i++) {
-            this.animations.particles.push(new Particle(x, y, color));
+            this.animations.particles.spawn(x, y, color);
         }
     }
 
     // 添加得分飘字动画
     addFloatingScore(x, y, text, color) {
-        this.animations.floatingScores.push(new FloatingScore(x, y, text, color));
+        this.animations.floatingScores.spawn(x, y, text, color);
 
         // 同时触发 DOM 动画（用于额外的视觉效果）
         if (this.microInteractions) {
@@ -1417,64 +1392,19 @@ class EnhancedPinballGame {
     }
 
     addScoreAnimation(x, y, text) {
-        this.animations.scorePops.push({
-            x,
-            y,
-            text,
-            life: 1.0,
-            velocity: new Vector2(0, -2)
-        });
+        this.animations.scorePops.spawn(x, y, text);
     }
 
     updateAnimations() {
-        // 更新飘字动画
-        for (let i = this.animations.floatingScores.length - 1; i >= 0; i--) {
-            const fs = this.animations.floatingScores[i];
-            fs.update();
-            if (fs.isDead()) {
-                this.animations.floatingScores.splice(i, 1);
-            }
-        }
-
-        // 更新粒子
-        for (let i = this.animations.particles.length - 1; i >= 0; i--) {
-            const p = this.animations.particles[i];
-            p.update();
-            if (p.isDead()) {
-                this.animations.particles.splice(i, 1);
-            }
-        }
-
-        // 更新得分动画
-        for (let i = this.animations.scorePops.length - 1; i >= 0; i--) {
-            const pop = this.animations.scorePops[i];
-            pop.life -= 0.02;
-            pop.y += pop.velocity.y;
-
-            if (pop.life <= 0) {
-                this.animations.scorePops.splice(i, 1);
-            }
-        }
+        this.animations.floatingScores.update();
+        this.animations.particles.update();
+        this.animations.scorePops.update();
     }
 
     drawAnimations() {
-        // 绘制飘字动画
-        this.animations.floatingScores.forEach(fs => fs.draw(this.ctx));
-
-        // 绘制粒子
-        this.animations.particles.forEach(p => p.draw(this.ctx));
-
-        // 绘制得分动画
-        this.animations.scorePops.forEach(pop => {
-            this.ctx.save();
-            this.ctx.globalAlpha = pop.life;
-            this.ctx.font = `bold ${16 + (1 - pop.life) * 8}px 'Orbitron', monospace`;
-            this.ctx.fillStyle = '#ffff00';
-            this.ctx.textAlign = 'center';
-            this.ctx.textBaseline = 'middle';
-            this.ctx.fillText(pop.text, pop.x, pop.y);
-            this.ctx.restore();
-        });
+        this.animations.floatingScores.draw(this.ctx, this.renderCache);
+        this.animations.particles.draw(this.ctx, this.renderCache);
+        this.animations.scorePops.draw(this.ctx);
     }
 
     updateUI() {
@@ -1595,30 +1525,26 @@ class EnhancedPinballGame {
     }
 
     draw() {
-        this.ctx.clearRect(0, 0, this.width, this.height);
-        this.ctx.drawImage(this.bgCanvas, 0, 0, this.width, this.height);
+        const cache = this.renderCache;
 
-        // 绘制墙壁
-        this.elements.walls.forEach(w => {
-            this.ctx.fillStyle = w.color;
-            this.ctx.fillRect(w.x, w.y, w.w, w.h);
+        // 静态层不透明且铺满画布，不需要先 clearRect（省一次全屏填充）
+        cache.drawLayer(this.ctx, this.paintStaticLayer);
 
-            this.ctx.strokeStyle = 'rgba(255, 255, 255, 0.2)';
-            this.ctx.lineWidth = 1;
-            this.ctx.strokeRect(w.x, w.y, w.w, w.h);
-        });
-
-        // 绘制反弹器
-        this.elements.bumpers.forEach(b => b.draw(this.ctx));
+        // 绘制命中动画中的反弹器
+        for (const bumper of this.elements.bumpers) {
+            bumper.draw(this.ctx, cache);
+        }
 
         // 绘制挡板
         const p = this.elements.paddles[0];
         if (p) {
-            p.draw(this.ctx);
+            p.draw(this.ctx, cache);
         }
 
         // 绘制球
-        this.elements.balls.forEach(b => b.draw(this.ctx));
+        for (const ball of this.elements.balls) {
+            ball.draw(this.ctx, cache);
+        }
 
         // 绘制动画
         this.drawAnimations();
@@ -1632,23 +1558,40 @@ class EnhancedPinballGame {
     drawComboIndicator() {
         const centerX = this.width / 2;
         const centerY = 40;
+        const multiplier = this.state.comboMultiplier;
 
         this.ctx.save();
         this.ctx.globalAlpha = 0.8;
 
-        this.ctx.beginPath();
-        this.ctx.arc(centerX, centerY, 30, 0, Math.PI * 2);
+        const badge = this.renderCache.sprite(`combo:${multiplier}`, 64, 64,
+            spriteCtx => EnhancedPinballGame.paintComboBadge(spriteCtx, multiplier));
+        this.renderCache.drawSprite(this.ctx, badge, centerX, centerY);
 
-        const comboGradient = this.ctx.createRadialGradient(
-            centerX, centerY, 0,
-            centerX, centerY, 30
-        );
+        this.ctx.font = 'bold 24px "Orbitron", monospace, sans-serif';
+        this.ctx.fillStyle = '#ffffff';
+        this.ctx.textAlign = 'center';
+        this.ctx.textBaseline = 'middle';
+        this.ctx.fillText(this.state.combo.toString(), centerX, centerY);
+
+        this.ctx.font = 'bold 12px "Orbitron", monospace, sans-serif';
+        this.ctx.fillStyle = 'rgba(255, 255, 255, 0.8)';
+        this.ctx.fillText(`x${multiplier}`, centerX, centerY + 25);
+
+        this.ctx.restore();
+    }
 
-        if (this.state.comboMultiplier === 4) {
+    // 连击徽章的圆形底板，每个倍率栅格化一次
+    static paintComboBadge(ctx, multiplier) {
+        ctx.beginPath();
+        ctx.arc(0, 0, 30, 0, Math.PI * 2);
+
+        const comboGradient = ctx.createRadialGradient(0, 0, 0, 0, 0, 30);
+
+        if (multiplier === 4) {
             comboGradient.addColorStop(0, '#ffffff');
             comboGradient.addColorStop(0.5, '#fbbf24');
             comboGradient.addColorStop(1, '#d97706');
-        } else if (this.state.comboMultiplier === 3) {
+        } else if (multiplier === 3) {
             comboGradient.addColorStop(0, '#ffffff');
             comboGradient.addColorStop(0.5, '#f87171');
             comboGradient.addColorStop(1, '#dc2626');
@@ -1658,23 +1601,11 @@ class EnhancedPinballGame {
             comboGradient.addColorStop(1, '#2563eb');
         }
 
-        this.ctx.fillStyle = comboGradient;
-        this.ctx.fill();
-        this.ctx.strokeStyle = '#ffffff';
-        this.ctx.lineWidth = 2;
-        this.ctx.stroke();
-
-        this.ctx.font = 'bold 24px "Orbitron", monospace, sans-serif';
-        this.ctx.fillStyle = '#ffffff';
-        this.ctx.textAlign = 'center';
-        this.ctx.textBaseline = 'middle';
-        this.ctx.fillText(this.state.combo.toString(), centerX, centerY);
-
-        this.ctx.font = 'bold 12px "Orbitron", monospace, sans-serif';
-        this.ctx.fillStyle = 'rgba(255, 255, 255, 0.8)';
-        this.ctx.fillText(`x${this.state.comboMultiplier}`, centerX, centerY + 25);
-
-        this.ctx.restore();
+        ctx.fillStyle = comboGradient;
+        ctx.fill();
+        ctx.strokeStyle = '#ffffff';
+        ctx.lineWidth = 2;
+        ctx.stroke();
     }
 
     loop(timestamp) {
@@ -0,0 +1,290 @@
+/* 物理弹球 - 特效池基准测试（开发用，不进入构建产物） */
+/* particle-bench.html 和 tools/pinball_particles.py 共用这里的工作负载：
+   同一个种子下两种实现收到完全相同的碰撞事件和 Math.random 序列。 */
+
+// ========== 旧实现：每个特效一个对象，splice 删除（原样保留作对照） ==========
+class LegacyVector2 {
+    constructor(x = 0, y = 0) {
+        this.x = x;
+        this.y = y;
+    }
+}
+
+class LegacyFloatingScore {
+    constructor(x, y, text, color = '#ffff00') {
+        this.x = x;
+        this.y = y;
+        this.text = text;
+        this.color = color;
+        this.life = 1.0;
+        this.velocity = new LegacyVector2((Math.random() - 0.5) * 2, -3 - Math.random() * 2);
+        this.scale = 0.8;
+        this.rotation = (Math.random() - 0.5) * 0.2;
+    }
+
+    update() {
+        this.life -= 0.015;
+        this.y += this.velocity.y;
+        this.x += this.velocity.x;
+        this.velocity.y *= 0.98;
+        this.scale = 1 + (1 - this.life) * 0.5;
+    }
+
+    draw(ctx) {
+        ctx.save();
+        ctx.globalAlpha = Math.max(0, this.life);
+        ctx.translate(this.x, this.y);
+        ctx.rotate(this.rotation);
+        ctx.scale(this.scale, this.scale);
+        ctx.shadowColor = this.color;
+        ctx.shadowBlur = 15;
+        ctx.font = `bold 20px 'Orbitron', monospace`;
+        ctx.fillStyle = this.color;
+        ctx.textAlign = 'center';
+        ctx.textBaseline = 'middle';
+        ctx.fillText(this.text, 0, 0);
+        ctx.strokeStyle = 'rgba(0, 0, 0, 0.5)';
+        ctx.lineWidth = 3;
+        ctx.strokeText(this.text, 0, 0);
+        ctx.restore();
+    }
+
+    isDead() {
+        return this.life <= 0;
+    }
+}
+
+class LegacyParticle {
+    constructor(x, y, color) {
+        this.x = x;
+        this.y = y;
+        this.color = color;
+        const angle = Math.random() * Math.PI * 2;
+        const speed = 2 + Math.random() * 4;
+        this.vx = Math.cos(angle) * speed;
+        this.vy = Math.sin(angle) * speed;
+        this.life = 1.0;
+        this.size = 3 + Math.random() * 4;
+        this.decay = 0.02 + Math.random() * 0.02;
+    }
+
+    update() {
+        this.x += this.vx;
+        this.y += this.vy;
+        this.vy += 0.1;
+        this.life -= this.decay;
+        this.size *= 0.97;
+    }
+
+    draw(ctx) {
+        ctx.save();
+        ctx.globalAlpha = Math.max(0, this.life);
+        ctx.fillStyle = this.color;
+        ctx.shadowColor = this.color;
+        ctx.shadowBlur = 10;
+        ctx.beginPath();
+        ctx.arc(this.x, this.y, this.size, 0, Math.PI * 2);
+        ctx.fill();
+        ctx.restore();
+    }
+
+    isDead() {
+        return this.life <= 0 || this.size < 0.5;
+    }
+}
+
+class LegacyEffects {
+    constructor() {
+        this.scorePops = [];
+        this.particles = [];
+        this.floatingScores = [];
+    }
+
+    particle(x, y, color) {
+        this.particles.push(new LegacyParticle(x, y, color));
+    }
+
+    floatingScore(x, y, text, color) {
+        this.floatingScores.push(new LegacyFloatingScore(x, y, text, color));
+    }
+
+    scorePop(x, y, text) {
+        this.scorePops.push({ x, y, text, life: 1.0, velocity: new LegacyVector2(0, -2) });
+    }
+
+    update() {
+        for (let i = this.floatingScores.length - 1; i >= 0; i--) {
+            const fs = this.floatingScores[i];
+            fs.update();
+            if (fs.isDead()) {
+                this.floatingScores.splice(i, 1);
+            }
+        }
+        for (let i = this.particles.length - 1; i >= 0; i--) {
+            const p = this.particles[i];
+            p.update();
+            if (p.isDead()) {
+                this.particles.splice(i, 1);
+            }
+        }
+        for (let i = this.scorePops.length - 1; i >= 0; i--) {
+            const pop = this.scorePops[i];
+            pop.life -= 0.02;
+            pop.y += pop.velocity.y;
+            if (pop.life <= 0) {
+                this.scorePops.splice(i, 1);
+            }
+        }
+    }
+
+    draw(ctx) {
+        this.floatingScores.forEach(fs => fs.draw(ctx));
+        this.particles.forEach(p => p.draw(ctx));
+        this.scorePops.forEach(pop => {
+            ctx.save();
+            ctx.globalAlpha = pop.life;
+            ctx.font = `bold ${16 + (1 - pop.life) * 8}px 'Orbitron', monospace`;
+            ctx.fillStyle = '#ffff00';
+            ctx.textAlign = 'center';
+            ctx.textBaseline = 'middle';
+            ctx.fillText(pop.text, pop.x, pop.y);
+            ctx.restore();
+        });
+    }
+
+    // 粒子的 [x, y, life, size] 快照，用于比较两种实现
+    snapshot() {
+        return this.particles.map(p => [p.x, p.y, p.life, p.size]);
+    }
+
+    dropped() {
+        return 0;
+    }
+}
+
+// ========== 新实现：effects.js 的定长池，精灵来自 render-cache.js ==========
+class PooledEffects {
+    constructor(width, height) {
+        this.scorePops = new ScorePopPool();
+        this.particles = new ParticlePool();
+        this.floatingScores = new FloatingScorePool();
+        this.cache = new RenderCache();
+        this.cache.resize(width, height, 1);
+    }
+
+    particle(x, y, color) {
+        this.particles.spawn(x, y, color);
+    }
+
+    floatingScore(x, y, text, color) {
+        this.floatingScores.spawn(x, y, text, color);
+    }
+
+    scorePop(x, y, text) {
+        this.scorePops.spawn(x, y, text);
+    }
+
+    update() {
+        this.floatingScores.update();
+        this.particles.update();
+        this.scorePops.update();
+    }
+
+    draw(ctx) {
+        this.floatingScores.draw(ctx, this.cache);
+        this.particles.draw(ctx, this.cache);
+        this.scorePops.draw(ctx);
+    }
+
+    snapshot() {
+        const { x, y, life, size } = this.particles;
+        const rows = [];
+        for (let i = 0; i < this.particles.count; i++) rows.push([x[i], y[i], life[i], size[i]]);
+        return rows;
+    }
+
+    dropped() {
+        return this.particles.dropped + this.floatingScores.dropped + this.scorePops.dropped;
+    }
+}
+
+const PARTICLE_BENCH_IMPLS = { legacy: LegacyEffects, pooled: PooledEffects };
+
+// 与 tools/pinball_trace.py 相同的 mulberry32
+function mulberry32(seed) {
+    let state = seed >>> 0;
+    return function () {
+        state = (state + 0x6D2B79F5) >>> 0;
+        let t = state;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+}
+
+// 每个球每帧的碰撞概率，与游戏里的三种粒子喷发一致
+const BENCH_HITS = [
+    { chance: 0.05, count: 12, color: '#ea4335', score: true },  // 反弹器
+    { chance: 0.08, count: 5, color: 'rgba(255, 255, 255, 0.6)', score: false },  // 墙壁
+    { chance: 0.02, count: 8, color: '#4ade80', score: false }  // 挡板
+];
+
+/*
+ * 跑一次基准：frames 帧、balls 个球的碰撞事件。options:
+ *   ctx       绘制目标（真实 canvas 或计数桩）
+ *   heapUsed  返回当前 JS 堆字节数的函数，每帧采样一次（可选）
+ *   flush     每帧后调用，例如 getImageData 迫使 canvas 真正栅格化（可选）
+ *   snapshot  在这些帧号记录粒子快照（可选）
+ */
+function runParticleBench(impl, { frames = 3600, balls = 8, seed = 1, width = 400, height = 700,
+    ctx, heapUsed = null, flush = null, snapshot = [] } = {}) {
+    const effects = new PARTICLE_BENCH_IMPLS[impl](width, height);
+    const events = mulberry32(seed);
+    const random = Math.random;
+    Math.random = mulberry32(seed ^ 0x5bd1e995);
+    const now = () => performance.now();
+    const update = new Float64Array(frames);
+    const draw = new Float64Array(frames);
+    const live = new Float64Array(frames);
+    const heap = heapUsed ? new Float64Array(frames) : null;
+    const snapshots = {};
+    try {
+        for (let frame = 0; frame < frames; frame++) {
+            const start = now();
+            for (let b = 0; b < balls; b++) {
+                for (const hit of BENCH_HITS) {
+                    if (events() >= hit.chance) continue;
+                    const x = events() * width;
+                    const y = events() * height;
+                    for (let i = 0; i < hit.count; i++) effects.particle(x, y, hit.color);
+                    if (hit.score) {
+                        effects.floatingScore(x, y, '+100', '#ffff00');
+                        effects.scorePop(x, y, '+100');
+                    }
+                }
+            }
+            effects.update();
+            const drawn = now();
+            ctx.clearRect(0, 0, width, height);
+            effects.draw(ctx);
+            if (flush) flush();
+            draw[frame] = now() - drawn;
+            update[frame] = drawn - start;
+            live[frame] = effects.particles.length + effects.floatingScores.length +
+                effects.scorePops.length;
+            if (heap) heap[frame] = heapUsed();
+            if (snapshot.includes(frame)) snapshots[frame] = effects.snapshot();
+        }
+    } finally {
+        Math.random = random;
+    }
+    return {
+        impl,
+        update: Array.from(update),
+        draw: Array.from(draw),
+        live: Array.from(live),
+        heap: heap ? Array.from(heap) : null,
+        dropped: effects.dropped(),
+        snapshots
+    };
+}
@@ -0,0 +1,125 @@
+/* 物理弹球游戏 - 离屏渲染缓存 */
+/* 静态层（背景、墙壁、静止的反弹器底座）画在一张离屏画布上，只在尺寸 / DPR
+   变化或关卡重置时重画；球、光晕、粒子、飘字等精灵按当前 DPR 预先栅格化，
+   每帧只做 drawImage，不再逐帧创建渐变或开启 shadowBlur（低端手机的填充率瓶颈）。 */
+
+function createLayerCanvas(width, height) {
+    if (typeof OffscreenCanvas !== 'undefined') {
+        return new OffscreenCanvas(width, height);
+    }
+    const canvas = document.createElement('canvas');
+    canvas.width = width;
+    canvas.height = height;
+    return canvas;
+}
+
+class RenderCache {
+    constructor() {
+        this.width = 0;
+        this.height = 0;
+        this.dpr = 0;
+        this.layer = null;
+        this.layerCtx = null;
+        this.dirty = true;
+        this.sprites = new Map();
+        this.tables = new Map();
+        this.trailGradients = null;
+        this.stats = { layerRenders: 0, spriteRenders: 0 };
+    }
+
+    // 尺寸或 DPR 变化时返回 true，静态层在下一帧重画；DPR 变化时精灵全部作废
+    resize(width, height, dpr) {
+        if (width === this.width && height === this.height && dpr === this.dpr) {
+            return false;
+        }
+        if (dpr !== this.dpr) {
+            this.clearSprites();
+        }
+        this.width = width;
+        this.height = height;
+        this.dpr = dpr;
+        this.layer = createLayerCanvas(Math.max(1, Math.round(width * dpr)),
+            Math.max(1, Math.round(height * dpr)));
+        this.layerCtx = this.layer.getContext('2d');
+        this.dirty = true;
+        return true;
+    }
+
+    // 静态层内容变化（例如反弹器重建）时调用
+    invalidate() {
+        this.dirty = true;
+    }
+
+    clearSprites() {
+        this.sprites.clear();
+        this.tables.clear();
+        this.dirty = true;
+    }
+
+    // 按名称取一张查找表，随精灵一起作废。逐帧查精灵的调用方用它按
+    // 颜色 / 档位索引，避免每帧拼接字符串键
+    table(name) {
+        let table = this.tables.get(name);
+        if (!table) {
+            table = new Map();
+            this.tables.set(name, table);
+        }
+        return table;
+    }
+
+    // 把静态层铺到 ctx 上；过期时先调用 paint(layerCtx) 重画，坐标为 CSS 像素
+    drawLayer(ctx, paint) {
+        if (this.dirty) {
+            const layerCtx = this.layerCtx;
+            layerCtx.setTransform(this.dpr, 0, 0, this.dpr, 0, 0);
+            layerCtx.clearRect(0, 0, this.width, this.height);
+            paint(layerCtx);
+            this.dirty = false;
+            this.stats.layerRenders++;
+        }
+        ctx.drawImage(this.layer, 0, 0, this.width, this.height);
+    }
+
+    // 取出 key 对应的精灵，没有时栅格化：width / height 为 CSS 像素，
+    // paint(ctx) 以精灵中心为原点绘制
+    sprite(key, width, height, paint) {
+        let sprite = this.sprites.get(key);
+        if (!sprite) {
+            const dpr = this.dpr || 1;
+            const canvas = createLayerCanvas(Math.max(1, Math.ceil(width * dpr)),
+                Math.max(1, Math.ceil(height * dpr)));
+            const spriteCtx = canvas.getContext('2d');
+            spriteCtx.setTransform(canvas.width / width, 0, 0, canvas.height / height,
+                canvas.width / 2, canvas.height / 2);
+            paint(spriteCtx);
+            sprite = { canvas, width, height };
+            this.sprites.set(key, sprite);
+            this.stats.spriteRenders++;
+        }
+        return sprite;
+    }
+
+    // 以 (x, y) 为中心绘制精灵，scale 相对栅格化时的尺寸
+    drawSprite(ctx, sprite, x, y, scale = 1) {
+        const w = sprite.width * scale;
+        const h = sprite.height * scale;
+        ctx.drawImage(sprite.canvas, x - w / 2, y - h / 2, w, h);
+    }
+
+    // 轨迹渐变：在轨迹自身的坐标系里从 (0, 0) 到 (1, 0)，每层只创建一次
+    trailGradient(ctx, layer) {
+        if (!this.trailGradients) {
+            this.trailGradients = [0, 1, 2].map(i => {
+                const gradient = ctx.createLinearGradient(0, 0, 1, 0);
+                gradient.addColorStop(0, 'rgba(66, 133, 244, 0)');
+                gradient.addColorStop(1, `rgba(66, 133, 244, ${0.6 - i * 0.2})`);
+                return gradient;
+            });
+        }
+        return this.trailGradients[layer];
+    }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { RenderCache, createLayerCanvas };
+}
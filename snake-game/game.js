@@ -35,6 +35,8 @@ class SnakeGame {
         };
 
         this.snake = [];
+        // 蛇身占用网格与空闲格集合（见 grid.js），随蛇头前进、蛇尾收回增量更新
+        this.grid = new OccupancyGrid(this.tileCountX, this.tileCountY);
         this.food = null;
         this.dx = 0;
         this.dy = 0;
@@ -175,6 +177,7 @@ class SnakeGame {
                 x: Math.min(segment.x, this.tileCountX - 1),
                 y: Math.min(segment.y, this.tileCountY - 1)
             }));
+            this.rebuildGrid();
 
             // 确保食物也在边界内
             if (this.food) {
@@ -229,6 +232,7 @@ class SnakeGame {
             {x: Math.max(cx - 1, 0), y: cy},
             {x: Math.max(cx - 2, 0), y: cy}
         ];
+        this.rebuildGrid();
 
         this.dx = 1;
         this.dy = 0;
@@ -256,47 +260,28 @@ class SnakeGame {
             }
         }
 
-        let valid = false;
-        let attempts = 0;
-        const maxAttempts = 500; // 增加尝试次数
-
-        while (!valid && attempts < maxAttempts) {
+        // 从空闲格集合中均匀抽取，不再随机试探或整盘扫描
+        const spot = this.grid.randomFree();
+        if (spot) {
             this.food = {
-                x: Math.floor(Math.random() * this.tileCountX),
-                y: Math.floor(Math.random() * this.tileCountY),
+                x: spot.x,
+                y: spot.y,
                 type: type,
                 spawnTime: performance.now() // 记录生成时间用于动画
             };
-
-            // Check collision with snake
-            valid = !this.snake.some(s => s.x === this.food.x && s.y === this.food.y);
-            attempts++;
+        } else {
+            // 蛇完全填满屏幕，游戏获胜
+            this.gameWin();
         }
+    }
 
-        // 如果找不到有效位置，重新生成食物类型并重试
-        if (!valid) {
-            // 蛇几乎填满整个屏幕，尝试生成在蛇身外的任意位置
-            const emptySpots = [];
-            for (let x = 0; x < this.tileCountX; x++) {
-                for (let y = 0; y < this.tileCountY; y++) {
-                    if (!this.snake.some(s => s.x === x && s.y === y)) {
-                        emptySpots.push({x, y});
-                    }
-                }
-            }
-
-            if (emptySpots.length > 0) {
-                const spot = emptySpots[Math.floor(Math.random() * emptySpots.length)];
-                this.food = {
-                    x: spot.x,
-                    y: spot.y,
-                    type: type,
-                    spawnTime: performance.now()
-                };
-            } else {
-                // 蛇完全填满屏幕，游戏获胜
-                this.gameWin();
-            }
+    /**
+     * 按当前棋盘尺寸和蛇身重建占用网格
+     */
+    rebuildGrid() {
+        this.grid.reset(this.tileCountX, this.tileCountY);
+        for (const segment of this.snake) {
+            this.grid.occupy(segment.x, segment.y);
         }
     }
 
@@ -492,26 +477,21 @@ class SnakeGame {
             y: this.snake[0].y + this.dy
         };
 
-        // Wall Collision
-        if (head.x < 0 || head.x >= this.tileCountX ||
-            head.y < 0 || head.y >= this.tileCountY) {
-            this.gameOver();
-            return;
-        }
-
-        // Self Collision
-        if (this.snake.some(s => s.x === head.x && s.y === head.y)) {
+        // Wall and Self Collision - 越界也算占用；蛇尾这一步还没收回，撞上同样结束
+        if (this.grid.isOccupied(head.x, head.y)) {
             this.gameOver();
             return;
         }
 
         this.snake.unshift(head);
+        this.grid.occupy(head.x, head.y);
 
         // Food Collision
         if (this.food && head.x === this.food.x && head.y === this.food.y) {
             this.eatFood();
         } else {
-            this.snake.pop();
+            const tail = this.snake.pop();
+            this.grid.release(tail.x, tail.y);
         }
 
         // 限制UI更新频率
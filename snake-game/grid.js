@@ -0,0 +1,73 @@
+/**
+ * Snake Game - 占用网格
+ * 每格记录压在上面的蛇身段数（调整窗口大小后蛇身可能被压到同一格），
+ * 另维护一个空闲格集合：free 为空闲格下标的紧凑数组，slot 记录每格在
+ * free 中的位置（-1 表示被占用）。占用时与末尾交换后删除，释放时追加到末尾，
+ * 碰撞检测、占用 / 释放与随机取空格都是 O(1)。
+ */
+
+class OccupancyGrid {
+    constructor(cols, rows) {
+        this.reset(cols, rows);
+    }
+
+    /**
+     * 清空为 cols x rows 的空棋盘
+     */
+    reset(cols, rows) {
+        const size = cols * rows;
+        if (!this.counts || this.counts.length !== size) {
+            this.counts = new Uint16Array(size);
+            this.free = new Int32Array(size);
+            this.slot = new Int32Array(size);
+        } else {
+            this.counts.fill(0);
+        }
+        this.cols = cols;
+        this.rows = rows;
+        for (let i = 0; i < size; i++) {
+            this.free[i] = i;
+            this.slot[i] = i;
+        }
+        this.freeCount = size;
+    }
+
+    /**
+     * 越界或有蛇身的格子都算被占用
+     */
+    isOccupied(x, y) {
+        if (x < 0 || x >= this.cols || y < 0 || y >= this.rows) return true;
+        return this.counts[y * this.cols + x] > 0;
+    }
+
+    occupy(x, y) {
+        const cell = y * this.cols + x;
+        if (this.counts[cell]++ > 0) return;
+        // 与空闲数组末尾交换后删除
+        const slot = this.slot[cell];
+        const last = this.free[--this.freeCount];
+        this.free[slot] = last;
+        this.slot[last] = slot;
+        this.slot[cell] = -1;
+    }
+
+    release(x, y) {
+        const cell = y * this.cols + x;
+        if (--this.counts[cell] > 0) return;
+        this.slot[cell] = this.freeCount;
+        this.free[this.freeCount++] = cell;
+    }
+
+    /**
+     * 均匀随机取一个空格，返回 {x, y}；棋盘已满时返回 null
+     */
+    randomFree(random = Math.random) {
+        if (this.freeCount === 0) return null;
+        const cell = this.free[Math.floor(random() * this.freeCount)];
+        return { x: cell % this.cols, y: Math.floor(cell / this.cols) };
+    }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { OccupancyGrid };
+}
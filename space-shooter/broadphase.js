@@ -0,0 +1,154 @@
+/**
+ * 太空射击游戏 - 实体池与碰撞宽相位
+ * EntityPool：子弹 / 敌人对象回收复用，移除时与末尾交换（O(1)，不再 splice 搬移）。
+ * UniformGrid：每帧把子弹按包围盒放进均匀网格（计数排序到定长数组），
+ * 敌人只与自己覆盖的格子里的子弹做精确检测，代价从 O(敌人×子弹) 降到 O(敌人+子弹)。
+ */
+
+class EntityPool {
+    constructor(capacity, create) {
+        this.capacity = capacity;
+        this.create = create;
+        // 活动实体，紧凑数组，可以直接当数组读写
+        this.items = [];
+        this.spare = [];
+        this.dropped = 0;
+    }
+
+    get length() {
+        return this.items.length;
+    }
+
+    // 取一个对象放进活动列表；已满时返回 null
+    acquire() {
+        if (this.items.length >= this.capacity) {
+            this.dropped++;
+            return null;
+        }
+        const item = this.spare.pop() || this.create();
+        this.items.push(item);
+        return item;
+    }
+
+    // 与末尾交换后移除第 i 个：倒序遍历时换过来的元素已经处理过
+    release(i) {
+        const items = this.items;
+        const item = items[i];
+        items[i] = items[items.length - 1];
+        items.pop();
+        this.spare.push(item);
+    }
+
+    clear() {
+        while (this.items.length > 0) {
+            this.spare.push(this.items.pop());
+        }
+    }
+}
+
+class UniformGrid {
+    constructor(cellSize) {
+        this.cellSize = cellSize;
+        this.cols = 0;
+        this.rows = 0;
+        // 第 c 格的下标在 entries[cellStart[c] .. cellStart[c + 1])
+        this.cellStart = new Int32Array(1);
+        this.entries = new Int32Array(64);
+        // query 的结果与去重标记（跨格的元素只返回一次）
+        this.found = new Int32Array(64);
+        this.seen = new Int32Array(64);
+        this.queryId = 0;
+    }
+
+    // 把 items（带 x, y, w, h）的下标放进覆盖 width x height 的网格；越界的坐标归入边缘格子
+    build(items, width, height) {
+        const size = this.cellSize;
+        const cols = Math.max(1, Math.ceil(width / size));
+        const rows = Math.max(1, Math.ceil(height / size));
+        const cells = cols * rows;
+        if (this.cellStart.length < cells + 1) {
+            this.cellStart = new Int32Array(cells + 1);
+        }
+        this.cols = cols;
+        this.rows = rows;
+        const start = this.cellStart;
+        start.fill(0, 0, cells + 1);
+
+        // 第一遍：数每格的元素个数
+        let total = 0;
+        for (let i = 0; i < items.length; i++) {
+            const it = items[i];
+            const c0 = this.col(it.x), c1 = this.col(it.x + it.w);
+            const r0 = this.row(it.y), r1 = this.row(it.y + it.h);
+            for (let r = r0; r <= r1; r++) {
+                for (let c = c0; c <= c1; c++) {
+                    start[r * cols + c + 1]++;
+                    total++;
+                }
+            }
+        }
+        if (this.entries.length < total) {
+            this.entries = new Int32Array(Math.max(total, this.entries.length * 2));
+        }
+        if (this.seen.length < items.length) {
+            const length = Math.max(items.length, this.seen.length * 2);
+            this.seen = new Int32Array(length);
+            this.found = new Int32Array(length);
+            this.queryId = 0;
+        }
+
+        // 前缀和得到每格的起点，第二遍回填下标（cellStart[c + 1] 暂作写指针）
+        for (let c = 0; c < cells; c++) {
+            start[c + 1] += start[c];
+        }
+        for (let i = 0; i < items.length; i++) {
+            const it = items[i];
+            const c0 = this.col(it.x), c1 = this.col(it.x + it.w);
+            const r0 = this.row(it.y), r1 = this.row(it.y + it.h);
+            for (let r = r0; r <= r1; r++) {
+                for (let c = c0; c <= c1; c++) {
+                    this.entries[start[r * cols + c]++] = i;
+                }
+            }
+        }
+        // 回填后 cellStart[c] 指向第 c 格末尾，整体右移一位还原起点
+        for (let c = cells; c > 0; c--) {
+            start[c] = start[c - 1];
+        }
+        start[0] = 0;
+    }
+
+    col(x) {
+        return Math.min(this.cols - 1, Math.max(0, Math.floor(x / this.cellSize)));
+    }
+
+    row(y) {
+        return Math.min(this.rows - 1, Math.max(0, Math.floor(y / this.cellSize)));
+    }
+
+    // 与包围盒相交的格子里的下标写入 found，返回个数（只是候选，仍需精确检测）
+    query(x, y, w, h) {
+        const id = ++this.queryId;
+        const c0 = this.col(x), c1 = this.col(x + w);
+        const r0 = this.row(y), r1 = this.row(y + h);
+        const cols = this.cols, start = this.cellStart, entries = this.entries;
+        const seen = this.seen, found = this.found;
+        let count = 0;
+        for (let r = r0; r <= r1; r++) {
+            for (let cell = r * cols + c0, last = r * cols + c1; cell <= last; cell++) {
+                for (let k = start[cell], end = start[cell + 1]; k < end; k++) {
+                    const i = entries[k];
+                    if (seen[i] !== id) {
+                        seen[i] = id;
+                        found[count++] = i;
+                    }
+                }
+            }
+        }
+        return count;
+    }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { EntityPool, UniformGrid };
+}
@@ -0,0 +1,12 @@
+/**
+ * 注册离线缓存 Service Worker（sw.js），大厅和每个游戏页面都会加载
+ * 直接用 file:// 打开页面时浏览器不支持 Service Worker，跳过
+ */
+
+if ('serviceWorker' in navigator && location.protocol !== 'file:') {
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register('/sw.js').catch(error => {
+            console.warn('Service Worker 注册失败:', error);
+        });
+    });
+}
@@ -0,0 +1,176 @@
+/**
+ * 离线优先 Service Worker
+ * 预缓存列表和版本号由构建生成：tools.build 调用 tools/precache.py，按 dist/ 里
+ * 各页面实际引用的文件及其内容哈希改写下面两行。列表里也有页面引用的 CDN 样式表
+ * （Font Awesome、Google Fonts），安装时连同它们的字体一起缓存。每次部署内容有变，
+ * 版本号就变，新版本激活时删除旧版本的缓存。
+ *   预缓存列表里的文件、内容哈希文件名（style.<hash>.css）和 CDN 字体图标：缓存优先，
+ *   未命中再走网络并写入缓存。它们的内容变了 URL 或版本号就会变，缓存不会过期
+ *   其他同源文件（图标、未哈希的脚本样式等）：网络优先，离线时才用缓存
+ *   HTML：先返回缓存（stale-while-revalidate），缓存超过 HTML_FRESH_MS 才在后台重新验证
+ * 源码树里版本号为 null，不缓存任何东西，本地开发总是拿到最新文件。
+ */
+
+const PRECACHE_VERSION = null;
+const PRECACHE_URLS = [];
+
+const PRECACHED = new Set(PRECACHE_URLS);
+// tools/build.py 生成的哈希文件名：<名称>.<HASH_LENGTH 位十六进制>.css/js
+const HASHED_PATH = /\.[0-9a-f]{10}\.(?:css|js)$/;
+
+const CACHE_PREFIX = 'games-';
+const CACHE_NAME = CACHE_PREFIX + PRECACHE_VERSION;
+const HTML_FRESH_MS = 5 * 60 * 1000;
+// HTML 写入缓存的时间，用来判断是否需要后台重新验证
+const CACHED_AT = 'X-SW-Cached-At';
+// 跨域请求只缓存这些 CDN（字体、图标样式）
+const CDN_HOSTS = ['cdnjs.cloudflare.com', 'fonts.googleapis.com', 'fonts.gstatic.com'];
+
+// CDN 样式表里引用的字体文件（Chromium 总是选 woff2）
+const FONT_URL = /url\(\s*(['"]?)([^'")]+\.woff2)\1\s*\)/g;
+
+self.addEventListener('install', event => {
+    self.skipWaiting();
+    if (!PRECACHE_VERSION) return;
+    event.waitUntil(caches.open(CACHE_NAME).then(cache => Promise.all(
+        PRECACHE_URLS.map(url => new URL(url, self.location).origin === self.location.origin
+            ? precacheLocal(cache, url)
+            : precacheCdn(cache, url).catch(() => {}))
+    )));
+});
+
+// 本站文件必须全部缓存成功，否则安装失败、继续用旧版本
+async function precacheLocal(cache, url) {
+    // no-cache：不要把 HTTP 缓存里上一版的未哈希文件存进新版本
+    const response = await fetch(url, { cache: 'no-cache' });
+    if (!response.ok) throw new Error(`预缓存失败: ${url} (${response.status})`);
+    return put(cache, url, response);
+}
+
+// CDN 样式表连同它引用的字体一起缓存，页面第二次打开就不用再访问 CDN。
+// 尽力而为：CDN 不可用时不影响安装，运行时的 cacheFirst 会补上
+async function precacheCdn(cache, url) {
+    // CDN 都返回 Access-Control-Allow-Origin: *，用 cors 请求才读得到样式表内容
+    const response = await fetch(url, { mode: 'cors' });
+    if (!response.ok) return;
+    const css = await response.clone().text();
+    await cache.put(url, response);
+    const fonts = new Set([...css.matchAll(FONT_URL)].map(m => new URL(m[2], url).href));
+    await Promise.all([...fonts].map(async font => {
+        const fontResponse = await fetch(font, { mode: 'cors' });
+        if (fontResponse.ok) await cache.put(font, fontResponse);
+    }));
+}
+
+self.addEventListener('activate', event => {
+    event.waitUntil(caches.keys()
+        .then(keys => Promise.all(keys
+            .filter(key => key.startsWith(CACHE_PREFIX) && key !== CACHE_NAME)
+            .map(key => caches.delete(key))))
+        .then(() => self.clients.claim()));
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (!PRECACHE_VERSION || request.method !== 'GET') return;
+
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) {
+        if (CDN_HOSTS.includes(url.hostname)) {
+            event.respondWith(cacheFirst(request));
+        }
+        return;
+    }
+    if (request.mode === 'navigate' || request.destination === 'document' ||
+        url.pathname.endsWith('/') || url.pathname.endsWith('.html')) {
+        event.respondWith(staleWhileRevalidate(event, pageKey(url)));
+        return;
+    }
+    if (PRECACHED.has(url.pathname + url.search) || HASHED_PATH.test(url.pathname)) {
+        event.respondWith(cacheFirst(request));
+    } else {
+        event.respondWith(networkFirst(request));
+    }
+});
+
+// 页面按目录缓存：/snake-game、/snake-game/index.html 都对应 /snake-game/
+function pageKey(url) {
+    let path = url.pathname;
+    if (path.endsWith('/index.html')) {
+        path = path.slice(0, -'index.html'.length);
+    } else if (!path.endsWith('/') && !path.split('/').pop().includes('.')) {
+        path += '/';
+    }
+    return url.origin + path;
+}
+
+// HTML 带上写入时间另存一份（也去掉了重定向标记，可以直接回应导航请求）
+async function put(cache, key, response) {
+    const type = response.headers.get('Content-Type') || '';
+    if (!type.includes('text/html')) {
+        return cache.put(key, response);
+    }
+    const headers = new Headers(response.headers);
+    headers.set(CACHED_AT, String(Date.now()));
+    const body = await response.blob();
+    return cache.put(key, new Response(body, {
+        status: response.status,
+        statusText: response.statusText,
+        headers
+    }));
+}
+
+async function cacheFirst(request) {
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(request, { ignoreVary: true });
+    if (cached) return cached;
+
+    const response = await fetch(request);
+    // 跨域的 no-cors 请求拿到的是 opaque 响应，状态不可见，照样缓存
+    if (response.ok || response.type === 'opaque') {
+        await cache.put(request, response.clone());
+    }
+    return response;
+}
+
+async function networkFirst(request) {
+    const cache = await caches.open(CACHE_NAME);
+    try {
+        const response = await fetch(request);
+        if (response.ok) {
+            await cache.put(request, response.clone());
+        }
+        return response;
+    } catch (e) {
+        const cached = await cache.match(request, { ignoreVary: true });
+        if (cached) return cached;
+        throw e;
+    }
+}
+
+async function revalidate(cache, key) {
+    const response = await fetch(key, { cache: 'no-cache' });
+    if (response.ok) {
+        await put(cache, key, response.clone());
+    }
+    return response;
+}
+
+async function staleWhileRevalidate(event, key) {
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(key, { ignoreVary: true });
+    if (cached) {
+        const age = Date.now() - Number(cached.headers.get(CACHED_AT) || 0);
+        if (age > HTML_FRESH_MS) {
+            event.waitUntil(revalidate(cache, key).catch(() => {}));
+        }
+        return cached;
+    }
+    try {
+        return await revalidate(cache, key);
+    } catch (e) {
+        // 离线且页面不在缓存里：退回到游戏大厅
+        const hub = await cache.match(self.location.origin + '/', { ignoreVary: true });
+        return hub || Response.error();
+    }
+}
@@ -37,6 +37,8 @@ console.log('1. Checking game files...');
 const gameDir = '/home/jizey/test/games/physics-pinball';
 const requiredFiles = [
     'index.html',
+    'render-cache.js',
+    'effects.js',
     'game-enhanced.js',
     'game-options.js',
     'style.css'
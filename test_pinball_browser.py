@@ -2,72 +2,131 @@
 """
 Physics Pinball Game Browser Test
 Tests the game using requests and analyzes the response
+For every game at once, see: python3 -m tools.smoke
 """
 
-import requests
 import re
 import sys
-from pathlib import Path
+from functools import lru_cache
+
+from tools.cache import default_cache
+from tools.checks import CheckEngine, literal, regex
+from tools.smoke import Fetcher
 
 # Configuration
 PORT = 8888
 BASE_URL = f"http://localhost:{PORT}"
 GAME_URL = f"{BASE_URL}/physics-pinball/"
 
+# One keep-alive session for the whole run; each URL is downloaded only once
+FETCHER = Fetcher()
+
+# Critical game logic checks
+LOGIC_CHECKS = {
+    "Vector2 class": r"class Vector2",
+    "Circle class": r"class Circle",
+    "Ball class": r"class Ball\s+extends Circle",
+    "GameConfig": r"const GameConfig\s*=",
+    "PhysicsEntity class": r"class PhysicsEntity",
+    "EnhancedPinballGame class": r"class EnhancedPinballGame",
+    "init() method": r"init\(\)\s*\{",
+    "update() method": r"update\(\)\s*\{",
+    "draw() method": r"draw\(\)\s*\{",
+    "loop() method": r"loop\(\s*timestamp",
+    "launchBall() method": r"launchBall\(\)\s*\{",
+    "spawnBall() method": r"spawnBall\(\)\s*\{",
+    "handleLifeLost() method": r"handleLifeLost\(\)\s*\{",
+    "Keyboard controls": r"case\s*['\"]ArrowLeft",
+    "Touch controls": r"handleTouchStart",
+    "Collision detection": r"ball\.position\.subtract",
+    "Score calculation": r"this\.state\.score\s*\+",
+    "Game over logic": r"this\.state\.gameOver\s*=\s*true",
+    "Wall collision": r"wallThickness",
+    "Bumper collision": r"elements\.bumpers",
+    "Paddle collision": r"elements\.paddles"
+}
+
+# Plain substring checks used by the issue scans
+ISSUE_CHECKS = [
+    "new Ball(this.width - 50, this.height - 100)",
+    "ball.launched = false",
+    "GameConfig.gravity",
+    "gravity:",
+    "limitSpeed",
+    "maxBallSpeed",
+    "this.elements.balls.splice(index, 1)",
+    "initWalls()",
+    "removeEventListener",
+    "if (!this.canvas)",
+    "if (canvas)",
+    "try {",
+    "catch",
+    "cancelAnimationFrame",
+]
+
+CODE_ENGINE = CheckEngine(
+    [regex(name, pattern) for name, pattern in LOGIC_CHECKS.items()] +
+    [literal(text, text) for text in ISSUE_CHECKS]
+)
+
+# Reports persist across runs, keyed by script content and rule set
+CACHE = default_cache('checks')
+
+@lru_cache(maxsize=None)
+def scan_game_script(code):
+    """Run every script check in one pass; shared by the logic and issue tests"""
+    return CODE_ENGINE.scan(code, CACHE)
+
 def test_server_running():
     """Check if the game server is running"""
     print("1. Checking if game server is running...")
-    try:
-        response = requests.get(BASE_URL, timeout=5)
-        if response.status_code == 200:
-            print(f"   ✓ Server is running on port {PORT}")
-            return True
-        else:
-            print(f"   ✗ Server returned status {response.status_code}")
-            return False
-    except requests.exceptions.RequestException as e:
-        print(f"   ✗ Cannot connect to server: {e}")
-        print(f"   Tip: Start server with: python3 -m http.server {PORT} --directory /home/jizey/test/games")
+    response = FETCHER.fetch(f"{BASE_URL}/")
+    if response.error:
+        print(f"   ✗ Cannot connect to server: {response.error}")
+        print(f"   Tip: Start server with: python3 -m tools.serve --port {PORT}")
         return False
+    if response.status == 200:
+        print(f"   ✓ Server is running on port {PORT}")
+        return True
+    print(f"   ✗ Server returned status {response.status}")
+    return False
 
 def test_game_page():
     """Check if the game page loads correctly"""
     print("\n2. Loading game page...")
-    try:
-        response = requests.get(GAME_URL, timeout=10)
-        if response.status_code != 200:
-            print(f"   ✗ Game page returned status {response.status_code}")
-            return False
-
-        html = response.text
-
-        # Check for essential HTML elements
-        checks = {
-            "Canvas element": r'<canvas[^>]*id="game-canvas"',
-            "Start button": r'id="start-btn"',
-            "Restart button": r'id="restart-btn"',
-            "Score display": r'id="score"',
-            "Lives display": r'id="lives"',
-            "Game overlay": r'id="game-overlay"',
-            "Game script": r'src="game-enhanced\.js"',
-            "Options script": r'src="game-options\.js"',
-            "Style sheet": r'href="style\.css"'
-        }
-
-        passed = 0
-        for name, pattern in checks.items():
-            if re.search(pattern, html):
-                print(f"   ✓ {name} found")
-                passed += 1
-            else:
-                print(f"   ✗ {name} NOT found")
+    response = FETCHER.fetch(GAME_URL)
+    if response.error:
+        print(f"   ✗ Error loading game page: {response.error}")
+        return False
+    if response.status != 200:
+        print(f"   ✗ Game page returned status {response.status}")
+        return False
 
-        print(f"\n   HTML check: {passed}/{len(checks)} elements present")
-        return passed == len(checks)
+    html = response.text
+
+    # Check for essential HTML elements
+    checks = {
+        "Canvas element": r'<canvas[^>]*id="game-canvas"',
+        "Start button": r'id="start-btn"',
+        "Restart button": r'id="restart-btn"',
+        "Score display": r'id="score"',
+        "Lives display": r'id="lives"',
+        "Game overlay": r'id="game-overlay"',
+        "Game script": r'src="game-enhanced\.js"',
+        "Options script": r'src="game-options\.js"',
+        "Style sheet": r'href="style\.css"'
+    }
 
-    except requests.exceptions.RequestException as e:
-        print(f"   ✗ Error loading game page: {e}")
-        return False
+    passed = 0
+    for name, pattern in checks.items():
+        if re.search(pattern, html):
+            print(f"   ✓ {name} found")
+            passed += 1
+        else:
+            print(f"   ✗ {name} NOT found")
+
+    print(f"\n   HTML check: {passed}/{len(checks)} elements present")
+    return passed == len(checks)
 
 def test_game_scripts():
     """Check if game scripts load correctly"""
@@ -81,25 +140,24 @@ def test_game_scripts():
     passed = 0
     for script, expected_content in scripts_to_check:
         url = f"{GAME_URL}{script}"
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                content = response.text
-                if isinstance(expected_content, str) and not expected_content.endswith('.css'):
-                    # It's a pattern to search for
-                    if expected_content in content:
-                        print(f"   ✓ {script} loads (contains '{expected_content}')")
-                        passed += 1
-                    else:
-                        print(f"   ✗ {script} loads but missing '{expected_content}'")
-                else:
-                    # For CSS, just check if it loads
-                    print(f"   ✓ {script} loads ({len(content)} bytes)")
+        response = FETCHER.fetch(url)
+        if response.error:
+            print(f"   ✗ Error loading {script}: {response.error}")
+        elif response.status == 200:
+            content = response.text
+            if isinstance(expected_content, str) and not expected_content.endswith('.css'):
+                # It's a pattern to search for
+                if expected_content in content:
+                    print(f"   ✓ {script} loads (contains '{expected_content}')")
                     passed += 1
+                else:
+                    print(f"   ✗ {script} loads but missing '{expected_content}'")
             else:
-                print(f"   ✗ {script} returned status {response.status_code}")
-        except requests.exceptions.RequestException as e:
-            print(f"   ✗ Error loading {script}: {e}")
+                # For CSS, just check if it loads
+                print(f"   ✓ {script} loads ({len(content)} bytes)")
+                passed += 1
+        else:
+            print(f"   ✗ {script} returned status {response.status}")
 
     print(f"\n   Scripts check: {passed}/{len(scripts_to_check)} files load correctly")
     return passed == len(scripts_to_check)
@@ -108,102 +166,77 @@ def analyze_game_logic():
     """Analyze the game JavaScript for potential issues"""
     print("\n4. Analyzing game logic...")
 
-    try:
-        response = requests.get(f"{GAME_URL}game-enhanced.js", timeout=10)
-        if response.status_code != 200:
-            print("   ✗ Cannot load game script")
-            return False
-
-        code = response.text
-
-        # Critical game logic checks
-        checks = {
-            "Vector2 class": r"class Vector2",
-            "Circle class": r"class Circle",
-            "Ball class": r"class Ball\s+extends Circle",
-            "GameConfig": r"const GameConfig\s*=",
-            "PhysicsEntity class": r"class PhysicsEntity",
-            "EnhancedPinballGame class": r"class EnhancedPinballGame",
-            "init() method": r"init\(\)\s*\{",
-            "update() method": r"update\(\)\s*\{",
-            "draw() method": r"draw\(\)\s*\{",
-            "loop() method": r"loop\(\s*timestamp",
-            "launchBall() method": r"launchBall\(\)\s*\{",
-            "spawnBall() method": r"spawnBall\(\)\s*\{",
-            "handleLifeLost() method": r"handleLifeLost\(\)\s*\{",
-            "Keyboard controls": r"case\s*['\"]ArrowLeft",
-            "Touch controls": r"handleTouchStart",
-            "Collision detection": r"ball\.position\.subtract",
-            "Score calculation": r"this\.state\.score\s*\+",
-            "Game over logic": r"this\.state\.gameOver\s*=\s*true",
-            "Wall collision": r"wallThickness",
-            "Bumper collision": r"elements\.bumpers",
-            "Paddle collision": r"elements\.paddles"
-        }
-
-        passed = 0
-        issues = []
-
-        for name, pattern in checks.items():
-            if re.search(pattern, code):
-                print(f"   ✓ {name}")
-                passed += 1
-            else:
-                print(f"   ✗ {name} - MISSING")
-                issues.append(name)
+    response = FETCHER.fetch(f"{GAME_URL}game-enhanced.js")
+    if response.error:
+        print(f"   ✗ Error analyzing game logic: {response.error}")
+        return False
+    if response.status != 200:
+        print("   ✗ Cannot load game script")
+        return False
 
-        print(f"\n   Logic check: {passed}/{len(checks)} components found")
+    code = response.text
 
-        # Check for specific issues
-        print("\n5. Checking for specific issues...")
+    report = scan_game_script(code)
 
-        # Issue: Check if ball velocity is properly initialized on spawn
-        if "new Ball(this.width - 50, this.height - 100)" in code:
-            print("   ✓ Ball spawn position set")
-            if "ball.launched = false" in code:
-                print("   ✓ Ball launched state initialized")
-        else:
-            print("   ⚠ Ball spawn position may need review")
-            issues.append("Ball spawn position")
+    passed = 0
+    issues = []
 
-        # Issue: Check if gravity is applied
-        if "GameConfig.gravity" in code or "gravity:" in code:
-            print("   ✓ Gravity configured")
+    for name in LOGIC_CHECKS:
+        if report.found(name):
+            print(f"   ✓ {name}")
+            passed += 1
         else:
-            print("   ⚠ Gravity configuration missing")
-            issues.append("Gravity configuration")
+            print(f"   ✗ {name} - MISSING")
+            issues.append(name)
 
-        # Issue: Check if ball speed is limited
-        if "limitSpeed" in code or "maxBallSpeed" in code:
-            print("   ✓ Ball speed limiting present")
-        else:
-            print("   ⚠ Ball speed limiting missing")
-            issues.append("Ball speed limiting")
+    print(f"\n   Logic check: {passed}/{len(LOGIC_CHECKS)} components found")
 
-        # Issue: Check for proper ball removal
-        if "this.elements.balls.splice(index, 1)" in code:
-            print("   ✓ Ball removal from array present")
-        else:
-            print("   ⚠ Ball removal may be incomplete")
-            issues.append("Ball removal logic")
+    # Check for specific issues
+    print("\n5. Checking for specific issues...")
 
-        # Issue: Check for wall initialization
-        if "initWalls()" in code:
-            print("   ✓ Wall initialization method present")
-        else:
-            print("   ⚠ Wall initialization may be missing")
-            issues.append("Wall initialization")
+    # Issue: Check if ball velocity is properly initialized on spawn
+    if report.found("new Ball(this.width - 50, this.height - 100)"):
+        print("   ✓ Ball spawn position set")
+        if report.found("ball.launched = false"):
+            print("   ✓ Ball launched state initialized")
+    else:
+        print("   ⚠ Ball spawn position may need review")
+        issues.append("Ball spawn position")
+
+    # Issue: Check if gravity is applied
+    if report.found("GameConfig.gravity") or report.found("gravity:"):
+        print("   ✓ Gravity configured")
+    else:
+        print("   ⚠ Gravity configuration missing")
+        issues.append("Gravity configuration")
 
-        if issues:
-            print(f"\n   ⚠ {len(issues)} potential issue(s) found:")
-            for i, issue in enumerate(issues, 1):
-                print(f"      {i}. {issue}")
+    # Issue: Check if ball speed is limited
+    if report.found("limitSpeed") or report.found("maxBallSpeed"):
+        print("   ✓ Ball speed limiting present")
+    else:
+        print("   ⚠ Ball speed limiting missing")
+        issues.append("Ball speed limiting")
 
-        return len(issues) == 0
+    # Issue: Check for proper ball removal
+    if report.found("this.elements.balls.splice(index, 1)"):
+        print("   ✓ Ball removal from array present")
+    else:
+        print("   ⚠ Ball removal may be incomplete")
+        issues.append("Ball removal logic")
 
-    except requests.exceptions.RequestException as e:
-        print(f"   ✗ Error analyzing game logic: {e}")
-        return False
+    # Issue: Check for wall initialization
+    if report.found("initWalls()"):
+        print("   ✓ Wall initialization method present")
+    else:
+        print("   ⚠ Wall initialization may be missing")
+        issues.append("Wall initialization")
+
+    if issues:
+        print(f"\n   ⚠ {len(issues)} potential issue(s) found:")
+        for i, issue in enumerate(issues, 1):
+            print(f"      {i}. {issue}")
+
+    return len(issues) == 0
 
 def test_console_errors():
     """
@@ -211,49 +244,40 @@ def test_console_errors():
     """
     print("\n6. Checking for common JavaScript issues...")
 
-    try:
-        response = requests.get(f"{GAME_URL}game-enhanced.js", timeout=10)
-        if response.status_code != 200:
-            return False
-
-        code = response.text
-
-        issues = []
-
-        # Check for undefined variables in common patterns
-        if "this.canvas" in code and "this.canvas = " not in code and "getElementById('game-canvas')" not in code:
-            # This is OK - canvas is set in constructor
-            pass
+    response = FETCHER.fetch(f"{GAME_URL}game-enhanced.js")
+    if response.error:
+        print(f"   ✗ Error checking for issues: {response.error}")
+        return False
+    if response.status != 200:
+        return False
 
-        # Check for proper event listener cleanup
-        if "removeEventListener" in code:
-            print("   ✓ Event listener cleanup present")
-        else:
-            print("   ⚠ Event listener cleanup may be missing")
+    report = scan_game_script(response.text)
 
-        # Check for null/undefined checks
-        if "if (!this.canvas)" in code or "if (canvas)" in code:
-            print("   ✓ Null checks present")
-        else:
-            print("   ⚠ Null checks may be missing")
+    # Check for proper event listener cleanup
+    if report.found("removeEventListener"):
+        print("   ✓ Event listener cleanup present")
+    else:
+        print("   ⚠ Event listener cleanup may be missing")
 
-        # Check for error handling
-        if "try {" in code and "catch" in code:
-            print("   ✓ Error handling present")
-        else:
-            print("   ⚠ Error handling may be limited")
+    # Check for null/undefined checks
+    if report.found("if (!this.canvas)") or report.found("if (canvas)"):
+        print("   ✓ Null checks present")
+    else:
+        print("   ⚠ Null checks may be missing")
 
-        # Check for requestAnimationFrame cleanup
-        if "cancelAnimationFrame" in code:
-            print("   ✓ Animation frame cleanup present")
-        else:
-            print("   ⚠ Animation frame cleanup may be missing")
+    # Check for error handling
+    if report.found("try {") and report.found("catch"):
+        print("   ✓ Error handling present")
+    else:
+        print("   ⚠ Error handling may be limited")
 
-        return True
+    # Check for requestAnimationFrame cleanup
+    if report.found("cancelAnimationFrame"):
+        print("   ✓ Animation frame cleanup present")
+    else:
+        print("   ⚠ Animation frame cleanup may be missing")
 
-    except requests.exceptions.RequestException as e:
-        print(f"   ✗ Error checking for issues: {e}")
-        return False
+    return True
 
 def main():
     print("=" * 50)
@@ -267,7 +291,7 @@ def main():
 
     if not results[0][1]:
         print("\n✗ Server is not running. Please start the server first.")
-        print(f"   Run: python3 -m http.server {PORT} --directory /home/jizey/test/games")
+        print(f"   Run: python3 -m tools.serve --port {PORT}")
         sys.exit(1)
 
     results.append(("Game Page Loads", test_game_page()))
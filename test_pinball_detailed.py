@@ -6,19 +6,17 @@ Simulates game execution flow to find potential bugs
 
 import re
 
+from tools.cache import default_cache
+from tools.checks import CheckEngine, literal, regex
+from tools.site import ROOT
+
 def read_file(path):
     with open(path, 'r') as f:
         return f.read()
 
 # Read the game code
-game_code = read_file('/home/jizey/test/games/physics-pinball/game-enhanced.js')
+game_code = read_file(ROOT / 'physics-pinball' / 'game-enhanced.js')
 
-print("=" * 60)
-print("Physics Pinball - Detailed Logic Analysis")
-print("=" * 60)
-
-# 1. Check Ball Physics Configuration
-print("\n1. Ball Physics Configuration:")
 config_checks = {
     'gravity': r'gravity:\s*([\d.]+)',
     'friction': r'friction:\s*([\d.]+)',
@@ -28,15 +26,6 @@ config_checks = {
     'maxBallSpeed': r'maxBallSpeed:\s*([\d.]+)',
 }
 
-for name, pattern in config_checks.items():
-    match = re.search(pattern, game_code)
-    if match:
-        print(f"   {name}: {match.group(1)}")
-    else:
-        print(f"   ✗ {name}: NOT FOUND")
-
-# 2. Check Collision Detection
-print("\n2. Collision Detection:")
 collision_checks = {
     'Wall collision (left)': r'ball\.position\.x < wallThickness',
     'Wall collision (right)': r'ball\.position\.x > this\.width - wallThickness',
@@ -47,8 +36,40 @@ collision_checks = {
     'Bumper overlap resolution': r'overlap = minDist - dist',
 }
 
-for name, pattern in collision_checks.items():
-    if re.search(pattern, game_code):
+# Every check below is answered from one pass over the source
+engine = CheckEngine(
+    [regex(name, pattern) for name, pattern in config_checks.items()] +
+    [regex(name, pattern) for name, pattern in collision_checks.items()] +
+    [
+        regex('handleLifeLost body', r'handleLifeLost\(\)\s*{([^}]+)}'),
+        regex('Ball.update body', r'class Ball[^}]*update\(\)\s*{([^}]+)}', re.DOTALL),
+        literal('Overlay hidden', "overlay.style.display = 'none'"),
+        literal('Overlay hidden (dq)', 'overlay.style.display = "none"'),
+        literal('Overlay shown', "overlay.style.display = 'flex'"),
+        literal('Overlay shown (dq)', 'overlay.style.display = "flex"'),
+        regex('Paddle bounds', r'paddle\.position\.x = Math\.max\(20,\s*Math\.min\(this\.width - 20 - paddle\.width'),
+    ]
+)
+# Reused across runs until the source or the checks change
+report = engine.scan(game_code, default_cache('checks'))
+
+print("=" * 60)
+print("Physics Pinball - Detailed Logic Analysis")
+print("=" * 60)
+
+# 1. Check Ball Physics Configuration
+print("\n1. Ball Physics Configuration:")
+for name in config_checks:
+    match = report.first(name)
+    if match:
+        print(f"   {name}: {match.group(1)}")
+    else:
+        print(f"   ✗ {name}: NOT FOUND")
+
+# 2. Check Collision Detection
+print("\n2. Collision Detection:")
+for name in collision_checks:
+    if report.found(name):
         print(f"   {name}")
     else:
         print(f"   ✗ {name}: NOT FOUND")
@@ -57,7 +78,7 @@ for name, pattern in collision_checks.items():
 print("\n3. Potential Issues:")
 
 # Issue: Check if ball can be spawned when game is over
-handleLifeLost_match = re.search(r'handleLifeLost\(\)\s*{([^}]+)}', game_code)
+handleLifeLost_match = report.first('handleLifeLost body')
 if handleLifeLost_match:
     handleLifeLost_code = handleLifeLost_match.group(1)
     # Check if spawnBall is in the else block (not in game over block)
@@ -71,7 +92,7 @@ if handleLifeLost_match:
         print("   WARNING: spawnBall() not found in handleLifeLost")
 
 # Issue: Check for ball position update
-ball_update_match = re.search(r'class Ball[^}]*update\(\)\s*{([^}]+)}', game_code, re.DOTALL)
+ball_update_match = report.first('Ball.update body')
 if ball_update_match:
     ball_update_code = ball_update_match.group(1)
     has_gravity = 'velocity.y +=' in ball_update_code or 'gravity' in ball_update_code
@@ -82,14 +103,13 @@ if ball_update_match:
     print(f"   Ball.update() has position update: {has_position}")
 
 # Issue: Check if game overlay is hidden/shown properly
-if "overlay.style.display = 'none'" in game_code or 'overlay.style.display = "none"' in game_code:
+if report.found('Overlay hidden') or report.found('Overlay hidden (dq)'):
     print("   Overlay can be hidden")
-if "overlay.style.display = 'flex'" in game_code or 'overlay.style.display = "flex"' in game_code:
+if report.found('Overlay shown') or report.found('Overlay shown (dq)'):
     print("   Overlay can be shown")
 
 # Issue: Check paddle bounds
-paddle_bounds = re.search(r'paddle\.position\.x = Math\.max\(20,\s*Math\.min\(this\.width - 20 - paddle\.width', game_code)
-if paddle_bounds:
+if report.found('Paddle bounds'):
     print("   Paddle bounds properly constrained")
 else:
     print("   WARNING: Paddle bounds may not be properly constrained")
@@ -4,30 +4,14 @@ Physics Pinball Game - Final Test Report
 Comprehensive analysis of game functionality
 """
 
-import re
+from tools.cache import default_cache
+from tools.checks import CheckEngine, literal, regex
+from tools.sizes import compressed_sizes
+from tools.site import ROOT
 
-game_code = open('/home/jizey/test/games/physics-pinball/game-enhanced.js').read()
-html_code = open('/home/jizey/test/games/physics-pinball/index.html').read()
+game_code = open(ROOT / 'physics-pinball' / 'game-enhanced.js').read()
+html_code = open(ROOT / 'physics-pinball' / 'index.html').read()
 
-print("=" * 70)
-print(" " * 15 + "PHYSICS PINBALL GAME TEST REPORT")
-print("=" * 70)
-
-# Section 1: File Structure
-print("\n[1] FILE STRUCTURE CHECK")
-print("-" * 70)
-files = {
-    'index.html': 14338,
-    'game-enhanced.js': 43532,
-    'game-options.js': 23426,
-    'style.css': 24344
-}
-for f, size in files.items():
-    print(f"  {f:20s} - {size:6d} bytes")
-
-# Section 2: HTML Structure
-print("\n[2] HTML STRUCTURE")
-print("-" * 70)
 html_elements = [
     ('Canvas', '<canvas id="game-canvas"'),
     ('Start Button', 'id="start-btn"'),
@@ -38,13 +22,7 @@ html_elements = [
     ('Game Script', 'game-enhanced.js'),
     ('Options Script', 'game-options.js'),
 ]
-for name, pattern in html_elements:
-    found = pattern in html_code
-    print(f"  {'OK' if found else 'MISSING':8s} - {name}")
 
-# Section 3: Game Classes
-print("\n[3] GAME CLASSES")
-print("-" * 70)
 classes = [
     'Vector2',
     'PhysicsEntity', 
@@ -52,13 +30,7 @@ classes = [
     'Ball',
     'EnhancedPinballGame',
 ]
-for cls in classes:
-    found = f'class {cls}' in game_code
-    print(f"  {'OK' if found else 'MISSING':8s} - {cls}")
 
-# Section 4: Game Configuration
-print("\n[4] GAME CONFIGURATION")
-print("-" * 70)
 config = {
     'Gravity': r'gravity:\s*([\d.]+)',
     'Friction': r'friction:\s*([\d.]+)',
@@ -68,14 +40,7 @@ config = {
     'Max Ball Speed': r'maxBallSpeed:\s*([\d.]+)',
     'Paddle Speed': r'paddleSpeed:\s*([\d.]+)',
 }
-for name, pattern in config.items():
-    match = re.search(pattern, game_code)
-    value = match.group(1) if match else 'N/A'
-    print(f"  {name:18s} = {value:>8s}")
 
-# Section 5: Core Game Functions
-print("\n[5] CORE GAME FUNCTIONS")
-print("-" * 70)
 functions = [
     ('init()', 'Initialize game'),
     ('resize()', 'Handle canvas resize'),
@@ -89,56 +54,16 @@ functions = [
     ('restart()', 'Restart game'),
     ('togglePause()', 'Pause/resume'),
 ]
-for func, desc in functions:
-    found = func in game_code
-    print(f"  {'OK' if found else 'MISSING':8s} - {func:20s} - {desc}")
 
-# Section 6: Input Controls
-print("\n[6] INPUT CONTROLS")
-print("-" * 70)
 controls = [
-    ('ArrowLeft', 'Move paddle left'),
-    ('ArrowRight', 'Move paddle right'),
-    ('Space', 'Launch ball'),
-    ('KeyR', 'Restart game'),
-    ('KeyP/ESC', 'Pause game'),
-    ('Touch/Mouse', 'Paddle control'),
-]
-for key, desc in controls:
-    if 'Touch' in key:
-        found = 'handleTouchStart' in game_code
-    elif 'Arrow' in key:
-        found = key in game_code
-    elif 'Space' in key:
-        found = "' '" in game_code or '" "' in game_code
-    elif 'KeyR' in key:
-        found = "'r'" in game_code or '"r"' in game_code
-    elif 'KeyP' in key:
-        found = "'p'" in game_code or '"p"' in game_code
-    else:
-        found = False
-    print(f"  {'OK' if found else 'MISSING':8s} - {key:15s} - {desc}")
-
-# Section 7: Physics System
-print("\n[7] PHYSICS SYSTEM")
-print("-" * 70)
-physics = [
-    ('Gravity', 'velocity.y += GameConfig.gravity'),
-    ('Friction', 'velocity.multiply(GameConfig.friction)'),
-    ('Position Update', 'position.add(velocity)'),
-    ('Speed Limiting', 'limitSpeed()'),
-    ('Wall Collision', 'wallThickness'),
-    ('Paddle Collision', 'paddle.position.y'),
-    ('Bumper Collision', 'bumper.position'),
-    ('Bounce Calculation', 'elasticity'),
+    ('ArrowLeft', 'Move paddle left', ['ArrowLeft']),
+    ('ArrowRight', 'Move paddle right', ['ArrowRight']),
+    ('Space', 'Launch ball', ["' '", '" "']),
+    ('KeyR', 'Restart game', ["'r'", '"r"']),
+    ('KeyP/ESC', 'Pause game', ["'p'", '"p"']),
+    ('Touch/Mouse', 'Paddle control', ['handleTouchStart']),
 ]
-for name, pattern in physics:
-    found = pattern in game_code
-    print(f"  {'OK' if found else 'MISSING':8s} - {name}")
 
-# Section 8: Score System
-print("\n[8] SCORE SYSTEM")
-print("-" * 70)
 score_system = [
     ('Bumper Hit Score', 'bumper.scoreValue'),
     ('Score Update', 'state.score +='),
@@ -146,13 +71,7 @@ score_system = [
     ('Multiplier', 'comboMultiplier'),
     ('High Score Save', 'localStorage.setItem'),
 ]
-for name, pattern in score_system:
-    found = pattern in game_code
-    print(f"  {'OK' if found else 'MISSING':8s} - {name}")
 
-# Section 9: Game Flow
-print("\n[9] GAME FLOW")
-print("-" * 70)
 flow = [
     ('Ball Spawns', 'spawnBall()'),
     ('Ball Launches', 'launchBall()'),
@@ -162,21 +81,104 @@ flow = [
     ('Game Over Trigger', 'state.lives <= 0'),
     ('Game Over Display', 'gameOver = true'),
 ]
-for name, pattern in flow:
-    found = pattern in game_code
-    print(f"  {'OK' if found else 'MISSING':8s} - {name}")
 
-# Section 10: Accessibility
-print("\n[10] ACCESSIBILITY")
-print("-" * 70)
 a11y = [
     ('ARIA Labels', 'aria-label'),
     ('Screen Reader Support', 'sr-live-region'),
     ('Keyboard Navigation', 'tabindex'),
     ('Focus Management', 'focus()'),
 ]
+
+# All sections are answered from one pass over each file
+engine = CheckEngine(
+    [literal(f'html:{name}', pattern) for name, pattern in html_elements] +
+    [literal(f'class:{cls}', f'class {cls}') for cls in classes] +
+    [regex(f'config:{name}', pattern) for name, pattern in config.items()] +
+    [literal(f'func:{func}', func) for func, _ in functions] +
+    [literal(f'control:{p}', p) for p in sorted({p for _, _, ps in controls for p in ps})] +
+    [literal(f'score:{name}', pattern) for name, pattern in score_system] +
+    [literal(f'flow:{name}', pattern) for name, pattern in flow] +
+    [literal(f'a11y:{name}', pattern) for name, pattern in a11y]
+)
+# Reused across runs until a file or the checks change
+cache = default_cache('checks')
+code_report = engine.scan(game_code, cache)
+html_report = engine.scan(html_code, cache)
+
+print("=" * 70)
+print(" " * 15 + "PHYSICS PINBALL GAME TEST REPORT")
+print("=" * 70)
+
+# Section 1: File Structure
+print("\n[1] FILE STRUCTURE CHECK")
+print("-" * 70)
+files = ['index.html', 'game-enhanced.js', 'game-options.js', 'style.css']
+for f in files:
+    raw, gz, _ = compressed_sizes((ROOT / 'physics-pinball' / f).read_bytes(), cache)
+    print(f"  {f:20s} - {raw:6d} bytes ({gz:6d} gzip)")
+
+# Section 2: HTML Structure
+print("\n[2] HTML STRUCTURE")
+print("-" * 70)
+for name, pattern in html_elements:
+    found = html_report.found(f'html:{name}')
+    print(f"  {'OK' if found else 'MISSING':8s} - {name}")
+
+# Section 3: Game Classes
+print("\n[3] GAME CLASSES")
+print("-" * 70)
+for cls in classes:
+    found = code_report.found(f'class:{cls}')
+    print(f"  {'OK' if found else 'MISSING':8s} - {cls}")
+
+# Section 4: Game Configuration
+print("\n[4] GAME CONFIGURATION")
+print("-" * 70)
+for name, pattern in config.items():
+    match = code_report.first(f'config:{name}')
+    value = match.group(1) if match else 'N/A'
+    print(f"  {name:18s} = {value:>8s}")
+
+# Section 5: Core Game Functions
+print("\n[5] CORE GAME FUNCTIONS")
+print("-" * 70)
+for func, desc in functions:
+    found = code_report.found(f'func:{func}')
+    print(f"  {'OK' if found else 'MISSING':8s} - {func:20s} - {desc}")
+
+# Section 6: Input Controls
+print("\n[6] INPUT CONTROLS")
+print("-" * 70)
+for key, desc, patterns in controls:
+    found = any(code_report.found(f'control:{p}') for p in patterns)
+    print(f"  {'OK' if found else 'MISSING':8s} - {key:15s} - {desc}")
+
+# Section 7: Physics System
+print("\n[7] PHYSICS SYSTEM")
+print("-" * 70)
+print("  Checked by behaviour, not by source text: the golden traces in")
+print("  tests/golden are replayed frame by frame by tests/test_pinball_trace.py")
+print("  (or: python3 -m tools.pinball_trace replay)")
+
+# Section 8: Score System
+print("\n[8] SCORE SYSTEM")
+print("-" * 70)
+for name, pattern in score_system:
+    found = code_report.found(f'score:{name}')
+    print(f"  {'OK' if found else 'MISSING':8s} - {name}")
+
+# Section 9: Game Flow
+print("\n[9] GAME FLOW")
+print("-" * 70)
+for name, pattern in flow:
+    found = code_report.found(f'flow:{name}')
+    print(f"  {'OK' if found else 'MISSING':8s} - {name}")
+
+# Section 10: Accessibility
+print("\n[10] ACCESSIBILITY")
+print("-" * 70)
 for name, pattern in a11y:
-    found = pattern in game_code or pattern in html_code
+    found = code_report.found(f'a11y:{name}') or html_report.found(f'a11y:{name}')
     print(f"  {'OK' if found else 'MISSING':8s} - {name}")
 
 # Summary
@@ -191,7 +193,6 @@ all_checks = (
     list(config.keys()) +
     [f[0] for f in functions] +
     [c[0] for c in controls] +
-    [p[0] for p in physics] +
     [s[0] for s in score_system] +
     [f[0] for f in flow] +
     [a[0] for a in a11y]
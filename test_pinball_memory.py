@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Physics Pinball Memory Test
+Plays long scripted sessions of the real game in headless Chromium and
+measures, per phase:
+  - allocations per frame of Vector2, trail points and canvas gradients
+    (counted by instrumenting the page); particles and floating scores live
+    in the fixed pools of effects.js and allocate nothing per effect
+  - bytes allocated per frame and the top allocation sites, from the V8
+    heap sampling profiler (objects collected by GC included)
+  - retained heap growth between forced GCs at the start and end
+  - GC pause count, total and longest pause from the Chrome trace
+Exits non-zero when allocations per frame, retained heap or the longest GC
+pause exceed their budget.
+
+Usage:
+    python3 test_pinball_memory.py [--seconds 60] [--balls 1,8] \
+        [--max-allocs-per-frame 300] [--max-retained-kb 1024]
+"""
+
+import argparse
+import json
+import sys
+
+from tools.browser import (
+    GC_TRACE_CATEGORIES, add_browser_arguments, base_url_or_serve, chromium,
+    gc_pauses, sampled_allocations,
+)
+from tools.pinball_profile import CAPACITY, HOOKS, frame_stats
+from tools.site import game_url
+
+# Heap sampling interval in bytes; smaller is more precise and slower
+SAMPLING_INTERVAL = 16 * 1024
+TOP_SITES = 8
+
+# Every Vector2 method below returns a new Vector2. `new Vector2` inside the
+# class body binds to the original class, so those are counted per call and
+# the global binding is swapped for a counting subclass for outside callers.
+ALLOCATION_COUNTERS = """
+() => {
+    if (window.__allocations) return;
+    const counts = { Vector2: 0, trailPoint: 0, gradient: 0 };
+
+    for (const name of ['add', 'subtract', 'multiply', 'normalize', 'clone', 'rotate']) {
+        const original = Vector2.prototype[name];
+        Vector2.prototype[name] = function (...args) {
+            counts.Vector2++;
+            return original.apply(this, args);
+        };
+    }
+    Vector2 = class extends Vector2 {
+        constructor(...args) { super(...args); counts.Vector2++; }
+    };
+
+    const updateTrail = Ball.prototype.updateTrail;
+    Ball.prototype.updateTrail = function () {
+        if (this.launched) counts.trailPoint++;
+        return updateTrail.apply(this, arguments);
+    };
+
+    const context = CanvasRenderingContext2D.prototype;
+    for (const name of ['createRadialGradient', 'createLinearGradient']) {
+        const original = context[name];
+        context[name] = function (...args) {
+            counts.gradient++;
+            return original.apply(this, args);
+        };
+    }
+
+    window.__allocations = {
+        reset: () => { for (const key in counts) counts[key] = 0; },
+        snapshot: () => ({ ...counts }),
+    };
+}
+"""
+
+
+def heap_used(cdp, collect=True):
+    if collect:
+        cdp.send('HeapProfiler.collectGarbage')
+    return cdp.send('Runtime.getHeapUsage')['usedSize']
+
+
+def run_phase(page, browser, cdp, balls, seconds):
+    """Play one phase with `balls` on the table and measure it"""
+    before = heap_used(cdp)
+    page.evaluate('() => window.__allocations.reset()')
+    browser.start_tracing(page=page, categories=GC_TRACE_CATEGORIES)
+    cdp.send('HeapProfiler.startSampling', {
+        'samplingInterval': SAMPLING_INTERVAL,
+        'includeObjectsCollectedByMajorGC': True,
+        'includeObjectsCollectedByMinorGC': True,
+    })
+    page.evaluate('(balls) => window.__frameProfiler.start(balls)', balls)
+
+    # Uncollected heap once a second, to see the sawtooth between GCs
+    heap_series = []
+    for _ in range(max(1, int(seconds))):
+        page.wait_for_timeout(1000)
+        heap_series.append(heap_used(cdp, collect=False))
+
+    sample = page.evaluate('() => window.__frameProfiler.stop()')
+    counts = page.evaluate('() => window.__allocations.snapshot()')
+    profile = cdp.send('HeapProfiler.stopSampling')['profile']
+    trace = json.loads(browser.stop_tracing())
+    # Drop the balls before the closing GC so they do not count as retained
+    page.evaluate('() => window.__frameProfiler.start(1)')
+    page.evaluate('() => window.__frameProfiler.stop()')
+    after = heap_used(cdp)
+
+    ticks = max(frame_stats(sample['rows'])['ticks'], 1)
+    sites = sampled_allocations(profile)
+    pauses = gc_pauses(trace)
+    all_pauses = [ms for durations in pauses.values() for ms in durations]
+    return {
+        'balls': balls,
+        'frames': ticks,
+        'allocations': counts,
+        'allocs_per_frame': sum(counts.values()) / ticks,
+        'sampled_bytes_per_frame': sum(sites.values()) / ticks,
+        'top_sites': sorted(sites.items(), key=lambda item: -item[1])[:TOP_SITES],
+        'retained_kb': (after - before) / 1024,
+        'heap_peak_kb': max(heap_series) / 1024,
+        'gc': {name: {'count': len(d), 'total_ms': sum(d), 'max_ms': max(d, default=0.0)}
+               for name, d in pauses.items()},
+        'gc_max_ms': max(all_pauses, default=0.0),
+        'gc_total_ms': sum(all_pauses),
+    }
+
+
+def check_budgets(result, args):
+    """(label, ok, detail) for each budget"""
+    checks = [
+        ('allocations per frame', result['allocs_per_frame'] <= args.max_allocs_per_frame,
+         f"{result['allocs_per_frame']:.1f} / {args.max_allocs_per_frame}"),
+        ('retained heap', result['retained_kb'] <= args.max_retained_kb,
+         f"{result['retained_kb']:.0f} KB / {args.max_retained_kb} KB"),
+    ]
+    if args.max_gc_pause_ms is not None:
+        checks.append(('longest GC pause', result['gc_max_ms'] <= args.max_gc_pause_ms,
+                       f"{result['gc_max_ms']:.2f} ms / {args.max_gc_pause_ms} ms"))
+    return checks
+
+
+def print_result(result):
+    print(f"\n{result['balls']} ball(s), {result['frames']} frames:")
+    counts = ', '.join(f"{k} {v / result['frames']:.1f}"
+                       for k, v in result['allocations'].items())
+    print(f"   Allocations/frame: {result['allocs_per_frame']:.1f} ({counts})")
+    print(f"   Sampled bytes/frame: ~{result['sampled_bytes_per_frame'] / 1024:.1f} KB")
+    print(f"   Heap: peak {result['heap_peak_kb']:.0f} KB, "
+          f"retained {result['retained_kb']:+.0f} KB after GC")
+    for name, gc in result['gc'].items():
+        print(f"   {name}: {gc['count']} pauses, total {gc['total_ms']:.1f} ms, "
+              f"longest {gc['max_ms']:.2f} ms")
+    print("   Top allocation sites:")
+    for (function, url, line), size in result['top_sites']:
+        print(f"     {size / 1024:9.0f} KB  {function} ({url.rsplit('/', 1)[-1]}:{line})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_browser_arguments(parser)
+    parser.add_argument('--balls', default='1,8',
+                        help='comma-separated balls on the table, one phase each')
+    parser.add_argument('--seconds', type=float, default=60, help='length of each phase')
+    parser.add_argument('--max-allocs-per-frame', type=float, default=300)
+    parser.add_argument('--max-retained-kb', type=float, default=1024)
+    parser.add_argument('--max-gc-pause-ms', type=float,
+                        help='also fail when a single GC pause is longer than this')
+    parser.add_argument('--json', help='also write the measurements to this JSON file')
+    args = parser.parse_args(argv)
+    ball_counts = [int(v) for v in args.balls.split(',')]
+
+    print("=" * 60)
+    print("Physics Pinball - Allocation and GC Test")
+    print("=" * 60)
+
+    results = []
+    with base_url_or_serve(args.base_url) as base_url, \
+            chromium(args.chrome, headless=not args.headed) as browser:
+        page = browser.new_page()
+        page.goto(game_url(base_url, 'physics-pinball'))
+        page.wait_for_function('() => window.enhancedGame')
+        page.evaluate(ALLOCATION_COUNTERS)
+        page.evaluate(HOOKS, CAPACITY)
+        cdp = page.context.new_cdp_session(page)
+        cdp.send('HeapProfiler.enable')
+        page.keyboard.press('Space')
+        for balls in ball_counts:
+            result = run_phase(page, browser, cdp, balls, args.seconds)
+            print_result(result)
+            results.append(result)
+
+    print("\n" + "=" * 60)
+    print("Budgets")
+    print("=" * 60)
+    failed = 0
+    for result in results:
+        for label, ok, detail in check_budgets(result, args):
+            failed += not ok
+            print(f"{'✓ PASS' if ok else '✗ FAIL'} - {result['balls']} ball(s) {label}: {detail}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, default=str)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+Browser harness helpers that do not need a browser
+"""
+
+from urllib.request import urlopen
+
+from tools.browser import gc_pauses, sampled_allocations, serve
+
+
+def test_serve_repository():
+    with serve() as base_url:
+        with urlopen(f'{base_url}/physics-pinball/') as response:
+            assert response.status == 200
+            assert b'game-enhanced.js' in response.read()
+
+
+def test_gc_pauses_from_trace():
+    trace = {'traceEvents': [
+        {'name': 'MinorGC', 'ph': 'X', 'dur': 1500},
+        {'name': 'MinorGC', 'ph': 'X', 'dur': 500},
+        {'name': 'MajorGC', 'ph': 'X', 'dur': 12000},
+        {'name': 'MinorGC', 'ph': 'B'},
+        {'name': 'FunctionCall', 'ph': 'X', 'dur': 99000},
+    ]}
+    assert gc_pauses(trace) == {'MinorGC': [1.5, 0.5], 'MajorGC': [12.0]}
+
+
+def test_sampled_allocations_sums_call_sites():
+    def node(name, line, size, *children):
+        return {'callFrame': {'functionName': name, 'url': 'http://x/game.js',
+                              'lineNumber': line}, 'selfSize': size,
+                'children': list(children)}
+
+    profile = {'head': node('', 0, 0,
+                            node('update', 1171, 0, node('add', 9, 4096)),
+                            node('draw', 1596, 0, node('add', 9, 2048),
+                                 node('', 50, 1024)))}
+    sites = sampled_allocations(profile)
+    assert sites[('add', 'http://x/game.js', 10)] == 6144
+    assert sites[('(anonymous)', 'http://x/game.js', 51)] == 1024
+    assert len(sites) == 2
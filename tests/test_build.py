@@ -0,0 +1,132 @@
+"""
+Incremental content-hashed build
+"""
+
+import json
+import os
+
+import pytest
+
+from tools.build import MANIFEST_NAME, Builder, hashed_name, rewrite_html
+
+GAMES = ['snake-game', 'minesweeper']
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / 'src'
+    root.mkdir()
+    (root / 'index.html').write_text('<link rel="preload" href="style.css" as="style">'
+                                     '<link rel="stylesheet" href="style.css">'
+                                     '<script type="application/json" id="game-assets">{}'
+                                     '</script>')
+    (root / 'style.css').write_text('body {}')
+    (root / '_headers').write_text('/*\n  X-Frame-Options: DENY\n')
+    for game in GAMES:
+        (root / game).mkdir()
+        (root / game / 'index.html').write_text(
+            '<link rel="stylesheet" href="style.css">'
+            '<link rel="stylesheet" href="../style.css?v=2">'
+            '<script src="game.js"></script>'
+            '<script src="https://cdn.example/lib.js"></script>')
+        (root / game / 'style.css').write_text(f'/* {game} */')
+        (root / game / 'game.js').write_text(f'// {game}')
+        (root / game / 'game.test.js').write_text('test')
+        (root / game / 'shot.png').write_bytes(b'png')
+        (root / game / 'README.md').write_text('readme')
+    return root, tmp_path / 'dist'
+
+
+def test_rewrite_html_keeps_relative_prefix_and_query():
+    html = '<link rel="stylesheet" href="../style.css?v=2"><script src="game.js"></script>'
+    hashed = {'style.css': 'style.abc.css', 'g/game.js': 'g/game.def.js'}
+    assert rewrite_html(html, 'g/index.html', hashed) == (
+        '<link rel="stylesheet" href="../style.abc.css?v=2"><script src="game.def.js"></script>')
+
+
+def test_full_build_hashes_linked_assets(tree):
+    root, out = tree
+    result = Builder(root, out, GAMES).build()
+    assert result.full
+
+    digest = json.loads((out / MANIFEST_NAME).read_text())['files']['snake-game/game.js']['hash']
+    hashed = hashed_name('snake-game/game.js', digest)
+    assert result.hashed['snake-game/game.js'] == hashed
+    assert (out / hashed).read_text() == '// snake-game'
+    # The unhashed file stays for paths built at runtime
+    assert (out / 'snake-game' / 'game.js').exists()
+    assert not (out / 'snake-game' / 'game.test.js').exists()
+    assert not (out / 'snake-game' / 'shot.png').exists()
+    assert (out / 'snake-game' / 'README.md').exists()
+
+    page = (out / 'snake-game' / 'index.html').read_text()
+    assert f'src="{os.path.basename(hashed)}"' in page
+    assert 'href="../style.' in page and '?v=2' in page
+    assert 'https://cdn.example/lib.js' in page
+    headers = (out / '_headers').read_text()
+    assert headers.startswith('/*\n  X-Frame-Options: DENY\n')
+    assert f'/{hashed}\n  Cache-Control: public, max-age=31536000, immutable' in headers
+
+
+def test_hub_preloads_and_prefetch_map_use_hashed_names(tree):
+    root, out = tree
+    result = Builder(root, out, GAMES).build()
+    style = result.hashed['style.css']
+    hub = (out / 'index.html').read_text()
+    assert f'<link rel="preload" href="{style}" as="style">' in hub
+    assert 'href="style.css"' not in hub
+
+    assets = json.loads(hub.split('id="game-assets">')[1].split('</script>')[0])
+    assert list(assets) == GAMES
+    # The URLs the game page asks for, relative to the hub; CDN scripts are left out
+    assert assets['snake-game'] == [
+        './' + result.hashed['snake-game/style.css'], f'./{style}?v=2',
+        './' + result.hashed['snake-game/game.js']]
+
+
+def test_incremental_build_touches_only_changed_game(tree):
+    root, out = tree
+    Builder(root, out, GAMES).build()
+    untouched = out / 'minesweeper' / 'index.html'
+    before = untouched.stat().st_mtime_ns
+
+    result = Builder(root, out, GAMES).build()
+    assert not result.full and result.written == [] and result.removed == []
+
+    (root / 'snake-game' / 'game.js').write_text('// snake-game v2')
+    result = Builder(root, out, GAMES).build()
+    old = [name for name in result.removed if name.startswith('snake-game/game.')]
+    assert len(old) == 1 and not (out / old[0]).exists()
+    # The hub's prefetch map names the new hashed file too
+    assert set(result.written) == {'snake-game/game.js', result.hashed['snake-game/game.js'],
+                                   'snake-game/index.html', 'index.html', '_headers'}
+    assert untouched.stat().st_mtime_ns == before
+
+
+def test_removed_game_is_cleaned_up(tree):
+    root, out = tree
+    Builder(root, out, GAMES).build()
+    result = Builder(root, out, ['snake-game']).build()
+    assert 'minesweeper/index.html' in result.removed
+    assert not (out / 'minesweeper').exists()
+
+
+def test_minified_build_reuses_cached_transforms(tree, tmp_path):
+    from tools.cache import ResultCache
+
+    root, out = tree
+    (root / 'snake-game' / 'game.js').write_text('// comment\nlet  a = 1\nfoo( a )\n')
+    (root / 'snake-game' / 'style.css').write_text('.used { a: 1 }\n.gone { b: 2 }')
+    index = root / 'snake-game' / 'index.html'
+    index.write_text(index.read_text() + '\n\n<div   class="used"></div>')
+    cache = ResultCache(tmp_path / 'cache.db')
+
+    Builder(root, out, GAMES, minify=True, cache=cache).build()
+    assert (out / 'snake-game' / 'game.js').read_text() == 'let a=1\nfoo(a)'
+    assert (out / 'snake-game' / 'style.css').read_text() == '.used{a:1}'
+    assert '</script>\n<div' in (out / 'snake-game' / 'index.html').read_text()
+
+    # A clean rebuild gets the same output from the cache
+    result = Builder(root, tmp_path / 'dist2', GAMES, minify=True, cache=cache).build()
+    assert result.full and not result.warnings
+    assert (tmp_path / 'dist2' / 'snake-game' / 'style.css').read_text() == '.used{a:1}'
@@ -0,0 +1,53 @@
+"""
+Persistent result cache: hits, size cap and LRU eviction
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tools.cache import ResultCache, content_hash
+
+
+def test_content_hash_separates_parts():
+    assert content_hash('ab', 'c') != content_hash('a', 'bc')
+    assert content_hash('x') == content_hash(b'x')
+
+
+def test_get_put_and_persistence(tmp_path):
+    path = tmp_path / 'c.sqlite'
+    cache = ResultCache(str(path))
+    assert cache.get('k') is None
+    cache.put('k', b'value')
+    assert cache.get('k') == b'value'
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+    assert ResultCache(str(path)).get('k') == b'value'
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path / 'c.sqlite'), max_bytes=300)
+    for key in 'abc':
+        cache.put(key, b'x' * 100)
+        time.sleep(0.01)
+    cache.get('a')              # 'b' is now the least recently used
+    time.sleep(0.01)
+    cache.put('d', b'x' * 100)
+    assert cache.get('b') is None
+    assert all(cache.get(key) is not None for key in 'acd')
+    assert cache.size() <= 300
+
+
+def test_every_call_is_serialized(tmp_path):
+    cache = ResultCache(str(tmp_path / 'c.sqlite'), max_bytes=2000)
+
+    def work(n):
+        for i in range(50):
+            cache.put(f'{n}-{i}', b'x' * 100)
+            if i % 10 == 0:
+                cache.clear()
+            assert 0 <= cache.size() <= 2000 and len(cache) <= 20
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(work, range(8)))
+    cache.clear()
+    assert len(cache) == 0 and cache.size() == 0
@@ -0,0 +1,90 @@
+"""
+Check engine tests: one-pass results must agree with plain re / `in` scans
+"""
+
+import re
+
+from tools.cache import ResultCache
+from tools.checks import CheckEngine, literal, regex, regex_prefix
+from tools.site import ROOT
+
+SOURCE = (ROOT / 'physics-pinball' / 'game-enhanced.js').read_text(encoding='utf-8')
+
+
+def test_regex_prefix():
+    assert regex_prefix(r'class Ball\s+extends') == 'class Ball'
+    assert regex_prefix(r'init\(\)\s*\{') == 'init()'
+    assert regex_prefix(r'ab?c') == 'a'
+    assert regex_prefix(r'foo|bar') == ''
+    assert regex_prefix(r'abc', re.IGNORECASE) == ''
+    assert regex_prefix(r'(?i)class ball') == ''
+
+
+def test_matches_agree_with_re():
+    patterns = {
+        'gravity': r'gravity:\s*([\d.]+)',
+        'update': r'update\(\)\s*\{',
+        'subtract': r'ball\.position\.subtract\(bumper\.position\)',
+        'bounce': r'velocity\.[xy] \*= -GameConfig\.elasticity',
+        'short': r'[a-z]\.x',
+    }
+    report = CheckEngine([regex(n, p) for n, p in patterns.items()]).scan(SOURCE)
+    for name, pattern in patterns.items():
+        expected = [m.start() for m in re.finditer(pattern, SOURCE)]
+        assert [h.start for h in report.hits[name]] == expected, name
+        first = re.search(pattern, SOURCE)
+        assert (report.first(name) is None) == (first is None)
+
+
+def test_overlapping_literals_are_all_found():
+    text = 'ball.position.subtract(bumper.position)\nbumper.position'
+    engine = CheckEngine([
+        literal('long', 'ball.position.subtract'),
+        literal('prefix', 'ball.position'),
+        literal('inner', 'bumper.position'),
+        literal('missing', 'paddle.position'),
+    ])
+    report = engine.scan(text)
+    assert [h.start for h in report.hits['long']] == [0]
+    assert [h.start for h in report.hits['prefix']] == [0]
+    assert [(h.start, h.line) for h in report.hits['inner']] == [(23, 1), (40, 2)]
+    assert not report.found('missing')
+
+
+def test_flagged_and_self_overlapping_patterns_agree_with_re():
+    text = 'CLASS BALL class ball\naaaa aaa a.xa.x'
+    rules = [
+        regex('flagged', r'(?i)class ball'),
+        regex('verbose', r'(?x) class \s ball'),
+        regex('repeat', r'aa'),
+        literal('literal', 'aa'),
+        regex('chain', r'a\.xa'),
+    ]
+    report = CheckEngine(rules).scan(text)
+    for rule in rules:
+        pattern = rule.pattern if rule.regex else re.escape(rule.pattern)
+        expected = [m.span() for m in re.finditer(pattern, text, rule.flags)]
+        assert [(h.start, h.end) for h in report.hits[rule.name]] == expected, rule.name
+    assert report.count('flagged') == 2 and report.count('repeat') == 3
+
+
+def test_groups_and_line_numbers():
+    report = CheckEngine([regex('gravity', r'gravity:\s*([\d.]+)')]).scan(SOURCE)
+    hit = report.first('gravity')
+    assert hit.group(1) == '0.25'
+    assert SOURCE.splitlines()[hit.line - 1].strip().startswith('gravity:')
+
+
+def test_cached_report_matches_scan(tmp_path):
+    engine = CheckEngine([regex('config', r'gravity:\s*([\d.]+)'), literal('loop', 'loop(')])
+    cache = ResultCache(str(tmp_path / 'checks.sqlite'))
+    text = 'const c = { gravity: 0.25 };\nloop(timestamp)\n'
+    first = engine.scan(text, cache)
+    second = engine.scan(text, cache)
+    assert not first.cached and second.cached
+    assert second.hits == first.hits
+    assert second.first('config').group(1) == '0.25'
+
+    # A different rule set must not reuse the report
+    other = CheckEngine([literal('loop', 'loop(')])
+    assert not other.scan(text, cache).cached
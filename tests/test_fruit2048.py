@@ -0,0 +1,65 @@
+"""
+Fruit 2048 bitboard engine: rules, players and the check against game.js
+"""
+
+import random
+import shutil
+
+import pytest
+
+from tools.fruit2048 import (
+    Expectimax, benchmark, can_move, from_grid, fruit_scores, move, play_game, play_move,
+    random_boards, to_grid, transpose, verify, SCORES,
+)
+
+
+def test_transpose_matches_grid_transpose():
+    for board in random_boards(50, random.Random(1)):
+        assert to_grid(transpose(board)) == [list(col) for col in zip(*to_grid(board))]
+
+
+def test_merges_pair_from_the_moving_side_and_cap_at_peach():
+    board = from_grid([[1, 1, 1, 1], [2, 0, 2, 3], [10, 10, 0, 0], [0, 0, 0, 0]])
+    new, points, merges = move(board, 'left')
+    assert to_grid(new) == [[2, 2, 0, 0], [3, 3, 0, 0], [10, 0, 0, 0], [0, 0, 0, 0]]
+    assert points == 4 + 4 + 8 + 1024 and merges == 4
+    new, _, _ = move(board, 'right')
+    assert to_grid(new)[1] == [0, 0, 3, 3]
+    new, _, _ = move(board, 'down')
+    assert to_grid(new)[3] == [10, 10, 2, 3]
+
+
+def test_combo_bonus_and_reset():
+    board = from_grid([[1, 1, 0, 0], [2, 2, 0, 0], [3, 0, 0, 0], [0, 0, 0, 0]])
+    new, gained, combo = play_move(board, 'left', 0)
+    assert (gained, combo) == (4 + 8, 1)
+    # Second merging move in a row: + floor(points * 0.5 * 2)
+    assert play_move(board, 'left', 1)[1:] == (24, 2)
+    # Valid move without merges resets, an invalid one keeps the combo
+    assert play_move(from_grid([[0, 1]]), 'left', 3)[1:] == (0, 0)
+    assert play_move(from_grid([[1, 2]]), 'left', 3)[1:] == (0, 3)
+
+
+def test_can_move():
+    full = [[1, 2, 1, 2], [2, 1, 2, 1], [1, 2, 1, 2], [2, 1, 2, 1]]
+    assert not can_move(from_grid(full))
+    full[3][3] = 2
+    assert can_move(from_grid(full))
+
+
+def test_expectimax_outplays_random_and_games_are_seeded_per_index():
+    game = play_game(Expectimax(1), random.Random(5), max_moves=400)
+    assert game.max_level >= 8 and game.score > 0
+    _, a = benchmark(games=4, policy='greedy', seed=2, workers=1, chunk=1)
+    _, b = benchmark(games=4, policy='greedy', seed=2, workers=2, chunk=3)
+    assert a == b
+
+
+def test_fruit_scores_are_read_from_game_js():
+    assert fruit_scores() == SCORES
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+def test_engine_matches_game_js_move_and_check_state():
+    _, mismatches = verify(boards=300, seed=4)
+    assert mismatches == []
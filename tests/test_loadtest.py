@@ -0,0 +1,60 @@
+"""
+Load generator against a small site on the production-like server
+"""
+
+import asyncio
+import email.utils
+
+from tools.loadtest import compare, freshness, run_load
+from tools.serve import running
+
+
+def make_site(root):
+    (root / '_headers').write_text('/*/game.js\n  Cache-Control: public, max-age=86400\n'
+                                   '/*/index.html\n  Cache-Control: no-cache\n')
+    # Only snake-game is in the prefetch map; minesweeper falls back to its page's assets
+    (root / 'index.html').write_text('<link rel="stylesheet" href="style.css">'
+                                     '<script type="application/json" id="game-assets">'
+                                     '{"snake-game":["./snake-game/style.css",'
+                                     '"./snake-game/game.js"]}</script>'
+                                     '<script src="hub.js"></script>' + ' ' * 500)
+    (root / 'style.css').write_text('body {}')
+    (root / 'hub.js').write_text('prefetchGame();')
+    for game in ('snake-game', 'minesweeper'):
+        (root / game).mkdir()
+        (root / game / 'index.html').write_text('<script src="game.js"></script>')
+        (root / game / 'game.js').write_text('loop();' * 100)
+    (root / 'snake-game' / 'style.css').write_text('canvas {}')
+
+
+def test_freshness_rules():
+    now = 1_000_000.0
+    assert freshness({'cache-control': 'public, max-age=60'}, now) == 60
+    assert freshness({'cache-control': 'no-cache'}, now) == 0
+    assert freshness({'cache-control': 'no-store'}, now) is None
+    modified = email.utils.formatdate(now - 1000, usegmt=True)
+    assert freshness({'last-modified': modified}, now) == 100
+
+
+def test_run_load_reports_outcomes(tmp_path):
+    make_site(tmp_path)
+    with running(tmp_path) as (url, server):
+        targets = set()
+        server.log = lambda method, target, status: targets.add(target)
+        result = asyncio.run(run_load(url, users=3, sessions=4,
+                                      games=['snake-game', 'minesweeper'], hovers=(1, 2)))
+
+    assert result['requests'] > 0
+    assert result['games'] and sum(result['games'].values()) == 12
+    outcomes = result['outcomes']
+    assert outcomes['page']['error'] == 0 and outcomes['asset']['error'] == 0
+    # no-cache pages come back as 304 on repeat visits; game.js stays fresh
+    assert outcomes['page']['revalidated'] > 0
+    assert outcomes['asset']['cache'] + outcomes['prefetch']['cache'] > 0
+    # Hovers fetch what the pages use, never guessed names
+    assert outcomes['prefetch']['error'] == 0 and result['statuses'].get('404', 0) == 0
+    assert '/snake-game/style.css' in targets and '/minesweeper/style.css' not in targets
+    assert result['latency_ms']['all']['p50'] > 0
+
+    rows = {label: change for label, _, _, change in compare(result, result)}
+    assert rows['req/s'] == 0.0
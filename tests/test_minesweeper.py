@@ -0,0 +1,94 @@
+"""
+Minesweeper engine: vectorized counts, placement, solver and generator
+"""
+
+import shutil
+
+import numpy as np
+import pytest
+
+from tools.minesweeper import (
+    DIFFICULTIES, adjacent_counts, decode, encode, flood, generate, open_board, openings,
+    place_mines, reveal_order, run_reveals, safe_zone, solve,
+)
+
+
+def test_difficulties_come_from_game_js():
+    assert [(d.name, d.rows, d.cols, d.mines) for d in DIFFICULTIES.values()] == [
+        ('beginner', 9, 9, 10), ('intermediate', 16, 16, 40), ('expert', 16, 30, 99)]
+
+
+def test_adjacent_counts_match_the_per_cell_loop():
+    mines = np.random.default_rng(1).random((3, 7, 11)) < 0.3
+    counts = adjacent_counts(mines)
+    for b, r, c in np.ndindex(mines.shape):
+        expected = mines[b, max(r - 1, 0):r + 2, max(c - 1, 0):c + 2].sum() - mines[b, r, c]
+        assert counts[b, r, c] == expected
+
+
+def test_place_mines_keeps_first_click_area_clear():
+    expert = DIFFICULTIES['expert']
+    boards = place_mines(expert, (0, 29), 50, np.random.default_rng(2))
+    assert boards.shape == (50, 16, 30)
+    assert (boards.sum(axis=(1, 2)) == 99).all()
+    assert not (boards & safe_zone(16, 30, (0, 29))).any()
+    assert (decode(encode(boards[0]), 16, 30) == boards[0]).all()
+
+
+def test_solver_uses_pairs_and_refuses_to_guess():
+    board = np.array([[1, 0, 1],
+                      [0, 0, 0],
+                      [0, 0, 0]], dtype=bool)
+    result = solve(board, (2, 1))
+    assert result.solved and result.pairs > 0
+
+    # One mine among three covered cells of a 2x2 board is a guess
+    coin_flip = np.array([[0, 0], [0, 1]], dtype=bool)
+    result = solve(coin_flip, (0, 0))
+    assert not result.solved and result.revealed == 1
+
+
+def test_generated_boards_are_solvable_and_independent_of_workers():
+    beginner = DIFFICULTIES['beginner']
+    a, click, stats = generate(beginner, 10, seed=5, workers=1, batch=8)
+    b, _, _ = generate(beginner, 10, seed=5, workers=2, batch=8)
+    assert len(a) == 10 and stats['attempts'] >= 10
+    assert all((x == y).all() for x, y in zip(a, b))
+    assert all(solve(board, click).solved for board in a)
+
+
+def open_cases(count, seed):
+    rng = np.random.default_rng(seed)
+    return [open_board(20, 30, 40, rng) for _ in range(count)]
+
+
+def reference(case):
+    mines, click = case['mines'], case['click']
+    counts = adjacent_counts(mines)
+    revealed = np.zeros_like(mines)
+    revealed[click] = True
+    return counts, revealed, reveal_order(counts, revealed, np.zeros_like(mines), click)
+
+
+def test_reveal_order_opens_the_same_region_as_the_solver():
+    for case in open_cases(10, 6):
+        counts, revealed, (cells, numbers) = reference(case)
+        expected = flood(revealed, *openings(case['mines'], counts))
+        assert set(cells) | {int(np.ravel_multi_index(case['click'], counts.shape))} == \
+            set(np.flatnonzero(expected))
+        assert all(counts.ravel()[n] > 0 for n in numbers)
+        assert len(cells) == len(set(cells))
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+def test_game_js_reveals_the_reference_region_in_one_pass():
+    cases = open_cases(5, 7)
+    for case, js in zip(cases, run_reveals(cases)):
+        counts, revealed, (cells, numbers) = reference(case)
+        assert sorted(js['revealed']) == sorted(set(cells) | set(np.flatnonzero(revealed)))
+        assert js['revealed_cells'] == len(js['revealed'])
+        # Numbers come up staggered in BFS order, driven by animation frames only
+        times = [js['number_times'][str(n)] for n in numbers]
+        assert times == sorted(times) and len(js['number_times']) == len(numbers)
+        assert js['total'].get('setTimeout', 0) == 0
+        assert js['settled_ms'] <= 1000 + 400 + 2 * 1000 / 60
@@ -0,0 +1,83 @@
+"""
+Conservative minifiers and unused CSS pruning
+"""
+
+import pytest
+
+from tools.minify import (
+    MinifyError, js_tokens, minify_css, minify_html, minify_js, prune_css, used_names,
+)
+
+TRICKY_JS = r"""
+// leading comment
+const a = 1 /* inline */ + +b;
+let c = a
+++d
+const re = /\/\*not a comment*\//g, half = total / 2 / count;
+const t = `x ${ { k: '}' }.k } // ${`nested ${a}`}`;
+function f() {
+    return /[/]/.test(s)
+}
+x = y - -z; w = v++ + 1;
+if (a) { b() }
+(function () {})()
+"""
+
+
+def test_minify_js_keeps_every_token_and_line_breaks_that_matter():
+    out = minify_js(TRICKY_JS)
+    assert js_tokens(out) == js_tokens(TRICKY_JS)
+    assert '//' not in out.split('\n')[0] and 'inline' not in out
+    assert '+ +b' in out and '- -z' in out and 'v++ +1' in out
+    # `a\n++d` must not become `a++d`
+    assert 'c=a\n++d' in out
+    assert '/\\/\\*not a comment*\\//g' in out
+    assert "`x ${ { k: '}' }.k } // ${`nested ${a}`}`" in out
+    assert '}\n(function' in out
+
+
+def test_minify_js_rejects_broken_input():
+    with pytest.raises(MinifyError):
+        minify_js('const s = "unterminated\n')
+
+
+def test_minify_css_leaves_strings_media_and_calc_alone():
+    css = '''
+    /* comment */ .a/**/.b , .c > .d {
+        content: "  ; } ";
+        width: calc(100% - 2px);
+    }
+    @media screen and (max-width: 600px) { .e { color : red ; } }
+    /*! keep me */
+    '''
+    assert minify_css(css) == (
+        '.a.b,.c>.d{content:"  ; } ";width:calc(100% - 2px)}'
+        '@media screen and (max-width:600px){.e{color:red}}/*! keep me */')
+
+
+def test_prune_css_keeps_used_and_runtime_built_classes():
+    css = ('.used, .unused { a: 1 }\n.tile-8 { b: 2 }\n#menu .item { c: 3 }\n'
+           '@media (max-width: 10px) { .gone { d: 4 } }\n'
+           '@keyframes spin { from { e: 5 } }\n[data-x=".nope"] { f: 6 }')
+    html = '<div class="used" id="menu"><span class="item"></span></div>'
+    js = "el.className = 'tile-' + value;"
+    pruned, removed = prune_css(css, *used_names([html, js]))
+    assert '.used{' in pruned.replace(' ', '')
+    assert '.tile-8' in pruned and '#menu .item' in pruned
+    assert '@keyframes spin' in pruned and '[data-x=".nope"]' in pruned
+    assert '.gone' not in pruned and '@media' not in pruned
+    assert sorted(removed) == ['.gone', '.unused']
+
+
+def test_minify_html_collapses_text_but_not_pre_or_data_scripts():
+    html = ('<!-- note -->\n<div>\n    Hello   world\n</div>\n<pre>  keep\n   this </pre>\n'
+            '<script>\n  // comment\n  let x = 1\n  x++\n</script>\n'
+            '<script type="application/ld+json">{ "a":  1 }</script>\n'
+            '<style> .a { color : red } </style>')
+    out = minify_html(html)
+    assert 'note' not in out
+    assert '<div>\nHello world\n</div>' in out
+    assert '<pre>  keep\n   this </pre>' in out
+    assert '<script>let x=1\nx++</script>' in out
+    assert '{ "a":  1 }' in out
+    assert '<style>.a{color:red}</style>' in out
@@ -0,0 +1,102 @@
+"""
+Performance history, rolling baseline gate and trend report
+"""
+
+import sqlite3
+
+import pytest
+
+from tools.perf_dashboard import (METRIC_NAMES, SESSIONS, History, collect, frame_metrics, main,
+                                  regressions, render_report)
+from tools.site import GAMES
+
+
+def metrics(load_ms=100.0, transfer_bytes=50_000.0, **overrides):
+    out = dict.fromkeys(METRIC_NAMES, 10.0)
+    out.update(load_ms=load_ms, transfer_bytes=transfer_bytes, heap_bytes=2e6, **overrides)
+    return out
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = History(str(tmp_path / 'history.sqlite'))
+    for n, load in enumerate([98, 100, 102, 101, 99]):
+        history.record(f'sha{n}', {'snake-game': metrics(load), 'minesweeper': metrics(load)})
+    yield history
+    history.close()
+
+
+def test_every_game_has_a_session():
+    assert sorted(SESSIONS) == sorted(GAMES)
+
+
+def test_history_is_append_only(history):
+    with pytest.raises(sqlite3.DatabaseError, match='append-only'):
+        history.db.execute("UPDATE results SET value = 0")
+    with pytest.raises(sqlite3.DatabaseError, match='append-only'):
+        history.db.execute("DELETE FROM runs")
+    assert [r['sha'] for r in history.runs()] == [f'sha{n}' for n in range(5)]
+
+
+def test_regression_against_rolling_median(history):
+    slow = history.record('slow', {'snake-game': metrics(130), 'minesweeper': metrics(120)})
+    found = regressions(history, slow)
+    assert [(r['game'], r['metric']) for r in found] == [('snake-game', 'load_ms')]
+    assert found[0]['baseline'] == 100 and found[0]['change'] == pytest.approx(0.3)
+    # A tighter threshold catches the other game too
+    assert len(regressions(history, slow, {'load_ms': 0.1})) == 2
+
+    # Deterministic metrics have a tight default; dirty runs never join the baseline
+    big = history.record('big', {'snake-game': metrics(transfer_bytes=52_000)}, dirty=True)
+    assert [r['metric'] for r in regressions(history, big)] == ['transfer_bytes']
+    assert history.baseline(big)['snake-game']['load_ms'] == (101, 5)
+
+
+def test_too_little_history_is_not_gated(tmp_path):
+    history = History(str(tmp_path / 'history.sqlite'))
+    history.record('a', {'snake-game': metrics(100)})
+    run = history.record('b', {'snake-game': metrics(500)})
+    assert regressions(history, run) == []
+    assert len(regressions(history, run, min_runs=1)) == 1
+    history.close()
+
+
+def test_report_and_exit_code(history, tmp_path, capsys):
+    path, report = history.path, tmp_path / 'report.html'
+    assert main(['report', '--history', path, '--report', str(report)]) == 0
+    history.record('slow', {'snake-game': metrics(150), 'minesweeper': metrics(100)})
+    assert main(['report', '--history', path, '--report', str(report)]) == 1
+    assert 'snake-game' in capsys.readouterr().out
+
+    text = report.read_text()
+    assert text.count('<svg') == 2 * len(METRIC_NAMES)
+    assert text.count('class="regressed"') == 1
+    assert '1 regression(s)' in render_report(history)
+    assert main(['report', '--history', path, '--report', str(report),
+                 '--threshold', 'load_ms=0.6']) == 0
+
+
+def test_frame_metrics():
+    stats = frame_metrics([0, 16, 32, 48, 64, 114])
+    assert stats['frame_p50_ms'] == 16 and stats['frame_p99_ms'] > 45
+    assert frame_metrics([5])['frame_p95_ms'] == 0
+
+
+@pytest.fixture(scope='module')
+def launchable():
+    pytest.importorskip('playwright.sync_api')
+    from tools.browser import chromium
+    try:
+        with chromium():
+            pass
+    except Exception as e:
+        pytest.skip(f'needs a Chromium Playwright can launch ({type(e).__name__})')
+
+
+def test_collect_measures_a_session(launchable):
+    results, errors = collect(['snake-game', 'tic-tac-toe'], seconds=1)
+    for game, values in results.items():
+        assert errors[game] == []
+        assert sorted(values) == sorted(METRIC_NAMES)
+        assert values['load_ms'] > 0 and values['transfer_bytes'] > 0
+        assert values['heap_bytes'] > 0 and values['frame_p50_ms'] > 0
@@ -0,0 +1,43 @@
+"""
+Continuous collision check tests on hand-built segments
+"""
+
+import numpy as np
+
+from tools.pinball_ccd import (
+    box_interval, chord_substeps, circle_interval, substeps_needed, tunnelled,
+)
+
+
+def arr(*values):
+    return np.array(values, dtype=float)
+
+
+def test_grazing_pass_through_circle_is_flagged():
+    # Passes 30 px from the centre of a radius-35 circle, endpoints outside
+    t_in, t_out = circle_interval(arr(-30), arr(30), arr(60), arr(0), 0, 0, 35)
+    assert tunnelled(t_in, t_out)[0]
+    # Chord is 2*sqrt(35^2 - 30^2) ~ 36 px of a 60 px step
+    assert substeps_needed(t_in, t_out)[0] == 2
+
+
+def test_endpoint_inside_is_not_tunnelling():
+    t_in, t_out = circle_interval(arr(-30), arr(0), arr(30), arr(0), 0, 0, 35)
+    assert not tunnelled(t_in, t_out)[0]
+
+
+def test_miss_is_not_flagged():
+    t_in, t_out = circle_interval(arr(-30), arr(50), arr(60), arr(0), 0, 0, 35)
+    assert not tunnelled(t_in, t_out)[0]
+
+
+def test_box_crossing():
+    # Falls straight through a 10 px tall box in one 30 px step
+    t_in, t_out = box_interval(arr(5), arr(-10), arr(0), arr(30), 0, 0, 10, 10)
+    assert tunnelled(t_in, t_out)[0]
+    assert substeps_needed(t_in, t_out)[0] == 2
+
+
+def test_chord_substeps():
+    assert chord_substeps(10, 35) == 1
+    assert chord_substeps(40, 35) == 3
@@ -0,0 +1,31 @@
+"""
+Frame statistics of the pinball frame-time profiler
+"""
+
+import numpy as np
+
+from tools.pinball_profile import COLUMNS, FRAME_BUDGET_MS, frame_stats
+
+
+def rows(timestamps, ticked, draw_ms=2.0):
+    out = np.zeros((len(timestamps), len(COLUMNS)))
+    out[:, COLUMNS.index('timestamp')] = timestamps
+    out[:, COLUMNS.index('ticked')] = ticked
+    out[:, COLUMNS.index('draw')] = draw_ms
+    return out.ravel().tolist()
+
+
+def test_steady_60fps_drops_nothing():
+    stats = frame_stats(rows(np.arange(61) * FRAME_BUDGET_MS, 1))
+    assert stats['ticks'] == 61 and stats['dropped'] == 0
+    assert round(stats['fps']) == 60
+    assert stats['work_ms']['p50'] == 2.0
+
+
+def test_long_frames_count_as_dropped_and_idle_callbacks_are_skipped():
+    timestamps = [0, 16.7, 33.4, 83.5, 100.2, 108.5]
+    stats = frame_stats(rows(timestamps, [1, 1, 1, 1, 1, 0]))
+    # 50 ms between two ticks is three budgets: two frames dropped
+    assert stats['dropped'] == 2
+    assert stats['idle_callbacks'] == 1
+    assert stats['frame_ms']['max'] > 50
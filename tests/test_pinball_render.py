@@ -0,0 +1,42 @@
+"""
+Pinball render cache: no per-frame gradients or blurs, layers redrawn only when stale
+"""
+
+import shutil
+
+import pytest
+
+from tools.pinball_render import metric_series, run_session, summarise
+
+needs_node = pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+
+
+@needs_node
+def test_steady_state_frames_draw_cached_sprites_only():
+    session = run_session(frames=240, balls=8, dpr=2, seed=2)
+    screen = metric_series(session, 'screen')
+    # Trail gradients are created once, in the first frames with a trail
+    assert screen['gradients'][60:].sum() == 0
+    assert screen['shadowed'].sum() == 0 and screen['blurred_px'].sum() == 0
+    # One full-screen pass: the static layer blit, no clearRect
+    assert (screen['full'] == 1).all()
+    summary = summarise(session)
+    assert summary['screen']['draw_images'] > 8
+    assert summary['cache']['layerRenders'] == 1
+
+
+@needs_node
+def test_static_layer_and_sprites_rerender_only_when_stale():
+    session = run_session(frames=90, balls=2, dpr=1, size=(480, 720), seed=4,
+                          resizes=[(30, 480, 720, 1), (45, 400, 720, 1)])
+    renders = [frame['layer_renders'] for frame in session['frames']]
+    # First frame and the real size change; the same-size resize is a no-op
+    assert renders[29:45] == [1] * 16 and renders[45] == 2
+    assert session['cache']['layerRenders'] == 2
+    sprites_before = session['cache']['spriteRenders']
+
+    session = run_session(frames=90, balls=2, dpr=1, size=(480, 720), seed=4,
+                          resizes=[(45, 480, 720, 2)])
+    # A DPR change re-rasterizes every sprite at the new resolution
+    assert session['cache']['layerRenders'] == 2
+    assert session['cache']['spriteRenders'] > sprites_before
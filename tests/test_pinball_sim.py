@@ -0,0 +1,77 @@
+"""
+Headless pinball simulation tests against the rules in game-enhanced.js
+"""
+
+import numpy as np
+
+from tools.pinball_sim import (
+    LAUNCH_VELOCITY, PADDLE_WIDTH, GameConfig, Layout, PinballBatch,
+)
+
+
+def test_config_matches_game_source():
+    assert GameConfig.from_source() == GameConfig()
+
+
+def test_first_frame_after_launch():
+    cfg = GameConfig()
+    sim = PinballBatch(1, config=cfg)
+    x0, y0 = sim.x[0, 0], sim.y[0, 0]
+    sim.step()
+    vx = LAUNCH_VELOCITY[0] * cfg.friction
+    vy = (LAUNCH_VELOCITY[1] + cfg.gravity) * cfg.friction
+    assert np.isclose(sim.vx[0, 0], vx) and np.isclose(sim.vy[0, 0], vy)
+    assert np.isclose(sim.x[0, 0], x0 + vx) and np.isclose(sim.y[0, 0], y0 + vy)
+
+
+def test_bumper_hit_scores_and_pushes_ball_out():
+    layout = Layout.default()
+    sim = PinballBatch(1, layout=layout)
+    sim.step()
+    bx, by, radius = layout.bumpers[2]
+    sim.x[0, 0], sim.y[0, 0] = bx + 5, by
+    sim.vx[0, 0], sim.vy[0, 0] = -1, 0
+    sim.step()
+    assert sim.score[0] == 100
+    assert sim.bumper_anim[0, 2] == 1
+    dist = np.hypot(sim.x[0, 0] - bx, sim.y[0, 0] - by)
+    assert dist >= radius + sim.config.ballRadius - 1e-9
+    assert np.isclose(np.hypot(sim.vx[0, 0], sim.vy[0, 0]), sim.config.ballSpeed * 1.3)
+
+
+def test_drain_loses_life_and_respawns():
+    sim = PinballBatch(2)
+    sim.step()
+    sim.y[0, 0] = sim.layout.height + 50
+    sim.step()
+    assert list(sim.lives) == [2, 3]
+    assert not sim.running[0] and not sim.launched[0, 0]
+    assert (sim.x[0, 0], sim.y[0, 0]) == sim.layout.spawn
+
+
+def test_paddle_returns_ball_upwards():
+    sim = PinballBatch(1)
+    sim.step()
+    sim.x[0, 0] = sim.paddle_x[0] + PADDLE_WIDTH / 2
+    sim.y[0, 0] = sim.layout.paddle_y - 5
+    sim.vx[0, 0], sim.vy[0, 0] = 0, 5
+    sim.step()
+    assert sim.vy[0, 0] < 0 and sim.combo[0] == 1
+
+
+def test_seeded_runs_are_reproducible():
+    a = PinballBatch(64, seed=7).run(2000)
+    b = PinballBatch(64, seed=7).run(2000)
+    assert np.array_equal(a.x, b.x) and np.array_equal(a.score, b.score)
+
+
+def test_grid_broadphase_matches_brute_force():
+    rng = np.random.default_rng(0)
+    bumpers = np.column_stack([rng.uniform(60, 740, 30), rng.uniform(60, 400, 30),
+                               rng.uniform(12, 25, 30)])
+    layout = Layout(800, 600, bumpers)
+    runs = [PinballBatch(50, 3, layout=layout, seed=5, broadphase=name).run(1500)
+            for name in ('brute', 'grid')]
+    for name in ('x', 'y', 'vx', 'vy', 'score', 'bumper_hits', 'bumper_anim'):
+        assert np.array_equal(getattr(runs[0], name), getattr(runs[1], name))
+    assert runs[0].bumper_hits.sum() > 0
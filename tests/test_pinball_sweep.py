@@ -0,0 +1,27 @@
+"""
+Sweep tests: range parsing, config grid and seed reproducibility
+"""
+
+from tools.pinball_sim import GameConfig
+from tools.pinball_sweep import config_grid, parse_range, sweep
+
+
+def test_parse_range():
+    assert parse_range('0.2:0.3:3') == [0.2, 0.25, 0.3]
+    assert parse_range('18,22') == [18.0, 22.0]
+
+
+def test_config_grid_is_cartesian():
+    grid = list(config_grid(GameConfig(), {'gravity': [0.2, 0.3], 'elasticity': [0.8, 0.9]}))
+    assert len(grid) == 4
+    assert {(c.gravity, c.elasticity) for c in grid} == {
+        (0.2, 0.8), (0.2, 0.9), (0.3, 0.8), (0.3, 0.9)}
+    assert all(c.friction == GameConfig().friction for c in grid)
+
+
+def test_results_do_not_depend_on_batching_of_workers():
+    configs = list(config_grid(GameConfig(), {'gravity': [0.25, 0.35]}))
+    a = sweep(configs, games=40, batch=20, frames=600, seed=3, workers=1)
+    b = sweep(configs, games=40, batch=20, frames=600, seed=3, workers=2)
+    assert a == b
+    assert all(s['games'] == 40 for s in a)
@@ -0,0 +1,60 @@
+"""
+Golden-trace format and replay of the pinball physics
+"""
+
+from dataclasses import replace
+
+import numpy as np
+
+from tools.pinball_sim import GameConfig
+from tools.pinball_trace import (
+    GAME_SOURCE, GOLDEN_DIR, TRACE_DTYPE, TraceWriter, compare, golden_traces, read_trace,
+    record, replay,
+)
+
+
+def test_writer_roundtrip_is_memory_mapped(tmp_path):
+    records = np.zeros(1000, TRACE_DTYPE)
+    records['frame'] = np.arange(1000)
+    records['x'] = np.linspace(0, 800, 1000)
+    path = tmp_path / 'a.trace'
+    with TraceWriter(path, {'engine': 'sim', 'seed': 3}) as writer:
+        writer.append(records[:600])
+        writer.append(records[600:])
+        writer.event(5, 2, True)
+    trace = read_trace(path)
+    assert isinstance(trace.records, np.memmap)
+    assert trace.header['seed'] == 3
+    assert np.array_equal(trace.records, records)
+    assert trace.events.tolist() == [(5, 2, 1)]
+
+
+def test_compare_reports_first_divergent_frame(tmp_path):
+    golden = record(tmp_path / 'golden.trace', frames=600, seed=2, config=GameConfig())
+    other = record(tmp_path / 'other.trace', frames=600, seed=2,
+                   config=replace(GameConfig(), gravity=0.26))
+    assert compare(golden, golden) is None
+    divergence = compare(golden, other)
+    assert divergence.frame == 0 and 'vy' in divergence.fields
+
+    shorter = record(tmp_path / 'short.trace', frames=300, seed=2, config=GameConfig())
+    assert compare(golden, shorter).fields == {'length': (600, 300)}
+
+
+def test_golden_traces_replay():
+    paths = golden_traces()
+    assert paths
+    for path in paths:
+        assert replay(path) is None, path
+
+
+def test_node_golden_catches_edits_to_the_game(tmp_path):
+    golden = GOLDEN_DIR / 'pinball-node-seed1.trace'
+    assert read_trace(golden).header['engine'] == 'node'
+    source = GAME_SOURCE.read_text(encoding='utf-8')
+    edited = tmp_path / 'game-enhanced.js'
+    edited.write_text(source.replace('velocity.y += GameConfig.gravity;',
+                                     'velocity.y += GameConfig.gravity * 1.01;'),
+                      encoding='utf-8')
+    divergence = replay(golden, source=edited)
+    assert divergence is not None and 'vy' in divergence.fields
@@ -0,0 +1,172 @@
+"""
+Static server: routing, _headers rules, encodings, validators and sendfile
+"""
+
+import gzip
+import http.client
+import os
+import socket
+
+import pytest
+
+from tools import serve
+from tools.serve import HeaderRules, accepted_encodings, running
+
+HEADERS = """
+# comment
+/*
+  X-Frame-Options: DENY
+/*/game.js
+  Cache-Control: public, max-age=86400
+/*/index.html
+  Cache-Control: public, max-age=0, must-revalidate
+/:game/assets/*
+  X-Asset: yes
+"""
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / '_headers').write_text(HEADERS)
+    (tmp_path / 'index.html').write_text('<h1>hub</h1>')
+    game = tmp_path / 'snake-game'
+    game.mkdir()
+    (game / 'index.html').write_text('<script src="game.js"></script>')
+    (game / 'game.js').write_text('const snake = [];\n' * 200)
+    (game / 'big.bin').write_bytes(os.urandom(serve.MAX_CACHED_FILE + 4096))
+    with running(tmp_path) as (url, server):
+        host, port = url.rsplit('/', 1)[-1].split(':')
+        yield tmp_path, server, lambda: http.client.HTTPConnection(host, int(port))
+
+
+def get(conn, path, method='GET', **headers):
+    conn.request(method, path, headers=headers)
+    response = conn.getresponse()
+    return response, response.read()
+
+
+def test_header_rules_match_globs_and_placeholders():
+    rules = HeaderRules.parse(HEADERS)
+    assert dict(rules.match('/snake-game/game.js')) == {
+        'X-Frame-Options': 'DENY', 'Cache-Control': 'public, max-age=86400'}
+    assert dict(rules.match('/snake-game/assets/a/b.png'))['X-Asset'] == 'yes'
+    assert 'X-Asset' not in dict(rules.match('/assets/b.png'))
+
+
+def test_accept_encoding_order_and_q_values():
+    assert accepted_encodings('gzip') == ['gzip']
+    assert accepted_encodings('gzip;q=0, identity') == []
+    assert accepted_encodings(None) == []
+    if serve.brotli:
+        assert accepted_encodings('gzip, br') == ['br', 'gzip']
+        assert accepted_encodings('br;q=0.5, gzip') == ['gzip', 'br']
+
+
+def test_directory_index_and_headers_like_worker(site):
+    _, _, connect = site
+    conn = connect()
+    response, body = get(conn, '/snake-game')
+    assert response.status == 200
+    assert b'game.js' in body
+    assert response.getheader('Cache-Control') == 'public, max-age=0, must-revalidate'
+    assert response.getheader('X-Frame-Options') == 'DENY'
+    assert response.getheader('Content-Type') == 'text/html; charset=utf-8'
+
+    # Same keep-alive connection
+    response, body = get(conn, '/')
+    assert body == b'<h1>hub</h1>'
+    response, _ = get(conn, '/missing.js')
+    assert response.status == 404
+
+
+def test_compressed_variants_and_etags(site):
+    root, _, connect = site
+    conn = connect()
+    plain, body = get(conn, '/snake-game/game.js')
+    assert body == (root / 'snake-game' / 'game.js').read_bytes()
+    assert int(plain.getheader('Content-Length')) == len(body)
+    assert plain.getheader('Cache-Control') == 'public, max-age=86400'
+
+    zipped, zbody = get(conn, '/snake-game/game.js', **{'Accept-Encoding': 'gzip'})
+    assert zipped.getheader('Content-Encoding') == 'gzip'
+    assert zipped.getheader('Vary') == 'Accept-Encoding'
+    assert gzip.decompress(zbody) == body
+    assert zipped.getheader('ETag') != plain.getheader('ETag')
+
+    response, empty = get(conn, '/snake-game/game.js',
+                          **{'If-None-Match': plain.getheader('ETag')})
+    assert response.status == 304 and empty == b''
+    assert response.getheader('Cache-Control') == 'public, max-age=86400'
+
+    head, empty = get(conn, '/snake-game/game.js', method='HEAD')
+    assert head.status == 200 and empty == b''
+    assert head.getheader('Content-Length') == str(len(body))
+
+
+def test_changed_file_gets_new_etag(site):
+    root, server, connect = site
+    conn = connect()
+    first, _ = get(conn, '/index.html')
+    path = root / 'index.html'
+    path.write_text('<h1>changed hub</h1>')
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    second, body = get(conn, '/index.html', **{'If-None-Match': first.getheader('ETag')})
+    assert second.status == 200 and body == b'<h1>changed hub</h1>'
+    assert server.cache.misses == 2
+
+
+def test_large_files_use_sendfile_and_traversal_is_refused(site):
+    root, server, connect = site
+    conn = connect()
+    response, body = get(conn, '/snake-game/big.bin')
+    assert body == (root / 'snake-game' / 'big.bin').read_bytes()
+    assert server.sendfiles == 1
+    response, _ = get(conn, '/%2e%2e/%2e%2e/etc/passwd')
+    assert response.status == 404
+
+
+def raw_request(address, data, shutdown=False):
+    with socket.create_connection((address.host, address.port), timeout=5) as sock:
+        sock.sendall(data)
+        if shutdown:
+            sock.shutdown(socket.SHUT_WR)
+        reply = b''
+        while chunk := sock.recv(4096):
+            reply += chunk
+    return reply
+
+
+def test_bad_content_length_is_a_400_and_closes(site):
+    root, server, connect = site
+    for value in ('abc', '-5'):
+        reply = raw_request(connect(), f'GET / HTTP/1.1\r\nHost: x\r\n'
+                                       f'Content-Length: {value}\r\n\r\n'.encode())
+        assert reply.startswith(b'HTTP/1.1 400 ')
+    assert get(connect(), '/index.html')[0].status == 200
+
+
+def test_nul_in_path_is_a_404(site, caplog):
+    root, server, connect = site
+    response, _ = get(connect(), '/%00')
+    assert response.status == 404
+    assert get(connect(), '/index.html')[0].status == 200
+    assert not [r for r in caplog.records if r.levelname == 'ERROR']
+
+
+def test_short_body_closes_the_connection_quietly(site, caplog):
+    root, server, connect = site
+    reply = raw_request(connect(), b'POST / HTTP/1.1\r\nHost: x\r\nContent-Length: 10\r\n\r\n'
+                                   b'abc', shutdown=True)
+    assert reply == b''
+    assert get(connect(), '/index.html')[0].status == 200
+    assert not [r for r in caplog.records if r.levelname == 'ERROR']
+
+
+def test_worker_mode_falls_back_and_adds_csp(tmp_path):
+    (tmp_path / 'index.html').write_text('<h1>hub</h1>')
+    with running(tmp_path, worker=True) as (url, server):
+        conn = http.client.HTTPConnection(url.split('//')[1])
+        response, body = get(conn, '/favicon.ico')
+        assert response.status == 200 and body == b'<h1>hub</h1>'
+        assert 'Content-Security-Policy' in dict(response.getheaders())
+        assert response.getheader('X-XSS-Protection') == '1; mode=block'
@@ -0,0 +1,31 @@
+"""
+First-load size report and transfer budgets
+"""
+
+from tools.sizes import HUB, check_budgets, compressed_sizes, first_load
+
+
+def test_first_load_counts_local_assets_and_missing_files(tmp_path):
+    (tmp_path / 'g').mkdir()
+    (tmp_path / 'g' / 'index.html').write_text(
+        '<link rel="stylesheet" href="../style.css"><script src="game.js"></script>'
+        '<script src="https://cdn.example/lib.js"></script>')
+    (tmp_path / 'style.css').write_text('body { margin: 0 }' * 50)
+    weight = first_load(tmp_path, 'g')
+    assert [f.path for f in weight.files] == ['g/index.html', 'style.css']
+    assert weight.missing == ['g/game.js']
+    raw, gz, _ = compressed_sizes((tmp_path / 'style.css').read_bytes())
+    assert weight.files[1].raw == raw == 900 and weight.files[1].gzip == gz < raw
+
+
+def test_budgets_fail_on_overweight_or_incomplete_pages(tmp_path):
+    (tmp_path / 'index.html').write_text('x' * 1000)
+    hub = first_load(tmp_path, HUB)
+    budgets = {'metric': 'raw', 'default': 2000, 'pages': {'tight': 10}}
+    metric, rows = check_budgets([hub], budgets)
+    assert metric == 'raw' and rows == [(HUB, 1000, 2000, True)]
+
+    hub.page = 'tight'
+    assert check_budgets([hub], budgets)[1][0][3] is False
+    hub.page, hub.missing = HUB, ['game.js']
+    assert check_budgets([hub], budgets)[1][0][3] is False
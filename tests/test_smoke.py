@@ -0,0 +1,32 @@
+"""
+De-duplicating fetcher used by the smoke test
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tools.smoke import Fetcher
+
+
+def test_waiters_see_an_unexpected_download_error():
+    fetcher = Fetcher()
+    started, release = threading.Event(), threading.Event()
+
+    def download(url):
+        started.set()
+        release.wait()
+        raise RuntimeError('boom')
+
+    fetcher._download = download
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        owner = pool.submit(fetcher.fetch, 'http://x/')
+        started.wait()
+        waiter = pool.submit(fetcher.fetch, 'http://x/')
+        release.set()
+        for future in (owner, waiter):
+            with pytest.raises(RuntimeError):
+                future.result(timeout=5)
+    assert fetcher.results() == []
+    fetcher.close()
@@ -0,0 +1,66 @@
+"""
+Snake occupancy grid, free-cell set and the cycle bot
+"""
+
+import random
+import shutil
+
+import pytest
+
+from tools.snake import (
+    OccupancyGrid, by_fill, cycle_directions, hamiltonian_cycle, play_game, start_snake, verify,
+)
+
+needs_node = pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+
+
+@pytest.mark.parametrize('cols,rows', [(20, 20), (10, 11), (11, 10)])
+def test_hamiltonian_cycle_visits_every_cell_once(cols, rows):
+    nxt = hamiltonian_cycle(cols, rows)
+    cell, seen = 0, set()
+    for _ in range(cols * rows):
+        seen.add(cell)
+        after = nxt[cell]
+        assert abs(after % cols - cell % cols) + abs(after // cols - cell // cols) == 1
+        cell = after
+    assert cell == 0 and len(seen) == cols * rows
+    head, neck, _ = start_snake(cols, rows)
+    dx, dy = cycle_directions(cols, rows, head, neck)[head[1] * cols + head[0]]
+    assert (head[0] + dx, head[1] + dy) != neck
+
+
+def test_free_set_tracks_stacked_segments():
+    rng = random.Random(5)
+    grid = OccupancyGrid(7, 6)
+    cells = []
+    for _ in range(2000):
+        if cells and rng.random() < 0.45:
+            grid.release(*cells.pop(rng.randrange(len(cells))))
+        else:
+            # Segments may share a cell, as after a resize clamps the snake
+            cells.append((rng.randrange(7), rng.randrange(6)))
+            grid.occupy(*cells[-1])
+        occupied = set(cells)
+        free = {(c % 7, c // 7) for c in grid.free[:grid.free_count]}
+        assert free.isdisjoint(occupied) and len(free) + len(occupied) == 42
+        assert all(grid.is_occupied(x, y) for x, y in occupied)
+    assert grid.is_occupied(-1, 0) and grid.is_occupied(7, 0)
+    spot = grid.random_free(rng.random)
+    assert spot is None or spot not in set(cells)
+
+
+@pytest.mark.parametrize('index', ['scan', 'grid'])
+def test_bot_fills_the_board_with_either_index(index):
+    game, steps = play_game(10, 10, index, seed=2)
+    assert game.won and len(game.snake) >= 95
+    # Won on eating: the last food is under the head
+    assert game.food == game.snake[0]
+    rows = by_fill(game.spawns['length'], game.spawns['ns'], 100)
+    assert sum(r['calls'] for r in rows) == len(game.spawns['ns'])
+
+
+@needs_node
+def test_real_game_keeps_grid_in_step_with_the_snake():
+    ok, result = verify(12, 10, seed=4)
+    assert result['mismatches'] == 0 and result['food_on_snake'] == 0
+    assert result['won'] and ok
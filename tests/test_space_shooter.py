@@ -0,0 +1,84 @@
+"""
+Space shooter entity pools, bullet grid and the wave bot
+"""
+
+import json
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from tools.space_shooter import (
+    BROADPHASE_SOURCE, BULLET_H, BULLET_W, ENEMY_SIZE, HEIGHT, SHIP_SIZE, WIDTH, Entity,
+    EntityPool, UniformGrid, collide_grid, collide_naive, collides, run_node,
+)
+
+needs_node = pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+
+
+def dense_frame(rng, enemies, bullets):
+    out = [Entity(rng.uniform(-10, WIDTH), rng.uniform(-60, HEIGHT + 30), ENEMY_SIZE, ENEMY_SIZE,
+                  0, i) for i in range(enemies)]
+    out += [Entity(rng.uniform(-5, WIDTH), rng.uniform(-30, HEIGHT), BULLET_W, BULLET_H, 0,
+                   1000 + i) for i in range(bullets)]
+    return out[:enemies], out[enemies:]
+
+
+def copies(items):
+    return [Entity(e.x, e.y, e.w, e.h, e.s, e.id) for e in items]
+
+
+@pytest.mark.parametrize('min_bullets', [0, 16])
+def test_grid_pass_hits_what_the_nested_loop_hits(min_bullets):
+    rng = random.Random(7)
+    for _ in range(40):
+        enemies, bullets = dense_frame(rng, rng.randrange(300), rng.randrange(80))
+        ship = Entity(rng.uniform(0, WIDTH), HEIGHT - 80, SHIP_SIZE, SHIP_SIZE, 0, -1)
+        naive_enemies, naive_bullets = copies(enemies), copies(bullets)
+        naive = collide_naive(naive_enemies, naive_bullets, ship, HEIGHT)
+        enemy_pool, bullet_pool = EntityPool(1 << 20), EntityPool(1 << 20)
+        enemy_pool.items, bullet_pool.items = copies(enemies), copies(bullets)
+        grid = collide_grid(enemy_pool, bullet_pool, ship, HEIGHT, UniformGrid(), min_bullets)
+        assert sorted(grid[0]) == sorted(naive[0]) and sorted(grid[1]) == sorted(naive[1])
+        assert {e.id for e in enemy_pool.items} == {e.id for e in naive_enemies}
+        assert {b.id for b in bullet_pool.items} == {b.id for b in naive_bullets}
+
+
+@needs_node
+def test_js_grid_query_covers_every_overlap_once():
+    script = (
+        "const fs = require('fs');"
+        f"(0, eval)(fs.readFileSync({json.dumps(str(BROADPHASE_SOURCE))}, 'utf8') +"
+        " ';globalThis.EntityPool = EntityPool; globalThis.UniformGrid = UniformGrid;');"
+        "const input = JSON.parse(fs.readFileSync(0, 'utf8'));"
+        "const grid = new UniformGrid(64);"
+        "grid.build(input.bullets, 800, 600);"
+        "const found = input.enemies.map(e =>"
+        " Array.from(grid.found.subarray(0, grid.query(e.x, e.y, e.w, e.h))));"
+        "const pool = new EntityPool(3, () => ({ id: 0 }));"
+        "for (let i = 0; i < 4; i++) { const item = pool.acquire(); if (item) item.id = i; }"
+        "pool.release(0);"
+        "process.stdout.write(JSON.stringify({ found, ids: pool.items.map(p => p.id),"
+        " dropped: pool.dropped, spare: pool.spare.length }));")
+    rng = random.Random(3)
+    enemies, bullets = dense_frame(rng, 60, 120)
+    payload = {name: [{'x': e.x, 'y': e.y, 'w': e.w, 'h': e.h} for e in items]
+               for name, items in (('enemies', enemies), ('bullets', bullets))}
+    proc = subprocess.run(['node', '-e', script], input=json.dumps(payload), capture_output=True,
+                          text=True, check=True)
+    result = json.loads(proc.stdout)
+    for e, found in zip(enemies, result['found']):
+        assert len(found) == len(set(found))
+        overlapping = {j for j, b in enumerate(bullets) if collides(b, e)}
+        assert overlapping <= set(found)
+    # Swap-remove: the last item fills the hole, the fourth acquire was refused
+    assert result['ids'] == [2, 1] and result['dropped'] == 1 and result['spare'] == 1
+
+
+@needs_node
+def test_real_game_runs_waves_past_the_pool_caps():
+    waves = run_node([1, 40], cooldown=0.02, frames=400, seed=2)
+    low, high = (w['frames'] for w in waves)
+    assert max(high['enemies']) > 256 and max(low['bullets']) > 16
+    assert all(w['kills'] > 0 for w in waves)
@@ -0,0 +1,53 @@
+"""
+Tic-tac-toe move table and the perfect-play oracle
+"""
+
+import shutil
+
+import pytest
+
+from tools.tictactoe import (
+    EMPTY, O, TABLE_PATH, Oracle, check, generate, parse_table, reachable, to_move,
+)
+
+needs_node = pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+
+
+def test_oracle_solves_the_known_game():
+    oracle = Oracle(3)
+    assert len(reachable(3)) == 5478
+    assert oracle.outcome(EMPTY * 9) == 0
+    assert len(oracle.values) == 765
+    # minimax() scoring: O completes the top row now (10 - 0) rather than later
+    board = 'OO-XX-X--'
+    assert oracle.move_scores(board)[2] == 9 and oracle.best_moves(board) == [2]
+
+
+def test_shipped_table_is_current_and_optimal_after_unfolding():
+    oracle, table, source, _ = generate(3)
+    with open(TABLE_PATH, encoding='utf-8') as f:
+        shipped = f.read()
+    assert shipped == source, 'run python3 -m tools.tictactoe generate'
+    size, perms, moves = parse_table(shipped)
+    assert size == 3 and moves == table
+    # The client's lookup: smallest image, table cell mapped back through its permutation
+    for board in reachable(3):
+        if to_move(board) != O or oracle.terminal(board):
+            continue
+        images = [''.join(board[p] for p in perm) for perm in perms]
+        first = images.index(min(images))
+        cell = perms[first][moves[images[first]]]
+        assert cell in oracle.best_moves(board), board
+
+
+@needs_node
+def test_game_levels_against_the_oracle():
+    result = check(games=200, seed=2)
+    levels = result['levels']
+    assert all(r['illegal'] == 0 for r in levels.values())
+    assert levels['hard']['outcome_lost'] == 0 and levels['hard']['optimal'] == levels['hard']['positions']
+    # Medium: always takes a win and blocks a single threat, but can be forked
+    assert levels['medium']['missed_wins'] == 0 and levels['medium']['missed_blocks'] == 0
+    assert levels['medium']['outcome_lost'] > 0
+    assert result['games']['hard/perfect']['X'] == 0 and result['games']['hard/random']['X'] == 0
+    assert levels['hard']['think_max_us'] < levels['minimax']['think_max_us']
@@ -0,0 +1,74 @@
+"""
+worker.js routing emulator and its memoized resolution table
+"""
+
+import os
+
+import pytest
+
+from tools.worker_routing import (
+    CSP, RoutingTable, benchmark, disk_lookup, response_headers, route,
+)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / 'index.html').write_text('hub')
+    (tmp_path / '_headers').write_text('/*/index.html\n  Cache-Control: no-cache\n')
+    for path in ('snake-game/index.html', 'snake-game/game.js', 'snake-game/snake-game/x.js'):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(path)
+    return tmp_path
+
+
+def test_route_follows_the_worker_chain(tree):
+    exists = disk_lookup(tree)
+    assert route('/', exists).asset == '/index.html'
+    direct = route('/snake-game', exists)
+    assert (direct.asset, direct.step, direct.lookups) == ('/snake-game/index.html', 'direct', 1)
+    assert route('/snake-game/', exists).asset == '/snake-game/index.html'
+
+    # The slash-toggled retry resolves relative to the request URL
+    retry = route('/snake-game/x.js', exists)
+    assert (retry.asset, retry.step, retry.lookups) == ('/snake-game/snake-game/x.js', 'retry', 2)
+
+    fallback = route('/favicon.ico', exists)
+    assert (fallback.asset, fallback.step, fallback.lookups) == ('/index.html', 'fallback', 3)
+
+    os.remove(tree / 'index.html')
+    missing = route('/favicon.ico', exists)
+    assert (missing.asset, missing.step, missing.lookups) == (None, 'missing', 3)
+
+
+def test_response_headers_add_worker_headers_and_csp(tree):
+    status, headers = response_headers(tree, route('/snake-game/', disk_lookup(tree)))
+    headers = dict(headers)
+    assert status == 200
+    assert headers['Cache-Control'] == 'no-cache'
+    assert headers['X-XSS-Protection'] == '1; mode=block'
+    assert headers['Content-Security-Policy'] == CSP
+
+    status, headers = response_headers(tree, route('/snake-game/game.js', disk_lookup(tree)))
+    assert 'Content-Security-Policy' not in dict(headers)
+
+
+def test_table_matches_chain_and_rebuilds_on_change(tree):
+    table = RoutingTable(tree, check_interval=0)
+    exists = disk_lookup(tree)
+    for path in ('/', '/snake-game', '/snake-game/', '/snake-game/game.js',
+                 '/snake-game/x.js', '/nope', '/nope.png'):
+        assert table.resolve(path) == route(path, exists)
+
+    assert table.resolve('/new.js').step == 'fallback'
+    (tree / 'new.js').write_text('new')
+    os.utime(tree, ns=(0, os.stat(tree).st_mtime_ns + 10**9))
+    assert table.resolve('/new.js').step == 'direct'
+    assert table.rebuilds == 2
+
+
+def test_benchmark_counts_extra_lookups(tree):
+    result = benchmark(tree, ['/', '/snake-game/game.js', '/favicon.ico'], repeat=2)
+    assert result['requests'] == 6
+    assert result['steps'] == {'direct': 4, 'retry': 0, 'fallback': 2, 'missing': 0}
+    assert result['lookups'] == 10
+    assert result['extra_lookups'] == 4
@@ -195,7 +195,8 @@ class TicTacToeGame {
             this.isAiThinking = true;
             this.updateUI();
             this.announce(`玩家X在${row + 1}行${col + 1}列下子。AI正在思考...`);
-            setTimeout(() => this.aiMove(), 500);
+            // 困难模式查表即得，不再固定等待 500ms；下一帧再落子，让玩家的 X 先绘制出来
+            requestAnimationFrame(() => this.aiMove());
         }
     }
 
@@ -230,10 +231,7 @@ class TicTacToeGame {
             return;
         }
 
-        let move;
-        if (this.difficulty === 'hard') move = this.getBestMove();
-        else if (this.difficulty === 'medium') move = this.getStrategicMove();
-        else move = this.getRandomMove();
+        const move = this.chooseMove();
 
         if (move) {
             this.makeMove(move.r, move.c, 'O');
@@ -250,6 +248,13 @@ class TicTacToeGame {
         }
     }
 
+    // 按难度选出 AI 的落子（不修改棋盘）
+    chooseMove() {
+        if (this.difficulty === 'hard') return this.getBestMove();
+        if (this.difficulty === 'medium') return this.getStrategicMove();
+        return this.getRandomMove();
+    }
+
     getRandomMove() {
         const available = [];
         for(let r = 0; r < 3; r++) {
@@ -313,6 +318,10 @@ class TicTacToeGame {
             return { r: 1, c: 1 };
         }
 
+        const tableMove = this.lookupMove();
+        if (tableMove) return tableMove;
+
+        // 没有走法表（或局面不在表中）时退回完整搜索
         for(let r = 0; r < 3; r++) {
             for(let c = 0; c < 3; c++) {
                 if(this.board[r][c] === '') {
@@ -330,6 +339,49 @@ class TicTacToeGame {
         return move;
     }
 
+    /**
+     * 在预计算走法表（ai-moves.js，由 tools/tictactoe.py 生成）中查 O 的最佳落子。
+     * 表里只有对称约简后的代表局面：取棋盘 8 种对称像中字典序最小的一个查表，
+     * 再把表中的格子映射回当前棋盘。查不到时返回 null。
+     */
+    lookupMove() {
+        const table = TicTacToeGame.loadMoveTable();
+        if (!table) return null;
+
+        const cells = this.board.flat().map(cell => cell || '-');
+        let key = null;
+        let perm = null;
+        for (const candidate of table.symmetries) {
+            const image = candidate.map(i => cells[i]).join('');
+            if (key === null || image < key) {
+                key = image;
+                perm = candidate;
+            }
+        }
+
+        const cell = table.moves.get(key);
+        if (cell === undefined) return null;
+        const index = perm[cell];
+        return { r: Math.floor(index / 3), c: index % 3 };
+    }
+
+    // 首次使用时把打包的走法字符串展开为 Map；没有加载 ai-moves.js 时为 null
+    static loadMoveTable() {
+        if (TicTacToeGame.moveTable === undefined) {
+            TicTacToeGame.moveTable = null;
+            if (typeof TTT_MOVE_TABLE !== 'undefined' && TTT_MOVE_TABLE.size === 3) {
+                const width = 10;
+                const moves = new Map();
+                for (let i = 0; i < TTT_MOVE_TABLE.moves.length; i += width) {
+                    const entry = TTT_MOVE_TABLE.moves.slice(i, i + width);
+                    moves.set(entry.slice(0, 9), parseInt(entry[9], 36));
+                }
+                TicTacToeGame.moveTable = { symmetries: TTT_MOVE_TABLE.symmetries, moves };
+            }
+        }
+        return TicTacToeGame.moveTable;
+    }
+
     isBoardEmpty() {
         return this.board.every(row => row.every(cell => cell === ''));
     }
@@ -947,6 +999,9 @@ class TicTacToeGame {
     }
 }
 
+// 走法表在首次查表时加载；设为 null 可强制使用完整搜索
+TicTacToeGame.moveTable = undefined;
+
 // 添加屏幕阅读器专用样式
 const srOnlyStyle = document.createElement('style');
 srOnlyStyle.textContent = `
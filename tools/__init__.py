@@ -0,0 +1,6 @@
+"""
+Python QA, simulation and build tooling for the games collection.
+
+Run the command-line tools from the repository root, e.g.
+    python3 -m tools.smoke --base-url http://localhost:8888
+"""
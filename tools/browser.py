@@ -0,0 +1,90 @@
+"""
+Headless browser helpers shared by the in-page harnesses
+The production-like static server (tools.serve) for the repository or a
+built dist/ tree on an ephemeral port, a Playwright Chromium launcher, and readers for the GC
+trace events and heap sampling profiles Chrome returns. Playwright is only
+imported when a browser is actually launched.
+"""
+
+import contextlib
+import os
+
+from tools.serve import running
+from tools.site import ROOT
+
+# Set to a Chrome / Chromium binary to use it instead of Playwright's download
+CHROME_ENV = 'CHROME_PATH'
+
+
+@contextlib.contextmanager
+def serve(root=ROOT, port=0):
+    """Serve `root` on localhost in a background thread; yields the base URL"""
+    with running(root, port=port) as (url, _):
+        yield url
+
+
+@contextlib.contextmanager
+def base_url_or_serve(base_url=None, root=ROOT):
+    """Use `base_url` when given, otherwise serve `root` for the duration"""
+    if base_url:
+        yield base_url.rstrip('/')
+    else:
+        with serve(root) as url:
+            yield url
+
+
+@contextlib.contextmanager
+def chromium(executable=None, headless=True, args=()):
+    """Launch Chromium through Playwright; yields the Browser"""
+    from playwright.sync_api import sync_playwright
+
+    executable = executable or os.environ.get(CHROME_ENV) or None
+    with sync_playwright() as p:
+        browser = p.chromium.launch(executable_path=executable, headless=headless,
+                                    args=list(args))
+        try:
+            yield browser
+        finally:
+            browser.close()
+
+
+def add_browser_arguments(parser):
+    """--base-url / --chrome / --headed, shared by the browser harness CLIs"""
+    parser.add_argument('--base-url',
+                        help='site to test (default: serve the repository locally)')
+    parser.add_argument('--chrome', help=f'browser binary (default: ${CHROME_ENV} '
+                        'or the Playwright download)')
+    parser.add_argument('--headed', action='store_true', help='show the browser window')
+
+
+# Trace events V8 emits for each garbage collection on the main thread
+GC_EVENTS = ('MinorGC', 'MajorGC')
+GC_TRACE_CATEGORIES = ['devtools.timeline', 'v8', 'disabled-by-default-v8.gc']
+
+
+def gc_pauses(trace):
+    """Durations in ms of the GC events of a Chrome trace, by event name"""
+    events = trace['traceEvents'] if isinstance(trace, dict) else trace
+    pauses = {name: [] for name in GC_EVENTS}
+    for event in events:
+        if event.get('name') in pauses and event.get('ph') == 'X':
+            pauses[event['name']].append(event.get('dur', 0) / 1000)
+    return pauses
+
+
+def sampled_allocations(profile):
+    """
+    Flatten a HeapProfiler sampling profile into {(function, url, line):
+    bytes}, summing the self size of every node of the call tree.
+    """
+    sites = {}
+    stack = [profile['head']]
+    while stack:
+        node = stack.pop()
+        frame = node['callFrame']
+        if node.get('selfSize'):
+            key = (frame['functionName'] or '(anonymous)', frame['url'],
+                   frame['lineNumber'] + 1)
+            sites[key] = sites.get(key, 0) + node['selfSize']
+        stack.extend(node.get('children', ()))
+    return sites
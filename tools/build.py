@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Incremental, content-hashed site build
+Copies the hub files and every game in build.sh's GAMES into dist/ in
+parallel, skipping test files and screenshots like build.sh does. Sources
+whose size and mtime match the last build manifest are not even read;
+outputs whose content hash is unchanged are not rewritten.
+
+Every stylesheet, script and preloaded file an HTML page links gets a
+content-hashed copy next to it (style.css -> style.<hash>.css) and the page
+is rewritten to use it. The unhashed file stays in place for code that
+builds paths at runtime. The hub's hover prefetch reads the game pages'
+hashed assets from a map the build fills into index.html (#game-assets).
+Hashed copies are served with an immutable Cache-Control rule appended to
+dist/_headers.
+
+sw.js is written last: its precache list and version are filled in from
+the pages just written and the content hashes of what they link
+(tools.precache).
+
+With --minify, JS, CSS and HTML go through tools.minify first, and rules no
+page or script of a stylesheet can match are dropped. Minified outputs are
+cached by source and dependency hashes, so unchanged files are not redone.
+
+Usage:
+    python3 -m tools.build [--out dist] [--clean] [--minify] [--jobs 8]
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+from tools.cache import content_hash, default_cache
+from tools.minify import (
+    MINIFY_VERSION, MinifyError, minify_css, minify_html, minify_js, prune_css, used_names,
+)
+from tools.site import ASSET_LINK_RE, GAMES, ROOT
+
+MANIFEST_NAME = 'build-manifest.json'
+MANIFEST_VERSION = 1
+CORE_FILES = ['index.html', 'style.css', 'shared-styles.css', 'manifest.json',
+              '_headers', '_routes.json', 'worker.js', 'sw.js', 'sw-register.js']
+SERVICE_WORKER = 'sw.js'
+# build.sh's `find -delete` patterns, applied to game directories
+GAME_EXCLUDES = ['*test*.js', '*.png', 'test.html', '*-bench.*']
+HASHED_EXTENSIONS = ('.css', '.js')
+MINIFIED_EXTENSIONS = ('.css', '.js', '.html')
+HASH_LENGTH = 10
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Cloudflare ignores _headers rules past this count
+MAX_HEADER_RULES = 100
+
+_TAG_RE = re.compile(r'<(script|link)\b[^>]*>', re.IGNORECASE)
+_SRC_RE = re.compile(r'(\bsrc=")([^"]+)(")', re.IGNORECASE)
+_HREF_RE = re.compile(r'(\bhref=")([^"]+)(")', re.IGNORECASE)
+# The hub's prefetch map, {game folder: [hub-relative asset URLs]}
+_GAME_ASSETS_RE = re.compile(
+    r'(<script type="application/json" id="game-assets">)(.*?)(</script>)', re.DOTALL)
+
+
+def file_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hashed_name(rel, digest):
+    """snake-game/style.css -> snake-game/style.<hash>.css"""
+    stem, ext = posixpath.splitext(rel)
+    return f'{stem}.{digest[:HASH_LENGTH]}{ext}'
+
+
+def list_sources(root=ROOT, games=GAMES):
+    """Relative paths of every file the build publishes"""
+    sources = [name for name in CORE_FILES if os.path.isfile(os.path.join(root, name))]
+    for game in games:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, game)):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+            rel_dir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+            for name in sorted(filenames):
+                if name.startswith('.') or any(fnmatch.fnmatch(name, p) for p in GAME_EXCLUDES):
+                    continue
+                sources.append(f'{rel_dir}/{name}')
+    return sources
+
+
+def linked_assets(html):
+    """(match span, ref) of every script src and stylesheet / preload href of a page"""
+    for tag in _TAG_RE.finditer(html):
+        text = tag.group(0)
+        if tag.group(1).lower() == 'script':
+            attr = _SRC_RE.search(text)
+        elif ASSET_LINK_RE.search(text):
+            attr = _HREF_RE.search(text)
+        else:
+            continue
+        if attr:
+            yield tag.start() + attr.start(2), tag.start() + attr.end(2), attr.group(2)
+
+
+def resolve_ref(page, ref):
+    """Output path a page-relative reference points at, or None when not local"""
+    if ref.startswith(('http://', 'https://', '//', 'data:', '#')):
+        return None
+    path = ref.split('?', 1)[0].split('#', 1)[0]
+    base = '' if path.startswith('/') else posixpath.dirname(page)
+    resolved = posixpath.normpath(posixpath.join(base, path.lstrip('/')))
+    return None if resolved.startswith('..') else resolved
+
+
+def hashed_ref(page, ref, hashed):
+    """`ref` pointed at its target's hashed copy, query kept; None when it has none"""
+    target = resolve_ref(page, ref)
+    if target not in hashed:
+        return None
+    path, sep, rest = ref.partition('?')
+    return posixpath.join(posixpath.dirname(path), posixpath.basename(hashed[target])) + sep + rest
+
+
+def rewrite_html(html, page, hashed):
+    """Point a page's stylesheets, scripts and preloads at their hashed copies"""
+    pieces, last = [], 0
+    for start, end, ref in linked_assets(html):
+        new = hashed_ref(page, ref, hashed)
+        if new is not None:
+            pieces += [html[last:start], new]
+            last = end
+    pieces.append(html[last:])
+    return ''.join(pieces)
+
+
+def game_assets(pages, games, hashed):
+    """{game: [URLs, relative to the hub, of the local assets its page links]}, as the
+    rewritten page requests them"""
+    out = {}
+    for game in games:
+        page = f'{game}/index.html'
+        if page not in pages:
+            continue
+        urls = []
+        for _, _, ref in linked_assets(pages[page].decode('utf-8')):
+            if resolve_ref(page, ref) is None:
+                continue
+            ref = hashed_ref(page, ref, hashed) or ref
+            url = ref if ref.startswith('/') else './' + posixpath.normpath(
+                posixpath.join(game, ref))
+            if url not in urls:
+                urls.append(url)
+        out[game] = urls
+    return out
+
+
+def fill_game_assets(html, assets):
+    """The hub with its #game-assets map filled in"""
+    return _GAME_ASSETS_RE.sub(
+        lambda m: m.group(1) + json.dumps(assets, separators=(',', ':')) + m.group(3),
+        html, count=1)
+
+
+def headers_block(hashed):
+    """_headers rules giving every hashed asset an immutable Cache-Control"""
+    lines = ['', '# 哈希资源（构建生成，内容不变可永久缓存）']
+    for path in sorted(hashed.values()):
+        lines += [f'/{path}', f'  Cache-Control: {IMMUTABLE}']
+    return '\n'.join(lines) + '\n'
+
+
+@dataclass
+class BuildResult:
+    written: list = field(default_factory=list)
+    unchanged: int = 0
+    read: int = 0
+    removed: list = field(default_factory=list)
+    hashed: dict = field(default_factory=dict)
+    warnings: list = field(default_factory=list)
+    seconds: float = 0.0
+    full: bool = False
+
+
+class Builder:
+    def __init__(self, root=ROOT, out=None, games=GAMES, jobs=None, minify=False, cache=None):
+        self.root = str(root)
+        self.out = str(out or os.path.join(self.root, 'dist'))
+        self.games = list(games)
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) * 4)
+        self.manifest_path = os.path.join(self.out, MANIFEST_NAME)
+        self.minify = minify
+        # Minified outputs keyed by transform key, shared between builds and checkouts
+        self.cache = cache
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+    def read(self, rel):
+        with open(os.path.join(self.root, rel), 'rb') as f:
+            return f.read()
+
+    def source_hash(self, rel, previous):
+        """(hash, stat, data) of a source; data is None when the manifest's hash was trusted"""
+        stat = os.stat(os.path.join(self.root, rel))
+        entry = previous.get(rel)
+        if entry and entry['source_size'] == stat.st_size and \
+                entry['source_mtime_ns'] == stat.st_mtime_ns:
+            return entry['source_hash'], stat, None
+        data = self.read(rel)
+        return file_hash(data), stat, data
+
+    def emit(self, rel, data, digest, previous):
+        """Write an output unless the last build already wrote this content"""
+        path = os.path.join(self.out, rel)
+        entry = previous.get(rel)
+        if entry and entry['hash'] == digest and os.path.exists(path) and \
+                os.path.getsize(path) == entry['size']:
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return True
+
+    def css_dependencies(self, rel, sources, page_refs):
+        """Pages linking a stylesheet, their directories' scripts and pages, and linked scripts"""
+        deps = set()
+        for page, refs in page_refs.items():
+            if rel not in refs:
+                continue
+            directory = posixpath.dirname(page)
+            deps.add(page)
+            deps.update(s for s in sources if posixpath.dirname(s) == directory
+                        and s.endswith(('.html', '.js')))
+            deps.update(r for r in refs if r in sources and r.endswith('.js'))
+        return sorted(deps)
+
+    def transform_key(self, rel, source_digest, deps=(), hashes=None):
+        """Identifies the minified output of a source; None when it is copied as-is"""
+        ext = posixpath.splitext(rel)[1]
+        if not self.minify or ext not in MINIFIED_EXTENSIONS:
+            return None
+        return content_hash(MINIFY_VERSION, ext, source_digest,
+                            *(f'{d}:{hashes[d]}' for d in deps))
+
+    def transform(self, rel, data, key, deps=(), texts=None, warnings=None):
+        if key is None:
+            return data
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            return cached
+        text = data.decode('utf-8')
+        try:
+            if rel.endswith('.js'):
+                text = minify_js(text)
+            elif rel.endswith('.css'):
+                if deps:
+                    text, _ = prune_css(text, *used_names(texts(d) for d in deps))
+                text = minify_css(text)
+            else:
+                text = minify_html(text)
+        except MinifyError as e:
+            warnings.append(f'{rel}: not minified ({e})')
+            return data
+        output = text.encode('utf-8')
+        if self.cache is not None:
+            self.cache.put(key, output)
+        return output
+
+    def build(self, clean=False):
+        start = time.perf_counter()
+        manifest = None if clean else self.load_manifest()
+        result = BuildResult(full=manifest is None)
+        if manifest is None and os.path.isdir(self.out):
+            shutil.rmtree(self.out)
+        os.makedirs(self.out, exist_ok=True)
+        previous = (manifest or {}).get('files', {})
+
+        sources = list_sources(self.root, self.games)
+        pages = {rel: self.read(rel) for rel in sources if rel.endswith('.html')}
+        page_refs = {page: {resolve_ref(page, ref)
+                            for _, _, ref in linked_assets(data.decode('utf-8'))}
+                     for page, data in pages.items()}
+        linked = set().union(*page_refs.values())
+        plain = [rel for rel in sources
+                 if rel not in pages and rel not in ('_headers', SERVICE_WORKER)]
+        rendered = list(pages) + (['_headers'] if '_headers' in sources else [])
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            info = dict(zip(plain, pool.map(lambda rel: self.source_hash(rel, previous), plain)))
+        hashes = {rel: digest for rel, (digest, _, _) in info.items()}
+        hashes.update((page, file_hash(data)) for page, data in pages.items())
+        if SERVICE_WORKER in sources:
+            hashes[SERVICE_WORKER] = file_hash(self.read(SERVICE_WORKER))
+        source_set = set(sources)
+        deps = {rel: self.css_dependencies(rel, source_set, page_refs)
+                for rel in plain if rel.endswith('.css')}
+
+        def text(rel):
+            return (pages.get(rel) or self.read(rel)).decode('utf-8', errors='replace')
+
+        def record(rel, stat, source_digest, digest, size, key):
+            entry = {'source': rel, 'source_size': stat.st_size,
+                     'source_mtime_ns': stat.st_mtime_ns, 'source_hash': source_digest,
+                     'hash': digest, 'size': size}
+            if key:
+                entry['transform'] = key
+            return entry
+
+        def copy(rel):
+            digest, stat, data = info[rel]
+            rel_deps = deps.get(rel, ())
+            key = self.transform_key(rel, digest, rel_deps, hashes)
+            warnings = []
+            entry = previous.get(rel)
+            output = None
+            if entry and entry['source_hash'] == digest and entry.get('transform') == key:
+                out_digest, size = entry['hash'], entry['size']
+            else:
+                data = data if data is not None else self.read(rel)
+                output = self.transform(rel, data, key, rel_deps, text, warnings)
+                out_digest, size = file_hash(output), len(output)
+            outputs = {rel: record(rel, stat, digest, out_digest, size, key)}
+            if rel in linked and rel.endswith(HASHED_EXTENSIONS):
+                outputs[hashed_name(rel, out_digest)] = dict(outputs[rel], immutable=True)
+            written = []
+            for name in outputs:
+                existing = previous.get(name)
+                path = os.path.join(self.out, name)
+                if existing and existing['hash'] == out_digest and os.path.exists(path) and \
+                        os.path.getsize(path) == size:
+                    continue
+                if output is None:
+                    data = data if data is not None else self.read(rel)
+                    output = self.transform(rel, data, key, rel_deps, text, warnings)
+                self.emit(name, output, out_digest, {})
+                written.append(name)
+            return outputs, written, data is not None, warnings
+
+        def render(rel):
+            data = pages.get(rel) or self.read(rel)
+            stat = os.stat(os.path.join(self.root, rel))
+            key, warnings = None, []
+            if rel.endswith('.html'):
+                html = rewrite_html(data.decode('utf-8'), rel, result.hashed)
+                if rel == 'index.html':
+                    html = fill_game_assets(html, game_assets(pages, self.games, result.hashed))
+                data = html.encode('utf-8')
+                key = self.transform_key(rel, file_hash(data))
+                data = self.transform(rel, data, key, warnings=warnings)
+            else:
+                data += headers_block(result.hashed).encode('utf-8')
+            digest = file_hash(data)
+            written = [rel] if self.emit(rel, data, digest, previous) else []
+            return ({rel: record(rel, stat, hashes[rel] if rel in hashes else digest,
+                                 digest, len(data), key)}, written, True, warnings)
+
+        def render_worker(rel):
+            from tools.precache import precache_entries, precache_version, render_service_worker
+
+            template = self.read(rel)
+            entries = precache_entries(self.out, files, self.games)
+            data = render_service_worker(template.decode('utf-8'), precache_version(entries),
+                                         entries).encode('utf-8')
+            stat = os.stat(os.path.join(self.root, rel))
+            key, warnings = self.transform_key(rel, file_hash(data)), []
+            data = self.transform(rel, data, key, warnings=warnings)
+            digest = file_hash(data)
+            written = [rel] if self.emit(rel, data, digest, previous) else []
+            return ({rel: record(rel, stat, file_hash(template), digest, len(data), key)},
+                    written, True, warnings)
+
+        # Phase 1 copies (and minifies) everything else in parallel; phase 2
+        # renders the pages and _headers, which depend on the hashed names;
+        # phase 3 fills the service worker's precache list in from the pages
+        files = {}
+        worker = [SERVICE_WORKER] if SERVICE_WORKER in sources else []
+        for phase, jobs in ((copy, plain), (render, rendered), (render_worker, worker)):
+            with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                for outputs, written, read, warnings in pool.map(phase, jobs):
+                    files.update(outputs)
+                    result.written += written
+                    result.unchanged += len(outputs) - len(written)
+                    result.read += read
+                    result.warnings += warnings
+                    result.hashed.update((entry['source'], name)
+                                         for name, entry in outputs.items()
+                                         if entry.get('immutable'))
+
+        # Outputs of the last build that this one no longer produces
+        for rel in sorted(set(previous) - set(files)):
+            path = os.path.join(self.out, rel)
+            if os.path.exists(path):
+                os.remove(path)
+            result.removed.append(rel)
+        self.prune_empty_dirs()
+
+        self.write_manifest(files, result.hashed)
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def prune_empty_dirs(self):
+        for dirpath, dirnames, filenames in os.walk(self.out, topdown=False):
+            if dirpath != self.out and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+    def write_manifest(self, files, hashed):
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'games': self.games,
+            'assets': dict(sorted(hashed.items())),
+            'files': dict(sorted(files.items())),
+        }
+        temp = self.manifest_path + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp, self.manifest_path)
+
+
+def count_header_rules(path):
+    with open(path, encoding='utf-8') as f:
+        return sum(1 for line in f if line.strip() and not line[0].isspace()
+                   and not line.startswith('#'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--out', default=str(ROOT / 'dist'))
+    parser.add_argument('--clean', action='store_true', help='ignore the manifest and rebuild')
+    parser.add_argument('--jobs', type=int, help='copy threads (default: 4 per CPU)')
+    parser.add_argument('--minify', action='store_true',
+                        help='minify JS / CSS / HTML and drop unused CSS rules')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='do not reuse minified outputs from the cache')
+    parser.add_argument('--json', help='also write the build result to this JSON file')
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache or not args.minify else default_cache('minify')
+    builder = Builder(ROOT, args.out, jobs=args.jobs, minify=args.minify, cache=cache)
+    result = builder.build(clean=args.clean)
+
+    kind = 'Full' if result.full else 'Incremental'
+    print(f"{kind} build: {len(result.written)} written, {result.unchanged} unchanged, "
+          f"{len(result.removed)} removed, {result.read} sources read, "
+          f"{len(result.hashed)} hashed assets in {result.seconds * 1000:.0f} ms")
+    for rel in result.written:
+        print(f"  → {rel}")
+    for rel in result.removed:
+        print(f"  ✗ {rel}")
+    for warning in result.warnings:
+        print(f"⚠️  {warning}")
+
+    headers = os.path.join(builder.out, '_headers')
+    if os.path.exists(headers) and count_header_rules(headers) > MAX_HEADER_RULES:
+        print(f"⚠️  {headers} has more than {MAX_HEADER_RULES} rules; "
+              "Cloudflare ignores the rest")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(asdict(result), f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Persistent content-addressed result cache
+A small SQLite table of key -> blob with a total size cap and
+least-recently-used eviction. Keys are built from content hashes, so an
+entry never goes stale: editing a file or a rule set simply produces a
+different key, and the old entry ages out.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from tools.site import ROOT
+
+# Overrides the cache directory; set to an empty string to disable caching
+CACHE_ENV = 'GAMES_CACHE_DIR'
+DEFAULT_DIR = ROOT / '.cache'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def content_hash(*parts):
+    """sha256 over str / bytes parts, each length-prefixed so joins cannot collide"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Safe to share between threads; calls are serialized on one connection"""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            ' key TEXT PRIMARY KEY, value BLOB NOT NULL,'
+            ' size INTEGER NOT NULL, used REAL NOT NULL)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS results_used ON results (used)')
+        self.db.commit()
+
+    def get(self, key):
+        with self.lock:
+            row = self.db.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.db.execute('UPDATE results SET used = ? WHERE key = ?', (time.time(), key))
+            self.db.commit()
+            return row[0]
+
+    def put(self, key, value):
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                            (key, value, len(value), time.time()))
+            self._evict()
+            self.db.commit()
+
+    def _evict(self):
+        total = self._size()
+        if total <= self.max_bytes:
+            return
+        # Oldest first until the table fits again
+        for key, size in self.db.execute(
+                'SELECT key, size FROM results ORDER BY used ASC').fetchall():
+            if total <= self.max_bytes:
+                break
+            self.db.execute('DELETE FROM results WHERE key = ?', (key,))
+            total -= size
+
+    def _size(self):
+        return self.db.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+
+    def size(self):
+        with self.lock:
+            return self._size()
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def clear(self):
+        with self.lock:
+            self.db.execute('DELETE FROM results')
+            self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+def default_cache(name, max_bytes=DEFAULT_MAX_BYTES):
+    """The shared cache file `name`.sqlite, or None when caching is disabled"""
+    directory = os.environ.get(CACHE_ENV, str(DEFAULT_DIR))
+    if not directory:
+        return None
+    return ResultCache(os.path.join(directory, f'{name}.sqlite'), max_bytes)
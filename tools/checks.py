@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Single-pass static check engine
+Every rule of a rule set is reduced to a literal anchor - the rule text for
+literal rules, the literal prefix for regex rules - and all anchors are
+compiled into one trie-shaped alternation. A single scan over the source
+finds every anchor occurrence (overlaps included); regex rules are then only
+verified at the positions where their anchor occurred.
+
+Reports can be kept in a persistent cache keyed by the hash of the scanned
+text and of the rule set, so unchanged files are not scanned again.
+
+Usage:
+    python3 -m tools.checks rules.json [--games snake-game minesweeper] [--no-cache]
+
+where rules.json is a list of {"name", "pattern", "regex"?, "flags"?} objects.
+"""
+
+import argparse
+import bisect
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+
+try:
+    import re._parser as sre_parse
+    from re._constants import LITERAL
+except ImportError:  # Python < 3.11
+    import sre_parse
+    from sre_constants import LITERAL
+
+from tools.cache import content_hash, default_cache
+from tools.site import GAMES, ROOT
+
+# Anchors shorter than this match too often to be worth verifying from
+MIN_ANCHOR = 2
+# Part of every cache key; bump when the meaning of a report changes
+ENGINE_VERSION = 2
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    pattern: str
+    regex: bool = False
+    flags: int = 0
+
+
+def literal(name, text):
+    """Rule that matches when `text` occurs verbatim (the old `in` checks)"""
+    return Rule(name, text)
+
+
+def regex(name, pattern, flags=0):
+    """Rule that matches `pattern` (the old re.search checks)"""
+    return Rule(name, pattern, regex=True, flags=flags)
+
+
+@dataclass
+class Hit:
+    rule: str
+    start: int
+    end: int
+    line: int
+    text: str
+    groups: tuple = ()
+
+    def group(self, index=0):
+        return self.text if index == 0 else self.groups[index - 1]
+
+
+@dataclass
+class Report:
+    hits: dict = field(default_factory=dict)
+    elapsed: float = 0.0
+    cached: bool = False
+
+    def found(self, name):
+        return bool(self.hits.get(name))
+
+    def first(self, name):
+        hits = self.hits.get(name)
+        return hits[0] if hits else None
+
+    def count(self, name):
+        return len(self.hits.get(name, ()))
+
+    def to_json(self):
+        return json.dumps({name: [[h.start, h.end, h.line, h.text, list(h.groups)]
+                                  for h in hits]
+                           for name, hits in self.hits.items()})
+
+    @classmethod
+    def from_json(cls, data, elapsed=0.0):
+        hits = {name: [Hit(name, start, end, line, text, tuple(groups))
+                       for start, end, line, text, groups in rows]
+                for name, rows in json.loads(data).items()}
+        return cls(hits, elapsed, cached=True)
+
+
+def regex_prefix(pattern, flags=0):
+    """Longest literal string every match of `pattern` must start with"""
+    parsed = sre_parse.parse(pattern, flags)
+    # Inline flags such as (?i) end up in the parsed state, not in `flags`
+    if parsed.state.flags & (re.IGNORECASE | re.VERBOSE):
+        return ''
+    chars = []
+    for op, av in parsed:
+        if op is not LITERAL:
+            break
+        chars.append(chr(av))
+    return ''.join(chars)
+
+
+def _build_trie(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = None
+    return trie
+
+
+def _trie_regex(trie):
+    """Regex matching the longest word of `trie` at a position"""
+    def build(node):
+        terminal = '' in node
+        branches = [re.escape(ch) + build(child)
+                    for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            # Greedy optional: the longer continuation is tried first
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+def _prefix_words(trie, word):
+    """All words of `trie` that are prefixes of `word` (including itself)"""
+    found = []
+    node = trie
+    for i, ch in enumerate(word, 1):
+        node = node[ch]
+        if '' in node:
+            found.append(word[:i])
+    return found
+
+
+class CheckEngine:
+    def __init__(self, rules):
+        self.rules = list(rules)
+        names = [r.name for r in self.rules]
+        if len(names) != len(set(names)):
+            raise ValueError('rule names must be unique')
+
+        # anchor -> [(rule, compiled regex or None)]
+        self._by_anchor = {}
+        # Rules without a usable anchor; each costs its own scan
+        self._unanchored = []
+
+        for rule in self.rules:
+            compiled = re.compile(rule.pattern, rule.flags) if rule.regex else None
+            anchor = regex_prefix(rule.pattern, rule.flags) if rule.regex else rule.pattern
+            if len(anchor) < MIN_ANCHOR:
+                self._unanchored.append((rule, compiled or re.compile(re.escape(rule.pattern))))
+            else:
+                self._by_anchor.setdefault(anchor, []).append((rule, compiled))
+
+        trie = _build_trie(self._by_anchor)
+        # The scan reports the longest anchor starting at a position; every
+        # shorter anchor that is a prefix of it matched there as well.
+        self._implied = {a: _prefix_words(trie, a) for a in self._by_anchor}
+        self._scanner = (
+            re.compile('(?=(' + _trie_regex(trie) + '))') if trie else None
+        )
+        self.fingerprint = content_hash(str(ENGINE_VERSION), *(
+            f'{r.name}\0{r.pattern}\0{int(r.regex)}\0{r.flags}' for r in self.rules))
+
+    def scan(self, text, cache=None):
+        """Report for `text`; taken from / stored in `cache` when one is given"""
+        if cache is None:
+            return self._scan(text)
+        start_time = time.perf_counter()
+        key = content_hash(self.fingerprint, text)
+        data = cache.get(key)
+        if data is not None:
+            return Report.from_json(data, time.perf_counter() - start_time)
+        report = self._scan(text)
+        cache.put(key, report.to_json())
+        return report
+
+    def _scan(self, text):
+        start_time = time.perf_counter()
+        line_starts = [0] + [m.end() for m in re.finditer('\n', text)]
+        hits = {rule.name: [] for rule in self.rules}
+
+        def add(rule, match):
+            start = match.start()
+            hits[rule.name].append(Hit(
+                rule.name, start, match.end(),
+                bisect.bisect_right(line_starts, start),
+                match.group(0), match.groups(),
+            ))
+
+        if self._scanner:
+            # End of each rule's last match: like re.finditer, matches of one
+            # rule never overlap
+            ends = {}
+            for m in self._scanner.finditer(text):
+                pos = m.start()
+                for anchor in self._implied[m.group(1)]:
+                    for rule, compiled in self._by_anchor[anchor]:
+                        if pos < ends.get(rule.name, 0):
+                            continue
+                        if compiled is None:
+                            ends[rule.name] = pos + len(anchor)
+                            hits[rule.name].append(Hit(
+                                rule.name, pos, pos + len(anchor),
+                                bisect.bisect_right(line_starts, pos), anchor,
+                            ))
+                        else:
+                            match = compiled.match(text, pos)
+                            if match:
+                                ends[rule.name] = match.end()
+                                add(rule, match)
+
+        for rule, compiled in self._unanchored:
+            for match in compiled.finditer(text):
+                add(rule, match)
+
+        return Report(hits, time.perf_counter() - start_time)
+
+
+def load_rules(path):
+    with open(path, encoding='utf-8') as f:
+        return [Rule(r['name'], r['pattern'], r.get('regex', False), r.get('flags', 0))
+                for r in json.load(f)]
+
+
+def game_sources(games=GAMES):
+    """Every non-test JS file of the given games"""
+    for game in games:
+        for path in sorted((ROOT / game).glob('*.js')):
+            if 'test' not in path.name:
+                yield path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('rules', help='JSON rule file')
+    parser.add_argument('--games', nargs='*', default=GAMES)
+    parser.add_argument('--no-cache', action='store_true',
+                        help='scan every file even if a cached report exists')
+    parser.add_argument('--cache-size', type=float, default=64, help='cache cap in MB')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    engine = CheckEngine(load_rules(args.rules))
+    compiled = time.perf_counter() - start
+    cache = None if args.no_cache else default_cache('checks', int(args.cache_size * 2**20))
+
+    total = 0
+    for path in game_sources(args.games):
+        report = engine.scan(path.read_text(encoding='utf-8'), cache)
+        matched = sum(1 for hits in report.hits.values() if hits)
+        total += report.elapsed
+        print(f"  {path.relative_to(ROOT)!s:40s} {matched:5d}/{len(engine.rules)} rules "
+              f"{report.elapsed * 1000:7.1f} ms{' (cached)' if report.cached else ''}")
+
+    print(f"\n  {len(engine.rules)} rules compiled in {compiled * 1000:.1f} ms, "
+          f"scanned in {total * 1000:.1f} ms")
+    if cache:
+        print(f"  cache: {cache.hits} hits, {cache.misses} misses, "
+              f"{len(cache)} entries, {cache.size() / 2**20:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,605 @@
+#!/usr/bin/env python3
+"""
+Headless fruit-2048 engine, expectimax player and rule checker
+The 4x4 board is one 64-bit integer, one nibble per cell holding the fruit
+level (0 = empty, 1 = apple ... 10 = peach); cell (r, c) is nibble 4*r + c.
+Moves are table lookups: every 16-bit row has its left/right result, merge
+points and merge count precomputed, and up/down go through a transpose.
+
+The rules follow FruitGame in fruit-2048/game.js:
+  - a merge of two level-L fruits gives level min(L + 1, 10) and scores that
+    fruit's score (so two peaches merge into a peach worth 1024);
+  - every valid move with merges extends the combo, and from combo 2 on adds
+    floor(merge points * 0.5 * combo); a valid move without merges resets it.
+    The game also ends a combo after 2 s without merges; the headless player
+    is assumed to move faster than that;
+  - after a valid move the previewed fruit lands on a random empty cell and a
+    new preview is drawn from the spawn weights (apple / orange, 50/50).
+
+`verify` runs the real FruitGame.move and checkState from game.js under
+Node on random boards and compares them with the engine.
+
+Usage:
+    python3 -m tools.fruit2048 bench [--games 1000] [--depth 1] [--policy expectimax] \
+        [--spawn 0.5,0.5] [--max-moves 5000] [--workers N] [--seed 1] [--json out.json]
+    python3 -m tools.fruit2048 verify [--boards 2000] [--seed 1]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+
+import numpy as np
+
+from tools.site import ROOT
+
+GAME_SOURCE = ROOT / 'fruit-2048' / 'game.js'
+
+SIZE = 4
+MAX_LEVEL = 10
+DIRECTIONS = ('up', 'down', 'left', 'right')
+SPAWN_WEIGHTS = (0.5, 0.5)  # getRandomBasicFruit: apple or orange
+ROW_MASK = 0xFFFF
+
+# Heuristic weights for the expectimax leaf evaluation (per row and column)
+LOST_PENALTY = 200000.0
+EMPTY_WEIGHT = 270.0
+MERGE_WEIGHT = 700.0
+MONOTONICITY_POWER = 4.0
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+# Chance branches less likely than this are evaluated, not searched
+MIN_PROBABILITY = 1e-4
+
+
+def fruit_scores(path=GAME_SOURCE):
+    """Score of every fruit level, read from the fruits table in game.js"""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    scores = {int(level): int(score) for level, score in
+              re.findall(r'\{\s*level:\s*(\d+),[^}]*?score:\s*(\d+)', source)}
+    return tuple(scores[level] for level in range(1, MAX_LEVEL + 1))
+
+
+# Scores as shipped; fruit_scores() re-reads them from game.js for verification
+SCORES = tuple(2 ** level for level in range(1, MAX_LEVEL + 1))
+
+
+def _row_cells(row):
+    return [(row >> (4 * i)) & 0xF for i in range(SIZE)]
+
+
+def _cells_row(cells):
+    row = 0
+    for i, level in enumerate(cells):
+        row |= level << (4 * i)
+    return row
+
+
+def _reverse_row(row):
+    return _cells_row(_row_cells(row)[::-1])
+
+
+def _slide_left(cells, scores):
+    """The merge loop of FruitGame.move for one row; (cells, points, merges)"""
+    row = [level for level in cells if level]
+    out, points, merges = [], 0, 0
+    while row:
+        if len(row) >= 2 and row[0] == row[1]:
+            level = min(row[0] + 1, MAX_LEVEL)
+            del row[:2]
+            out.append(level)
+            points += scores[level - 1]
+            merges += 1
+        else:
+            out.append(row.pop(0))
+    return out + [0] * (SIZE - len(out)), points, merges
+
+
+def _heuristic(cells):
+    empty = cells.count(0)
+    merges, previous, counter = 0, 0, 0
+    for level in cells:
+        if not level:
+            continue
+        if level == previous:
+            counter += 1
+        elif counter:
+            merges += 1 + counter
+            counter = 0
+        previous = level
+    if counter:
+        merges += 1 + counter
+    left = right = 0.0
+    for a, b in zip(cells, cells[1:]):
+        if a > b:
+            left += a ** MONOTONICITY_POWER - b ** MONOTONICITY_POWER
+        else:
+            right += b ** MONOTONICITY_POWER - a ** MONOTONICITY_POWER
+    return (LOST_PENALTY + EMPTY_WEIGHT * empty + MERGE_WEIGHT * merges
+            - MONOTONICITY_WEIGHT * min(left, right)
+            - SUM_WEIGHT * sum(level ** SUM_POWER for level in cells))
+
+
+@dataclass(frozen=True)
+class Tables:
+    left: list
+    right: list
+    points: list
+    merges: list
+    heuristic: list
+
+
+@lru_cache(maxsize=None)
+def tables(scores=SCORES):
+    """Move, score and heuristic lookup tables for all 65536 rows"""
+    n = 1 << 16
+    left, right = [0] * n, [0] * n
+    points, merges, heuristic = [0] * n, [0] * n, [0.0] * n
+    for row in range(n):
+        cells = _row_cells(row)
+        moved, points[row], merges[row] = _slide_left(cells, scores)
+        left[row] = _cells_row(moved)
+        heuristic[row] = _heuristic(cells)
+    for row in range(n):
+        # Sliding right is sliding the mirrored row left; points are symmetric
+        right[row] = _reverse_row(left[_reverse_row(row)])
+    return Tables(left, right, points, merges, heuristic)
+
+
+def transpose(board):
+    """Swap cell (r, c) with (c, r)"""
+    a = board & 0xF0000F0000F0000F
+    b = ((board & 0x0000F0000F0000F0) << 12) | ((board & 0x0F0000F0000F0000) >> 12)
+    c = ((board & 0x00000000F0000F00) << 24) | ((board & 0x00F0000F00000000) >> 24)
+    d = ((board & 0x000000000000F000) << 36) | ((board & 0x000F000000000000) >> 36)
+    return a | b | c | d
+
+
+def _rows_move(board, table, t):
+    out = points = merges = 0
+    for shift in (0, 16, 32, 48):
+        row = (board >> shift) & ROW_MASK
+        out |= table[row] << shift
+        points += t.points[row]
+        merges += t.merges[row]
+    return out, points, merges
+
+
+def move(board, direction, t=None):
+    """(board, merge points, merge count) after sliding in `direction`"""
+    t = t or tables()
+    if direction == 'left':
+        return _rows_move(board, t.left, t)
+    if direction == 'right':
+        return _rows_move(board, t.right, t)
+    out, points, merges = _rows_move(transpose(board),
+                                     t.left if direction == 'up' else t.right, t)
+    return transpose(out), points, merges
+
+
+def combo_score(points, merges, combo):
+    """(score gained, combo) for a valid move with these merges"""
+    if not merges:
+        return 0, 0
+    combo += 1
+    return points + (points * combo // 2 if combo >= 2 else 0), combo
+
+
+def play_move(board, direction, combo, t=None):
+    """
+    One FruitGame.move without the spawn: (board, score gained, combo).
+    An invalid move returns the board unchanged and leaves the combo alone.
+    """
+    new, points, merges = move(board, direction, t)
+    if new == board:
+        return board, 0, combo
+    return (new,) + combo_score(points, merges, combo)
+
+
+def empty_cells(board):
+    return [i for i in range(SIZE * SIZE) if not (board >> (4 * i)) & 0xF]
+
+
+def can_move(board):
+    """FruitGame.checkState: an empty cell or two equal neighbours"""
+    if empty_cells(board):
+        return True
+    for b in (board, transpose(board)):
+        for shift in (0, 16, 32, 48):
+            cells = _row_cells((b >> shift) & ROW_MASK)
+            if any(x == y for x, y in zip(cells, cells[1:])):
+                return True
+    return False
+
+
+def max_level(board):
+    return max(_row_cells(board & ROW_MASK) + _row_cells((board >> 16) & ROW_MASK)
+               + _row_cells((board >> 32) & ROW_MASK) + _row_cells(board >> 48))
+
+
+def from_grid(grid):
+    """Board from rows of levels (0 or None for empty)"""
+    board = 0
+    for r, row in enumerate(grid):
+        for c, level in enumerate(row):
+            board |= (level or 0) << (4 * (SIZE * r + c))
+    return board
+
+
+def to_grid(board):
+    return [_row_cells((board >> (16 * r)) & ROW_MASK) for r in range(SIZE)]
+
+
+def draw_level(rng, weights):
+    x = rng.random() * sum(weights)
+    for level, weight in enumerate(weights, 1):
+        x -= weight
+        if x < 0:
+            return level
+    return len(weights)
+
+
+# Players
+
+def evaluate(board, t):
+    h = t.heuristic
+    tb = transpose(board)
+    return (h[board & ROW_MASK] + h[(board >> 16) & ROW_MASK]
+            + h[(board >> 32) & ROW_MASK] + h[board >> 48]
+            + h[tb & ROW_MASK] + h[(tb >> 16) & ROW_MASK]
+            + h[(tb >> 32) & ROW_MASK] + h[tb >> 48])
+
+
+class Expectimax:
+    """
+    Depth-limited expectimax over (move, spawn) plies. The first spawn is
+    the previewed fruit, so only its cell is a chance event; deeper spawns
+    average over the spawn weights.
+    """
+
+    def __init__(self, depth=1, weights=SPAWN_WEIGHTS, t=None):
+        self.depth = depth
+        total = sum(weights)
+        self.spawns = [(level, w / total) for level, w in enumerate(weights, 1) if w]
+        self.t = t or tables()
+        self.cache = {}
+
+    def __call__(self, board, next_level, rng):
+        self.cache.clear()
+        best, best_value = None, -1.0
+        for direction in DIRECTIONS:
+            new, _, _ = move(board, direction, self.t)
+            if new == board:
+                continue
+            value = self.chance(new, self.depth, 1.0, next_level)
+            if value > best_value:
+                best, best_value = direction, value
+        return best
+
+    def chance(self, board, depth, probability, known=None):
+        if depth <= 0 or probability < MIN_PROBABILITY:
+            return evaluate(board, self.t)
+        key = (board, depth, known)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        cells = empty_cells(board)
+        spawns = [(known, 1.0)] if known else self.spawns
+        probability /= len(cells)
+        total = 0.0
+        for i in cells:
+            for level, p in spawns:
+                total += p * self.player(board | (level << (4 * i)), depth - 1, probability * p)
+        value = total / len(cells)
+        self.cache[key] = value
+        return value
+
+    def player(self, board, depth, probability):
+        best = 0.0
+        for direction in DIRECTIONS:
+            new, _, _ = move(board, direction, self.t)
+            if new != board:
+                best = max(best, self.chance(new, depth, probability))
+        return best
+
+
+class Greedy:
+    """One ply: the move with the best immediate merge points, then heuristic"""
+
+    def __init__(self, t=None):
+        self.t = t or tables()
+
+    def __call__(self, board, next_level, rng):
+        options = []
+        for direction in DIRECTIONS:
+            new, points, _ = move(board, direction, self.t)
+            if new != board:
+                options.append((points, evaluate(new, self.t), direction))
+        return max(options)[2] if options else None
+
+
+class RandomPlayer:
+    def __init__(self, t=None):
+        self.t = t or tables()
+
+    def __call__(self, board, next_level, rng):
+        valid = [d for d in DIRECTIONS if move(board, d, self.t)[0] != board]
+        return rng.choice(valid) if valid else None
+
+
+POLICIES = {'expectimax': Expectimax, 'greedy': Greedy, 'random': RandomPlayer}
+
+
+@dataclass
+class GameResult:
+    score: int = 0
+    moves: int = 0
+    max_level: int = 0
+    max_combo: int = 0
+    combo_bonus: int = 0
+    merges: int = 0
+    capped: bool = False
+    levels: list = field(default_factory=list)  # move count when each level first appeared
+
+
+def play_game(player, rng, weights=SPAWN_WEIGHTS, max_moves=5000, t=None):
+    """One game from FruitGame.reset() to game over (or `max_moves`)"""
+    t = t or tables()
+    board, combo = 0, 0
+    result = GameResult(levels=[0] * MAX_LEVEL)
+
+    def spawn(board, level):
+        cells = empty_cells(board)
+        return board | (level << (4 * cells[int(rng.random() * len(cells))]))
+
+    next_level = draw_level(rng, weights)
+    for _ in range(2):
+        board = spawn(board, next_level)
+        next_level = draw_level(rng, weights)
+
+    while can_move(board):
+        if result.moves >= max_moves:
+            result.capped = True
+            break
+        direction = player(board, next_level, rng)
+        board, points, merges = move(board, direction, t)
+        gained, combo = combo_score(points, merges, combo)
+        result.moves += 1
+        result.score += gained
+        result.combo_bonus += gained - points
+        result.merges += merges
+        result.max_combo = max(result.max_combo, combo)
+        top = max_level(board)
+        if top > result.max_level:
+            for level in range(result.max_level + 1, top + 1):
+                result.levels[level - 1] = result.moves
+            result.max_level = top
+        board = spawn(board, next_level)
+        next_level = draw_level(rng, weights)
+    result.max_level = max(result.max_level, max_level(board))
+    return result
+
+
+def run_games(task):
+    """Worker entry point; game i is seeded from (seed, i) only"""
+    first, count, seed, policy, depth, weights, max_moves = task
+    t = tables()
+    player = Expectimax(depth, weights, t) if policy == 'expectimax' else POLICIES[policy](t)
+    results = []
+    for index in range(first, first + count):
+        rng = random.Random(seed * 1_000_003 + index)
+        results.append(asdict(play_game(player, rng, weights, max_moves, t)))
+    return first, results
+
+
+def percentiles(values):
+    if len(values) == 0:
+        return {'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    p50, p95 = np.percentile(values, [50, 95])
+    return {'mean': float(np.mean(values)), 'p50': float(p50),
+            'p95': float(p95), 'max': float(np.max(values))}
+
+
+def benchmark(games=1000, policy='expectimax', depth=1, weights=SPAWN_WEIGHTS,
+              max_moves=5000, seed=1, workers=None, chunk=25):
+    """Play `games` games over a process pool; a summary dict and the raw results"""
+    tasks = [(first, min(chunk, games - first), seed, policy, depth, tuple(weights), max_moves)
+             for first in range(0, games, chunk)]
+    start = time.perf_counter()
+    parts = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for first, results in pool.map(run_games, tasks):
+            parts[first] = results
+    elapsed = time.perf_counter() - start
+    results = [r for first in sorted(parts) for r in parts[first]]
+
+    scores = np.array([r['score'] for r in results])
+    moves = np.array([r['moves'] for r in results])
+    top = np.array([r['max_level'] for r in results])
+    bonus = sum(r['combo_bonus'] for r in results)
+    summary = {
+        'games': len(results),
+        'policy': policy,
+        'depth': depth if policy == 'expectimax' else None,
+        'spawn_weights': list(weights),
+        'seconds': elapsed,
+        'games_per_second': len(results) / elapsed if elapsed else 0.0,
+        'moves_per_second': float(moves.sum()) / elapsed if elapsed else 0.0,
+        'score': percentiles(scores),
+        'moves': percentiles(moves),
+        'max_combo': percentiles([r['max_combo'] for r in results]),
+        'combo_bonus_share': bonus / max(int(scores.sum()), 1),
+        'capped': sum(r['capped'] for r in results),
+        # Share of games that reached each level, and the median move it took
+        'reached': {level: float((top >= level).mean()) for level in range(1, MAX_LEVEL + 1)},
+        'moves_to_reach': {level: float(np.median([r['levels'][level - 1] for r in results
+                                                   if r['max_level'] >= level]))
+                           for level in range(1, MAX_LEVEL + 1) if (top >= level).any()},
+    }
+    return summary, results
+
+
+# Checking the engine against game.js
+
+JS_HARNESS = r"""
+const fs = require('fs');
+const vm = require('vm');
+const noop = () => {};
+const context = {
+    console: { log: noop, warn: noop, error: noop },
+    setTimeout: noop, clearTimeout: noop, Math, Date,
+    localStorage: { getItem: () => null, setItem: noop },
+    document: { addEventListener: noop }, navigator: {}, window: {},
+};
+vm.createContext(context);
+vm.runInContext(fs.readFileSync(process.argv[1], 'utf8') + '\nthis.FruitGame = FruitGame;', context);
+
+const input = JSON.parse(fs.readFileSync(0, 'utf8'));
+const fruits = input.scores.map((score, i) => ({ level: i + 1, score }));
+const cell = level => level ? { ...fruits[level - 1] } : null;
+const out = input.cases.map(({ grid, direction, combo }) => {
+    const game = Object.create(context.FruitGame.prototype);
+    Object.assign(game, {
+        fruits, gridSize: grid.length, score: 0, bestScore: Infinity, comboCount: combo,
+        soundEnabled: false, gameOver: false,
+        grid: grid.map(row => row.map(cell)),
+        elements: { board: { getBoundingClientRect: () => ({ left: 0, top: 0, width: 400, height: 400 }) } },
+    });
+    for (const name of ['addRandomFruit', 'updateUI', 'render', 'showCombo',
+                        'showFloatingScore', 'showGameOver', 'playSound']) {
+        game[name] = noop;
+    }
+    game.checkState();
+    const over = game.gameOver;
+    game.checkState = noop;
+    game.move(direction);
+    return { grid: game.grid.map(row => row.map(c => c ? c.level : 0)),
+             score: game.score, combo: game.comboCount, over };
+});
+process.stdout.write(JSON.stringify(out));
+"""
+
+
+def random_boards(count, rng):
+    """Boards with a mix of empty cells, equal neighbours and capped peaches"""
+    boards = []
+    for _ in range(count):
+        fill = rng.random()
+        top = rng.randint(2, MAX_LEVEL)
+        grid = [[rng.randint(1, top) if rng.random() < fill else 0 for _ in range(SIZE)]
+                for _ in range(SIZE)]
+        boards.append(from_grid(grid))
+    return boards
+
+
+def run_js(cases, scores, source=GAME_SOURCE):
+    node = shutil.which('node')
+    if node is None:
+        raise RuntimeError('node is required to run game.js')
+    payload = json.dumps({'scores': scores, 'cases': cases})
+    proc = subprocess.run([node, '-e', JS_HARNESS, str(source)], input=payload,
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def verify(boards=2000, seed=1, source=GAME_SOURCE):
+    """Differences between game.js and the engine on random boards and moves"""
+    rng = random.Random(seed)
+    scores = fruit_scores(source)
+    t = tables(scores)
+    cases = []
+    for board in random_boards(boards, rng):
+        cases.append({'grid': to_grid(board), 'direction': rng.choice(DIRECTIONS),
+                      'combo': rng.choice([0, 0, 1, 2, 5])})
+    mismatches = []
+    for case, js in zip(cases, run_js(cases, list(scores), source)):
+        board = from_grid(case['grid'])
+        new, gained, combo = play_move(board, case['direction'], case['combo'], t)
+        expected = {'grid': to_grid(new), 'score': gained, 'combo': combo,
+                    'over': not can_move(board)}
+        if js != expected:
+            mismatches.append({'case': case, 'js': js, 'engine': expected})
+    return scores, mismatches
+
+
+def parse_weights(text):
+    return tuple(float(w) for w in text.split(','))
+
+
+def print_summary(s):
+    print(f"  {s['games']} games in {s['seconds']:.1f} s "
+          f"({s['games_per_second']:.1f} games/s, {s['moves_per_second']:.0f} moves/s)")
+    print(f"  score  p50 {s['score']['p50']:.0f}  p95 {s['score']['p95']:.0f}  "
+          f"max {s['score']['max']:.0f}  (combo bonus {s['combo_bonus_share']:.1%})")
+    print(f"  moves  p50 {s['moves']['p50']:.0f}  p95 {s['moves']['p95']:.0f}  "
+          f"capped {s['capped']}")
+    print(f"  max combo p50 {s['max_combo']['p50']:.0f}  max {s['max_combo']['max']:.0f}")
+    print("  level reached:")
+    for level, share in s['reached'].items():
+        if share:
+            moves = s['moves_to_reach'].get(level, 0)
+            print(f"    {level:2d} ({SCORES[level - 1]:5d}) {share:7.1%}   median move {moves:.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='\n'.join(__doc__.strip().splitlines()[1:]))
+    sub = parser.add_subparsers(dest='command', required=True)
+    bench = sub.add_parser('bench', help='play many games and report score distributions')
+    bench.add_argument('--games', type=int, default=1000)
+    bench.add_argument('--policy', choices=sorted(POLICIES), default='expectimax')
+    bench.add_argument('--depth', type=int, default=1, help='expectimax plies')
+    bench.add_argument('--spawn', type=parse_weights, default=SPAWN_WEIGHTS,
+                       help='spawn weights of levels 1, 2, ... (default 0.5,0.5)')
+    bench.add_argument('--max-moves', type=int, default=5000)
+    bench.add_argument('--seed', type=int, default=1)
+    bench.add_argument('--workers', type=int, default=os.cpu_count())
+    bench.add_argument('--json', help='also write the summary and per-game results here')
+    check = sub.add_parser('verify', help='compare the engine with game.js under Node')
+    check.add_argument('--boards', type=int, default=2000)
+    check.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.command == 'verify':
+        print("=" * 70)
+        print(f"Fruit 2048 rules: engine vs {GAME_SOURCE.relative_to(ROOT)}")
+        print("=" * 70)
+        scores, mismatches = verify(args.boards, args.seed)
+        if scores != SCORES:
+            print(f"  ⚠ fruit scores in game.js changed: {scores}")
+        for m in mismatches[:10]:
+            print(f"  ✗ {json.dumps(m)}")
+        print(f"{'✓' if not mismatches else '✗'} {args.boards - len(mismatches)}"
+              f"/{args.boards} moves identical")
+        return 1 if mismatches else 0
+
+    print("=" * 70)
+    print(f"Fruit 2048 bench: {args.policy}"
+          + (f" depth {args.depth}" if args.policy == 'expectimax' else '')
+          + f", spawn {','.join(f'{w:g}' for w in args.spawn)}, {args.workers} workers, "
+          f"seed {args.seed}")
+    print("=" * 70)
+    summary, results = benchmark(args.games, args.policy, args.depth, args.spawn,
+                                 args.max_moves, args.seed, args.workers)
+    print_summary(summary)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'seed': args.seed, 'summary': summary, 'games': results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Load generator for the game site
+Runs concurrent simulated players against a server. Each player repeats
+sessions like a browser would:
+  1. load the index.html hub and its scripts and stylesheets
+  2. hover a few game cards, prefetching <game>/index.html and the assets
+     the hub's #game-assets map lists for it, the way prefetchGame() does;
+     without a map (an unbuilt tree), the assets the game page links
+  3. open one game and load all of its scripts and stylesheets
+Every player keeps its own HTTP cache (max-age, heuristic freshness,
+ETag / Last-Modified revalidation, prefetches usable for 5 minutes) and a
+pool of 6 keep-alive connections. Reports throughput, latency percentiles
+per request kind, bytes on the wire and how requests were answered: from
+the player's cache, by a 304, or by a full download.
+
+Usage:
+    python3 -m tools.loadtest [--base-url http://localhost:8888] [--users 50] \
+        [--sessions 20] [--json run.json] [--baseline previous.json]
+"""
+
+import argparse
+import asyncio
+import email.utils
+import gzip
+import json
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlsplit
+
+import numpy as np
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from tools.site import GAMES, page_assets, prefetch_map
+
+DEFAULT_BASE_URL = "http://localhost:8888"
+# Browsers open at most this many connections per host
+CONNECTIONS_PER_USER = 6
+# Chrome keeps prefetched responses usable for this long regardless of max-age
+PREFETCH_SECONDS = 300
+# Heuristic freshness for responses without Cache-Control: 10% of their age
+HEURISTIC_FRACTION = 0.1
+KINDS = ('page', 'asset', 'prefetch')
+OUTCOMES = ('cache', 'revalidated', 'downloaded', 'error')
+
+
+@dataclass
+class Response:
+    status: int
+    headers: dict
+    body: bytes
+    wire_bytes: int
+
+    def text(self):
+        encoding = self.headers.get('content-encoding', 'identity')
+        body = self.body
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        elif encoding == 'br':
+            body = brotli.decompress(body)
+        return body.decode('utf-8', errors='replace')
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, path, headers):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f'GET {path} HTTP/1.1', f'Host: {self.host}:{self.port}']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        status_line, *header_lines = head.decode('latin-1').split('\r\n')
+        status = int(status_line.split(' ', 2)[1])
+        response_headers = {}
+        for line in header_lines:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                response_headers[name.strip().lower()] = value.strip()
+
+        if status == 304 or status < 200:
+            body = b''
+        elif 'content-length' in response_headers:
+            body = await self.reader.readexactly(int(response_headers['content-length']))
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = await self._read_chunked()
+        else:
+            body = await self.reader.read()
+            response_headers['connection'] = 'close'
+        if response_headers.get('connection', '').lower() == 'close' or \
+                status_line.startswith('HTTP/1.0'):
+            self.close()
+        return Response(status, response_headers, body, len(head) + len(body))
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                await self.reader.readuntil(b'\r\n')
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class ConnectionPool:
+    def __init__(self, host, port, size=CONNECTIONS_PER_USER):
+        self.idle = asyncio.Queue()
+        for _ in range(size):
+            self.idle.put_nowait(Connection(host, port))
+
+    async def request(self, path, headers):
+        connection = await self.idle.get()
+        try:
+            return await connection.request(path, headers)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            connection.close()
+            raise
+        finally:
+            self.idle.put_nowait(connection)
+
+    def close(self):
+        while not self.idle.empty():
+            self.idle.get_nowait().close()
+
+
+@dataclass
+class CacheEntry:
+    response: Response
+    fresh_until: float
+    validators: dict
+
+
+def freshness(headers, now):
+    """Seconds a response may be reused without revalidation"""
+    cache_control = headers.get('cache-control', '').lower()
+    if 'no-store' in cache_control:
+        return None
+    if 'no-cache' in cache_control:
+        return 0.0
+    match = re.search(r'max-age=(\d+)', cache_control)
+    if match:
+        return float(match.group(1))
+    if 'last-modified' in headers:
+        modified = email.utils.parsedate_to_datetime(headers['last-modified']).timestamp()
+        return max(0.0, (now - modified) * HEURISTIC_FRACTION)
+    return 0.0
+
+
+class BrowserCache:
+    """Per-player HTTP cache keyed by path"""
+
+    def __init__(self):
+        self.entries = {}
+
+    def lookup(self, path, now):
+        """(fresh entry or None, conditional request headers)"""
+        entry = self.entries.get(path)
+        if entry is None:
+            return None, {}
+        if now < entry.fresh_until:
+            return entry, {}
+        return None, entry.validators
+
+    def store(self, path, response, now, prefetch=False):
+        lifetime = freshness(response.headers, time.time())
+        if lifetime is None or response.status != 200:
+            self.entries.pop(path, None)
+            return
+        if prefetch:
+            lifetime = max(lifetime, PREFETCH_SECONDS)
+        validators = {}
+        if 'etag' in response.headers:
+            validators['If-None-Match'] = response.headers['etag']
+        if 'last-modified' in response.headers:
+            validators['If-Modified-Since'] = response.headers['last-modified']
+        self.entries[path] = CacheEntry(response, now + lifetime, validators)
+
+    def refreshed(self, path, response, now):
+        """Apply a 304: keep the stored body, renew its freshness"""
+        entry = self.entries[path]
+        merged = dict(entry.response.headers, **{k: v for k, v in response.headers.items()
+                                                  if k not in ('content-length',)})
+        self.store(path, Response(200, merged, entry.response.body, 0), now)
+        return self.entries[path].response
+
+
+@dataclass
+class Stats:
+    latencies: dict = field(default_factory=lambda: {kind: [] for kind in KINDS})
+    outcomes: dict = field(default_factory=lambda: {
+        kind: dict.fromkeys(OUTCOMES, 0) for kind in KINDS})
+    statuses: dict = field(default_factory=dict)
+    wire_bytes: int = 0
+    sessions: list = field(default_factory=list)
+    games: dict = field(default_factory=dict)
+
+
+class Player:
+    def __init__(self, base_url, stats, rng, think=0.0, hovers=(0, 3), encodings='gzip, br'):
+        parts = urlsplit(base_url)
+        self.prefix = parts.path.rstrip('/')
+        self.pool = ConnectionPool(parts.hostname, parts.port or 80)
+        self.cache = BrowserCache()
+        self.stats = stats
+        self.rng = rng
+        self.think = think
+        self.hovers = hovers
+        self.headers = {'Accept-Encoding': encodings} if encodings else {}
+
+    async def get(self, path, kind):
+        """Fetch through the player's cache; returns the Response or None on error"""
+        now = time.monotonic()
+        entry, conditional = self.cache.lookup(path, now)
+        if entry is not None:
+            self.stats.outcomes[kind]['cache'] += 1
+            return entry.response
+
+        start = time.perf_counter()
+        try:
+            response = await self.pool.request(self.prefix + path,
+                                               dict(self.headers, **conditional))
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            self.stats.outcomes[kind]['error'] += 1
+            self.stats.statuses['error'] = self.stats.statuses.get('error', 0) + 1
+            return None
+        self.stats.latencies[kind].append((time.perf_counter() - start) * 1000)
+        self.stats.wire_bytes += response.wire_bytes
+        self.stats.statuses[response.status] = self.stats.statuses.get(response.status, 0) + 1
+
+        if response.status == 304 and path in self.cache.entries:
+            self.stats.outcomes[kind]['revalidated'] += 1
+            return self.cache.refreshed(path, response, now)
+        if response.status != 200:
+            self.stats.outcomes[kind]['error'] += 1
+            return None
+        self.stats.outcomes[kind]['downloaded'] += 1
+        self.cache.store(path, response, now, prefetch=kind == 'prefetch')
+        return response
+
+    async def load_page(self, path):
+        page = await self.get(path, 'page')
+        if page is None:
+            return None
+        assets = [urlsplit(urljoin(path, ref)).path for ref in page_assets(page.text())]
+        await asyncio.gather(*(self.get(asset, 'asset') for asset in assets))
+        return page
+
+    async def hover(self, folder, assets):
+        """The prefetches of a hovered card; `assets` is the hub's prefetch map"""
+        path = f'/{folder}/index.html'
+        if folder in assets:
+            paths = [path] + [urlsplit(urljoin('/', url)).path for url in assets[folder]]
+            await asyncio.gather(*(self.get(p, 'prefetch') for p in paths))
+            return
+        page = await self.get(path, 'prefetch')
+        if page is not None:
+            await asyncio.gather(*(self.get(urlsplit(urljoin(path, ref)).path, 'prefetch')
+                                   for ref in page_assets(page.text())))
+
+    async def pause(self, seconds):
+        if seconds > 0:
+            await asyncio.sleep(self.rng.expovariate(1 / seconds))
+
+    async def session(self, games):
+        start = time.perf_counter()
+        hub = await self.load_page('/')
+        assets = prefetch_map(hub.text()) if hub is not None else {}
+        for _ in range(self.rng.randint(*self.hovers)):
+            await self.pause(self.think)
+            await self.hover(self.rng.choice(games), assets)
+        await self.pause(self.think)
+        game = self.rng.choice(games)
+        await self.load_page(f'/{game}/')
+        self.stats.games[game] = self.stats.games.get(game, 0) + 1
+        self.stats.sessions.append((time.perf_counter() - start) * 1000)
+
+
+def percentiles(values):
+    if len(values) == 0:
+        return {'p50': 0.0, 'p90': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    p50, p90, p95, p99 = np.percentile(values, [50, 90, 95, 99])
+    return {'p50': float(p50), 'p90': float(p90), 'p95': float(p95), 'p99': float(p99),
+            'max': float(np.max(values))}
+
+
+async def run_load(base_url=DEFAULT_BASE_URL, users=50, sessions=20, games=GAMES,
+                   think=0.0, hovers=(0, 3), encodings='gzip, br', seed=1):
+    """Run `users` players for `sessions` sessions each; returns the summary dict"""
+    stats = Stats()
+    players = [Player(base_url, stats, random.Random(seed * 100003 + i), think, hovers,
+                      encodings) for i in range(users)]
+
+    async def play(player):
+        for _ in range(sessions):
+            await player.session(list(games))
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(play(p) for p in players))
+    finally:
+        for player in players:
+            player.pool.close()
+    wall = time.perf_counter() - start
+    return summarize(stats, wall, base_url, users, sessions)
+
+
+def summarize(stats, wall, base_url, users, sessions):
+    requests = sum(len(v) for v in stats.latencies.values())
+    served = {outcome: sum(stats.outcomes[k][outcome] for k in KINDS) for outcome in OUTCOMES}
+    lookups = sum(served.values())
+    return {
+        'base_url': base_url,
+        'users': users,
+        'sessions_per_user': sessions,
+        'wall_seconds': wall,
+        'requests': requests,
+        'requests_per_second': requests / wall if wall else 0.0,
+        'sessions_per_second': len(stats.sessions) / wall if wall else 0.0,
+        'wire_bytes': stats.wire_bytes,
+        'megabytes_per_second': stats.wire_bytes / wall / 2**20 if wall else 0.0,
+        'latency_ms': dict({kind: percentiles(stats.latencies[kind]) for kind in KINDS},
+                           all=percentiles([ms for v in stats.latencies.values() for ms in v])),
+        'session_ms': percentiles(stats.sessions),
+        'outcomes': stats.outcomes,
+        'cache_hit_ratio': served['cache'] / lookups if lookups else 0.0,
+        'revalidated_ratio': served['revalidated'] / lookups if lookups else 0.0,
+        'statuses': {str(k): v for k, v in sorted(stats.statuses.items(), key=str)},
+        'games': stats.games,
+    }
+
+
+def print_summary(result):
+    print(f"\n{result['requests']} requests in {result['wall_seconds']:.2f} s: "
+          f"{result['requests_per_second']:.0f} req/s, "
+          f"{result['sessions_per_second']:.1f} sessions/s, "
+          f"{result['megabytes_per_second']:.2f} MB/s "
+          f"({result['wire_bytes'] / 2**20:.1f} MB)")
+    print("\nLatency (ms)        p50      p90      p95      p99      max")
+    for kind, p in result['latency_ms'].items():
+        print(f"   {kind:10s} {p['p50']:8.2f} {p['p90']:8.2f} {p['p95']:8.2f} "
+              f"{p['p99']:8.2f} {p['max']:8.2f}")
+    s = result['session_ms']
+    print(f"   {'session':10s} {s['p50']:8.2f} {s['p90']:8.2f} {s['p95']:8.2f} "
+          f"{s['p99']:8.2f} {s['max']:8.2f}")
+    print("\nAnswered by        cache  revalidated  downloaded  error")
+    for kind, counts in result['outcomes'].items():
+        print(f"   {kind:10s} {counts['cache']:9d} {counts['revalidated']:12d} "
+              f"{counts['downloaded']:11d} {counts['error']:6d}")
+    print(f"\nCache hit ratio {result['cache_hit_ratio']:.1%}, "
+          f"revalidated {result['revalidated_ratio']:.1%}; statuses {result['statuses']}")
+
+
+# Metric, where it lives in the result, and whether higher is better
+COMPARED = [
+    ('req/s', ('requests_per_second',), True),
+    ('p50 ms', ('latency_ms', 'all', 'p50'), False),
+    ('p95 ms', ('latency_ms', 'all', 'p95'), False),
+    ('p99 ms', ('latency_ms', 'all', 'p99'), False),
+    ('MB on wire', ('wire_bytes',), False),
+    ('cache hit ratio', ('cache_hit_ratio',), True),
+]
+
+
+def compare(baseline, result):
+    """(label, before, after, change) rows for the headline metrics"""
+    rows = []
+    for label, keys, _ in COMPARED:
+        before, after = baseline, result
+        for key in keys:
+            before, after = before[key], after[key]
+        if keys == ('wire_bytes',):
+            before, after = before / 2**20, after / 2**20
+        change = (after - before) / before if before else 0.0
+        rows.append((label, before, after, change))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL)
+    parser.add_argument('--users', type=int, default=50, help='concurrent players')
+    parser.add_argument('--sessions', type=int, default=20, help='sessions per player')
+    parser.add_argument('--games', nargs='*', default=GAMES)
+    parser.add_argument('--think-ms', type=float, default=0,
+                        help='mean pause between hovers and the game launch')
+    parser.add_argument('--hovers', default='0,3', help='min,max cards hovered per session')
+    parser.add_argument('--encodings', default='gzip, br', help="Accept-Encoding ('' for none)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='JSON of an earlier run to compare against')
+    args = parser.parse_args(argv)
+    hovers = tuple(int(v) for v in args.hovers.split(','))
+
+    print("=" * 60)
+    print(f"Load test: {args.users} players x {args.sessions} sessions at {args.base_url}")
+    print("=" * 60)
+    result = asyncio.run(run_load(args.base_url, args.users, args.sessions, args.games,
+                                  args.think_ms / 1000, hovers, args.encodings, args.seed))
+    print_summary(result)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\nAgainst {args.baseline}")
+        for label, before, after, change in compare(baseline, result):
+            print(f"   {label:16s} {before:10.2f} -> {after:10.2f} ({change:+.1%})")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+    # Prefetch misses are the hub guessing file names; pages and assets must load
+    failed = result['outcomes']['page']['error'] + result['outcomes']['asset']['error']
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
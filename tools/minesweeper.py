@@ -0,0 +1,639 @@
+#!/usr/bin/env python3
+"""
+Headless minesweeper engine, constraint solver and no-guess board generator
+Boards are NumPy boolean mine masks. Adjacent-mine counts for a whole batch
+come from one 3x3 neighbourhood sum over the padded masks, replacing the
+per-cell countAdjacentMines loop of minesweeper/game.js. Mines are placed
+like MinesweeperGame.placeMines (uniformly, never in the 3x3 block around
+the first click) but as one random permutation per board instead of
+rejection sampling.
+
+The solver plays a board the way a careful player would: it opens the
+first click, then repeatedly applies
+  - single constraints: a number whose mines are all flagged clears its
+    other neighbours; one with as many unknown neighbours as missing mines
+    flags them all;
+  - pairs of overlapping numbers X, Y: if X needs exactly |X \\ Y| more
+    mines than Y, every cell of X \\ Y is a mine and every cell of Y \\ X
+    is safe;
+  - the global mine count once it is exhausted or equals the unknown cells.
+A board is "no-guess" when these rules alone open every safe cell. The
+rules are sound but not complete, so some boards that are solvable by
+deeper reasoning are rejected; every accepted board is solvable.
+
+`reveal` runs MinesweeperGame.reveal from game.js under Node with a stub
+DOM and a fake clock on large open boards, and reports reveal time, timers,
+animation frames and DOM writes. reveal_order() is the Python reference of
+its flood fill.
+
+Pools written with --pool hold, per board, the first click and the mine
+bitmask as hex (bit r * cols + c), ready for a client to load instead of
+generating.
+
+Usage:
+    python3 -m tools.minesweeper bench [--difficulty expert] [--boards 200] [--workers N]
+    python3 -m tools.minesweeper generate expert --count 100 [--click 8,15] \
+        [--seed 1] [--pool expert.json]
+    python3 -m tools.minesweeper reveal [--source game.js] [--compare OLD.js]
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from tools.site import ROOT
+
+GAME_SOURCE = ROOT / 'minesweeper' / 'game.js'
+
+
+@dataclass(frozen=True)
+class Difficulty:
+    name: str
+    rows: int
+    cols: int
+    mines: int
+
+    @property
+    def centre(self):
+        return self.rows // 2, self.cols // 2
+
+
+def difficulties(path=GAME_SOURCE):
+    """The entries of MinesweeperGame's this.config, in source order"""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    return {name: Difficulty(name, int(rows), int(cols), int(mines)) for name, rows, cols, mines in
+            re.findall(r'(\w+):\s*\{\s*rows:\s*(\d+),\s*cols:\s*(\d+),\s*mines:\s*(\d+)\s*\}',
+                       source)}
+
+
+DIFFICULTIES = difficulties()
+
+
+# Board geometry
+
+def neighbour_sum(mask):
+    """Number of set neighbours of every cell (8-neighbourhood) over the last two axes"""
+    a = np.asarray(mask, dtype=np.int8)
+    p = np.zeros(a.shape[:-2] + (a.shape[-2] + 2, a.shape[-1] + 2), dtype=np.int8)
+    p[..., 1:-1, 1:-1] = a
+    # The 3x3 box sum is separable: rows of three, then columns of three
+    h = p[..., :, :-2] + p[..., :, 1:-1] + p[..., :, 2:]
+    return h[..., :-2, :] + h[..., 1:-1, :] + h[..., 2:, :] - a
+
+
+def dilate(mask):
+    """Cells with at least one set neighbour"""
+    return neighbour_sum(mask) > 0
+
+
+def adjacent_counts(mines):
+    """countAdjacentMines for every cell of every board in one pass"""
+    return neighbour_sum(mines)
+
+
+def safe_zone(rows, cols, click):
+    zone = np.zeros((rows, cols), dtype=bool)
+    r, c = click
+    zone[max(r - 1, 0):r + 2, max(c - 1, 0):c + 2] = True
+    return zone
+
+
+def place_mines(difficulty, click, count, rng):
+    """`count` boards of shape (rows, cols) with the mines uniformly outside the safe zone"""
+    rows, cols = difficulty.rows, difficulty.cols
+    candidates = np.flatnonzero(~safe_zone(rows, cols, click))
+    if difficulty.mines > len(candidates):
+        raise ValueError(f'{difficulty.name}: {difficulty.mines} mines do not fit')
+    # The k smallest of a row of random keys are a uniform k-subset
+    keys = rng.random((count, len(candidates)))
+    chosen = candidates[np.argpartition(keys, difficulty.mines - 1, axis=1)[:, :difficulty.mines]]
+    mines = np.zeros((count, rows * cols), dtype=bool)
+    np.put_along_axis(mines, chosen, True, axis=1)
+    return mines.reshape(count, rows, cols)
+
+
+def encode(mines):
+    """Mine mask as a hex bitmask, bit r * cols + c"""
+    bits = np.flatnonzero(mines.ravel())
+    return format(sum(1 << int(i) for i in bits), 'x')
+
+
+def decode(text, rows, cols):
+    value = int(text, 16)
+    return np.array([(value >> i) & 1 for i in range(rows * cols)], dtype=bool).reshape(rows, cols)
+
+
+# Solver
+
+@dataclass
+class SolveResult:
+    solved: bool
+    revealed: int
+    steps: int = 0        # rounds of deductions
+    single: int = 0       # cells decided by single-constraint rounds
+    pairs: int = 0        # cells decided by the pair rule
+    global_count: int = 0  # cells decided by the global mine count
+
+
+def openings(mines, counts):
+    """
+    Label of the zero region of every cell (-1 elsewhere) and, per label,
+    the flat indices that open together with it: the region and its border
+    of numbers, which is what floodFill reveals from any cell of the region.
+    """
+    rows, cols = mines.shape
+    zero = ((counts == 0) & ~mines).ravel()
+    labels = np.full(rows * cols, -1, dtype=np.int32)
+    regions = []
+    for start in np.flatnonzero(zero):
+        if labels[start] >= 0:
+            continue
+        label = len(regions)
+        labels[start] = label
+        queue, opened = [int(start)], {int(start)}
+        for cell in queue:
+            r, c = divmod(cell, cols)
+            for rr in range(max(r - 1, 0), min(r + 2, rows)):
+                for cc in range(max(c - 1, 0), min(c + 2, cols)):
+                    n = rr * cols + cc
+                    opened.add(n)
+                    if zero[n] and labels[n] < 0:
+                        labels[n] = label
+                        queue.append(n)
+        regions.append(np.fromiter(opened, dtype=np.int64, count=len(opened)))
+    return labels, regions
+
+
+def flood(revealed, labels, regions):
+    """Open the zero regions touched by `revealed` together with their borders"""
+    flat = revealed.ravel()
+    touched = np.unique(labels[flat & (labels >= 0)])
+    if len(touched):
+        flat = flat.copy()
+        flat[np.concatenate([regions[label] for label in touched])] = True
+    return flat.reshape(revealed.shape)
+
+
+def _pair_deductions(need, unknown_sets, cols):
+    """Apply the overlapping-pair rule; (safe, mine) sets of flat cell indices"""
+    safe, mine = set(), set()
+    cells = list(unknown_sets)
+    for index, a in enumerate(cells):
+        ra, ca = divmod(a, cols)
+        set_a, need_a = unknown_sets[a], need[a]
+        for b in cells[index + 1:]:
+            rb, cb = divmod(b, cols)
+            if abs(ra - rb) > 2 or abs(ca - cb) > 2:
+                continue
+            set_b, need_b = unknown_sets[b], need[b]
+            if not set_a & set_b:
+                continue
+            for x, y, nx, ny in ((set_a, set_b, need_a, need_b), (set_b, set_a, need_b, need_a)):
+                only_x = x - y
+                if nx - ny == len(only_x):
+                    mine |= only_x
+                    safe |= y - x
+    return safe, mine
+
+
+def solve(mines, click, counts=None):
+    """Play the board from `click` with the deduction rules only"""
+    mines = np.asarray(mines, dtype=bool)
+    rows, cols = mines.shape
+    total = int(mines.sum())
+    counts = adjacent_counts(mines) if counts is None else counts
+    revealed = np.zeros_like(mines)
+    flagged = np.zeros_like(mines)
+    result = SolveResult(False, 0)
+    if mines[click]:
+        return result
+    labels, regions = openings(mines, counts)
+    revealed[click] = True
+    revealed = flood(revealed, labels, regions)
+    safe_cells = mines.size - total
+
+    while True:
+        opened = int(revealed.sum())
+        if opened == safe_cells:
+            result.solved, result.revealed = True, opened
+            return result
+        result.steps += 1
+        unknown = ~revealed & ~flagged
+        unknown_around = neighbour_sum(unknown)
+        need = np.where(revealed, counts - neighbour_sum(flagged), 0)
+        active = revealed & (unknown_around > 0)
+
+        new_safe = dilate(active & (need == 0)) & unknown
+        new_mines = dilate(active & (need == unknown_around)) & unknown
+        if new_safe.any() or new_mines.any():
+            result.single += int(new_safe.sum() + new_mines.sum())
+        else:
+            flat_unknown = unknown.ravel()
+            flat_need = need.ravel()
+            unknown_sets = {}
+            for cell in np.flatnonzero(active.ravel()):
+                r, c = divmod(int(cell), cols)
+                around = {rr * cols + cc
+                          for rr in range(max(r - 1, 0), min(r + 2, rows))
+                          for cc in range(max(c - 1, 0), min(c + 2, cols))
+                          if flat_unknown[rr * cols + cc]}
+                unknown_sets[int(cell)] = frozenset(around)
+            safe, mine = _pair_deductions(
+                {cell: int(flat_need[cell]) for cell in unknown_sets}, unknown_sets, cols)
+            if safe or mine:
+                new_safe = np.zeros(mines.size, dtype=bool)
+                new_safe[list(safe)] = True
+                new_mines = np.zeros(mines.size, dtype=bool)
+                new_mines[list(mine)] = True
+                new_safe, new_mines = new_safe.reshape(mines.shape), new_mines.reshape(mines.shape)
+                result.pairs += len(safe) + len(mine)
+            else:
+                left = total - int(flagged.sum())
+                n_unknown = int(unknown.sum())
+                if left == 0:
+                    new_safe = unknown
+                elif left == n_unknown:
+                    new_mines = unknown
+                else:
+                    result.revealed = opened
+                    return result
+                result.global_count += n_unknown
+
+        if (new_safe & mines).any() or (new_mines & ~mines).any():
+            raise AssertionError('unsound deduction')
+        flagged |= new_mines
+        revealed = flood(revealed | new_safe, labels, regions)
+
+
+# Generation
+
+def generate_batch(task):
+    """Worker entry point: try `attempts` boards, keep the no-guess ones"""
+    difficulty, click, attempts, seed = task
+    rng = np.random.default_rng(np.random.SeedSequence(seed))
+    start = time.perf_counter()
+    boards = place_mines(difficulty, click, attempts, rng)
+    counts = adjacent_counts(boards)
+    placed = time.perf_counter() - start
+    accepted, steps = [], []
+    for board, board_counts in zip(boards, counts):
+        result = solve(board, click, board_counts)
+        steps.append(result.steps)
+        if result.solved:
+            accepted.append(board)
+    return {'accepted': accepted, 'attempts': attempts, 'steps': steps,
+            'place_seconds': placed, 'seconds': time.perf_counter() - start}
+
+
+def generate(difficulty, count, click=None, seed=1, workers=None, batch=64):
+    """
+    `count` no-guess boards. Batches are seeded from (seed, batch index) and
+    merged in batch order, so the output does not depend on `workers`.
+    """
+    click = click or difficulty.centre
+    boards, stats = [], {'attempts': 0, 'seconds': 0.0, 'place_seconds': 0.0, 'steps': []}
+    next_batch = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while len(boards) < count:
+            n = max(workers or os.cpu_count() or 1, 1)
+            tasks = [(difficulty, click, batch, [seed, next_batch + i]) for i in range(n)]
+            next_batch += n
+            for part in pool.map(generate_batch, tasks):
+                boards.extend(part['accepted'])
+                stats['attempts'] += part['attempts']
+                stats['seconds'] += part['seconds']
+                stats['place_seconds'] += part['place_seconds']
+                stats['steps'].extend(part['steps'])
+    return boards[:count], click, stats
+
+
+def js_generate(difficulty, click, rng):
+    """placeMines + countAdjacentMines as written in game.js, for comparison"""
+    rows, cols = difficulty.rows, difficulty.cols
+    grid = [[False] * cols for _ in range(rows)]
+    placed = 0
+    while placed < difficulty.mines:
+        r, c = int(rng.random() * rows), int(rng.random() * cols)
+        if abs(r - click[0]) <= 1 and abs(c - click[1]) <= 1:
+            continue
+        if not grid[r][c]:
+            grid[r][c] = True
+            placed += 1
+    counts = [[0] * cols for _ in range(rows)]
+    for r in range(rows):
+        for c in range(cols):
+            if not grid[r][c]:
+                counts[r][c] = sum(grid[nr][nc]
+                                   for nr in range(max(r - 1, 0), min(r + 2, rows))
+                                   for nc in range(max(c - 1, 0), min(c + 2, cols)))
+    return grid, counts
+
+
+def benchmark(difficulty, boards=200, seed=1, workers=None):
+    """Boards/second for plain placement (game.js loop vs vectorized) and no-guess generation"""
+    rng = np.random.default_rng(seed)
+    click = difficulty.centre
+    n = min(boards, 200)
+    start = time.perf_counter()
+    for _ in range(n):
+        js_generate(difficulty, click, rng)
+    js_rate = n / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    adjacent_counts(place_mines(difficulty, click, boards * 10, rng))
+    numpy_rate = boards * 10 / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pool, _, stats = generate(difficulty, boards, click, seed, workers)
+    elapsed = time.perf_counter() - start
+    return {
+        'difficulty': difficulty.name,
+        'js_loop_boards_per_second': js_rate,
+        'numpy_boards_per_second': numpy_rate,
+        'no_guess_boards': len(pool),
+        'attempts': stats['attempts'],
+        'acceptance': stats['attempts'] and len(pool) / stats['attempts'],
+        'no_guess_boards_per_second': len(pool) / elapsed,
+        'solver_ms_per_board': 1000 * (stats['seconds'] - stats['place_seconds'])
+        / max(stats['attempts'], 1),
+        'mean_steps': float(np.mean(stats['steps'])) if stats['steps'] else 0.0,
+    }
+
+
+# Reveal: reference flood fill and the game.js measurement harness
+
+def reveal_order(counts, revealed, flagged, start):
+    """
+    MinesweeperGame.computeRevealRegion: cells opened from the revealed zero
+    at `start`, as flat indices in BFS order, and the numbered ones among
+    them in the order their numbers are staggered in.
+    """
+    rows, cols = counts.shape
+    flat_counts = counts.ravel().tolist()
+    closed = (~np.asarray(revealed, dtype=bool) & ~np.asarray(flagged, dtype=bool)).ravel().tolist()
+    queue, cells, numbers = [start[0] * cols + start[1]], [], []
+    for index in queue:
+        r, c = divmod(index, cols)
+        for nr in range(max(r - 1, 0), min(r + 2, rows)):
+            for nc in range(max(c - 1, 0), min(c + 2, cols)):
+                n = nr * cols + nc
+                if not closed[n]:
+                    continue
+                closed[n] = False
+                cells.append(n)
+                (numbers if flat_counts[n] else queue).append(n)
+    return cells, numbers
+
+
+REVEAL_HARNESS = r"""
+const fs = require('fs');
+const vm = require('vm');
+const FRAME_MS = 1000 / 60;
+const stats = {};
+const clock = { now: 0, frame: 0, timers: [], frames: [], seq: 0 };
+const count = name => { stats[name] = (stats[name] || 0) + 1; };
+
+class Element {
+    constructor() {
+        this.dataset = {};
+        this._classes = new Set();
+        this._text = '';
+        const self = this;
+        this.style = new Proxy({}, { set(target, key, value) { count('style'); target[key] = value; return true; } });
+        this.classList = {
+            add(...names) { count('classList'); names.forEach(n => self._classes.add(n));
+                            names.filter(n => /^number-\d/.test(n)).forEach(() => self.onNumber && self.onNumber()); },
+            remove(...names) { count('classList'); names.forEach(n => self._classes.delete(n)); },
+            contains(name) { return self._classes.has(name); },
+        };
+    }
+    set textContent(value) { count('textContent'); this._text = String(value); }
+    get textContent() { return this._text; }
+    set innerHTML(value) {}
+    setAttribute() { count('setAttribute'); }
+    addEventListener() {}
+    appendChild() {}
+    focus() {}
+}
+
+const document = {
+    getElementById: () => new Element(), querySelector: () => new Element(),
+    querySelectorAll: () => [], createElement: () => new Element(),
+    addEventListener() {}, body: new Element(),
+};
+const context = {
+    console, document, Math, Date, Number, String, Array, Set, Proxy,
+    window: { innerWidth: 1920, addEventListener() {} },
+    navigator: { userAgent: 'node', maxTouchPoints: 0 },
+    performance: { now: () => clock.now },
+    setTimeout(cb, delay = 0) { count('setTimeout'); clock.timers.push({ due: clock.now + delay, seq: clock.seq++, cb }); return clock.seq; },
+    clearTimeout() {}, setInterval() { return 0; }, clearInterval() {},
+    requestAnimationFrame(cb) { count('requestAnimationFrame'); clock.frames.push(cb); return clock.frames.length; },
+    cancelAnimationFrame() { clock.frames.length = 0; },
+};
+vm.createContext(context);
+vm.runInContext(fs.readFileSync(process.argv[1], 'utf8') + '\nthis.MinesweeperGame = MinesweeperGame;', context);
+
+function run() {
+    // Timers due before the next frame run first, in (due, creation) order
+    while (clock.timers.length || clock.frames.length) {
+        const frameTime = (clock.frame + 1) * FRAME_MS;
+        let next = -1;
+        clock.timers.forEach((t, i) => {
+            const best = clock.timers[next];
+            if (t.due < frameTime && (next < 0 || t.due < best.due || (t.due === best.due && t.seq < best.seq))) next = i;
+        });
+        if (next >= 0) {
+            const timer = clock.timers.splice(next, 1)[0];
+            clock.now = Math.max(clock.now, timer.due);
+            timer.cb();
+            continue;
+        }
+        clock.frame++;
+        clock.now = frameTime;
+        clock.frames.splice(0).forEach(cb => cb(clock.now));
+    }
+}
+
+const input = JSON.parse(fs.readFileSync(0, 'utf8'));
+const out = input.map(({ rows, cols, mines, counts, flags, click }) => {
+    const game = new context.MinesweeperGame();
+    game.config.custom = { rows, cols, mines: mines.length };
+    game.state.difficulty = 'custom';
+    game.reset();
+    game.checkWin = () => {};
+    mines.forEach(i => { game.state.grid[(i / cols) | 0][i % cols].isMine = true; });
+    flags.forEach(i => { game.state.grid[(i / cols) | 0][i % cols].isFlagged = true; });
+    const numberTimes = {};
+    game.state.grid.forEach((row, r) => row.forEach((cell, c) => {
+        cell.adjacent = counts[r * cols + c];
+        cell.element.dataset.r = r;
+        cell.element.dataset.c = c;
+        cell.element.onNumber = () => { numberTimes[r * cols + c] = clock.now - clickedAt; };
+    }));
+    game.state.gameState = 'playing';
+    Object.keys(stats).forEach(k => delete stats[k]);
+
+    const clickedAt = clock.now;
+    const started = process.hrtime.bigint();
+    game.reveal(click[0], click[1]);
+    const revealNs = Number(process.hrtime.bigint() - started);
+    const sync = { ...stats };
+    run();
+    const revealed = [];
+    game.state.grid.forEach((row, r) => row.forEach((cell, c) => { if (cell.isRevealed) revealed.push(r * cols + c); }));
+    return { reveal_ms: revealNs / 1e6, revealed, revealed_cells: game.state.revealedCells,
+             number_times: numberTimes, settled_ms: clock.now - clickedAt, sync, total: { ...stats } };
+});
+process.stdout.write(JSON.stringify(out));
+"""
+
+
+def run_reveals(cases, source=GAME_SOURCE):
+    """Run MinesweeperGame.reveal from `source` under Node with a fake clock"""
+    node = shutil.which('node')
+    if node is None:
+        raise RuntimeError('node is required to run game.js')
+    payload = json.dumps([{'rows': int(c['mines'].shape[0]), 'cols': int(c['mines'].shape[1]),
+                           'mines': np.flatnonzero(c['mines']).tolist(),
+                           'counts': adjacent_counts(c['mines']).ravel().tolist(),
+                           'flags': np.flatnonzero(c.get('flags', np.zeros(0))).tolist(),
+                           'click': list(c['click'])} for c in cases])
+    proc = subprocess.run([node, '-e', REVEAL_HARNESS, str(source)], input=payload,
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def open_board(rows, cols, mines, rng):
+    """A board with few mines, clicked in the middle: one click opens most of it"""
+    click = (rows // 2, cols // 2)
+    board = place_mines(Difficulty('open', rows, cols, mines), click, 1, rng)[0]
+    return {'mines': board, 'click': click}
+
+
+def reveal_benchmark(sizes, source=GAME_SOURCE, repeat=11, seed=1):
+    """Reveal time, timers and DOM writes of one opening click per board size"""
+    rng = np.random.default_rng(seed)
+    cases = [open_board(rows, cols, mines, rng) for rows, cols, mines in sizes
+             for _ in range(repeat)]
+    results = run_reveals(cases, source)
+    rows = []
+    for i, (r, c, m) in enumerate(sizes):
+        runs = results[i * repeat:(i + 1) * repeat]
+        total = runs[-1]['total']
+        rows.append({
+            'size': f'{r}x{c}/{m}',
+            'revealed': runs[-1]['revealed_cells'],
+            'numbers': len(runs[-1]['number_times']),
+            # The first run pays for JIT warm-up
+            'reveal_ms': float(np.median([run['reveal_ms'] for run in runs[1:] or runs])),
+            'timers': total.get('setTimeout', 0),
+            'frames': total.get('requestAnimationFrame', 0),
+            'dom_writes_sync': sum(v for k, v in runs[-1]['sync'].items()
+                                   if k not in ('setTimeout', 'requestAnimationFrame')),
+            'dom_writes': sum(v for k, v in total.items()
+                              if k not in ('setTimeout', 'requestAnimationFrame')),
+            'settled_ms': runs[-1]['settled_ms'],
+        })
+    return rows
+
+
+REVEAL_SIZES = [(16, 30, 10), (50, 50, 30), (100, 100, 60)]
+
+
+def print_reveal_rows(label, rows):
+    print(f"\n{label}")
+    print(f"  {'board':14s} {'opened':>7s} {'numbers':>8s} {'reveal ms':>10s} {'timers':>7s} "
+          f"{'frames':>7s} {'DOM sync':>9s} {'DOM total':>10s} {'settled':>8s}")
+    for r in rows:
+        print(f"  {r['size']:14s} {r['revealed']:7d} {r['numbers']:8d} {r['reveal_ms']:10.2f} "
+              f"{r['timers']:7d} {r['frames']:7d} {r['dom_writes_sync']:9d} {r['dom_writes']:10d} "
+              f"{r['settled_ms']:7.0f}ms")
+
+
+def parse_click(text):
+    r, c = text.split(',')
+    return int(r), int(c)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='\n'.join(__doc__.strip().splitlines()[1:]))
+    sub = parser.add_subparsers(dest='command', required=True)
+    bench = sub.add_parser('bench', help='boards/second per difficulty')
+    bench.add_argument('--difficulty', choices=sorted(DIFFICULTIES), action='append')
+    bench.add_argument('--boards', type=int, default=200, help='no-guess boards per difficulty')
+    bench.add_argument('--seed', type=int, default=1)
+    bench.add_argument('--workers', type=int, default=os.cpu_count())
+    bench.add_argument('--json', help='also write the results to this JSON file')
+    gen = sub.add_parser('generate', help='write a pool of no-guess boards')
+    gen.add_argument('difficulty', choices=sorted(DIFFICULTIES))
+    gen.add_argument('--count', type=int, default=100)
+    gen.add_argument('--click', type=parse_click, help='first click as ROW,COL (default: centre)')
+    gen.add_argument('--seed', type=int, default=1)
+    gen.add_argument('--workers', type=int, default=os.cpu_count())
+    gen.add_argument('--pool', help='JSON file to write the boards to')
+    rev = sub.add_parser('reveal', help='time one opening click of game.js on open boards')
+    rev.add_argument('--source', default=str(GAME_SOURCE))
+    rev.add_argument('--compare', help='another game.js to measure the same boards with')
+    rev.add_argument('--repeat', type=int, default=11)
+    args = parser.parse_args(argv)
+
+    if args.command == 'reveal':
+        print("=" * 70)
+        print("Minesweeper reveal: one opening click per board")
+        print("=" * 70)
+        for source in filter(None, [args.compare, args.source]):
+            print_reveal_rows(source, reveal_benchmark(REVEAL_SIZES, source, args.repeat))
+        return 0
+
+    if args.command == 'generate':
+        difficulty = DIFFICULTIES[args.difficulty]
+        boards, click, stats = generate(difficulty, args.count, args.click, args.seed,
+                                        args.workers)
+        print(f"✓ {len(boards)} no-guess {difficulty.name} boards from {stats['attempts']} "
+              f"attempts, first click {click}")
+        if args.pool:
+            with open(args.pool, 'w', encoding='utf-8') as f:
+                json.dump({'difficulty': difficulty.name, 'rows': difficulty.rows,
+                           'cols': difficulty.cols, 'mines': difficulty.mines,
+                           'click': list(click), 'seed': args.seed,
+                           'boards': [encode(b) for b in boards]}, f)
+            print(f"  pool written to {args.pool}")
+        return 0
+
+    names = args.difficulty or list(DIFFICULTIES)
+    print("=" * 70)
+    print(f"Minesweeper generation: {args.boards} no-guess boards per difficulty, "
+          f"{args.workers} workers")
+    print("=" * 70)
+    print(f"{'difficulty':14s} {'js loop/s':>10s} {'numpy/s':>10s} {'accept':>7s} "
+          f"{'no-guess/s':>11s} {'solve ms':>9s} {'steps':>6s}")
+    results = []
+    for name in names:
+        r = benchmark(DIFFICULTIES[name], args.boards, args.seed, args.workers)
+        results.append(r)
+        print(f"{name:14s} {r['js_loop_boards_per_second']:10.0f} "
+              f"{r['numpy_boards_per_second']:10.0f} {r['acceptance']:7.1%} "
+              f"{r['no_guess_boards_per_second']:11.1f} {r['solver_ms_per_board']:9.2f} "
+              f"{r['mean_steps']:6.1f}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'seed': args.seed, 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+"""
+Conservative JS / CSS / HTML minifiers for the build
+No parser dependencies: each minifier tokenizes just enough to never touch
+strings, template literals, regular expressions or <pre> text, and only
+removes comments and whitespace. JavaScript keeps a line break wherever a
+removed run of whitespace had one, unless the neighbouring tokens make
+automatic semicolon insertion impossible, so statement boundaries never
+change.
+
+prune_css() drops style rules whose selectors name a class or id that
+appears nowhere in the pages and scripts using the stylesheet. Class names
+built at runtime ('tile-' + value, `cell-${n}`) are kept by prefix.
+"""
+
+import re
+
+# Bump when the output of any minifier changes, so cached results are redone
+MINIFY_VERSION = '1'
+
+_WORD_CHAR = re.compile(r'[\w$\\\u0080-\uffff]')
+_NUMBER_RE = re.compile(r'(?:0[xXoObB][\da-fA-F_]+|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)'
+                        r'(?:[eE][+-]?\d+)?)n?')
+_WORD_RE = re.compile(r'[\w$\\\u0080-\uffff]+')
+# After these words a '/' starts a regular expression, not a division
+_REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                   'throw', 'case', 'do', 'else', 'yield', 'await'}
+# A line break next to these characters can never end a statement
+_JOIN_AFTER = set('{;,([=:?&|<>*%')
+_JOIN_BEFORE = set('}),;]:?')
+
+
+class MinifyError(ValueError):
+    pass
+
+
+def _scan_string(src, i):
+    quote = src[i]
+    i += 1
+    while i < len(src):
+        c = src[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == quote:
+            return i + 1
+        if c == '\n':
+            break
+        i += 1
+    raise MinifyError(f'unterminated string at {i}')
+
+
+def _scan_template(src, i):
+    """End of the template literal starting at src[i] == '`'"""
+    i += 1
+    while i < len(src):
+        c = src[i]
+        if c == '\\':
+            i += 2
+        elif c == '`':
+            return i + 1
+        elif c == '$' and src.startswith('${', i):
+            i = _scan_code_until_brace(src, i + 2)
+        else:
+            i += 1
+    raise MinifyError('unterminated template literal')
+
+
+def _scan_code_until_brace(src, i):
+    """Skip a ${ ... } substitution; returns the index after its closing brace"""
+    depth = 0
+    for kind, text, start in _tokens(src, i):
+        if text == '{':
+            depth += 1
+        elif text == '}':
+            if depth == 0:
+                return start + 1
+            depth -= 1
+    raise MinifyError('unterminated template substitution')
+
+
+def _scan_regex(src, i):
+    i += 1
+    in_class = False
+    while i < len(src):
+        c = src[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '\n':
+            break
+        if in_class:
+            in_class = c != ']'
+        elif c == '[':
+            in_class = True
+        elif c == '/':
+            i += 1
+            while i < len(src) and _WORD_CHAR.match(src[i]):
+                i += 1
+            return i
+        i += 1
+    raise MinifyError(f'unterminated regular expression at {i}')
+
+
+def _tokens(src, i=0):
+    """(kind, text, start) of JavaScript tokens; kinds: space, comment, code"""
+    previous = None  # last significant token text
+    n = len(src)
+    while i < n:
+        c = src[i]
+        start = i
+        if c in ' \t\r\n\f\v\u00a0\ufeff\u2028\u2029':
+            while i < n and src[i] in ' \t\r\n\f\v\u00a0\ufeff\u2028\u2029':
+                i += 1
+            yield 'space', src[start:i], start
+            continue
+        if src.startswith('//', i):
+            end = src.find('\n', i)
+            i = n if end < 0 else end
+            yield 'comment', src[start:i], start
+            continue
+        if src.startswith('/*', i):
+            end = src.find('*/', i + 2)
+            if end < 0:
+                raise MinifyError('unterminated comment')
+            i = end + 2
+            yield 'comment', src[start:i], start
+            continue
+        if c in '\'"':
+            i = _scan_string(src, i)
+        elif c == '`':
+            i = _scan_template(src, i)
+        elif c == '/' and (previous is None or previous in _REGEX_KEYWORDS or
+                           (not _WORD_CHAR.match(previous[-1]) and previous[-1] not in ')]}')):
+            i = _scan_regex(src, i)
+        elif c.isdigit() or (c == '.' and i + 1 < n and src[i + 1].isdigit()):
+            i = _NUMBER_RE.match(src, i).end()
+        elif _WORD_CHAR.match(c):
+            i = _WORD_RE.match(src, i).end()
+        else:
+            i += 1
+        previous = src[start:i]
+        yield 'code', previous, start
+
+
+def _needs_space(a, b):
+    x, y = a[-1], b[0]
+    if _WORD_CHAR.match(x) and _WORD_CHAR.match(y):
+        return True
+    if x in '+-' and y in '+-':
+        return True
+    if x == '/' or y == '/':
+        return True
+    if y == '.' and a[0].isdigit():
+        return True
+    return (x == '<' and y == '!') or (x == '-' and y == '>')
+
+
+def minify_js(src):
+    out = []
+    last = None
+    gap = None  # whitespace seen since the last code token: None, ' ' or '\n'
+    for kind, text, _ in _tokens(src):
+        if kind != 'code':
+            if '\n' in text or '\u2028' in text or '\u2029' in text:
+                gap = '\n'
+            elif gap is None:
+                gap = ' '
+            continue
+        if last is not None and gap is not None:
+            if gap == '\n' and last[-1] not in _JOIN_AFTER and text[0] not in _JOIN_BEFORE:
+                out.append('\n')
+            elif _needs_space(last, text):
+                out.append(' ')
+        out.append(text)
+        last = text
+        gap = None
+    return ''.join(out)
+
+
+def js_tokens(src):
+    """Significant tokens only; minify_js must preserve this sequence exactly"""
+    return [text for kind, text, _ in _tokens(src) if kind == 'code']
+
+
+# CSS
+
+_CSS_STRING_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+_CSS_COMMENT_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|/\*.*?\*/)''', re.DOTALL)
+
+
+def minify_css(src):
+    # Comments vanish without leaving whitespace (.a/**/.b is .a.b); /*! notices stay
+    src = _CSS_COMMENT_RE.sub(
+        lambda m: '' if m.group(0).startswith('/*') and not m.group(0).startswith('/*!')
+        else m.group(0), src)
+    pieces = _CSS_STRING_RE.split(src)
+    for index in range(0, len(pieces), 2):
+        piece = re.sub(r'\s+', ' ', pieces[index])
+        # Never around '(' ('and (' in media queries) or '+' / '-' (calc())
+        piece = re.sub(r'\s*([{};,>~])\s*', r'\1', piece)
+        piece = re.sub(r':\s+', ':', piece)
+        # Before ':' only in declarations; in selectors 'a :hover' differs from 'a:hover'
+        piece = re.sub(r'\s+:(?=[^{}]*(?:[;}]|$))', ':', piece)
+        pieces[index] = piece.replace(';}', '}')
+    return ''.join(pieces).strip()
+
+
+def _split_top(text, sep):
+    """Split on `sep` outside parentheses, brackets and strings"""
+    parts, depth, start, quote = [], 0, 0, None
+    for i, c in enumerate(text):
+        if quote:
+            if c == quote and text[i - 1] != '\\':
+                quote = None
+        elif c in '"\'':
+            quote = c
+        elif c in '([':
+            depth += 1
+        elif c in ')]':
+            depth -= 1
+        elif c == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _css_blocks(css):
+    """Top-level (prelude, body) pairs; body None for statements like @import"""
+    blocks, i, n = [], 0, len(css)
+    while i < n:
+        start = i
+        depth, quote = 0, None
+        while i < n:
+            c = css[i]
+            if quote:
+                if c == '\\':
+                    i += 1
+                elif c == quote:
+                    quote = None
+            elif c in '"\'':
+                quote = c
+            elif css.startswith('/*', i):
+                end = css.find('*/', i + 2)
+                i = n - 1 if end < 0 else end + 1
+            elif c == ';' and depth == 0:
+                blocks.append((css[start:i + 1], None))
+                i += 1
+                break
+            elif c == '{':
+                if depth == 0:
+                    brace = i
+                depth += 1
+            elif c == '}':
+                depth -= 1
+                if depth == 0:
+                    blocks.append((css[start:brace], css[brace + 1:i]))
+                    i += 1
+                    break
+            i += 1
+        else:
+            if css[start:].strip():
+                blocks.append((css[start:], None))
+    return blocks
+
+
+_SELECTOR_NAME_RE = re.compile(r'[.#](-?[_a-zA-Z][\w-]*)')
+_STRIP_RE = re.compile(r'\[[^\]]*\]|"[^"]*"|\'[^\']*\'')
+_GROUP_RULES = ('@media', '@supports', '@layer', '@container', '@document')
+
+
+def used_names(texts):
+    """Class / id candidates of some HTML and JS, and prefixes of runtime-built names"""
+    words, prefixes = set(), set()
+    for text in texts:
+        words.update(re.findall(r'[\w-]+', text))
+        prefixes.update(re.findall(r'([A-Za-z][\w-]*)(?:[\'"`]\s*\+|\$\{)', text))
+    return words, {p for p in prefixes if len(p) >= 2}
+
+
+def _selector_used(selector, words, prefixes):
+    names = _SELECTOR_NAME_RE.findall(_STRIP_RE.sub('', selector))
+    return all(name in words or any(name.startswith(p) for p in prefixes) for name in names)
+
+
+def prune_css(css, words, prefixes):
+    """Stylesheet without the rules no page or script can match; (css, removed selectors)"""
+    removed = []
+
+    def prune(text):
+        out = []
+        for prelude, body in _css_blocks(text):
+            head = prelude.strip()
+            if body is None:
+                out.append(prelude)
+            elif head.startswith('@'):
+                if head.lower().startswith(_GROUP_RULES):
+                    inner = prune(body)
+                    if inner.strip():
+                        out.append(f'{prelude}{{{inner}}}')
+                else:
+                    out.append(f'{prelude}{{{body}}}')
+            else:
+                selectors = _split_top(re.sub(r'/\*.*?\*/', '', head, flags=re.DOTALL), ',')
+                kept = [s for s in selectors if _selector_used(s, words, prefixes)]
+                removed.extend(s.strip() for s in selectors if s not in kept)
+                if kept:
+                    out.append(f"{','.join(s.strip() for s in kept)}{{{body}}}")
+        return '\n'.join(out)
+
+    return prune(css), removed
+
+
+# HTML
+
+_HTML_TOKEN_RE = re.compile(
+    r'(<!--.*?-->|<(script|style|pre|textarea)\b[^>]*>.*?</\2\s*>|<[^>]+>)',
+    re.DOTALL | re.IGNORECASE)
+_SCRIPT_TYPE_RE = re.compile(r'\btype="([^"]*)"', re.IGNORECASE)
+_JS_TYPES = {'', 'text/javascript', 'module', 'application/javascript'}
+
+
+def _minify_raw_block(block, tag):
+    open_end = block.index('>') + 1
+    close_start = block.lower().rindex('</')
+    opening, body, closing = block[:open_end], block[open_end:close_start], block[close_start:]
+    if tag == 'style':
+        return opening + minify_css(body) + closing
+    if tag == 'script':
+        match = _SCRIPT_TYPE_RE.search(opening)
+        if (match.group(1).lower() if match else '') in _JS_TYPES:
+            return opening + minify_js(body).strip() + closing
+    return block
+
+
+def minify_html(src):
+    out, last = [], 0
+    for match in _HTML_TOKEN_RE.finditer(src):
+        out.append(re.sub(r'\s+', lambda m: '\n' if '\n' in m.group(0) else ' ',
+                          src[last:match.start()]))
+        token = match.group(0)
+        if token.startswith('<!--'):
+            # Keep conditional comments
+            if token.startswith('<!--[if'):
+                out.append(token)
+        elif match.group(2):
+            out.append(_minify_raw_block(token, match.group(2).lower()))
+        else:
+            out.append(token)
+        last = match.end()
+    out.append(re.sub(r'\s+', lambda m: '\n' if '\n' in m.group(0) else ' ', src[last:]))
+    return re.sub(r'\n\s*\n', '\n', ''.join(out)).strip() + '\n'
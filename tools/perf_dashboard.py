@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+Cross-game performance history, trend report and regression gate
+For every game in build.sh's GAMES, a fresh headless Chromium profile loads
+the page and plays a short scripted session (keys, clicks or typing,
+depending on the game). The runner records:
+  load_ms          navigation start to the end of the load event
+  transfer_bytes   bytes over the wire for the page and everything it
+                   fetched before the session (Resource Timing transferSize)
+  frame_p50/p95/p99_ms
+                   requestAnimationFrame intervals during the session
+  heap_bytes       JS heap in use after the session and a forced GC
+
+Each run is appended to a local SQLite history together with the git SHA
+it measured. The history is append-only: triggers reject UPDATE and
+DELETE. Every run is compared against a rolling baseline: the median of
+the last --window clean runs before it. A run from a dirty working tree
+is stored and gated but never becomes part of a baseline. A metric
+regresses when it is more than its threshold above the baseline. The
+defaults allow for how noisy each metric is, and --threshold overrides
+them. `run` and `report` exit 1 when the run they gate has a regression.
+Both rewrite a static HTML report with a trend line per game and metric.
+
+Service workers are blocked so every load is a cold first visit.
+
+Usage:
+    python3 -m tools.perf_dashboard run [--root dist | --base-url URL] [--games a,b] \
+        [--seconds 10] [--history .perf/history.sqlite] [--report .perf/report.html] \
+        [--window 5] [--min-runs 3] [--threshold 0.1] [--threshold frame_p99_ms=0.3]
+    python3 -m tools.perf_dashboard report [--history ...] [--report ...] [--threshold ...]
+"""
+
+import argparse
+import html
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from tools.browser import add_browser_arguments, base_url_or_serve, chromium
+from tools.site import GAMES, ROOT, game_url
+
+HISTORY_FILE = ROOT / '.perf' / 'history.sqlite'
+REPORT_FILE = ROOT / '.perf' / 'report.html'
+# (name, label, unit); every metric is better when lower
+METRICS = [
+    ('load_ms', 'Load', 'ms'),
+    ('transfer_bytes', 'Transfer', 'bytes'),
+    ('frame_p50_ms', 'Frame p50', 'ms'),
+    ('frame_p95_ms', 'Frame p95', 'ms'),
+    ('frame_p99_ms', 'Frame p99', 'ms'),
+    ('heap_bytes', 'JS heap', 'bytes'),
+]
+METRIC_NAMES = [name for name, _, _ in METRICS]
+# Allowed rise over the baseline, by how much each metric moves between identical runs
+DEFAULT_THRESHOLDS = {
+    'load_ms': 0.25,
+    'transfer_bytes': 0.02,
+    'frame_p50_ms': 0.10,
+    'frame_p95_ms': 0.25,
+    'frame_p99_ms': 0.40,
+    'heap_bytes': 0.15,
+}
+WINDOW = 5
+MIN_RUNS = 3
+SESSION_SECONDS = 10
+STEP_MS = 100
+SETTLE_MS = 500
+VIEWPORT = {'width': 1280, 'height': 800}
+BROWSER_ARGS = ['--enable-precise-memory-info']
+TREND_RUNS = 30
+
+# Steps: (action, argument). `start` runs once after the load, `loop` cycles
+# one step per STEP_MS for the length of the session.
+#   click / focus  selector (the first match, through the DOM)
+#   click_nth      selector (a different match on each pass)
+#   press / hold   key (hold keeps it down for the whole step)
+#   type           text
+SESSIONS = {
+    'space-shooter': {'start': [('click', '#startGameBtn'), ('down', 'Space')],
+                      'loop': [('hold', 'ArrowLeft'), ('hold', 'ArrowLeft'),
+                               ('hold', 'ArrowRight'), ('hold', 'ArrowRight')]},
+    'platform-jumper': {'start': [('click', '#startButton')],
+                        'loop': [('hold', 'ArrowRight'), ('press', 'Space'),
+                                 ('hold', 'ArrowLeft'), ('press', 'ArrowUp')]},
+    'fruit-2048': {'loop': [('press', 'ArrowUp'), ('press', 'ArrowRight'),
+                            ('press', 'ArrowDown'), ('press', 'ArrowLeft')]},
+    'memory-cards': {'loop': [('click_nth', '.card')]},
+    'snake-game': {'start': [('click', '#start-btn')],
+                   'loop': [('press', 'ArrowUp'), ('press', 'ArrowRight'),
+                            ('press', 'ArrowDown'), ('press', 'ArrowLeft'),
+                            ('click', '#restart-btn')]},
+    'brick-breaker': {'start': [('click', '#startBtn'), ('press', 'Space')],
+                      'loop': [('hold', 'ArrowLeft'), ('hold', 'ArrowRight'),
+                               ('press', 'Space')]},
+    'tic-tac-toe': {'loop': [('click_nth', '.cell')] * 9 + [('click', '#newGameBtn')]},
+    'minesweeper': {'loop': [('click_nth', '.cell')] * 8 + [('click', '#restart-btn')]},
+    'typing-test': {'start': [('focus', '#typingInput')], 'loop': [('type', 'the ')]},
+    'physics-pinball': {'start': [('click', '#start-btn'), ('press', 'Space')],
+                        'loop': [('hold', 'ArrowLeft'), ('hold', 'ArrowRight'),
+                                 ('press', 'Space')]},
+    'down-100-floors': {'start': [('click', '#start-btn')],
+                        'loop': [('hold', 'ArrowLeft'), ('hold', 'ArrowRight')]},
+}
+
+# Installed before any page script: every rAF timestamp from document start
+FRAME_RECORDER = """
+window.__perfFrames = [];
+requestAnimationFrame(function tick(t) {
+    window.__perfFrames.push(t);
+    requestAnimationFrame(tick);
+});
+"""
+
+LOAD_METRICS = """() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource');
+    return {
+        load_ms: nav.loadEventEnd - nav.startTime,
+        transfer_bytes: [nav, ...resources].reduce((sum, e) => sum + (e.transferSize || 0), 0),
+    };
+}"""
+
+DOM_ACTION = """([action, selector, n]) => {
+    const found = document.querySelectorAll(selector);
+    if (!found.length) return false;
+    const el = action === 'click_nth' ? found[(n * 7) % found.length] : found[0];
+    if (action === 'focus') el.focus(); else el.click();
+    return true;
+}"""
+
+
+def frame_metrics(timestamps):
+    """rAF timestamps (ms) -> p50 / p95 / p99 of the intervals"""
+    intervals = np.diff(np.asarray(timestamps, dtype=float))
+    if len(intervals) == 0:
+        return {'frame_p50_ms': 0.0, 'frame_p95_ms': 0.0, 'frame_p99_ms': 0.0}
+    p50, p95, p99 = np.percentile(intervals, [50, 95, 99])
+    return {'frame_p50_ms': float(p50), 'frame_p95_ms': float(p95), 'frame_p99_ms': float(p99)}
+
+
+def act(page, step, n, step_ms=STEP_MS):
+    action, arg = step
+    if action in ('click', 'click_nth', 'focus'):
+        page.evaluate(DOM_ACTION, [action, arg, n])
+    elif action == 'press':
+        page.keyboard.press(arg)
+    elif action == 'down':
+        page.keyboard.down(arg)
+    elif action == 'hold':
+        page.keyboard.down(arg)
+        page.wait_for_timeout(step_ms)
+        page.keyboard.up(arg)
+        return
+    elif action == 'type':
+        page.keyboard.type(arg)
+    else:
+        raise ValueError(f'unknown session action {action!r}')
+    page.wait_for_timeout(step_ms)
+
+
+def play(page, session, seconds, step_ms=STEP_MS):
+    """Run a session's start steps, then its loop for `seconds`; returns the rAF timestamps"""
+    for n, step in enumerate(session.get('start', [])):
+        act(page, step, n, step_ms)
+    page.evaluate('() => { window.__perfFrames.length = 0; }')
+    loop = session['loop']
+    end = time.monotonic() + seconds
+    n = 0
+    while time.monotonic() < end:
+        act(page, loop[n % len(loop)], n, step_ms)
+        n += 1
+    return page.evaluate('() => window.__perfFrames.slice()')
+
+
+def measure_game(browser, base_url, game, seconds=SESSION_SECONDS):
+    """{metric: value} of one cold load and session, plus the page errors seen"""
+    context = browser.new_context(viewport=VIEWPORT, service_workers='block')
+    try:
+        page = context.new_page()
+        errors = []
+        page.on('pageerror', lambda e: errors.append(str(e)))
+        page.add_init_script(FRAME_RECORDER)
+        page.goto(game_url(base_url, game), wait_until='load')
+        page.wait_for_timeout(SETTLE_MS)
+        metrics = page.evaluate(LOAD_METRICS)
+        metrics.update(frame_metrics(play(page, SESSIONS[game], seconds)))
+        cdp = context.new_cdp_session(page)
+        cdp.send('HeapProfiler.collectGarbage')
+        metrics['heap_bytes'] = cdp.send('Runtime.getHeapUsage')['usedSize']
+    finally:
+        context.close()
+    return {name: float(metrics[name]) for name in METRIC_NAMES}, errors
+
+
+def collect(games=GAMES, seconds=SESSION_SECONDS, base_url=None, root=ROOT, chrome=None,
+            headless=True):
+    """{game: {metric: value}} and {game: [page errors]} for one run"""
+    results, errors = {}, {}
+    with base_url_or_serve(base_url, root) as url, \
+            chromium(chrome, headless=headless, args=BROWSER_ARGS) as browser:
+        for game in games:
+            results[game], errors[game] = measure_game(browser, url, game, seconds)
+    return results, errors
+
+
+def git_revision(root=ROOT):
+    """(HEAD SHA, whether tracked files have uncommitted changes)"""
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=root, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    return git('rev-parse', 'HEAD'), bool(git('status', '--porcelain', '--untracked-files=no'))
+
+
+class History:
+    """Append-only SQLite history of runs and their per-game metrics"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sha TEXT NOT NULL,
+                dirty INTEGER NOT NULL,
+                created REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS runs_sha ON runs (sha);
+            CREATE TABLE IF NOT EXISTS results (
+                run_id INTEGER NOT NULL REFERENCES runs (id),
+                game TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                value REAL NOT NULL,
+                PRIMARY KEY (run_id, game, metric));
+            CREATE TRIGGER IF NOT EXISTS runs_no_update BEFORE UPDATE ON runs
+                BEGIN SELECT RAISE(ABORT, 'perf history is append-only'); END;
+            CREATE TRIGGER IF NOT EXISTS runs_no_delete BEFORE DELETE ON runs
+                BEGIN SELECT RAISE(ABORT, 'perf history is append-only'); END;
+            CREATE TRIGGER IF NOT EXISTS results_no_update BEFORE UPDATE ON results
+                BEGIN SELECT RAISE(ABORT, 'perf history is append-only'); END;
+            CREATE TRIGGER IF NOT EXISTS results_no_delete BEFORE DELETE ON results
+                BEGIN SELECT RAISE(ABORT, 'perf history is append-only'); END;
+        """)
+
+    def record(self, sha, results, dirty=False, created=None):
+        """Append one run of {game: {metric: value}}; returns its id"""
+        with self.db:
+            run_id = self.db.execute(
+                'INSERT INTO runs (sha, dirty, created) VALUES (?, ?, ?)',
+                (sha, int(dirty), created if created is not None else time.time())).lastrowid
+            self.db.executemany(
+                'INSERT INTO results VALUES (?, ?, ?, ?)',
+                [(run_id, game, metric, float(value))
+                 for game, metrics in results.items() for metric, value in metrics.items()])
+        return run_id
+
+    def runs(self):
+        """Every run, oldest first"""
+        return [{'id': run_id, 'sha': sha, 'dirty': bool(dirty), 'created': created}
+                for run_id, sha, dirty, created in self.db.execute(
+                    'SELECT id, sha, dirty, created FROM runs ORDER BY id')]
+
+    def results(self, run_id):
+        out = {}
+        for game, metric, value in self.db.execute(
+                'SELECT game, metric, value FROM results WHERE run_id = ?', (run_id,)):
+            out.setdefault(game, {})[metric] = value
+        return out
+
+    def baseline(self, run_id, window=WINDOW):
+        """{game: {metric: (median, samples)}} over the last `window` clean runs before run_id"""
+        out = {}
+        rows = self.db.execute("""
+            SELECT game, metric, value FROM results
+            WHERE run_id IN (SELECT id FROM runs WHERE id < ? AND dirty = 0
+                             ORDER BY id DESC LIMIT ?)""", (run_id, window))
+        for game, metric, value in rows:
+            out.setdefault(game, {}).setdefault(metric, []).append(value)
+        return {game: {metric: (statistics.median(values), len(values))
+                       for metric, values in metrics.items()}
+                for game, metrics in out.items()}
+
+    def series(self, game, metric, limit=TREND_RUNS):
+        """[(run id, value)] of the last `limit` runs that measured it, oldest first"""
+        rows = self.db.execute("""
+            SELECT run_id, value FROM results WHERE game = ? AND metric = ?
+            ORDER BY run_id DESC LIMIT ?""", (game, metric, limit)).fetchall()
+        return rows[::-1]
+
+    def close(self):
+        self.db.close()
+
+
+def regressions(history, run_id, thresholds=None, window=WINDOW, min_runs=MIN_RUNS):
+    """Every metric of a run more than its threshold above a baseline of at least
+    `min_runs` runs"""
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    baseline = history.baseline(run_id, window)
+    found = []
+    for game, metrics in sorted(history.results(run_id).items()):
+        for metric in METRIC_NAMES:
+            if metric not in metrics or metric not in baseline.get(game, {}):
+                continue
+            base, samples = baseline[game][metric]
+            if samples < min_runs or base <= 0:
+                continue
+            change = metrics[metric] / base - 1
+            if change > thresholds[metric]:
+                found.append({'game': game, 'metric': metric, 'value': metrics[metric],
+                              'baseline': base, 'change': change,
+                              'threshold': thresholds[metric]})
+    return found
+
+
+def format_value(value, unit):
+    if unit == 'bytes':
+        return f'{value / 1024 / 1024:.2f} MB' if value >= 1024 * 1024 else f'{value / 1024:.1f} KB'
+    return f'{value:.1f} ms'
+
+
+def sparkline(points, baseline=None, width=160, height=32):
+    """Inline SVG polyline of [(run id, value)], with a dashed baseline"""
+    if not points:
+        return ''
+    values = [v for _, v in points] + ([baseline] if baseline is not None else [])
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+
+    def y(value):
+        return height - 2 - (value - low) / span * (height - 4)
+
+    step = (width - 4) / max(len(points) - 1, 1)
+    coords = ' '.join(f'{2 + i * step:.1f},{y(v):.1f}' for i, (_, v) in enumerate(points))
+    parts = [f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">']
+    if baseline is not None:
+        parts.append(f'<line x1="0" x2="{width}" y1="{y(baseline):.1f}" y2="{y(baseline):.1f}" '
+                     'class="base"/>')
+    parts.append(f'<polyline points="{coords}" class="line"/>')
+    last_x, last_y = 2 + (len(points) - 1) * step, y(points[-1][1])
+    parts.append(f'<circle cx="{last_x:.1f}" cy="{last_y:.1f}" r="2.5" class="dot"/></svg>')
+    return ''.join(parts)
+
+
+REPORT_STYLE = """
+body { font: 14px/1.4 system-ui, sans-serif; margin: 2em; color: #1e293b; }
+h1 { margin-bottom: 0.2em; } .meta { color: #64748b; margin-bottom: 1.5em; }
+table { border-collapse: collapse; margin-bottom: 2em; }
+th, td { padding: 4px 10px; text-align: right; border-bottom: 1px solid #e2e8f0; }
+th:first-child, td:first-child { text-align: left; }
+tr.regressed td { background: #fee2e2; }
+.line { fill: none; stroke: #2563eb; stroke-width: 1.5; }
+.base { stroke: #94a3b8; stroke-dasharray: 3 3; } .dot { fill: #2563eb; }
+.bad { color: #b91c1c; font-weight: 600; } .good { color: #15803d; }
+"""
+
+
+def render_report(history, run_id=None, thresholds=None, window=WINDOW, min_runs=MIN_RUNS):
+    """Static HTML trend report of the history, gated on run_id (default: the latest)"""
+    runs = history.runs()
+    if not runs:
+        return '<!DOCTYPE html><meta charset="utf-8"><title>Performance</title><p>No runs yet.</p>'
+    run = next(r for r in runs if r['id'] == run_id) if run_id else runs[-1]
+    results = history.results(run['id'])
+    baseline = history.baseline(run['id'], window)
+    flagged = {(r['game'], r['metric']): r
+               for r in regressions(history, run['id'], thresholds, window, min_runs)}
+    when = time.strftime('%Y-%m-%d %H:%M', time.localtime(run['created']))
+    out = ['<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">',
+           '<title>Game performance trends</title>', f'<style>{REPORT_STYLE}</style></head><body>',
+           '<h1>Game performance trends</h1>',
+           f'<p class="meta">Run {run["id"]} of {len(runs)} at {html.escape(run["sha"][:10])}'
+           f'{" (dirty)" if run["dirty"] else ""}, {when}. Baseline: median of the last '
+           f'{window} clean runs. ',
+           f'<span class="{"bad" if flagged else "good"}">{len(flagged)} regression(s)</span></p>']
+    for game in sorted(results):
+        out.append(f'<h2>{html.escape(game)}</h2><table><tr><th>Metric</th><th>Latest</th>'
+                   '<th>Baseline</th><th>Change</th><th>Last runs</th></tr>')
+        for metric, label, unit in METRICS:
+            if metric not in results[game]:
+                continue
+            value = results[game][metric]
+            base = baseline.get(game, {}).get(metric, (None, 0))[0]
+            change = f'{(value / base - 1):+.1%}' if base else '–'
+            regressed = (game, metric) in flagged
+            out.append(
+                f'<tr class="{"regressed" if regressed else ""}"><td>{label}</td>'
+                f'<td>{format_value(value, unit)}</td>'
+                f'<td>{format_value(base, unit) if base is not None else "–"}</td>'
+                f'<td class="{"bad" if regressed else ""}">{change}</td>'
+                f'<td>{sparkline(history.series(game, metric), base)}</td></tr>')
+        out.append('</table>')
+    out.append('</body></html>')
+    return '\n'.join(out)
+
+
+def write_report(path, text):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def parse_threshold(text):
+    """'0.1' -> every metric, 'frame_p99_ms=0.3' -> one metric"""
+    metric, sep, value = text.rpartition('=')
+    if sep and metric not in METRIC_NAMES:
+        raise argparse.ArgumentTypeError(f'unknown metric {metric!r}')
+    return (metric if sep else None, float(value))
+
+
+def thresholds_from(pairs):
+    out = {}
+    for metric, value in pairs or ():
+        if metric is None:
+            out.update(dict.fromkeys(METRIC_NAMES, value))
+        else:
+            out[metric] = value
+    return out
+
+
+def print_regressions(found):
+    for r in found:
+        unit = dict((name, unit) for name, _, unit in METRICS)[r['metric']]
+        print(f"  ✗ {r['game']:18s} {r['metric']:15s} {format_value(r['value'], unit):>10s} vs "
+              f"{format_value(r['baseline'], unit):>10s} ({r['change']:+.1%}, "
+              f"allowed {r['threshold']:.0%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='\n'.join(__doc__.strip().splitlines()[1:]))
+    sub = parser.add_subparsers(dest='command', required=True)
+    run = sub.add_parser('run', help='measure every game, append the run and gate it')
+    add_browser_arguments(run)
+    run.add_argument('--root', default=str(ROOT), help='directory to serve (e.g. dist)')
+    run.add_argument('--games', help='comma-separated subset of the games')
+    run.add_argument('--seconds', type=float, default=SESSION_SECONDS,
+                     help='length of each scripted session')
+    run.add_argument('--json', help='also write the run to this JSON file')
+    report = sub.add_parser('report', help='rewrite the report and gate the latest run')
+    for command in (run, report):
+        command.add_argument('--history', default=str(HISTORY_FILE))
+        command.add_argument('--report', default=str(REPORT_FILE), help='HTML report to write')
+        command.add_argument('--window', type=int, default=WINDOW,
+                             help='clean runs in the rolling baseline')
+        command.add_argument('--min-runs', type=int, default=MIN_RUNS,
+                             help='baseline runs needed before a metric is gated')
+        command.add_argument('--threshold', type=parse_threshold, action='append',
+                             metavar='[METRIC=]FRACTION',
+                             help='allowed rise over the baseline (repeatable)')
+    args = parser.parse_args(argv)
+    thresholds = thresholds_from(args.threshold)
+
+    history = History(args.history)
+    try:
+        if args.command == 'run':
+            games = args.games.split(',') if args.games else GAMES
+            sha, dirty = git_revision()
+            results, errors = collect(games, args.seconds, args.base_url, args.root,
+                                      args.chrome, not args.headed)
+            run_id = history.record(sha, results, dirty)
+            print("=" * 70)
+            print(f"Run {run_id} at {sha[:10]}{' (dirty)' if dirty else ''}: "
+                  f"{len(games)} games, {args.seconds:g} s sessions")
+            print("=" * 70)
+            for game, metrics in results.items():
+                print(f"  {game:18s} " + '  '.join(
+                    f"{label} {format_value(metrics[name], unit)}"
+                    for name, label, unit in METRICS))
+                for error in errors[game]:
+                    print(f"    ⚠️  page error: {error}")
+            if args.json:
+                with open(args.json, 'w', encoding='utf-8') as f:
+                    json.dump({'sha': sha, 'dirty': dirty, 'results': results,
+                               'errors': errors}, f, indent=2)
+        else:
+            runs = history.runs()
+            if not runs:
+                print(f"No runs in {args.history}")
+                return 0
+            run_id = runs[-1]['id']
+
+        found = regressions(history, run_id, thresholds, args.window, args.min_runs)
+        write_report(args.report, render_report(history, run_id, thresholds, args.window,
+                                                args.min_runs))
+    finally:
+        history.close()
+
+    print(f"\n{'✗' if found else '✓'} {len(found)} regression(s) against the rolling "
+          f"baseline; report: {args.report}")
+    print_regressions(found)
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
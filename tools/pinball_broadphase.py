@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Ball/bumper broadphase benchmark for the headless pinball simulation
+Times the bumper pass of PinballBatch.step per frame for the brute-force
+loop (every ball against every bumper, like EnhancedPinballGame.update)
+and for the uniform-grid broadphase, over a range of ball and bumper
+counts. Layouts with more than the three stock bumpers are scattered
+randomly over the upper part of the table.
+
+Walls are three half-plane comparisons per ball and stay out of the grid.
+
+Usage:
+    python3 -m tools.pinball_broadphase [--balls 1000,4000,16000] [--bumpers 3,12,24,48]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from tools.pinball_sim import BROADPHASES, POLICIES, GameConfig, Layout, PinballBatch
+
+BALLS_PER_GAME = 4
+
+
+def scattered_layout(count, seed=0, width=800, height=600, ball_radius=10):
+    """`count` non-overlapping bumpers with room for a ball between any two"""
+    if count <= 3:
+        layout = Layout.default(width, height)
+        return Layout(width, height, layout.bumpers[:count])
+    rng = np.random.default_rng(seed)
+    bumpers = []
+    for _ in range(count * 1000):
+        radius = rng.uniform(12, 25)
+        x = rng.uniform(60, width - 60)
+        y = rng.uniform(60, height * 0.7)
+        if all(np.hypot(x - bx, y - by) > radius + br + 2 * ball_radius + 2
+               for bx, by, br in bumpers):
+            bumpers.append((x, y, radius))
+            if len(bumpers) == count:
+                return Layout(width, height, np.array(bumpers))
+    raise ValueError(f'could not place {count} bumpers on a {width}x{height} table')
+
+
+def time_bumper_pass(balls, layout, broadphase, frames=200, warmup=100, seed=1):
+    """Mean seconds per frame spent in the bumper pass"""
+    games = max(1, balls // BALLS_PER_GAME)
+    sim = PinballBatch(games, BALLS_PER_GAME, config=GameConfig(), layout=layout,
+                       seed=seed, broadphase=broadphase)
+    policy = POLICIES['track']()
+    # Let the balls spread over the table before measuring
+    sim.run(warmup, policy=policy)
+
+    collide = sim._collide_bumpers if sim.grid is None else sim._collide_bumpers_grid
+    spent = 0.0
+
+    def timed(live):
+        nonlocal spent
+        start = time.perf_counter()
+        collide(live)
+        spent += time.perf_counter() - start
+
+    if sim.grid is None:
+        sim._collide_bumpers = timed
+    else:
+        sim._collide_bumpers_grid = timed
+    sim.run(frames, policy=policy)
+    return spent / frames, sim
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--balls', default='1000,4000,16000,64000',
+                        help='comma-separated total ball counts')
+    parser.add_argument('--bumpers', default='3,12,24,48',
+                        help='comma-separated bumper counts')
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    ball_counts = [int(v) for v in args.balls.split(',')]
+    bumper_counts = [int(v) for v in args.bumpers.split(',')]
+
+    print("=" * 72)
+    print("Physics Pinball - Bumper Broadphase Benchmark")
+    print("=" * 72)
+    print(f"  {BALLS_PER_GAME} balls per game, {args.frames} frames, "
+          f"bumper pass time per frame")
+    print(f"\n  {'bumpers':>7s} {'balls':>7s} {'cells':>7s} "
+          + ' '.join(f"{name + ' ms':>9s}" for name in BROADPHASES)
+          + f" {'speedup':>8s} {'ns/ball':>8s}")
+
+    for count in bumper_counts:
+        layout = scattered_layout(count, seed=args.seed)
+        for balls in ball_counts:
+            times = {}
+            for name in BROADPHASES:
+                times[name], sim = time_bumper_pass(balls, layout, name, args.frames,
+                                                    seed=args.seed)
+            grid = sim.grid
+            print(f"  {count:7d} {balls:7d} {grid.nx:3d}x{grid.ny:<3d} "
+                  + ' '.join(f"{times[name] * 1000:9.3f}" for name in BROADPHASES)
+                  + f" {times['brute'] / times['grid']:7.2f}x"
+                  f" {times['grid'] / balls * 1e9:8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Continuous collision check for the pinball physics
+Replays simulated ball trajectories frame by frame and sweeps the ball
+circle along each frame's integration step (position.add(velocity)). A
+frame is flagged when the swept circle touches a bumper or the paddle
+although the discrete, point-in-time checks of EnhancedPinballGame.update
+see no contact. For each flagged frame it computes the smallest number of
+equal substeps that would have caught the contact, and reports the worst
+case per speed band.
+
+Walls are half-plane tests (ball.position.x < wallThickness + radius), so
+a discrete step cannot skip them; only bumpers and the paddle can tunnel.
+
+Usage:
+    python3 -m tools.pinball_ccd [--games 500] [--frames 5000] [--maxBallSpeed 40]
+"""
+
+import argparse
+import math
+import sys
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+from tools.pinball_sim import (
+    CONTACT_EPSILON, PADDLE_HEIGHT, PADDLE_WIDTH, POLICIES, GameConfig, PinballBatch,
+    box_interval,
+)
+
+# Per-frame displacement bands in px/frame
+SPEED_BANDS = [0, 5, 10, 15, 20, 25, 30, 40, 60]
+MAX_SUBSTEPS = 64
+
+
+def circle_interval(x0, y0, dx, dy, cx, cy, radius):
+    """
+    Parameter interval (t_in, t_out) during which p0 + t*d lies inside the
+    circle; t_in >= t_out where the line misses it. Elementwise.
+    """
+    fx, fy = x0 - cx, y0 - cy
+    a = dx * dx + dy * dy
+    b = 2 * (fx * dx + fy * dy)
+    c = fx * fx + fy * fy - radius * radius
+    disc = b * b - 4 * a * c
+    with np.errstate(invalid='ignore', divide='ignore'):
+        root = np.sqrt(np.where(disc > 0, disc, 0))
+        t_in = np.where((disc > 0) & (a > 0), (-b - root) / (2 * a), np.inf)
+        t_out = np.where((disc > 0) & (a > 0), (-b + root) / (2 * a), -np.inf)
+    return t_in, t_out
+
+
+def tunnelled(t_in, t_out):
+    """
+    Contact strictly inside the step: the path enters and leaves the shape
+    between the start point (t=0, checked last frame) and the end point
+    (t=1, checked this frame).
+    """
+    return (t_in > 0) & (t_out < 1) & (t_in < t_out)
+
+
+def substeps_needed(t_in, t_out, limit=MAX_SUBSTEPS):
+    """
+    Smallest n such that one of the sample points k/n (k = 1..n) falls
+    inside (t_in, t_out); `limit + 1` where even `limit` substeps miss.
+    """
+    needed = np.full(t_in.shape, limit + 1)
+    pending = np.ones(t_in.shape, dtype=bool)
+    for n in range(1, limit + 1):
+        k = np.floor(t_in * n) + 1
+        hit = pending & (k < t_out * n)
+        needed[hit] = n
+        pending &= ~hit
+        if not pending.any():
+            break
+    return needed
+
+
+def chord_substeps(speed, radius, depth=1.0):
+    """
+    Substeps that guarantee a contact at least `depth` px deep into a circle
+    of `radius` is sampled: the step must be no longer than that chord.
+    """
+    chord = 2 * math.sqrt(max(2 * radius * depth - depth * depth, 0))
+    return max(1, math.ceil(speed / chord))
+
+
+@dataclass
+class BandStats:
+    frames: int = 0
+    tunnelled: int = 0
+    worst: int = 0
+    by_target: dict = field(default_factory=dict)
+
+
+class CCDChecker:
+    """Accumulates per-speed-band tunnelling statistics from replayed frames"""
+
+    def __init__(self, sim, bands=SPEED_BANDS, limit=MAX_SUBSTEPS):
+        self.sim = sim
+        self.bands = list(bands)
+        self.limit = limit
+        self.stats = [BandStats() for _ in self.bands]
+        # (frame, game, ball, target, speed, substeps) for every flagged frame
+        self.incidents = []
+        self.frame = 0
+
+    def observe(self):
+        """Check the integration segment of the frame the sim just stepped"""
+        live, x0, y0, x1, y1 = self.sim.segment
+        self.frame += 1
+        if not live.any():
+            return
+        r = self.sim.config.ballRadius
+        dx, dy = x1 - x0, y1 - y0
+        speed = np.hypot(dx, dy)
+        band = np.searchsorted(self.bands, speed, side='right') - 1
+
+        counts = np.bincount(band[live], minlength=len(self.bands))
+        for i, count in enumerate(counts):
+            self.stats[i].frames += int(count)
+
+        targets = []
+        for b, (bx, by, _) in enumerate(self.sim.layout.bumpers):
+            radius = r + self.sim.bumper_radius[:, b:b + 1] - CONTACT_EPSILON
+            targets.append((f'bumper {b}', *circle_interval(x0, y0, dx, dy, bx, by, radius)))
+
+        px = self.sim.paddle_x[:, None]
+        py = self.sim.layout.paddle_y
+        t_in, t_out = box_interval(x0, y0, dx, dy, px, py - r, px + PADDLE_WIDTH,
+                                   py + PADDLE_HEIGHT + r)
+        # The paddle only collides with falling balls
+        falling = dy > 0
+        targets.append(('paddle', np.where(falling, t_in, np.inf),
+                        np.where(falling, t_out, -np.inf)))
+
+        for name, t_in, t_out in targets:
+            flagged = live & tunnelled(t_in, t_out)
+            if not flagged.any():
+                continue
+            needed = substeps_needed(t_in[flagged], t_out[flagged], self.limit)
+            games, balls = np.nonzero(flagged)
+            for g, k, n, s, i in zip(games, balls, needed, speed[flagged], band[flagged]):
+                stats = self.stats[i]
+                stats.tunnelled += 1
+                stats.worst = max(stats.worst, int(n))
+                stats.by_target[name] = stats.by_target.get(name, 0) + 1
+                self.incidents.append((self.frame, int(g), int(k), name, float(s), int(n)))
+
+    def report(self):
+        r = self.sim.config.ballRadius
+        smallest = r + float(self.sim.layout.bumpers[:, 2].min())
+        rows = []
+        for i, stats in enumerate(self.stats):
+            low = self.bands[i]
+            high = self.bands[i + 1] if i + 1 < len(self.bands) else math.inf
+            rows.append({
+                'band': (low, high),
+                'frames': stats.frames,
+                'tunnelled': stats.tunnelled,
+                'substeps_observed': max(stats.worst, 1 if stats.frames else 0),
+                'substeps_1px': chord_substeps(high if high != math.inf else low, smallest),
+                'targets': dict(stats.by_target),
+            })
+        return rows
+
+
+def check_simulation(games=500, frames=5000, config=None, seed=1, policy='track'):
+    sim = PinballBatch(games, config=config, seed=seed, record_segments=True)
+    checker = CCDChecker(sim)
+    choose = POLICIES[policy]()
+    for _ in range(frames):
+        if sim.game_over.all():
+            break
+        sim.step(*(choose(sim) if choose else ()))
+        checker.observe()
+    return checker
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=500)
+    parser.add_argument('--frames', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='track')
+    parser.add_argument('--maxBallSpeed', type=float,
+                        help='override GameConfig.maxBallSpeed to stress fast balls')
+    parser.add_argument('--ballSpeed', type=float, help='override GameConfig.ballSpeed')
+    parser.add_argument('--incidents', type=int, default=10,
+                        help='number of flagged frames to list')
+    args = parser.parse_args(argv)
+
+    config = GameConfig.from_source()
+    overrides = {k: getattr(args, k) for k in ('maxBallSpeed', 'ballSpeed')
+                 if getattr(args, k) is not None}
+    config = replace(config, **overrides)
+
+    checker = check_simulation(args.games, args.frames, config, args.seed, args.policy)
+
+    print("=" * 72)
+    print("Physics Pinball - Continuous Collision Check")
+    print("=" * 72)
+    print(f"  maxBallSpeed {config.maxBallSpeed}, ballSpeed {config.ballSpeed}, "
+          f"{args.games} games x {checker.frame} frames")
+    print(f"\n  {'px/frame':>11s} {'frames':>10s} {'tunnelled':>10s} "
+          f"{'substeps':>9s} {'for 1px':>8s}  targets")
+    for row in checker.report():
+        low, high = row['band']
+        label = f"{low:g}-{high:g}" if high != math.inf else f">={low:g}"
+        targets = ', '.join(f"{k}: {v}" for k, v in sorted(row['targets'].items()))
+        observed = row['substeps_observed']
+        observed = f">{MAX_SUBSTEPS}" if observed > MAX_SUBSTEPS else str(observed)
+        print(f"  {label:>11s} {row['frames']:10d} {row['tunnelled']:10d} "
+              f"{observed:>9s} {row['substeps_1px']:8d}  {targets}")
+
+    print("\n  substeps: smallest substep count that catches every flagged frame")
+    print("  for 1px:  substeps that sample every bumper contact at least 1px deep")
+
+    if checker.incidents and args.incidents:
+        print(f"\n  First {min(args.incidents, len(checker.incidents))} "
+              f"of {len(checker.incidents)} flagged frames:")
+        for frame, game, ball, target, speed, needed in checker.incidents[:args.incidents]:
+            needed = f">{MAX_SUBSTEPS}" if needed > MAX_SUBSTEPS else needed
+            print(f"    frame {frame:6d} game {game:5d} ball {ball} {target:9s} "
+                  f"{speed:6.2f} px/frame -> {needed} substeps")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
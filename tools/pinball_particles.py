@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Particle and floating-score benchmark: pooled effects vs the old objects
+Runs the workload of physics-pinball/particle-bench.js - collision bursts
+from N balls feeding particles, floating scores and score pops, the same
+events and Math.random stream for both implementations - and compares
+  legacy  one object per effect, removed with splice (the old game code)
+  pooled  the fixed-capacity typed-array pools of effects.js (swap-remove)
+Per frame it times update and draw and samples the JS heap. Heap churn is
+the sum of the heap's growth between samples (bytes allocated between
+collections) and the number of times the heap shrank (collections).
+
+Engines:
+    node     render-cache.js, effects.js and particle-bench.js in Node
+             (--expose-gc) with a call-counting stub canvas; no raster
+             cost, precise heap usage
+    browser  particle-bench.html in headless Chromium with a real canvas,
+             flushed every frame, and --enable-precise-memory-info
+
+Usage:
+    python3 -m tools.pinball_particles [--engine node] [--balls 1,8,16] \
+        [--frames 3600] [--seed 1] [--json out.json]
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+
+from tools.browser import add_browser_arguments, base_url_or_serve, chromium
+from tools.pinball_profile import FRAME_BUDGET_MS, percentiles
+from tools.site import ROOT, game_url
+
+GAME_DIR = ROOT / 'physics-pinball'
+# In page order: particle-bench.html loads these before its own script
+SOURCES = [GAME_DIR / 'render-cache.js', GAME_DIR / 'effects.js', GAME_DIR / 'particle-bench.js']
+BENCH_PAGE = 'particle-bench.html'
+IMPLS = ['legacy', 'pooled']
+# Frames run untimed first so both implementations are measured JIT-compiled
+WARMUP_FRAMES = 300
+
+NODE_HARNESS = r"""
+const fs = require('fs');
+let calls = 0;
+const ctx = {};
+for (const name of ['save', 'restore', 'beginPath', 'arc', 'fill', 'fillText', 'strokeText',
+                    'translate', 'rotate', 'scale', 'transform', 'setTransform', 'clearRect',
+                    'drawImage']) {
+    ctx[name] = () => { calls++; };
+}
+ctx.measureText = text => ({ width: 12 * text.length });
+// Sprite canvases draw into the same counting context
+globalThis.document = { createElement: () => ({ width: 0, height: 0, getContext: () => ctx }) };
+
+// Top-level classes of an indirect eval stay in its scope; export the runner
+(0, eval)(process.argv.slice(1).map(path => fs.readFileSync(path, 'utf8')).join('\n') +
+    '\nglobalThis.runParticleBench = runParticleBench;');
+const heapUsed = () => process.memoryUsage().heapUsed;
+
+const { runs, warmup } = JSON.parse(fs.readFileSync(0, 'utf8'));
+const out = runs.map(({ impl, options }) => {
+    runParticleBench(impl, { ...options, frames: warmup, ctx });
+    global.gc();
+    calls = 0;
+    const result = runParticleBench(impl, { ...options, ctx, heapUsed });
+    result.ctx_calls = calls;
+    return result;
+});
+process.stdout.write(JSON.stringify(out));
+"""
+
+BROWSER_RUN = """
+([impl, options, warmup]) => {
+    const canvas = document.getElementById('bench-canvas');
+    const ctx = canvas.getContext('2d');
+    const flush = () => ctx.getImageData(0, 0, 1, 1);
+    runParticleBench(impl, { ...options, frames: warmup, ctx, flush });
+    if (window.gc) window.gc();
+    return runParticleBench(impl, { ...options, ctx, flush,
+        heapUsed: () => performance.memory.usedJSHeapSize });
+}
+"""
+BROWSER_ARGS = ['--enable-precise-memory-info', '--js-flags=--expose-gc']
+
+
+def bench_runs(balls, frames, seed, snapshot=()):
+    """One run per implementation and ball count, in the order results come back"""
+    return [{'impl': impl, 'options': {'frames': frames, 'balls': b, 'seed': seed,
+                                       'snapshot': list(snapshot)}}
+            for b in balls for impl in IMPLS]
+
+
+def run_node(balls, frames=3600, seed=1, snapshot=(), warmup=WARMUP_FRAMES):
+    node = shutil.which('node')
+    if node is None:
+        raise RuntimeError('node is required to run the particle benchmark')
+    payload = json.dumps({'runs': bench_runs(balls, frames, seed, snapshot), 'warmup': warmup})
+    proc = subprocess.run([node, '--expose-gc', '-e', NODE_HARNESS, *map(str, SOURCES)],
+                          input=payload, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def run_browser(balls, frames=3600, seed=1, warmup=WARMUP_FRAMES, base_url=None, chrome=None,
+                headed=False):
+    results = []
+    with base_url_or_serve(base_url) as url, \
+            chromium(chrome, headless=not headed, args=BROWSER_ARGS) as browser:
+        page = browser.new_page()
+        page.goto(game_url(url, 'physics-pinball') + BENCH_PAGE)
+        page.wait_for_function('() => typeof runParticleBench === "function"')
+        for run in bench_runs(balls, frames, seed):
+            results.append(page.evaluate(BROWSER_RUN, [run['impl'], run['options'], warmup]))
+    return results
+
+
+def heap_churn(heap):
+    """(bytes the heap grew by between samples, number of samples where it shrank)"""
+    if heap is None or len(heap) < 2:
+        return 0.0, 0
+    deltas = np.diff(np.asarray(heap, dtype=float))
+    return float(deltas[deltas > 0].sum()), int((deltas < 0).sum())
+
+
+def summarise(result, balls):
+    update = np.asarray(result['update'])
+    draw = np.asarray(result['draw'])
+    frames = max(len(update), 1)
+    grown, drops = heap_churn(result['heap'])
+    return {
+        'impl': result['impl'],
+        'balls': balls,
+        'frames': len(update),
+        'update_ms': percentiles(update),
+        'draw_ms': percentiles(draw),
+        'frame_ms': percentiles(update + draw),
+        'over_budget': int((update + draw > FRAME_BUDGET_MS).sum()),
+        'alloc_kb_per_frame': grown / 1024 / frames,
+        'heap_drops': drops,
+        'peak_live': int(max(result['live'], default=0)),
+        'dropped': result['dropped'],
+        'ctx_calls_per_frame': result.get('ctx_calls', 0) / frames,
+    }
+
+
+def benchmark(balls, frames=3600, seed=1, engine='node', **browser):
+    if engine == 'browser':
+        raw = run_browser(balls, frames, seed, **browser)
+    else:
+        raw = run_node(balls, frames, seed)
+    counts = [b for b in balls for _ in IMPLS]
+    return [summarise(result, b) for result, b in zip(raw, counts)]
+
+
+def print_rows(rows):
+    print(f"{'balls':>5s} {'impl':8s} {'update p50/p99 ms':>18s} {'draw p50/p99 ms':>16s} "
+          f"{'alloc KB/f':>10s} {'GCs':>5s} {'peak':>6s} {'ctx/f':>7s}")
+    for r in rows:
+        print(f"{r['balls']:5d} {r['impl']:8s} "
+              f"{r['update_ms']['p50']:8.3f}/{r['update_ms']['p99']:<8.3f} "
+              f"{r['draw_ms']['p50']:7.3f}/{r['draw_ms']['p99']:<7.3f} "
+              f"{r['alloc_kb_per_frame']:10.2f} {r['heap_drops']:5d} {r['peak_live']:6d} "
+              f"{r['ctx_calls_per_frame']:7.0f}")
+        if r['dropped']:
+            print(f"      ✗ {r['dropped']} effects dropped by a full pool")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='\n'.join(__doc__.strip().splitlines()[1:]))
+    add_browser_arguments(parser)
+    parser.add_argument('--engine', choices=['node', 'browser'], default='node')
+    parser.add_argument('--balls', default='1,8,16',
+                        help='comma-separated balls feeding collisions, one run each')
+    parser.add_argument('--frames', type=int, default=3600)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='also write the results to this JSON file')
+    args = parser.parse_args(argv)
+    balls = [int(v) for v in args.balls.split(',')]
+    browser = ({'base_url': args.base_url, 'chrome': args.chrome, 'headed': args.headed}
+               if args.engine == 'browser' else {})
+
+    print("=" * 70)
+    print(f"Pinball effects: legacy objects vs pooled typed arrays ({args.engine}, "
+          f"{args.frames} frames)")
+    print("=" * 70)
+    rows = benchmark(balls, args.frames, args.seed, args.engine, **browser)
+    print_rows(rows)
+
+    print()
+    for b in balls:
+        legacy, pooled = (next(r for r in rows if r['balls'] == b and r['impl'] == impl)
+                          for impl in IMPLS)
+        speedup = legacy['frame_ms']['p50'] / max(pooled['frame_ms']['p50'], 1e-9)
+        print(f"{b:2d} ball(s): frame p50 x{speedup:.2f}, allocations "
+              f"{legacy['alloc_kb_per_frame']:.1f} → {pooled['alloc_kb_per_frame']:.1f} KB/frame, "
+              f"GCs {legacy['heap_drops']} → {pooled['heap_drops']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Frame-time profiler for physics-pinball in a headless browser
+Loads physics-pinball/index.html, wraps the game's loop(timestamp), update(),
+updateAnimations() and draw() - plus Ball.prototype.draw and drawAnimations()
+inside draw() - with performance.now() timers, and plays a scripted
+session: Space to launch, an autopilot on the paddle, then phases with
+more balls added on the table. Reports frame intervals and per-phase work
+as p50/p95/p99, dropped frames and an interval histogram per phase.
+
+Drained balls respawn and relaunch instead of costing a life, so every
+phase runs for its full length.
+
+Usage:
+    python3 -m tools.pinball_profile [--balls 1,4,8,16] [--seconds 10] [--json out.json]
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from tools.browser import add_browser_arguments, base_url_or_serve, chromium
+from tools.site import game_url
+
+FRAME_BUDGET_MS = 1000 / 60
+# Rows kept per phase; 10 s at 60 Hz needs 600
+CAPACITY = 1 << 16
+
+# Column layout of a sample row, in the order the hooks write them
+COLUMNS = ['timestamp', 'loop', 'update', 'animations', 'draw', 'balls', 'effects',
+           'ticked', 'particles', 'ball_count']
+PHASES = ['update', 'animations', 'draw', 'balls', 'effects']
+
+INTERVAL_BINS = [0, 8.3, 16.7, 20, 25, 33.3, 50, 100, np.inf]
+
+HOOKS = """
+(capacity) => {
+    const game = window.enhancedGame;
+    if (!game || window.__frameProfiler) return !!game;
+
+    const FIELDS = %(fields)d;
+    const rows = new Float64Array(capacity * FIELDS);
+    const now = () => performance.now();
+    const prof = { count: 0, drains: 0, targetBalls: 1, recording: false };
+    // Offset of the row of the rAF callback in progress, null when not recording
+    let row = null;
+
+    function timed(owner, name, slot) {
+        const original = owner[name];
+        owner[name] = function (...args) {
+            const start = now();
+            try {
+                return original.apply(this, args);
+            } finally {
+                if (row !== null) rows[row + slot] += now() - start;
+            }
+        };
+    }
+
+    // update() and draw() are looked up on the instance every frame
+    timed(game, 'update', %(update)d);
+    timed(game, 'updateAnimations', %(animations)d);
+    timed(game, 'draw', %(draw)d);
+    timed(game, 'drawAnimations', %(effects)d);
+    timed(Ball.prototype, 'draw', %(balls)d);
+
+    const update = game.update;
+    game.update = function () {
+        if (row !== null) rows[row + %(ticked)d] = 1;
+        return update.apply(this, arguments);
+    };
+
+    game.handleLifeLost = function () {
+        prof.drains++;
+        if (this.elements.balls.length === 0) {
+            this.spawnBall();
+            this.launchBall();
+        }
+    };
+
+    function addBall() {
+        const ball = new Ball(game.width * (0.2 + 0.6 * Math.random()), game.height * 0.25);
+        ball.velocity = new Vector2((Math.random() - 0.5) * 10, -Math.random() * 5);
+        ball.launched = true;
+        game.elements.balls.push(ball);
+    }
+
+    function steer() {
+        const balls = game.elements.balls;
+        if (game.state.running) {
+            while (balls.length < prof.targetBalls) addBall();
+        }
+        let lowest = null;
+        for (const ball of balls) {
+            if (ball.active && (!lowest || ball.position.y > lowest.position.y)) lowest = ball;
+        }
+        const paddle = game.elements.paddles[0];
+        if (!lowest || !paddle) return;
+        const centre = paddle.position.x + paddle.width / 2;
+        game.input.left = lowest.position.x < centre - 10;
+        game.input.right = lowest.position.x > centre + 10;
+    }
+
+    // loop is bound once in init() and re-read from the instance for every
+    // requestAnimationFrame, so replacing it here wraps all later frames
+    const loop = game.loop;
+    game.loop = function (timestamp) {
+        row = prof.recording && prof.count < capacity ? prof.count++ * FIELDS : null;
+        if (row !== null) rows[row] = timestamp;
+        const start = now();
+        steer();
+        loop(timestamp);
+        if (row !== null) {
+            rows[row + %(loop)d] = now() - start;
+            rows[row + %(particles)d] = game.animations.particles.length;
+            rows[row + %(ball_count)d] = game.elements.balls.length;
+        }
+        row = null;
+    };
+
+    prof.start = (balls) => {
+        rows.fill(0);
+        prof.count = 0;
+        prof.drains = 0;
+        prof.targetBalls = balls;
+        game.elements.balls.splice(Math.max(balls, 1));
+        prof.recording = true;
+    };
+    prof.stop = () => {
+        prof.recording = false;
+        return {
+            rows: Array.from(rows.subarray(0, prof.count * FIELDS)),
+            drains: prof.drains,
+        };
+    };
+
+    window.__frameProfiler = prof;
+    return true;
+}
+""" % dict(fields=len(COLUMNS), **{name: i for i, name in enumerate(COLUMNS)})
+
+
+def percentiles(values):
+    if len(values) == 0:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99),
+            'max': float(np.max(values))}
+
+
+def frame_stats(rows, budget=FRAME_BUDGET_MS):
+    """
+    Summarise sample rows (one per requestAnimationFrame callback). Frame
+    time is the interval between callbacks that ran a game tick; a frame
+    interval of n budgets counts n - 1 dropped frames.
+    """
+    rows = np.asarray(rows, dtype=float).reshape(-1, len(COLUMNS))
+    col = {name: rows[:, i] for i, name in enumerate(COLUMNS)}
+    ticked = col['ticked'] > 0
+    ticks = rows[ticked]
+    intervals = np.diff(ticks[:, COLUMNS.index('timestamp')])
+    work = sum(ticks[:, COLUMNS.index(name)] for name in ('update', 'animations', 'draw'))
+    span = (intervals.sum() / 1000) if len(intervals) else 0.0
+    histogram, _ = np.histogram(intervals, bins=INTERVAL_BINS)
+    return {
+        'callbacks': int(len(rows)),
+        'ticks': int(ticked.sum()),
+        'idle_callbacks': int((~ticked).sum()),
+        'fps': float(len(intervals) / span) if span else 0.0,
+        'frame_ms': percentiles(intervals),
+        'work_ms': percentiles(work),
+        'over_budget': int((work > budget).sum()),
+        'dropped': int(np.maximum(np.rint(intervals / budget) - 1, 0).sum()),
+        'phase_ms': {name: float(ticks[:, COLUMNS.index(name)].mean()) if len(ticks) else 0.0
+                     for name in PHASES},
+        'max_particles': int(col['particles'].max()) if len(rows) else 0,
+        'histogram': [int(n) for n in histogram],
+    }
+
+
+def profile_session(page, ball_counts, seconds):
+    """Play one phase per ball count; returns {balls: stats}"""
+    if not page.evaluate(HOOKS, CAPACITY):
+        raise RuntimeError('window.enhancedGame not found on the page')
+    page.keyboard.press('Space')
+    results = {}
+    for balls in ball_counts:
+        page.evaluate('(balls) => window.__frameProfiler.start(balls)', balls)
+        page.wait_for_timeout(seconds * 1000)
+        sample = page.evaluate('() => window.__frameProfiler.stop()')
+        stats = frame_stats(sample['rows'])
+        stats['drains'] = sample['drains']
+        results[balls] = stats
+    return results
+
+
+def print_histogram(stats):
+    total = max(sum(stats['histogram']), 1)
+    for low, high, count in zip(INTERVAL_BINS, INTERVAL_BINS[1:], stats['histogram']):
+        label = f"{low:5.1f}-{high:<5.1f}" if high != np.inf else f"{low:5.1f}+     "
+        bar = '#' * round(40 * count / total)
+        print(f"      {label} ms {count:6d} {bar}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_browser_arguments(parser)
+    parser.add_argument('--balls', default='1,4,8,16',
+                        help='comma-separated balls on the table, one phase each')
+    parser.add_argument('--seconds', type=float, default=10, help='length of each phase')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=800)
+    parser.add_argument('--json', help='also write the results to this JSON file')
+    args = parser.parse_args(argv)
+    ball_counts = [int(v) for v in args.balls.split(',')]
+
+    with base_url_or_serve(args.base_url) as base_url, \
+            chromium(args.chrome, headless=not args.headed) as browser:
+        page = browser.new_page(viewport={'width': args.width, 'height': args.height})
+        errors = []
+        page.on('pageerror', lambda e: errors.append(str(e)))
+        page.goto(game_url(base_url, 'physics-pinball'))
+        page.wait_for_function('() => window.enhancedGame')
+        results = profile_session(page, ball_counts, args.seconds)
+
+    print("=" * 72)
+    print("Physics Pinball - Frame Time Profile")
+    print("=" * 72)
+    print(f"  {args.width}x{args.height}, {args.seconds:g} s per phase, "
+          f"budget {FRAME_BUDGET_MS:.2f} ms")
+    for balls, stats in results.items():
+        frame, work = stats['frame_ms'], stats['work_ms']
+        holds = frame['p95'] <= FRAME_BUDGET_MS * 1.5
+        print(f"\n  {'✓' if holds else '✗'} {balls} ball(s): {stats['fps']:.1f} fps, "
+              f"{stats['ticks']} ticks, {stats['dropped']} dropped frames, "
+              f"{stats['idle_callbacks']} rAF callbacks without a tick")
+        print(f"      frame ms  p50 {frame['p50']:6.2f}  p95 {frame['p95']:6.2f}  "
+              f"p99 {frame['p99']:6.2f}  max {frame['max']:6.2f}")
+        print(f"      work ms   p50 {work['p50']:6.2f}  p95 {work['p95']:6.2f}  "
+              f"p99 {work['p99']:6.2f}  max {work['max']:6.2f}  "
+              f"({stats['over_budget']} over budget)")
+        print("      mean ms   " + '  '.join(
+            f"{name} {ms:.3f}" for name, ms in stats['phase_ms'].items()))
+        print(f"      particles max {stats['max_particles']}, drains {stats['drains']}")
+        print_histogram(stats)
+
+    for error in errors:
+        print(f"  ✗ page error: {error}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'budget_ms': FRAME_BUDGET_MS, 'seconds': args.seconds,
+                       'viewport': [args.width, args.height],
+                       'phases': {str(k): v for k, v in results.items()}}, f, indent=2)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
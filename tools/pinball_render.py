@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Draw-call and fill-rate census of the pinball renderer, headless under Node
+Loads render-cache.js, effects.js and a game-enhanced.js with a stub DOM
+whose 2D contexts record every drawing call, then plays a seeded session
+(balls launched on the table, a paddle autopilot, drained balls respawned)
+one update() / updateAnimations() / draw() per frame. Per frame and per
+target (the on-screen canvas vs offscreen layers and sprites) it counts
+  gradients   createLinearGradient / createRadialGradient calls
+  shadowed    fills, strokes, text and drawImage with shadowBlur > 0
+  painted px  device pixels covered by each operation's bounding box
+  blurred px  the part of those that went through a shadow blur
+  full        operations covering most of the canvas (full-screen passes)
+Pixel counts follow the current transform, so they are in device pixels
+at the chosen devicePixelRatio. They are bounding-box estimates: a proxy
+for fill rate, not a raster measurement.
+
+--compare runs the same session with another game-enhanced.js, e.g. one
+saved from an older revision with `git show REV:physics-pinball/game-enhanced.js`.
+
+Usage:
+    python3 -m tools.pinball_render [--frames 600] [--balls 1,8] [--dpr 2] \
+        [--source game-enhanced.js] [--compare OLD.js] [--json out.json]
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+
+from tools.site import ROOT
+
+GAME_DIR = ROOT / 'physics-pinball'
+GAME_SOURCE = GAME_DIR / 'game-enhanced.js'
+# Loaded before the game, as in index.html
+LIBRARIES = [GAME_DIR / 'render-cache.js', GAME_DIR / 'effects.js']
+METRICS = ['ops', 'gradients', 'shadowed', 'painted_px', 'blurred_px', 'draw_images', 'full']
+# Frames skipped in the steady-state summary: sprites are rasterized on first use
+WARMUP_FRAMES = 60
+
+HARNESS = r"""
+const fs = require('fs');
+const input = JSON.parse(fs.readFileSync(0, 'utf8'));
+const [width, height] = input.size;
+
+let state = 0x9e3779b9 ^ input.seed;
+Math.random = function () {
+    state = (state + 0x6D2B79F5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+};
+
+// ---- recording 2D context -------------------------------------------------
+const counters = {};
+function counter(target) {
+    return counters[target] || (counters[target] = { ops: 0, gradients: 0, shadowed: 0,
+        painted_px: 0, blurred_px: 0, draw_images: 0, full: 0 });
+}
+const gradient = () => ({ addColorStop() {} });
+
+class Recorder {
+    constructor(canvas, target) {
+        this.canvas = canvas;
+        this.target = target;
+        this.m = [1, 0, 0, 1, 0, 0];
+        this.stack = [];
+        this.shadowBlur = 0;
+        this.shadowColor = 'rgba(0, 0, 0, 0)';
+        this.lineWidth = 1;
+        this.font = '10px sans-serif';
+        this.path = null;
+    }
+    get counts() { return counter(this.target); }
+    save() { this.stack.push([this.m.slice(), this.shadowBlur, this.shadowColor, this.lineWidth, this.font]); }
+    restore() {
+        const saved = this.stack.pop();
+        if (saved) [this.m, this.shadowBlur, this.shadowColor, this.lineWidth, this.font] = saved;
+    }
+    transform(a, b, c, d, e, f) {
+        const [A, B, C, D, E, F] = this.m;
+        this.m = [A * a + C * b, B * a + D * b, A * c + C * d, B * c + D * d,
+                  A * e + C * f + E, B * e + D * f + F];
+    }
+    setTransform(a, b, c, d, e, f) { this.m = [a, b, c, d, e, f]; }
+    resetTransform() { this.m = [1, 0, 0, 1, 0, 0]; }
+    translate(x, y) { this.transform(1, 0, 0, 1, x, y); }
+    scale(x, y) { this.transform(x, 0, 0, y, 0, 0); }
+    rotate(r) { const c = Math.cos(r), s = Math.sin(r); this.transform(c, s, -s, c, 0, 0); }
+    createLinearGradient() { this.counts.gradients++; return gradient(); }
+    createRadialGradient() { this.counts.gradients++; return gradient(); }
+    measureText(text) { return { width: 0.6 * (parseFloat(/(\d+(\.\d+)?)px/.exec(this.font)?.[1]) || 10) * String(text).length }; }
+    getImageData() { return { data: new Uint8ClampedArray(4) }; }
+    // Path bounds in user space; transformed when painted
+    beginPath() { this.path = null; }
+    extend(x0, y0, x1, y1) {
+        const p = this.path;
+        this.path = p ? [Math.min(p[0], x0), Math.min(p[1], y0), Math.max(p[2], x1), Math.max(p[3], y1)]
+                      : [x0, y0, x1, y1];
+    }
+    moveTo(x, y) { this.extend(x, y, x, y); }
+    lineTo(x, y) { this.extend(x, y, x, y); }
+    arc(x, y, r) { this.extend(x - r, y - r, x + r, y + r); }
+    rect(x, y, w, h) { this.extend(x, y, x + w, y + h); }
+    closePath() {}
+    // Device-space area of a user-space box, grown by `pad` user units
+    paint(box, pad = 0) {
+        if (!box) return;
+        const counts = this.counts;
+        const [a, b, c, d, e, f] = this.m;
+        const xs = [], ys = [];
+        for (const [x, y] of [[box[0] - pad, box[1] - pad], [box[2] + pad, box[1] - pad],
+                              [box[0] - pad, box[3] + pad], [box[2] + pad, box[3] + pad]]) {
+            xs.push(a * x + c * y + e);
+            ys.push(b * x + d * y + f);
+        }
+        const w = Math.max(...xs) - Math.min(...xs);
+        const h = Math.max(...ys) - Math.min(...ys);
+        const area = w * h;
+        counts.ops++;
+        counts.painted_px += area;
+        if (area >= 0.9 * this.canvas.width * this.canvas.height) counts.full++;
+        if (this.shadowBlur > 0 && !/rgba\([^)]*,\s*0\)/.test(this.shadowColor)) {
+            // Shadows are blurred in device space
+            const blur = this.shadowBlur * 2;
+            counts.shadowed++;
+            counts.blurred_px += (w + 2 * blur) * (h + 2 * blur);
+        }
+    }
+    fill() { this.paint(this.path); }
+    stroke() { this.paint(this.path, this.lineWidth / 2); }
+    fillRect(x, y, w, h) { this.paint([x, y, x + w, y + h]); }
+    strokeRect(x, y, w, h) { this.paint([x, y, x + w, y + h], this.lineWidth / 2); }
+    clearRect(x, y, w, h) { const blur = this.shadowBlur; this.shadowBlur = 0; this.paint([x, y, x + w, y + h]); this.shadowBlur = blur; }
+    text(text, x, y, pad) {
+        const size = parseFloat(/(\d+(\.\d+)?)px/.exec(this.font)?.[1]) || 10;
+        const w = this.measureText(text).width;
+        this.paint([x - w / 2, y - size / 2, x + w / 2, y + size / 2], pad);
+    }
+    fillText(text, x, y) { this.text(text, x, y, 0); }
+    strokeText(text, x, y) { this.text(text, x, y, this.lineWidth / 2); }
+    drawImage(image, x = 0, y = 0, w = image.width, h = image.height) {
+        this.counts.draw_images++;
+        this.paint([x, y, x + w, y + h]);
+    }
+}
+
+let offscreen = 0;
+function canvas(target) {
+    const el = { width: 300, height: 150, style: {}, dataset: {},
+                 addEventListener() {}, removeEventListener() {}, setAttribute() {}, focus() {} };
+    const context = new Recorder(el, target);
+    el.getContext = () => context;
+    return el;
+}
+
+// Anything else in the DOM: every property is another stub, calls return stubs
+function stub() {
+    const store = {};
+    return new Proxy(function () {}, {
+        get(_, key) {
+            if (key === Symbol.toPrimitive) return () => 0;
+            if (key === 'then') return undefined;
+            if (!(key in store)) store[key] = stub();
+            return store[key];
+        },
+        set(_, key, value) { store[key] = value; return true; },
+        apply: () => stub(),
+        construct: () => stub(),
+    });
+}
+
+const screen = canvas('screen');
+const rect = { width, height };
+screen.parentElement = { getBoundingClientRect: () => ({ ...rect, left: 0, top: 0 }) };
+screen.getBoundingClientRect = () => ({ ...rect, left: 0, top: 0 });
+
+globalThis.window = globalThis;
+window.devicePixelRatio = input.dpr;
+window.addEventListener = () => {};
+window.removeEventListener = () => {};
+globalThis.document = new Proxy(stub(), {
+    get(target, key) {
+        if (key === 'readyState') return 'complete';
+        if (key === 'getElementById') return id => (id === 'game-canvas' ? screen : stub());
+        if (key === 'createElement') return tag => (tag === 'canvas' ? canvas('offscreen') : stub());
+        if (key === 'fonts') return undefined;
+        return target[key];
+    },
+});
+globalThis.localStorage = { getItem: () => null, setItem() {} };
+globalThis.navigator = { vibrate() {} };
+globalThis.requestAnimationFrame = () => 1;
+globalThis.cancelAnimationFrame = () => {};
+globalThis.setTimeout = () => 0;
+globalThis.clearTimeout = () => {};
+console.log = () => {};
+
+(0, eval)(input.sources.map(path => fs.readFileSync(path, 'utf8')).join('\n') +
+    '\nglobalThis.Ball = Ball; globalThis.Vector2 = Vector2;');
+const game = window.enhancedGame;
+
+function addBall() {
+    const ball = new Ball(game.width * (0.2 + 0.6 * Math.random()), game.height * 0.25);
+    ball.velocity = new Vector2((Math.random() - 0.5) * 10, -Math.random() * 5);
+    ball.launched = true;
+    game.elements.balls.push(ball);
+}
+game.handleLifeLost = function () {};
+game.state.running = true;
+const resizes = new Map(input.resizes.map(r => [r[0], r.slice(1)]));
+
+const frames = [];
+for (let frame = 0; frame < input.frames; frame++) {
+    if (resizes.has(frame)) {
+        const [w, h, dpr] = resizes.get(frame);
+        rect.width = w;
+        rect.height = h;
+        window.devicePixelRatio = dpr;
+        game.resize();
+    }
+    const balls = game.elements.balls;
+    for (let i = balls.length - 1; i >= 0; i--) {
+        if (!balls[i].active || balls[i].position.y > game.height + 50) balls.splice(i, 1);
+    }
+    while (balls.length < input.balls) addBall();
+    let lowest = balls[0];
+    for (const ball of balls) if (ball.position.y > lowest.position.y) lowest = ball;
+    const paddle = game.elements.paddles[0];
+    const centre = paddle.position.x + paddle.width / 2;
+    game.input.left = lowest.position.x < centre - 10;
+    game.input.right = lowest.position.x > centre + 10;
+
+    game.update();
+    game.updateAnimations();
+    for (const key in counters) delete counters[key];
+    game.draw();
+    frames.push({ screen: { ...counter('screen') }, offscreen: { ...counter('offscreen') },
+                  balls: balls.length, particles: game.animations.particles.length,
+                  layer_renders: game.renderCache ? game.renderCache.stats.layerRenders : 0 });
+}
+const cache = game.renderCache;
+process.stdout.write(JSON.stringify({
+    frames,
+    canvas: [screen.width, screen.height],
+    cache: cache ? { ...cache.stats, sprites: cache.sprites.size } : null,
+}));
+"""
+
+
+def run_session(source=GAME_SOURCE, frames=600, balls=1, dpr=2, size=(480, 720), seed=1,
+                resizes=()):
+    """Play one session; `resizes` holds (frame, width, height, dpr) tuples"""
+    node = shutil.which('node')
+    if node is None:
+        raise RuntimeError('node is required to run game-enhanced.js')
+    payload = json.dumps({'sources': [str(p) for p in LIBRARIES + [source]], 'frames': frames,
+                          'balls': balls, 'dpr': dpr, 'size': list(size), 'seed': seed,
+                          'resizes': [list(r) for r in resizes]})
+    proc = subprocess.run([node, '-e', HARNESS], input=payload, capture_output=True, text=True,
+                          check=True)
+    return json.loads(proc.stdout)
+
+
+def metric_series(session, target):
+    """{metric: per-frame array} for 'screen' or 'offscreen'"""
+    return {name: np.array([frame[target][name] for frame in session['frames']], dtype=float)
+            for name in METRICS}
+
+
+def summarise(session, warmup=WARMUP_FRAMES):
+    """Per-frame means after warm-up, and totals over the whole session"""
+    out = {'frames': len(session['frames']), 'cache': session['cache']}
+    for target in ('screen', 'offscreen'):
+        series = metric_series(session, target)
+        out[target] = {name: float(values[warmup:].mean()) if len(values) > warmup else 0.0
+                       for name, values in series.items()}
+        out[target + '_total'] = {name: float(values.sum()) for name, values in series.items()}
+    return out
+
+
+def census(source, ball_counts, frames=600, dpr=2, seed=1):
+    return {balls: summarise(run_session(source, frames, balls, dpr, seed=seed))
+            for balls in ball_counts}
+
+
+def print_census(label, results):
+    print(f"\n{label}")
+    print(f"  {'balls':>5s} {'ops/f':>7s} {'grad/f':>7s} {'shadow/f':>9s} {'Mpx/f':>7s} "
+          f"{'blur Mpx/f':>11s} {'full/f':>7s} {'offscreen ops':>14s}")
+    for balls, r in results.items():
+        s = r['screen']
+        print(f"  {balls:5d} {s['ops']:7.1f} {s['gradients']:7.2f} {s['shadowed']:9.2f} "
+              f"{s['painted_px'] / 1e6:7.2f} {s['blurred_px'] / 1e6:11.2f} {s['full']:7.2f} "
+              f"{r['offscreen_total']['ops']:14.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='\n'.join(__doc__.strip().splitlines()[1:]))
+    parser.add_argument('--source', default=str(GAME_SOURCE))
+    parser.add_argument('--compare', help='another game-enhanced.js to run the same sessions on')
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--balls', default='1,8', help='comma-separated balls, one session each')
+    parser.add_argument('--dpr', type=float, default=2, help='devicePixelRatio of the session')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='also write the results to this JSON file')
+    args = parser.parse_args(argv)
+    ball_counts = [int(v) for v in args.balls.split(',')]
+
+    print("=" * 70)
+    print(f"Pinball render census: {args.frames} frames at devicePixelRatio {args.dpr:g}, "
+          f"means after {WARMUP_FRAMES} warm-up frames")
+    print("=" * 70)
+    results = {}
+    for source in filter(None, [args.compare, args.source]):
+        results[source] = census(source, ball_counts, args.frames, args.dpr, args.seed)
+        print_census(source, results[source])
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+Headless physics-pinball simulation
+A NumPy port of Ball.update, Ball.limitSpeed, Ball.bounce and the wall /
+paddle / bumper pass of EnhancedPinballGame.update from
+physics-pinball/game-enhanced.js. Ball state is kept as structure-of-arrays
+of shape (games, balls_per_game), so thousands of independent games advance
+in one vectorized step.
+
+Usage:
+    python3 -m tools.pinball_sim [--games 1000] [--frames 3600] [--seed 1]
+        [--balls 4] [--broadphase grid]
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from tools.checks import CheckEngine, regex
+from tools.site import ROOT
+
+GAME_SOURCE = ROOT / 'physics-pinball' / 'game-enhanced.js'
+
+# Constants that are literals in game-enhanced.js rather than GameConfig fields
+WALL_THICKNESS = 20
+PADDLE_WIDTH = 120
+PADDLE_HEIGHT = 20
+PADDLE_MARGIN = 20          # paddle x is clamped to [20, width - 20 - width]
+PADDLE_OFFSET = 50          # paddle y = height - 50
+LAUNCH_VELOCITY = (-5.0, -15.0)
+BOUNCE_JITTER = 0.05        # bounce() rotates by (random - 0.5) * 0.05 rad
+BUMPER_PULSE = 8            # extra radius at the peak of the hit animation
+BUMPER_DECAY = 0.05
+LIVES = 3
+# Pushed-out balls rest exactly on the contact distance; ignore rounding there
+CONTACT_EPSILON = 1e-6
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    """The physics fields of the JS GameConfig object"""
+    gravity: float = 0.25
+    friction: float = 0.995
+    elasticity: float = 0.85
+    ballRadius: float = 10.0
+    ballSpeed: float = 8.0
+    paddleSpeed: float = 15.0
+    maxBallSpeed: float = 22.0
+    minBallSpeed: float = 3.0
+    bumperScore: int = 100
+
+    @classmethod
+    def from_source(cls, path=GAME_SOURCE):
+        """Read the current values out of game-enhanced.js"""
+        names = {f.name: f.name for f in fields(cls)}
+        names['bumperScore'] = 'bumper'
+        engine = CheckEngine(
+            [regex(field, rf'{key}:\s*([\d.]+)') for field, key in names.items()]
+        )
+        report = engine.scan(open(path, encoding='utf-8').read())
+        values = {}
+        for f in fields(cls):
+            hit = report.first(f.name)
+            if hit:
+                values[f.name] = type(f.default)(float(hit.group(1)))
+        return cls(**values)
+
+
+@dataclass(frozen=True)
+class Layout:
+    """Static table geometry; bumpers is an (n, 3) array of x, y, radius"""
+    width: float
+    height: float
+    bumpers: np.ndarray
+
+    @classmethod
+    def default(cls, width=800, height=600):
+        """The three bumpers placed by EnhancedPinballGame.resetLevel()"""
+        return cls(width, height, np.array([
+            [width * 0.3, height * 0.3, 25],
+            [width * 0.7, height * 0.3, 25],
+            [width * 0.5, height * 0.5, 30],
+        ], dtype=float))
+
+    @property
+    def paddle_y(self):
+        return self.height - PADDLE_OFFSET
+
+    @property
+    def spawn(self):
+        return self.width - 50, self.height - 100
+
+
+BROADPHASES = ('brute', 'grid')
+
+
+class BumperGrid:
+    """
+    Uniform grid over the table, built once from the static bumper layout.
+    Every cell lists, in bumper order, the bumpers whose largest possible
+    contact circle (radius + full hit pulse + ball radius) overlaps it.
+    Positions outside the table clamp to the border cells, which also hold
+    every bumper reaching past the border.
+    """
+
+    def __init__(self, layout, ball_radius, cell_size=None):
+        bumpers = layout.bumpers
+        self.bumper_x = bumpers[:, 0].copy()
+        self.bumper_y = bumpers[:, 1].copy()
+        reach = bumpers[:, 2] + BUMPER_PULSE + ball_radius
+        self.size = float(cell_size or (reach.max() if len(reach) else layout.width))
+        self.nx = max(1, int(np.ceil(layout.width / self.size)))
+        self.ny = max(1, int(np.ceil(layout.height / self.size)))
+
+        members = [[] for _ in range(self.nx * self.ny)]
+        for b, (bx, by, _) in enumerate(bumpers):
+            x0, x1 = self._span(bx - reach[b], bx + reach[b], self.nx)
+            y0, y1 = self._span(by - reach[b], by + reach[b], self.ny)
+            for cy in range(y0, y1 + 1):
+                for cx in range(x0, x1 + 1):
+                    members[cy * self.nx + cx].append(b)
+
+        # Rows padded with a sentinel that sorts after every bumper index
+        self.sentinel = len(bumpers)
+        self.count = np.array([len(m) for m in members])
+        self.table = np.full((len(members), max(self.count.max(), 1)), self.sentinel)
+        for cell, m in enumerate(members):
+            self.table[cell, :len(m)] = m
+
+    def _span(self, low, high, n):
+        return (min(max(int(low // self.size), 0), n - 1),
+                min(max(int(high // self.size), 0), n - 1))
+
+    def cells(self, x, y):
+        ix = np.clip((x // self.size).astype(np.int64), 0, self.nx - 1)
+        iy = np.clip((y // self.size).astype(np.int64), 0, self.ny - 1)
+        return iy * self.nx + ix
+
+    def next_candidate(self, cells, after):
+        """First bumper of each cell with an index above `after`, else sentinel"""
+        rows = self.table[cells]
+        return np.where(rows > after[:, None], rows, self.sentinel).min(axis=1)
+
+
+class PinballBatch:
+    """
+    `games` independent tables with `balls_per_game` ball slots each.
+    The browser game only ever has one ball; with more slots a life is lost
+    when the last ball of a game drains. Per-ball effects on shared game
+    state (combo, multiplier) are applied together once per frame, which is
+    exact for the single-ball case.
+    """
+
+    def __init__(self, games, balls_per_game=1, config=None, layout=None, seed=0,
+                 lives=LIVES, auto_launch=True, detect_tunnelling=False,
+                 record_segments=False, broadphase='brute'):
+        self.config = config or GameConfig()
+        self.layout = layout or Layout.default()
+        self.rng = np.random.default_rng(seed)
+        self.auto_launch = auto_launch
+        self.detect_tunnelling = detect_tunnelling
+        self.record_segments = record_segments
+        if broadphase not in BROADPHASES:
+            raise ValueError(f'broadphase must be one of {BROADPHASES}')
+        self.grid = (BumperGrid(self.layout, self.config.ballRadius)
+                     if broadphase == 'grid' else None)
+        # (live, x0, y0, x1, y1) of the last frame's integration step
+        self.segment = None
+        shape = (games, balls_per_game)
+        n_bumpers = len(self.layout.bumpers)
+
+        # Ball state, structure-of-arrays
+        self.x = np.zeros(shape)
+        self.y = np.zeros(shape)
+        self.vx = np.zeros(shape)
+        self.vy = np.zeros(shape)
+        self.active = np.zeros(shape, dtype=bool)
+        self.launched = np.zeros(shape, dtype=bool)
+        self.age = np.zeros(shape, dtype=np.int64)
+
+        # Per-game state
+        self.paddle_x = np.full(games, self.layout.width / 2 - PADDLE_WIDTH / 2)
+        self.score = np.zeros(games, dtype=np.int64)
+        self.lives = np.full(games, lives, dtype=np.int64)
+        self.combo = np.zeros(games, dtype=np.int64)
+        self.multiplier = np.ones(games, dtype=np.int64)
+        self.running = np.zeros(games, dtype=bool)
+        self.game_over = np.zeros(games, dtype=bool)
+        self.frames = np.zeros(games, dtype=np.int64)
+
+        # Per-game bumper animation (the hit pulse changes the collision radius)
+        self.bumper_anim = np.zeros((games, n_bumpers))
+        self.bumper_radius = np.broadcast_to(
+            self.layout.bumpers[:, 2], (games, n_bumpers)).copy()
+
+        # Counters
+        self.wall_hits = np.zeros(games, dtype=np.int64)
+        self.paddle_hits = np.zeros(games, dtype=np.int64)
+        self.bumper_hits = np.zeros(games, dtype=np.int64)
+        self.tunnels = np.zeros(games, dtype=np.int64)
+        # Frames each drained ball stayed in play, one array per draining frame
+        self.lifetimes = []
+
+        self.spawn(np.ones(games, dtype=bool))
+
+    @property
+    def games(self):
+        return self.x.shape[0]
+
+    def spawn(self, mask):
+        """spawnBall(): fill every slot of the masked games, not yet launched"""
+        sx, sy = self.layout.spawn
+        # Extra multiball slots line up leftwards from the spawn point
+        span = sx - WALL_THICKNESS - 2 * self.config.ballRadius
+        offsets = (np.arange(self.x.shape[1]) * self.config.ballRadius * 2.5) % span
+        self.x[mask] = sx - offsets
+        self.y[mask] = sy
+        self.vx[mask] = 0
+        self.vy[mask] = 0
+        self.active[mask] = True
+        self.launched[mask] = False
+        self.age[mask] = 0
+
+    def launch(self, mask=None):
+        """launchBall() for the masked games that are waiting to launch"""
+        ready = ~self.running & ~self.game_over
+        if mask is not None:
+            ready &= mask
+        balls = ready[:, None] & self.active & ~self.launched
+        self.vx[balls], self.vy[balls] = LAUNCH_VELOCITY
+        self.launched |= balls
+        self.running |= balls.any(axis=1)
+
+    def _bounce(self, balls, nx, ny):
+        """Ball.bounce(): reflect, damp and jitter the masked balls"""
+        e = self.config.elasticity
+        vx, vy = self.vx[balls], self.vy[balls]
+        dot = vx * nx + vy * ny
+        vx = (vx - 2 * dot * nx) * e
+        vy = (vy - 2 * dot * ny) * e
+        angle = (self.rng.random(vx.shape) - 0.5) * BOUNCE_JITTER
+        cos, sin = np.cos(angle), np.sin(angle)
+        self.vx[balls] = vx * cos - vy * sin
+        self.vy[balls] = vx * sin + vy * cos
+
+    def _collide_bumpers(self, live):
+        """Brute-force ball/bumper pass, in bumper order like the JS loop"""
+        r = self.config.ballRadius
+        for b, (bx, by, _) in enumerate(self.layout.bumpers):
+            dx = self.x - bx
+            dy = self.y - by
+            dist = np.hypot(dx, dy)
+            min_dist = r + self.bumper_radius[:, b:b + 1]
+            hit = live & (dist < min_dist)
+            if not hit.any():
+                continue
+            balls = np.flatnonzero(hit)
+            self._resolve_bumper(balls, b, dx[hit], dy[hit], dist[hit],
+                                 np.broadcast_to(min_dist, hit.shape)[hit])
+
+    def _collide_bumpers_grid(self, live):
+        """
+        Broadphase version of _collide_bumpers: every ball only tests the
+        bumpers listed in its grid cell. Each ball walks its candidates in
+        bumper order and is re-binned after a push-out, so the result is
+        identical to the brute-force pass.
+        """
+        grid = self.grid
+        r = self.config.ballRadius
+        per_game = self.x.shape[1]
+        x, y = self.x.reshape(-1), self.y.reshape(-1)
+
+        balls = np.flatnonzero(live)
+        cells = grid.cells(x[balls], y[balls])
+        occupied = grid.count[cells] > 0
+        balls, cells = balls[occupied], cells[occupied]
+        cursor = np.full(len(balls), -1)
+
+        while len(balls):
+            bumper = grid.next_candidate(cells, cursor)
+            pending = bumper < grid.sentinel
+            balls, cells, bumper = balls[pending], cells[pending], bumper[pending]
+            if not len(balls):
+                break
+            games = balls // per_game
+            dx = x[balls] - grid.bumper_x[bumper]
+            dy = y[balls] - grid.bumper_y[bumper]
+            dist = np.hypot(dx, dy)
+            min_dist = r + self.bumper_radius[games, bumper]
+            hit = dist < min_dist
+            if hit.any():
+                self._resolve_bumper(balls[hit], bumper[hit], dx[hit], dy[hit],
+                                     dist[hit], min_dist[hit])
+                cells[hit] = grid.cells(x[balls[hit]], y[balls[hit]])
+            cursor = bumper
+
+    def _resolve_bumper(self, balls, bumper, dx, dy, dist, min_dist):
+        """Push out, re-aim and score the balls (flat indices) that hit `bumper`"""
+        cfg = self.config
+        x, y = self.x.reshape(-1), self.y.reshape(-1)
+        vx, vy = self.vx.reshape(-1), self.vy.reshape(-1)
+        safe = np.where(dist == 0, 1, dist)
+        nx = np.where(dist == 0, 0, dx / safe)
+        ny = np.where(dist == 0, 0, dy / safe)
+        overlap = min_dist - dist
+        x[balls] += nx * overlap
+        y[balls] += ny * overlap
+        speed = np.maximum(cfg.ballSpeed * 1.3, np.hypot(vx[balls], vy[balls]) * 1.1)
+        vx[balls] = nx * speed
+        vy[balls] = ny * speed
+
+        games = balls // self.x.shape[1]
+        per_game = np.bincount(games, minlength=self.games)
+        self.score += per_game * cfg.bumperScore * self.multiplier
+        self.bumper_hits += per_game
+        self.bumper_anim[games, bumper] = 1
+
+    def step(self, left=None, right=None):
+        """
+        Advance every running game by one frame.
+        left / right are per-game booleans for the arrow keys.
+        """
+        cfg = self.config
+        lay = self.layout
+        r = cfg.ballRadius
+
+        if self.auto_launch:
+            self.launch()
+
+        run = self.running & ~self.game_over
+        self.frames += run
+
+        # Paddle input and clamp
+        if left is not None:
+            self.paddle_x -= np.where(run & left, cfg.paddleSpeed, 0)
+        if right is not None:
+            self.paddle_x += np.where(run & right, cfg.paddleSpeed, 0)
+        np.clip(self.paddle_x, PADDLE_MARGIN,
+                lay.width - PADDLE_MARGIN - PADDLE_WIDTH, out=self.paddle_x)
+
+        # Bumper.update(): hit pulse
+        animating = run[:, None] & (self.bumper_anim > 0)
+        self.bumper_anim[animating] -= BUMPER_DECAY
+        pulse = lay.bumpers[:, 2] + np.sin(self.bumper_anim * np.pi) * BUMPER_PULSE
+        self.bumper_radius = np.where(
+            animating, pulse,
+            np.where(run[:, None], lay.bumpers[:, 2], self.bumper_radius))
+
+        live = run[:, None] & self.active
+        self.age += live
+        x0, y0 = self.x, self.y
+
+        # Circle.update(): gravity, friction, integrate
+        self.vx = np.where(live, self.vx * cfg.friction, self.vx)
+        self.vy = np.where(live, (self.vy + cfg.gravity) * cfg.friction, self.vy)
+        self.x = np.where(live, self.x + self.vx, self.x)
+        self.y = np.where(live, self.y + self.vy, self.y)
+
+        # Ball.limitSpeed()
+        speed = np.hypot(self.vx, self.vy)
+        too_fast = live & (speed > cfg.maxBallSpeed)
+        too_slow = live & self.launched & (speed < cfg.minBallSpeed) & (speed > 0)
+        with np.errstate(divide='ignore'):
+            scale = np.where(too_fast, cfg.maxBallSpeed / speed,
+                             np.where(too_slow, cfg.minBallSpeed / speed, 1.0))
+        self.vx *= scale
+        self.vy *= scale
+
+        if self.record_segments:
+            self.segment = (live, x0, y0, self.x.copy(), self.y.copy())
+        if self.detect_tunnelling:
+            self.tunnels += self._tunnelled(live, x0, y0).sum(axis=1)
+
+        # Walls
+        left_wall = live & (self.x < WALL_THICKNESS + r)
+        self._bounce(left_wall, 1, 0)
+        self.x[left_wall] = WALL_THICKNESS + r + 1
+
+        right_wall = live & (self.x > lay.width - WALL_THICKNESS - r)
+        self._bounce(right_wall, -1, 0)
+        self.x[right_wall] = lay.width - WALL_THICKNESS - r - 1
+
+        top_wall = live & (self.y < WALL_THICKNESS + r)
+        self._bounce(top_wall, 0, 1)
+        self.y[top_wall] = WALL_THICKNESS + r + 1
+
+        self.wall_hits += (left_wall | right_wall | top_wall).sum(axis=1)
+
+        # Paddle
+        px = self.paddle_x[:, None]
+        py = lay.paddle_y
+        paddle = (live & (self.y + r > py) & (self.y - r < py + PADDLE_HEIGHT) &
+                  (self.x > px) & (self.x < px + PADDLE_WIDTH) & (self.vy > 0))
+        if paddle.any():
+            rel = (np.broadcast_to(px, paddle.shape)[paddle] + PADDLE_WIDTH / 2) - self.x[paddle]
+            angle = rel / (PADDLE_WIDTH / 2) * (np.pi / 3.5)
+            speed = np.minimum(np.hypot(self.vx[paddle], self.vy[paddle]) * 1.1,
+                               cfg.ballSpeed * 2)
+            self.vx[paddle] = speed * -np.sin(angle)
+            self.vy[paddle] = -np.abs(speed * np.cos(angle))
+            self.y[paddle] = py - r - 1
+
+            per_game = paddle.sum(axis=1)
+            self.paddle_hits += per_game
+            self.combo += per_game
+            self._update_multiplier()
+
+        # Bumpers
+        if self.grid is None:
+            self._collide_bumpers(live)
+        else:
+            self._collide_bumpers_grid(live)
+
+        # Drain
+        drained = live & (self.y > lay.height + r)
+        if drained.any():
+            self.lifetimes.append(self.age[drained])
+            self.active &= ~drained
+            self.launched &= ~drained
+            self._lose_lives(drained.any(axis=1) & ~self.active.any(axis=1))
+
+    def _tunnelled(self, live, x0, y0):
+        """
+        Balls whose path this frame crossed a bumper or the paddle although
+        neither the previous nor the new position overlaps it - the discrete
+        point-in-time checks never see those contacts.
+        """
+        r = self.config.ballRadius
+        missed = np.zeros_like(live)
+        for b, (bx, by, _) in enumerate(self.layout.bumpers):
+            min_dist = r + self.bumper_radius[:, b:b + 1] - CONTACT_EPSILON
+            near = segment_point_distance(x0, y0, self.x, self.y, bx, by) < min_dist
+            missed |= (near & (np.hypot(x0 - bx, y0 - by) >= min_dist) &
+                       (np.hypot(self.x - bx, self.y - by) >= min_dist))
+
+        px = self.paddle_x[:, None]
+        py = self.layout.paddle_y
+        box = (px, py - r, px + PADDLE_WIDTH, py + PADDLE_HEIGHT + r)
+        crossed = segment_hits_box(x0, y0, self.x, self.y, *box)
+        missed |= (crossed & (self.vy > 0) & ~point_in_box(x0, y0, *box) &
+                   ~point_in_box(self.x, self.y, *box))
+        return live & missed
+
+    def _update_multiplier(self):
+        self.multiplier = np.select(
+            [self.combo >= 10, self.combo >= 7, self.combo >= 4], [4, 3, 2], 1)
+
+    def _lose_lives(self, mask):
+        """handleLifeLost() for the masked games"""
+        self.lives[mask] -= 1
+        self.combo[mask] = 0
+        self.multiplier[mask] = 1
+        self.running[mask] = False
+        over = mask & (self.lives <= 0)
+        self.game_over |= over
+        self.spawn(mask & ~over)
+
+    def run(self, frames, policy=None):
+        """Step up to `frames` frames, stopping early once every game is over"""
+        for _ in range(frames):
+            if self.game_over.all():
+                break
+            if policy is None:
+                self.step()
+            else:
+                self.step(*policy(self))
+        return self
+
+
+def segment_point_distance(x0, y0, x1, y1, cx, cy):
+    """Distance from (cx, cy) to the segment (x0, y0)-(x1, y1), elementwise"""
+    dx, dy = x1 - x0, y1 - y0
+    length2 = dx * dx + dy * dy
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = np.clip(((cx - x0) * dx + (cy - y0) * dy) / length2, 0, 1)
+    t = np.where(length2 > 0, t, 0)
+    return np.hypot(x0 + t * dx - cx, y0 + t * dy - cy)
+
+
+def point_in_box(x, y, left, top, right, bottom):
+    return (x > left) & (x < right) & (y > top) & (y < bottom)
+
+
+def box_interval(x0, y0, dx, dy, left, top, right, bottom):
+    """Slab test: parameter interval during which p0 + t*d lies inside the open box"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tx1, tx2 = (left - x0) / dx, (right - x0) / dx
+        ty1, ty2 = (top - y0) / dy, (bottom - y0) / dy
+    # Axis-parallel motion: inside the slab for all t, or never
+    in_x = (x0 > left) & (x0 < right)
+    in_y = (y0 > top) & (y0 < bottom)
+    t_in = np.maximum(np.where(dx == 0, np.where(in_x, -np.inf, np.inf), np.minimum(tx1, tx2)),
+                      np.where(dy == 0, np.where(in_y, -np.inf, np.inf), np.minimum(ty1, ty2)))
+    t_out = np.minimum(np.where(dx == 0, np.where(in_x, np.inf, -np.inf), np.maximum(tx1, tx2)),
+                       np.where(dy == 0, np.where(in_y, np.inf, -np.inf), np.maximum(ty1, ty2)))
+    return t_in, t_out
+
+
+def segment_hits_box(x0, y0, x1, y1, left, top, right, bottom):
+    """Does the segment pass through the open box, elementwise"""
+    t_in, t_out = box_interval(x0, y0, x1 - x0, y1 - y0, left, top, right, bottom)
+    return (t_in < t_out) & (t_out > 0) & (t_in < 1)
+
+
+def track_ball(sim, dead_zone=10):
+    """Input policy: move the paddle towards the lowest active ball"""
+    y = np.where(sim.active, sim.y, -np.inf)
+    lowest = np.argmax(y, axis=1)
+    target = sim.x[np.arange(sim.games), lowest]
+    centre = sim.paddle_x + PADDLE_WIDTH / 2
+    return target < centre - dead_zone, target > centre + dead_zone
+
+
+class NoisyTracker:
+    """
+    Input policy of an imperfect player: tracks the ball, but aims at a
+    per-game offset of `sigma` px that is re-drawn after every paddle hit.
+    """
+
+    def __init__(self, sigma=PADDLE_WIDTH * 0.3, dead_zone=10):
+        self.sigma = sigma
+        self.dead_zone = dead_zone
+        self._offset = None
+        self._hits = None
+
+    def __call__(self, sim):
+        if self._offset is None:
+            self._offset = sim.rng.normal(0, self.sigma, sim.games)
+            self._hits = sim.paddle_hits.copy()
+        redraw = sim.paddle_hits != self._hits
+        if redraw.any():
+            self._offset[redraw] = sim.rng.normal(0, self.sigma, int(redraw.sum()))
+            self._hits = sim.paddle_hits.copy()
+        y = np.where(sim.active, sim.y, -np.inf)
+        lowest = np.argmax(y, axis=1)
+        target = sim.x[np.arange(sim.games), lowest] + self._offset
+        centre = sim.paddle_x + PADDLE_WIDTH / 2
+        return target < centre - self.dead_zone, target > centre + self.dead_zone
+
+
+POLICIES = {
+    'idle': lambda: None,
+    'track': lambda: track_ball,
+    'noisy': NoisyTracker,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--balls', type=int, default=1, help='balls per game')
+    parser.add_argument('--frames', type=int, default=3600)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='track',
+                        help='paddle input policy (default: track the ball)')
+    parser.add_argument('--broadphase', choices=BROADPHASES, default='brute',
+                        help='ball/bumper pass: every pair, or a uniform grid')
+    args = parser.parse_args(argv)
+
+    config = GameConfig.from_source()
+    sim = PinballBatch(args.games, args.balls, config=config, seed=args.seed,
+                       broadphase=args.broadphase)
+
+    start = time.perf_counter()
+    sim.run(args.frames, policy=POLICIES[args.policy]())
+    elapsed = time.perf_counter() - start
+
+    simulated = int(sim.frames.sum())
+    print("=" * 60)
+    print("Physics Pinball - Headless Simulation")
+    print("=" * 60)
+    print(f"  Config:        {config}")
+    print(f"  Games:         {args.games} x {args.balls} ball(s)")
+    print(f"  Game frames:   {simulated} in {elapsed:.2f} s "
+          f"({simulated / max(elapsed, 1e-9) / 1e6:.2f} M frames/s)")
+    if args.balls > 1:
+        print(f"  Ball frames:   {simulated * args.balls}")
+    print(f"  Games over:    {int(sim.game_over.sum())}/{args.games}")
+    print(f"  Score:         mean {sim.score.mean():.0f}, max {sim.score.max()}")
+    print(f"  Hits / game:   wall {sim.wall_hits.mean():.1f}, "
+          f"paddle {sim.paddle_hits.mean():.1f}, bumper {sim.bumper_hits.mean():.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo GameConfig sweeps for the headless pinball simulation
+Runs many seeded games for every combination of the given GameConfig
+ranges, spread over a process pool, and reports ball lifetime, score
+distribution and tunnelling incidents per configuration.
+
+Ranges are START:STOP:COUNT (inclusive linspace) or comma-separated values;
+fields that are not given keep their value from game-enhanced.js.
+
+Usage:
+    python3 -m tools.pinball_sweep --gravity 0.2:0.3:3 --elasticity 0.8,0.9 \
+        --games 1000 [--workers 8] [--seed 1] [--json sweep.json]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, replace
+
+import numpy as np
+
+from tools.pinball_sim import POLICIES, GameConfig, PinballBatch
+
+SWEEP_FIELDS = ['gravity', 'friction', 'elasticity', 'ballSpeed', 'maxBallSpeed', 'paddleSpeed']
+
+
+def parse_range(text):
+    """'0.2:0.3:3' -> [0.2, 0.25, 0.3]; '0.8,0.9' -> [0.8, 0.9]"""
+    if ':' in text:
+        start, stop, count = text.split(':')
+        return [float(v) for v in np.linspace(float(start), float(stop), int(count))]
+    return [float(v) for v in text.split(',')]
+
+
+def config_grid(base, ranges):
+    """Cartesian product of the ranges applied on top of `base`"""
+    names = [name for name in SWEEP_FIELDS if name in ranges]
+    for values in itertools.product(*(ranges[name] for name in names)):
+        yield replace(base, **dict(zip(names, values)))
+
+
+def run_batch(task):
+    """
+    Worker entry point. The seed is derived from (base seed, config index,
+    batch index) only, so results do not depend on scheduling or pool size.
+    """
+    config_index, batch_index, config, games, frames, base_seed, policy = task
+    seed = np.random.SeedSequence([base_seed, config_index, batch_index])
+    sim = PinballBatch(games, config=GameConfig(**config), seed=seed,
+                       detect_tunnelling=True)
+    sim.run(frames, policy=POLICIES[policy]())
+    lifetimes = np.concatenate(sim.lifetimes) if sim.lifetimes else np.zeros(0, np.int64)
+    return config_index, batch_index, {
+        'scores': sim.score,
+        'lifetimes': lifetimes,
+        'tunnels': int(sim.tunnels.sum()),
+        'frames': int(sim.frames.sum()),
+        'finished': int(sim.game_over.sum()),
+    }
+
+
+def percentiles(values):
+    if len(values) == 0:
+        return {'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    p50, p95 = np.percentile(values, [50, 95])
+    return {'mean': float(np.mean(values)), 'p50': float(p50),
+            'p95': float(p95), 'max': float(np.max(values))}
+
+
+def sweep(configs, games=1000, batch=2000, frames=10800, seed=1, workers=None,
+          policy='noisy'):
+    """Run `games` games per config; returns one summary dict per config"""
+    tasks = []
+    for ci, config in enumerate(configs):
+        for bi, start in enumerate(range(0, games, batch)):
+            tasks.append((ci, bi, asdict(config), min(batch, games - start),
+                          frames, seed, policy))
+
+    parts = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for ci, bi, result in pool.map(run_batch, tasks):
+            parts[ci, bi] = result
+
+    summaries = []
+    for ci, config in enumerate(configs):
+        # Merge in batch order so the output is independent of completion order
+        batches = [parts[key] for key in sorted(parts) if key[0] == ci]
+        scores = np.concatenate([b['scores'] for b in batches])
+        lifetimes = np.concatenate([b['lifetimes'] for b in batches])
+        frames_run = sum(b['frames'] for b in batches)
+        tunnels = sum(b['tunnels'] for b in batches)
+        summaries.append({
+            'config': asdict(config),
+            'games': int(len(scores)),
+            'finished': sum(b['finished'] for b in batches),
+            'frames': frames_run,
+            'score': percentiles(scores),
+            'lifetime': percentiles(lifetimes),
+            'tunnels': tunnels,
+            'tunnels_per_1k_frames': tunnels * 1000 / max(frames_run, 1),
+        })
+    return summaries
+
+
+def print_summaries(summaries, swept):
+    header = ' '.join(f"{name:>12s}" for name in swept)
+    print(f"  {header} {'score p50':>10s} {'score p95':>10s} "
+          f"{'life p50':>9s} {'life p95':>9s} {'tunnels':>8s} {'/1k fr':>7s}")
+    for s in summaries:
+        values = ' '.join(f"{s['config'][name]:12.4g}" for name in swept)
+        print(f"  {values} {s['score']['p50']:10.0f} {s['score']['p95']:10.0f} "
+              f"{s['lifetime']['p50']:9.0f} {s['lifetime']['p95']:9.0f} "
+              f"{s['tunnels']:8d} {s['tunnels_per_1k_frames']:7.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='\n'.join(__doc__.strip().splitlines()[1:]))
+    for name in SWEEP_FIELDS:
+        parser.add_argument(f'--{name}', type=parse_range, metavar='RANGE')
+    parser.add_argument('--games', type=int, default=1000, help='games per config')
+    parser.add_argument('--batch', type=int, default=2000,
+                        help='games vectorized together in one worker task')
+    parser.add_argument('--frames', type=int, default=10800,
+                        help='frame cap per game (default: 3 minutes at 60 fps)')
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='noisy')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--json', help='also write the summaries to this JSON file')
+    args = parser.parse_args(argv)
+
+    ranges = {name: getattr(args, name) for name in SWEEP_FIELDS
+              if getattr(args, name) is not None}
+    configs = list(config_grid(GameConfig.from_source(), ranges))
+    swept = list(ranges) or ['gravity']
+
+    print("=" * 70)
+    print(f"Pinball sweep: {len(configs)} configs x {args.games} games, "
+          f"{args.workers} workers, seed {args.seed}")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    summaries = sweep(configs, args.games, args.batch, args.frames, args.seed,
+                      args.workers, args.policy)
+    elapsed = time.perf_counter() - start
+
+    print_summaries(summaries, swept)
+    total_games = sum(s['games'] for s in summaries)
+    total_frames = sum(s['frames'] for s in summaries)
+    print(f"\n  {total_games} games, {total_frames} frames in {elapsed:.1f} s")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'seed': args.seed, 'policy': args.policy, 'frames': args.frames,
+                       'summaries': summaries}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
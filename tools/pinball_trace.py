@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+Golden-trace recording and deterministic replay for the pinball physics
+A trace holds everything needed to re-run a session - engine, seed,
+config and the ArrowLeft / ArrowRight / Space event stream with frame
+numbers - plus one fixed-size binary record per frame of ball position,
+velocity, score and lives. Replaying re-runs the session with the current
+code and compares it frame by frame against the golden trace, reporting
+the first divergent frame.
+
+File layout (little endian):
+    b'PBTRACE' + version byte, u32 header length, JSON header,
+    zero padding to a 64-byte boundary, frame records (TRACE_DTYPE),
+    input events (EVENT_DTYPE), u64 record count, u64 event count.
+Records are appended while recording and read through np.memmap, so
+multi-million-frame traces are written and compared in bounded memory.
+
+Engines:
+    sim      tools.pinball_sim.PinballBatch with one game, seeded NumPy RNG
+    node     game-enhanced.js under Node with a stub DOM on a fixed
+             NODE_VIEWPORT, seeded Math.random, one update() per frame
+    browser  game-enhanced.js in headless Chromium with a seeded
+             Math.random, stepped one update() per frame without rAF
+The node and browser engines run the game's own code, so their goldens
+catch any change to its physics; the sim golden checks the NumPy port.
+
+Usage:
+    python3 -m tools.pinball_trace record OUT.trace [--frames 3600] [--seed 1] [--engine node]
+    python3 -m tools.pinball_trace replay GOLDEN.trace [--atol 1e-3]
+    python3 -m tools.pinball_trace diff GOLDEN.trace OTHER.trace
+"""
+
+import argparse
+import json
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+from tools.pinball_sim import PADDLE_WIDTH, GameConfig, PinballBatch
+from tools.site import ROOT
+
+MAGIC = b'PBTRACE'
+VERSION = 1
+ALIGN = 64
+GOLDEN_DIR = ROOT / 'tests' / 'golden'
+GAME_DIR = ROOT / 'physics-pinball'
+GAME_SOURCE = GAME_DIR / 'game-enhanced.js'
+# Loaded before the game, as in index.html
+LIBRARIES = [GAME_DIR / 'render-cache.js', GAME_DIR / 'effects.js']
+# Canvas size of the node engine (CSS px, devicePixelRatio 1)
+NODE_VIEWPORT = (600, 800)
+ENGINES = ['sim', 'node', 'browser']
+
+TRACE_DTYPE = np.dtype([
+    ('frame', '<u4'),
+    ('x', '<f4'), ('y', '<f4'), ('vx', '<f4'), ('vy', '<f4'),
+    ('score', '<i4'),
+    ('lives', '<i1'),
+    ('active', '<u1'),
+])
+EVENT_DTYPE = np.dtype([('frame', '<u4'), ('key', '<u1'), ('down', '<u1')])
+KEYS = ['ArrowLeft', 'ArrowRight', ' ']
+LEFT, RIGHT, SPACE = range(len(KEYS))
+FLOAT_FIELDS = ['x', 'y', 'vx', 'vy']
+EXACT_FIELDS = ['score', 'lives', 'active']
+TRAILER = struct.Struct('<QQ')
+
+# Frames simulated per chunk before records are flushed to disk
+CHUNK = 1 << 16
+# Autopilot dead zone in px, as in tools.pinball_sim.track_ball
+DEAD_ZONE = 10
+# The autopilot aims off-centre by a seeded offset re-drawn every AIM_PERIOD
+# frames, so sessions also drain balls and lose lives
+AIM_PERIOD = 90
+AIM_SIGMA = PADDLE_WIDTH * 0.3
+
+
+class TraceWriter:
+    """Streams frame records to disk; events are buffered and written on close"""
+
+    def __init__(self, path, header):
+        self.path = Path(path)
+        self.file = open(self.path, 'wb')
+        data = json.dumps(header, sort_keys=True).encode('utf-8')
+        self.file.write(MAGIC + bytes([VERSION]) + struct.pack('<I', len(data)) + data)
+        self.file.write(b'\0' * (-self.file.tell() % ALIGN))
+        self.records = 0
+        self.events = []
+
+    def append(self, records):
+        records = np.asarray(records, dtype=TRACE_DTYPE)
+        self.file.write(records.tobytes())
+        self.records += len(records)
+
+    def event(self, frame, key, down):
+        self.events.append((frame, key, down))
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.write(np.array(self.events, dtype=EVENT_DTYPE).tobytes())
+        self.file.write(TRAILER.pack(self.records, len(self.events)))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@dataclass
+class Trace:
+    header: dict
+    records: np.ndarray     # np.memmap of TRACE_DTYPE
+    events: np.ndarray      # EVENT_DTYPE
+
+
+def read_trace(path):
+    path = Path(path)
+    with open(path, 'rb') as f:
+        magic = f.read(len(MAGIC) + 1)
+        if magic[:len(MAGIC)] != MAGIC or magic[-1] != VERSION:
+            raise ValueError(f'{path}: not a version {VERSION} pinball trace')
+        (length,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(length))
+        offset = f.tell() + (-f.tell() % ALIGN)
+        f.seek(-TRAILER.size, 2)
+        n_records, n_events = TRAILER.unpack(f.read(TRAILER.size))
+
+    events_offset = offset + n_records * TRACE_DTYPE.itemsize
+    records = (np.memmap(path, dtype=TRACE_DTYPE, mode='r', offset=offset,
+                         shape=(n_records,))
+               if n_records else np.zeros(0, TRACE_DTYPE))
+    events = np.fromfile(path, dtype=EVENT_DTYPE, count=n_events, offset=events_offset)
+    return Trace(header, records, events)
+
+
+def aim_offsets(seed, frames):
+    """Autopilot aim offset for every AIM_PERIOD block of frames"""
+    rng = np.random.default_rng([seed, AIM_PERIOD])
+    return rng.normal(0, AIM_SIGMA, frames // AIM_PERIOD + 1)
+
+
+class Autopilot:
+    """
+    Records the key presses of a paddle that follows the ball: Space while
+    waiting to launch, and the arrow held towards the ball (plus the aim
+    offset) outside the dead zone. Emits only the transitions, like a
+    keyboard.
+    """
+
+    def __init__(self, writer, offsets):
+        self.writer = writer
+        self.offsets = offsets
+        self.held = [False, False]
+
+    def __call__(self, frame, ball_x, paddle_x, waiting):
+        if waiting:
+            self.writer.event(frame, SPACE, True)
+        centre = paddle_x + PADDLE_WIDTH / 2 - self.offsets[frame // AIM_PERIOD]
+        want = [ball_x < centre - DEAD_ZONE, ball_x > centre + DEAD_ZONE]
+        for key in (LEFT, RIGHT):
+            if want[key] != self.held[key]:
+                self.writer.event(frame, key, want[key])
+                self.held[key] = want[key]
+        return self.held[LEFT], self.held[RIGHT], waiting
+
+
+class EventReplay:
+    """Feeds a recorded event stream back frame by frame"""
+
+    def __init__(self, events):
+        self.events = events
+        self.next = 0
+        self.held = [False, False]
+
+    def __call__(self, frame, *state):
+        launch = False
+        while self.next < len(self.events) and self.events[self.next]['frame'] <= frame:
+            event = self.events[self.next]
+            if event['key'] == SPACE:
+                launch |= bool(event['down'])
+            else:
+                self.held[event['key']] = bool(event['down'])
+            self.next += 1
+        return self.held[LEFT], self.held[RIGHT], launch
+
+
+def run_sim(writer, frames, seed, config, controller):
+    """Step one PinballBatch game under `controller`, writing one record per frame"""
+    sim = PinballBatch(1, config=config, seed=seed, auto_launch=False)
+    buffer = np.zeros(CHUNK, TRACE_DTYPE)
+    filled = 0
+    for frame in range(frames):
+        if sim.game_over[0]:
+            break
+        waiting = not sim.running[0] and sim.active[0, 0] and not sim.launched[0, 0]
+        left, right, launch = controller(frame, sim.x[0, 0], sim.paddle_x[0], waiting)
+        if launch:
+            sim.launch()
+        sim.step(np.array([left]), np.array([right]))
+
+        record = buffer[filled]
+        record['frame'] = frame
+        record['x'], record['y'] = sim.x[0, 0], sim.y[0, 0]
+        record['vx'], record['vy'] = sim.vx[0, 0], sim.vy[0, 0]
+        record['score'], record['lives'] = sim.score[0], sim.lives[0]
+        record['active'] = sim.active[0, 0]
+        filled += 1
+        if filled == CHUNK:
+            writer.append(buffer)
+            filled = 0
+    writer.append(buffer[:filled])
+
+
+# Installed before game-enhanced.js runs: deterministic Math.random (mulberry32)
+SEEDED_RANDOM = """
+(() => {
+    let state = %d >>> 0;
+    Math.random = function () {
+        state = (state + 0x6D2B79F5) >>> 0;
+        let t = state;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+})();
+"""
+
+# Stops the rAF loop and steps update() / updateAnimations() directly. With
+# `events` null the in-page autopilot plays and its key presses are returned.
+BROWSER_STEP = """
+([start, frames, events, deadZone, offsets, period]) => {
+    const game = window.enhancedGame;
+    if (!window.__traceStep) {
+        cancelAnimationFrame(game.animationFrameId);
+        game.loop = () => {};
+        window.__traceStep = { held: [false, false] };
+    }
+    const keys = %s;
+    const step = window.__traceStep;
+    const press = (key, down) => document.body.dispatchEvent(
+        new KeyboardEvent(down ? 'keydown' : 'keyup', { key: keys[key], bubbles: true }));
+    const rows = [];
+    const played = [];
+    let next = 0;
+    for (let frame = start; frame < start + frames && !game.state.gameOver; frame++) {
+        const ball = game.elements.balls[0];
+        const paddle = game.elements.paddles[0];
+        if (events) {
+            while (next < events.length && events[next][0] <= frame) {
+                press(events[next][1], events[next][2]);
+                next++;
+            }
+        } else if (ball && paddle) {
+            if (!game.state.running && !ball.launched) {
+                press(2, true);
+                press(2, false);
+                played.push([frame, 2, 1]);
+            }
+            const centre = paddle.position.x + paddle.width / 2 -
+                offsets[Math.floor(frame / period) - Math.floor(start / period)];
+            const want = [ball.position.x < centre - deadZone, ball.position.x > centre + deadZone];
+            for (const key of [0, 1]) {
+                if (want[key] !== step.held[key]) {
+                    press(key, want[key]);
+                    played.push([frame, key, want[key] ? 1 : 0]);
+                    step.held[key] = want[key];
+                }
+            }
+        }
+        game.update();
+        game.updateAnimations();
+        const b = game.elements.balls[0];
+        rows.push(frame, b ? b.position.x : 0, b ? b.position.y : 0,
+                  b ? b.velocity.x : 0, b ? b.velocity.y : 0,
+                  game.state.score, game.state.lives, b && b.active ? 1 : 0);
+    }
+    return { rows, played };
+}
+""" % json.dumps(KEYS)
+
+
+def play_chunks(step, writer, frames, seed, events=None):
+    """
+    Drive BROWSER_STEP through `step(args)` one CHUNK of frames at a time,
+    writing its records and, for a recording, the autopilot's key presses
+    """
+    offsets = aim_offsets(seed, frames)
+    for start in range(0, frames, CHUNK):
+        count = min(CHUNK, frames - start)
+        chunk_events = None
+        if events is not None:
+            chunk = events[(events['frame'] >= start) & (events['frame'] < start + count)]
+            chunk_events = [[int(e['frame']), int(e['key']), int(e['down'])] for e in chunk]
+        aim = offsets[start // AIM_PERIOD:(start + count) // AIM_PERIOD + 1].tolist()
+        result = step([start, count, chunk_events, DEAD_ZONE, aim, AIM_PERIOD])
+        rows = np.array(result['rows'], dtype=float).reshape(-1, len(TRACE_DTYPE.names))
+        records = np.zeros(len(rows), TRACE_DTYPE)
+        for i, name in enumerate(TRACE_DTYPE.names):
+            records[name] = rows[:, i]
+        writer.append(records)
+        for frame, key, down in result['played']:
+            writer.event(frame, key, bool(down))
+        if len(rows) < count:
+            break
+
+
+def run_browser(writer, frames, seed, events=None, base_url=None, chrome=None):
+    """Step the real game in Chromium; records the autopilot when `events` is None"""
+    from tools.browser import base_url_or_serve, chromium
+    from tools.site import game_url
+
+    with base_url_or_serve(base_url) as url, chromium(chrome) as browser:
+        page = browser.new_page()
+        page.add_init_script(SEEDED_RANDOM % seed)
+        page.goto(game_url(url, 'physics-pinball'))
+        page.wait_for_function('() => window.enhancedGame')
+        play_chunks(lambda args: page.evaluate(BROWSER_STEP, args), writer, frames, seed, events)
+
+
+# Loads the game with a stub DOM, then answers one BROWSER_STEP call per
+# stdin line with one JSON line on stdout
+NODE_HARNESS = r"""
+const fs = require('fs');
+const readline = require('readline');
+const input = JSON.parse(process.argv[1]);
+const [width, height] = input.viewport;
+(0, eval)(input.random);
+
+// Anything in the DOM: every property is another stub, calls return stubs
+function stub() {
+    const store = {};
+    return new Proxy(function () {}, {
+        get(_, key) {
+            if (key === Symbol.toPrimitive) return () => 0;
+            if (key === 'then') return undefined;
+            if (!(key in store)) store[key] = stub();
+            return store[key];
+        },
+        set(_, key, value) { store[key] = value; return true; },
+        apply: () => stub(),
+        construct: () => stub(),
+    });
+}
+function canvas() {
+    const el = stub();
+    el.width = 300;
+    el.height = 150;
+    return el;
+}
+const rect = { width, height, left: 0, top: 0 };
+const screen = canvas();
+screen.parentElement = { getBoundingClientRect: () => rect };
+screen.getBoundingClientRect = () => rect;
+// Key events reach the listeners the game put on document
+const listeners = {};
+const body = stub();
+body.dispatchEvent = event => (listeners[event.type] || []).forEach(fn => fn(event));
+globalThis.KeyboardEvent = class {
+    constructor(type, init) {
+        this.type = type;
+        this.key = init.key;
+        this.target = { matches: () => false };
+    }
+    preventDefault() {}
+};
+globalThis.window = globalThis;
+window.devicePixelRatio = 1;
+window.addEventListener = () => {};
+window.removeEventListener = () => {};
+globalThis.document = new Proxy(stub(), {
+    get(target, key) {
+        if (key === 'readyState') return 'complete';
+        if (key === 'body') return body;
+        if (key === 'fonts') return undefined;
+        if (key === 'addEventListener') {
+            return (type, fn) => (listeners[type] = listeners[type] || []).push(fn);
+        }
+        if (key === 'getElementById') return id => (id === 'game-canvas' ? screen : stub());
+        if (key === 'createElement') return tag => (tag === 'canvas' ? canvas() : stub());
+        return target[key];
+    },
+});
+globalThis.localStorage = { getItem: () => null, setItem() {} };
+globalThis.navigator = { vibrate() {} };
+globalThis.requestAnimationFrame = () => 1;
+globalThis.cancelAnimationFrame = () => {};
+globalThis.setTimeout = () => 0;
+globalThis.clearTimeout = () => {};
+console.log = console.warn = () => {};
+(0, eval)(input.sources.map(path => fs.readFileSync(path, 'utf8')).join('\n'));
+const step = (0, eval)(input.step);
+
+readline.createInterface({ input: process.stdin }).on('line', line => {
+    process.stdout.write(JSON.stringify(step(JSON.parse(line))) + '\n');
+});
+"""
+
+
+def run_node(writer, frames, seed, events=None, source=GAME_SOURCE, viewport=NODE_VIEWPORT):
+    """Step `source` (default: the real game) under Node; records the autopilot when
+    `events` is None"""
+    node = shutil.which('node')
+    if node is None:
+        raise RuntimeError('node is required for the node engine')
+    setup = json.dumps({'sources': [str(p) for p in LIBRARIES + [Path(source)]],
+                        'viewport': list(viewport), 'random': SEEDED_RANDOM % seed,
+                        'step': BROWSER_STEP})
+    proc = subprocess.Popen([node, '-e', NODE_HARNESS, setup], stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, text=True)
+
+    def step(args):
+        proc.stdin.write(json.dumps(args) + '\n')
+        proc.stdin.flush()
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f'node engine exited with status {proc.wait()}')
+        return json.loads(line)
+
+    try:
+        play_chunks(step, writer, frames, seed, events)
+    finally:
+        proc.stdin.close()
+        proc.wait()
+
+
+def run_engine(engine, writer, frames, seed, events=None, source=GAME_SOURCE, viewport=None,
+               base_url=None, chrome=None):
+    if engine == 'node':
+        run_node(writer, frames, seed, events, source, viewport or NODE_VIEWPORT)
+    else:
+        run_browser(writer, frames, seed, events, base_url, chrome)
+
+
+def record(path, frames=3600, seed=1, engine='sim', config=None, **options):
+    """Play an autopilot session and write it as a trace"""
+    config = config or GameConfig.from_source()
+    header = {'engine': engine, 'seed': seed, 'frames': frames, 'config': asdict(config),
+              'fields': TRACE_DTYPE.names, 'keys': KEYS}
+    if engine == 'node':
+        header['viewport'] = list(NODE_VIEWPORT)
+    with TraceWriter(path, header) as writer:
+        if engine == 'sim':
+            run_sim(writer, frames, seed, config, Autopilot(writer, aim_offsets(seed, frames)))
+        else:
+            run_engine(engine, writer, frames, seed, **options)
+    return read_trace(path)
+
+
+def rerun(trace, path, config=None, **options):
+    """Re-run the golden trace's session with the current code into `path`"""
+    header = dict(trace.header)
+    config = config or GameConfig.from_source()
+    header['config'] = asdict(config)
+    frames = len(trace.records)
+    with TraceWriter(path, header) as writer:
+        for event in trace.events:
+            writer.event(int(event['frame']), int(event['key']), bool(event['down']))
+        if header['engine'] == 'sim':
+            run_sim(writer, frames, header['seed'], config, EventReplay(trace.events))
+        else:
+            run_engine(header['engine'], writer, frames, header['seed'], trace.events,
+                       viewport=header.get('viewport'), **options)
+    return read_trace(path)
+
+
+@dataclass
+class Divergence:
+    frame: int
+    fields: dict            # field -> (golden, candidate)
+
+    def __str__(self):
+        values = ', '.join(f"{name} {g} != {c}" for name, (g, c) in self.fields.items())
+        return f"frame {self.frame}: {values}"
+
+
+def compare(golden, candidate, atol=1e-3, rtol=1e-6, chunk=CHUNK):
+    """
+    First frame where the traces differ: positions / velocities beyond the
+    tolerance, score, lives or active exactly. Works chunk by chunk on the
+    memory maps. None when they match.
+    """
+    a, b = golden.records, candidate.records
+    n = min(len(a), len(b))
+    for start in range(0, n, chunk):
+        end = min(start + chunk, n)
+        ga, cb = a[start:end], b[start:end]
+        bad = np.zeros(len(ga), dtype=bool)
+        for name in FLOAT_FIELDS:
+            bad |= ~np.isclose(ga[name], cb[name], rtol=rtol, atol=atol, equal_nan=True)
+        for name in EXACT_FIELDS:
+            bad |= ga[name] != cb[name]
+        if bad.any():
+            i = int(np.argmax(bad))
+            fields = {}
+            for name in FLOAT_FIELDS + EXACT_FIELDS:
+                g, c = ga[name][i].item(), cb[name][i].item()
+                close = (np.isclose(g, c, rtol=rtol, atol=atol) if name in FLOAT_FIELDS
+                         else g == c)
+                if not close:
+                    fields[name] = (g, c)
+            return Divergence(int(ga['frame'][i]), fields)
+    if len(a) != len(b):
+        return Divergence(n, {'length': (len(a), len(b))})
+    return None
+
+
+def replay(path, atol=1e-3, rtol=1e-6, config=None, **options):
+    """Re-run a golden trace and return its first Divergence, or None"""
+    golden = read_trace(path)
+    with tempfile.TemporaryDirectory() as tmp:
+        candidate = rerun(golden, Path(tmp) / 'candidate.trace', config, **options)
+        result = compare(golden, candidate, atol, rtol)
+        # Release the memory map before the directory goes away
+        del candidate
+    return result
+
+
+def golden_traces():
+    return sorted(GOLDEN_DIR.glob('*.trace'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='\n'.join(__doc__.strip().splitlines()[1:]))
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help='record an autopilot session')
+    rec.add_argument('output')
+    rec.add_argument('--frames', type=int, default=3600)
+    rec.add_argument('--seed', type=int, default=1)
+    rec.add_argument('--engine', choices=ENGINES, default='sim')
+
+    rep = sub.add_parser('replay', help='re-run golden traces and compare')
+    rep.add_argument('golden', nargs='*', help=f'default: {GOLDEN_DIR.relative_to(ROOT)}/*.trace')
+
+    diff = sub.add_parser('diff', help='compare two recorded traces')
+    diff.add_argument('golden')
+    diff.add_argument('candidate')
+
+    for p in (rep, diff):
+        p.add_argument('--atol', type=float, default=1e-3, help='px and px/frame')
+        p.add_argument('--rtol', type=float, default=1e-6)
+    for p in (rec, rep):
+        p.add_argument('--chrome', help='browser binary for the browser engine')
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        trace = record(args.output, args.frames, args.seed, args.engine, chrome=args.chrome)
+        print(f"  {args.output}: {len(trace.records)} frames, {len(trace.events)} events, "
+              f"final score {trace.records['score'][-1] if len(trace.records) else 0}")
+        return 0
+
+    if args.command == 'diff':
+        results = [(args.candidate, compare(read_trace(args.golden), read_trace(args.candidate),
+                                            args.atol, args.rtol))]
+    else:
+        paths = args.golden or golden_traces()
+        results = [(path, replay(path, args.atol, args.rtol, chrome=args.chrome))
+                   for path in paths]
+
+    failed = 0
+    for path, divergence in results:
+        failed += divergence is not None
+        status = '✓' if divergence is None else f'✗ diverged at {divergence}'
+        print(f"  {status:3s} {path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
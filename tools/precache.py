@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Service worker precache list and version for a built tree
+The hub and every game page in build.sh's GAMES are precached, together
+with the local scripts and stylesheets they link (the content-hashed copies
+the build rewrote them to), the PWA manifest and the stylesheets the pages
+link from the CDNs in CDN_HOSTS (Font Awesome, Google Fonts); sw.js caches
+the woff2 fonts those stylesheets name along with them. The version is a
+hash over every precached URL and the content hash of the file behind it
+(CDN URLs are versioned by the URL alone), so a deploy that changes anything
+a page loads gets a new cache, and sw.js drops the old one when it
+activates. tools.build fills both into dist/sw.js after it has written the
+pages.
+
+`verify` serves a built tree, loads every game twice in headless Chromium
+with one browser profile, and records every request made during each load,
+whatever its origin, including the ones the service worker itself sends on
+a cache miss. On the second load nothing may reach the network: every
+request must be answered by the service worker. The browser's own update
+check of /sw.js is not counted.
+
+Usage:
+    python3 -m tools.precache list [--dist dist]
+    python3 -m tools.precache verify [--dist dist] [--chrome PATH] [--headed]
+"""
+
+import argparse
+import json
+import posixpath
+import re
+import sys
+from html import unescape as html_unescape
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+from tools.build import HASH_LENGTH, MANIFEST_NAME, SERVICE_WORKER, resolve_ref
+from tools.cache import content_hash
+from tools.site import GAMES, ROOT, game_url, page_assets, page_refs
+
+PWA_MANIFEST = 'manifest.json'
+# Cross-origin hosts sw.js caches; must match CDN_HOSTS there
+CDN_HOSTS = ('cdnjs.cloudflare.com', 'fonts.googleapis.com', 'fonts.gstatic.com')
+# Precache "hash" of a CDN URL: its content is not known at build time
+CDN_DIGEST = 'cdn'
+# Time for late requests (fonts, audio) after the load event
+SETTLE_MS = 500
+
+# Stylesheets an inline <style> pulls in
+_IMPORT_RE = re.compile(r'''@import\s+(?:url\(\s*(['"]?)([^'")]+)\1\s*\)|(['"])([^'"]+)\3)''')
+_VERSION_RE = re.compile(r'^const PRECACHE_VERSION = .*?;$', re.MULTILINE)
+_URLS_RE = re.compile(r'^const PRECACHE_URLS = \[.*?\];$', re.MULTILINE | re.DOTALL)
+
+# Resolves once the page is controlled by an active service worker
+WAIT_FOR_CONTROLLER = """() => navigator.serviceWorker.ready.then(() =>
+    navigator.serviceWorker.controller || new Promise(resolve =>
+        navigator.serviceWorker.addEventListener('controllerchange', resolve, { once: true })))
+    .then(() => true)"""
+
+
+def page_url(page):
+    """index.html -> /, snake-game/index.html -> /snake-game/"""
+    directory = posixpath.dirname(page)
+    return f'/{directory}/' if directory else '/'
+
+
+def precache_entries(out, files, games=GAMES):
+    """{URL: content hash} of the pages, the assets they link and the PWA manifest
+
+    `files` is the build manifest's output table; the pages are read from
+    `out`, so the assets are the hashed names the build rewrote them to.
+    Stylesheets and scripts from CDN_HOSTS, linked or @imported, map to CDN_DIGEST.
+    """
+    entries = {}
+    for page in ['index.html'] + [f'{game}/index.html' for game in games]:
+        if page not in files:
+            continue
+        entries[page_url(page)] = files[page]['hash']
+        html = (Path(out) / page).read_text(encoding='utf-8')
+        for ref in page_assets(html):
+            target = resolve_ref(page, ref)
+            if target in files:
+                # The URL the page asks for, query included, so the cache key matches
+                query = ref.partition('?')[2].split('#', 1)[0]
+                entries['/' + target + ('?' + query if query else '')] = files[target]['hash']
+        # Attributes are HTML-escaped, <style> text is not
+        cdn = [html_unescape(ref) for ref in page_refs(html)]
+        cdn += [m.group(2) or m.group(4) for m in _IMPORT_RE.finditer(html)]
+        for url in cdn:
+            if urlsplit(url).hostname in CDN_HOSTS:
+                entries[url] = CDN_DIGEST
+    if PWA_MANIFEST in files:
+        entries['/' + PWA_MANIFEST] = files[PWA_MANIFEST]['hash']
+    return dict(sorted(entries.items()))
+
+
+def precache_version(entries):
+    return content_hash(*(f'{url} {digest}' for url, digest in entries.items()))[:HASH_LENGTH]
+
+
+def render_service_worker(template, version, urls):
+    """sw.js with its PRECACHE_VERSION and PRECACHE_URLS lines filled in"""
+    text, found = _VERSION_RE.subn(
+        lambda _: f'const PRECACHE_VERSION = {json.dumps(version)};', template, count=1)
+    text, listed = _URLS_RE.subn(
+        lambda _: f'const PRECACHE_URLS = {json.dumps(list(urls), indent=4)};', text, count=1)
+    if not (found and listed):
+        raise ValueError(f'{SERVICE_WORKER} has no PRECACHE_VERSION / PRECACHE_URLS line '
+                         'to fill in')
+    return text
+
+
+def load_manifest(dist):
+    with open(Path(dist) / MANIFEST_NAME, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def served_by_worker(request):
+    """True when the service worker answered the request without going to the network"""
+    if request.service_worker is not None:
+        return False
+    response = request.response()
+    return response is not None and response.from_service_worker
+
+
+def verify(root, games=GAMES, chrome=None, headless=True, settle_ms=SETTLE_MS):
+    """Per game: server requests of the first and second load, and every request of the
+    second, page or service worker, any origin, that the service worker did not answer"""
+    from tools.browser import chromium
+    from tools.serve import running
+
+    results = []
+    with running(root) as (base_url, server), chromium(chrome, headless) as browser:
+        hits = []
+        server.log = lambda method, target, status: hits.append(target)
+        # On the context, not the page, so the service worker's own fetches show up too
+        context = browser.new_context()
+        requests = []
+        context.on('request', requests.append)
+        page = context.new_page()
+        update_check = urljoin(base_url, '/' + SERVICE_WORKER)
+
+        def load(url):
+            del hits[:], requests[:]
+            page.goto(url, wait_until='load')
+            page.evaluate(WAIT_FOR_CONTROLLER)
+            page.wait_for_timeout(settle_ms)
+            return [target for target in hits if target.split('?')[0] != '/' + SERVICE_WORKER]
+
+        for game in games:
+            url = game_url(base_url, game)
+            first = load(url)
+            second = load(url)
+            uncached = [r.url for r in requests
+                        if urlsplit(r.url).scheme in ('http', 'https')
+                        and r.url.split('?')[0] != update_check
+                        and not served_by_worker(r)]
+            results.append({'game': game, 'first': len(first), 'second': second,
+                            'uncached': uncached})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='\n'.join(__doc__.strip().splitlines()[1:]))
+    sub = parser.add_subparsers(dest='command', required=True)
+    show = sub.add_parser('list', help='print the precache list and check dist/sw.js has it')
+    show.add_argument('--dist', default=str(ROOT / 'dist'))
+    check = sub.add_parser('verify', help='load every game twice in Chromium')
+    check.add_argument('--dist', default=str(ROOT / 'dist'))
+    check.add_argument('--chrome', help='browser binary (default: $CHROME_PATH or the '
+                       'Playwright download)')
+    check.add_argument('--headed', action='store_true', help='show the browser window')
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        manifest = load_manifest(args.dist)
+        entries = precache_entries(args.dist, manifest['files'], manifest['games'])
+        version = precache_version(entries)
+        for url, digest in entries.items():
+            print(f"  {digest[:HASH_LENGTH]:{HASH_LENGTH}s}  {url}")
+        worker = (Path(args.dist) / SERVICE_WORKER).read_text(encoding='utf-8')
+        current = json.dumps(version) in worker
+        print(f"{'✓' if current else '✗'} {len(entries)} URLs, version {version}"
+              f"{'' if current else f' (not the one in {SERVICE_WORKER}; rebuild)'}")
+        return 0 if current else 1
+
+    print("=" * 70)
+    print(f"Offline reload of {len(GAMES)} games from {args.dist}")
+    print("=" * 70)
+    results = verify(args.dist, chrome=args.chrome, headless=not args.headed)
+    ok = True
+    for r in results:
+        passed = not r['second'] and not r['uncached']
+        ok &= passed
+        print(f"{'✓' if passed else '✗'} {r['game']:18s} first load {r['first']:3d} requests, "
+              f"second {len(r['second'])}")
+        # uncached has the server hits too, as full URLs, next to the CDN ones
+        for target in r['uncached'] or r['second']:
+            print(f"    → {target}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Production-like static server for local QA
+An asyncio HTTP/1.1 server for the site tree or dist/ that behaves like the
+deployed site rather than like http.server:
+  - paths resolve like worker.js ('/' and extensionless paths -> index.html)
+  - headers from the _headers file (Cache-Control, security headers)
+  - hot files held in an in-memory LRU together with their gzip / brotli
+    variants (precompressed *.gz / *.br files next to them are used as-is)
+  - strong per-representation ETags, If-None-Match / If-Modified-Since -> 304
+  - files too large for the cache go out with zero-copy sendfile
+  - keep-alive connections
+
+Usage:
+    python3 -m tools.serve [--root dist] [--port 8888] [--cache-mb 64]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import email.utils
+import fnmatch
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from urllib.parse import unquote, urlsplit
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always offered
+    brotli = None
+
+from tools.site import ROOT
+
+DEFAULT_PORT = 8888
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+# Larger files are not kept in memory and go out through sendfile
+MAX_CACHED_FILE = 1024 * 1024
+MIN_COMPRESS_SIZE = 256
+MAX_HEADER_BYTES = 16 * 1024
+KEEPALIVE_TIMEOUT = 15
+
+COMPRESSIBLE = ('text/', 'application/javascript', 'application/json',
+                'application/manifest+json', 'application/xml', 'image/svg+xml')
+MIME_OVERRIDES = {
+    '.js': 'text/javascript',
+    '.mjs': 'text/javascript',
+    '.json': 'application/json',
+    '.webmanifest': 'application/manifest+json',
+    '.woff2': 'font/woff2',
+}
+# Preference order when the client accepts several encodings equally
+ENCODINGS = ['br', 'gzip'] if brotli else ['gzip']
+
+STATUS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+          405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+def content_type(path):
+    ext = os.path.splitext(path)[1].lower()
+    kind = MIME_OVERRIDES.get(ext) or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if kind.startswith('text/') or kind in ('application/json', 'application/manifest+json'):
+        kind += '; charset=utf-8'
+    return kind
+
+
+def asset_path(pathname):
+    """Asset a request path maps to, the way worker.js rewrites it"""
+    if pathname in ('', '/'):
+        return '/index.html'
+    if '.' not in pathname or pathname.endswith('/'):
+        return pathname + 'index.html' if pathname.endswith('/') else pathname + '/index.html'
+    return pathname
+
+
+def compress(data, encoding):
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+
+class HeaderRules:
+    """
+    Rules of a Cloudflare _headers file: an unindented URL pattern followed
+    by indented 'Name: value' lines. '*' matches any run of characters and
+    ':name' one path segment; every matching rule applies.
+    """
+
+    def __init__(self, rules=()):
+        self.rules = list(rules)
+        self._memo = {}
+
+    @classmethod
+    def parse(cls, text):
+        rules = []
+        for raw in text.splitlines():
+            line = raw.strip()
+            if not line or line.startswith('#'):
+                continue
+            if raw[0] not in ' \t':
+                rules.append((cls._compile(line), line, []))
+            elif rules and ':' in line:
+                name, value = line.split(':', 1)
+                rules[-1][2].append((name.strip(), value.strip()))
+        return cls((pattern, headers) for pattern, _, headers in rules)
+
+    @classmethod
+    def load(cls, root):
+        path = os.path.join(root, '_headers')
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as f:
+            return cls.parse(f.read())
+
+    @staticmethod
+    def _compile(pattern):
+        parts = re.split(r'(\*|:[A-Za-z]\w*)', pattern)
+        regex = ''.join('.*' if p == '*' else '[^/]+' if p.startswith(':') and len(p) > 1
+                        else re.escape(p) for p in parts)
+        return re.compile(regex + r'\Z')
+
+    def match(self, *paths):
+        """Headers of every rule matching any of `paths`, in file order"""
+        key = paths
+        if key not in self._memo:
+            headers = {}
+            for pattern, rule_headers in self.rules:
+                if any(pattern.match(p) for p in paths):
+                    for name, value in rule_headers:
+                        lower = name.lower()
+                        if lower in headers and headers[lower][1] != value:
+                            headers[lower] = (headers[lower][0], f'{headers[lower][1]}, {value}')
+                        else:
+                            headers[lower] = (name, value)
+            self._memo[key] = list(headers.values())
+        return self._memo[key]
+
+
+@dataclass
+class Entry:
+    path: str
+    mtime_ns: int
+    size: int
+    content_type: str
+    last_modified: str
+    # encoding ('identity', 'gzip', 'br') -> (body, etag); body None = sendfile
+    variants: dict = field(default_factory=dict)
+
+    @property
+    def weight(self):
+        return sum(len(body) for body, _ in self.variants.values() if body is not None)
+
+
+def load_entry(path, stat, cache_limit=MAX_CACHED_FILE):
+    kind = content_type(path)
+    entry = Entry(path, stat.st_mtime_ns, stat.st_size, kind,
+                  email.utils.formatdate(stat.st_mtime, usegmt=True))
+    if stat.st_size > cache_limit:
+        # Stream it; the ETag is derived from size and mtime instead of content
+        tag = hashlib.sha256(f'{stat.st_size}:{stat.st_mtime_ns}'.encode()).hexdigest()[:32]
+        entry.variants['identity'] = (None, f'"{tag}"')
+        return entry
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    tag = hashlib.sha256(data).hexdigest()[:32]
+    entry.variants['identity'] = (data, f'"{tag}"')
+    if len(data) >= MIN_COMPRESS_SIZE and kind.startswith(COMPRESSIBLE):
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if encoding not in ENCODINGS:
+                continue
+            # Use a build step's precompressed file if it is at least as new
+            pre = path + suffix
+            if os.path.exists(pre) and os.stat(pre).st_mtime_ns >= stat.st_mtime_ns:
+                with open(pre, 'rb') as f:
+                    body = f.read()
+            else:
+                body = compress(data, encoding)
+            if len(body) < len(data):
+                entry.variants[encoding] = (body, f'"{tag}-{encoding}"')
+    return entry
+
+
+class FileCache:
+    """LRU of Entry objects capped by the bytes of their cached bodies"""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path):
+        """Entry for `path`, reloaded when the file changed; None if missing"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.entries.pop(path, None)
+            return None
+        entry = self.entries.get(path)
+        if entry and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            self.entries.move_to_end(path)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        if entry:
+            self.bytes -= entry.weight
+            del self.entries[path]
+        entry = load_entry(path, stat)
+        self.entries[path] = entry
+        self.bytes += entry.weight
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= old.weight
+        return entry
+
+
+def accepted_encodings(header):
+    """Encodings of an Accept-Encoding header with q > 0, best first"""
+    accepted = {}
+    for item in (header or '').split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        match = re.search(r'q\s*=\s*([\d.]+)', params)
+        if match:
+            q = float(match.group(1))
+        accepted[name] = q
+    star = accepted.get('*', 0)
+    choices = [(accepted.get(enc, star), -i, enc) for i, enc in enumerate(ENCODINGS)]
+    return [enc for q, _, enc in sorted(choices, reverse=True) if q > 0]
+
+
+def etag_matches(header, etag):
+    """If-None-Match uses the weak comparison"""
+    if header.strip() == '*':
+        return True
+    strip = etag.removeprefix('W/')
+    return any(tag.strip().removeprefix('W/') == strip for tag in header.split(','))
+
+
+class StaticServer:
+    def __init__(self, root=ROOT, cache_bytes=DEFAULT_CACHE_BYTES, worker=False,
+                 access_log=False):
+        self.root = os.path.realpath(root)
+        self.cache = FileCache(cache_bytes)
+        self.headers = HeaderRules.load(self.root)
+        # worker.js emulation: retry and index.html fallback, worker headers
+        self.routes = None
+        if worker:
+            from tools.worker_routing import RoutingTable, worker_headers
+            self.routes = RoutingTable(self.root)
+            self.worker_headers = worker_headers
+        self.access_log = access_log
+        self.requests = 0
+        self.not_modified = 0
+        self.sendfiles = 0
+        self.connections = set()
+        self._date = (0, '')
+
+    def http_date(self):
+        now = int(time.time())
+        if self._date[0] != now:
+            self._date = (now, email.utils.formatdate(now, usegmt=True))
+        return self._date[1]
+
+    def lookup(self, asset_path):
+        try:
+            fs_path = os.path.realpath(os.path.join(self.root, asset_path.lstrip('/')))
+        except ValueError:
+            # e.g. an embedded NUL byte from /%00
+            return None
+        if fs_path != self.root and not fs_path.startswith(self.root + os.sep):
+            return None
+        if not os.path.isfile(fs_path):
+            return None
+        return self.cache.get(fs_path)
+
+    async def handle(self, reader, writer):
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'),
+                                                  KEEPALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError,
+                        asyncio.LimitOverrunError, ConnectionError):
+                    break
+                keep_alive = await self.respond(head, reader, writer)
+                if not keep_alive:
+                    break
+        finally:
+            self.connections.discard(task)
+            with contextlib.suppress(Exception):
+                writer.close()
+                await writer.wait_closed()
+
+    async def close_connections(self):
+        """Cancel the idle keep-alive connections left after the listener closed"""
+        for task in list(self.connections):
+            task.cancel()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+
+    async def respond(self, head, reader, writer):
+        self.requests += 1
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            await self.send(writer, 400, [], b'', keep_alive=False)
+            return False
+        request = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                request[name.strip().lower()] = value.strip()
+
+        connection = request.get('connection', '').lower()
+        keep_alive = (connection != 'close' if version == 'HTTP/1.1'
+                      else connection == 'keep-alive')
+        try:
+            length = int(request.get('content-length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            await self.send(writer, 400, [], b'', keep_alive=False)
+            return False
+        if length:
+            try:
+                await asyncio.wait_for(reader.readexactly(length), KEEPALIVE_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                # The body never arrived in full: nothing sensible to answer
+                return False
+
+        if method not in ('GET', 'HEAD'):
+            await self.send(writer, 405, [('Allow', 'GET, HEAD')], b'', keep_alive=keep_alive)
+            return keep_alive
+
+        url_path = unquote(urlsplit(target).path)
+        if self.routes:
+            asset = self.routes.resolve(url_path).asset
+            entry = self.lookup(asset) if asset else None
+        else:
+            asset = asset_path(url_path)
+            entry = self.lookup(asset)
+        if entry is None:
+            body = b'404 - File Not Found\n'
+            headers = [('Content-Type', 'text/plain; charset=utf-8')]
+            if self.routes:
+                headers = self.worker_headers(headers, '')
+            await self.send(writer, 404, headers,
+                            body if method == 'GET' else b'', length=len(body),
+                            keep_alive=keep_alive)
+            self.log(method, target, 404)
+            return keep_alive
+
+        encoding = 'identity'
+        if len(entry.variants) > 1:
+            for candidate in accepted_encodings(request.get('accept-encoding')):
+                if candidate in entry.variants:
+                    encoding = candidate
+                    break
+        body, etag = entry.variants[encoding]
+
+        headers = [('Content-Type', entry.content_type), ('ETag', etag),
+                   ('Last-Modified', entry.last_modified)]
+        if len(entry.variants) > 1:
+            headers.append(('Vary', 'Accept-Encoding'))
+        if encoding != 'identity':
+            headers.append(('Content-Encoding', encoding))
+        headers += self.headers.match(url_path, asset)
+        if self.routes:
+            headers = self.worker_headers(headers, entry.content_type)
+
+        inm = request.get('if-none-match')
+        ims = request.get('if-modified-since')
+        fresh = etag_matches(inm, etag) if inm is not None else (
+            ims is not None and ims == entry.last_modified)
+        if fresh:
+            self.not_modified += 1
+            await self.send(writer, 304, headers, b'', length=None, keep_alive=keep_alive)
+            self.log(method, target, 304)
+            return keep_alive
+
+        size = len(body) if body is not None else entry.size
+        if body is None and method == 'GET':
+            await self.send(writer, 200, headers, b'', length=size, keep_alive=keep_alive)
+            self.sendfiles += 1
+            with open(entry.path, 'rb') as f:
+                await asyncio.get_running_loop().sendfile(writer.transport, f)
+        else:
+            await self.send(writer, 200, headers, body if method == 'GET' else b'',
+                            length=size, keep_alive=keep_alive)
+        self.log(method, target, 200)
+        return keep_alive
+
+    async def send(self, writer, status, headers, body, length=0, keep_alive=True):
+        lines = [f'HTTP/1.1 {status} {STATUS[status]}', f'Date: {self.http_date()}',
+                 'Server: games-static']
+        lines += [f'{name}: {value}' for name, value in headers]
+        if length is not None:
+            lines.append(f'Content-Length: {length}')
+        if not keep_alive:
+            lines.append('Connection: close')
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    def log(self, method, target, status):
+        if self.access_log:
+            print(f'{self.http_date()} {method} {target} {status}', flush=True)
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES,
+                                          reuse_address=True)
+
+
+@contextlib.contextmanager
+def running(root=ROOT, host='127.0.0.1', port=0, **options):
+    """Run a StaticServer on its own event loop thread; yields (base URL, server)"""
+    server = StaticServer(root, **options)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    state = {}
+
+    def run():
+        asyncio.set_event_loop(loop)
+        state['server'] = loop.run_until_complete(server.start(host, port))
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+    bound = state['server'].sockets[0].getsockname()[1]
+    try:
+        yield f'http://{host}:{bound}', server
+    finally:
+        async def stop():
+            state['server'].close()
+            await state['server'].wait_closed()
+            await server.close_connections()
+
+        asyncio.run_coroutine_threadsafe(stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--root', default=str(ROOT), help='directory to serve (e.g. dist)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache-mb', type=float, default=DEFAULT_CACHE_BYTES / 2**20)
+    parser.add_argument('--worker', action='store_true',
+                        help='route and add headers like worker.js (retry, index.html '
+                        'fallback, CSP)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='no access log')
+    args = parser.parse_args(argv)
+
+    server = StaticServer(args.root, int(args.cache_mb * 2**20), args.worker,
+                          access_log=not args.quiet)
+
+    async def serve():
+        listener = await server.start(args.host, args.port)
+        print(f"Serving {server.root} at http://{args.host}:{args.port}/ "
+              f"(encodings: {', '.join(ENCODINGS)})", flush=True)
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print(f"\n{server.requests} requests, {server.not_modified} not modified, "
+              f"cache {server.cache.hits} hits / {server.cache.misses} misses")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
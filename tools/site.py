@@ -0,0 +1,80 @@
+"""
+Site layout helpers shared by the Python tools
+Knows where the repository lives, which games get built and which local
+scripts and stylesheets each page pulls in.
+"""
+
+import json
+import re
+from pathlib import Path
+from urllib.parse import urljoin
+
+ROOT = Path(__file__).resolve().parent.parent
+BUILD_SCRIPT = ROOT / 'build.sh'
+
+_GAME_ASSETS_RE = re.compile(
+    r'<script type="application/json" id="game-assets">(.*?)</script>', re.DOTALL)
+_GAMES_RE = re.compile(r'^GAMES="([^"]+)"', re.MULTILINE)
+_SCRIPT_RE = re.compile(r'<script\b[^>]*\bsrc="([^"]+)"', re.IGNORECASE)
+_LINK_RE = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+_HREF_RE = re.compile(r'\bhref="([^"]+)"', re.IGNORECASE)
+# <link> types the browser fetches: stylesheets and the preload / prefetch hints
+ASSET_LINK_RE = re.compile(r'\brel="(?:stylesheet|preload|prefetch|modulepreload)"',
+                           re.IGNORECASE)
+
+
+def load_games(build_script=BUILD_SCRIPT):
+    """Read the GAMES list from build.sh so every tool covers the same set"""
+    match = _GAMES_RE.search(Path(build_script).read_text(encoding='utf-8'))
+    if not match:
+        raise ValueError(f'GAMES variable not found in {build_script}')
+    return match.group(1).split()
+
+
+GAMES = load_games()
+
+
+def is_local(ref):
+    """True for references served by this site (not CDN, data: or anchors)"""
+    return not (
+        ref.startswith(('http://', 'https://', '//', 'data:', '#', 'mailto:'))
+    )
+
+
+def page_refs(html):
+    """Return every script, stylesheet and preload reference of a page (CDN ones too), in order"""
+    refs = [m.group(1) for m in _SCRIPT_RE.finditer(html)]
+    for tag in _LINK_RE.finditer(html):
+        if ASSET_LINK_RE.search(tag.group(0)):
+            href = _HREF_RE.search(tag.group(0))
+            if href:
+                refs.append(href.group(1))
+
+    seen = []
+    for ref in refs:
+        if ref not in seen:
+            seen.append(ref)
+    return seen
+
+
+def page_assets(html):
+    """Return the local script, stylesheet and preload references of a page, in order"""
+    return [ref for ref in page_refs(html) if is_local(ref)]
+
+
+def prefetch_map(hub_html):
+    """The hub's #game-assets map, {game: [hub-relative asset URLs]}; {} when absent"""
+    match = _GAME_ASSETS_RE.search(hub_html)
+    try:
+        return json.loads(match.group(1) or '{}') if match else {}
+    except ValueError:
+        return {}
+
+
+def page_asset_urls(page_url, html):
+    """Resolve page_assets() against the page URL"""
+    return [urljoin(page_url, ref) for ref in page_assets(html)]
+
+
+def game_url(base_url, game):
+    return f"{base_url.rstrip('/')}/{game}/"
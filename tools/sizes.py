@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+First-load size report and transfer budgets
+For the hub and every game page of a built tree, adds up the page and
+the local stylesheets, scripts and preloaded files it links (each file
+once, however many tags name it). Sizes are given raw, gzip -9
+and brotli -11 (when the brotli module is installed). Each page's transfer
+size is checked against size-budgets.json; the exit status is 1 when a
+page is over budget, which fails build.sh.
+
+Usage:
+    python3 -m tools.sizes [--dist dist] [--budgets size-budgets.json] \
+        [--source] [--json sizes.json]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass, field
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from tools.cache import content_hash, default_cache
+from tools.site import GAMES, ROOT, is_local, page_assets
+
+BUDGETS_FILE = ROOT / 'size-budgets.json'
+HUB = 'hub'
+
+
+@dataclass
+class FileSize:
+    path: str
+    raw: int
+    gzip: int
+    br: int = None
+
+
+@dataclass
+class PageWeight:
+    page: str
+    files: list = field(default_factory=list)
+    missing: list = field(default_factory=list)
+
+    def total(self, metric):
+        return sum(getattr(f, metric) or 0 for f in self.files)
+
+
+def compressed_sizes(data, cache=None):
+    """(raw, gzip, brotli) byte counts; brotli is None without the module"""
+    key = content_hash('sizes', data) if cache is not None else None
+    if key:
+        cached = cache.get(key)
+        if cached is not None:
+            return tuple(json.loads(cached))
+    sizes = (len(data), len(gzip.compress(data, compresslevel=9, mtime=0)),
+             len(brotli.compress(data, quality=11)) if brotli else None)
+    if key:
+        cache.put(key, json.dumps(sizes).encode())
+    return sizes
+
+
+def page_file(page):
+    return 'index.html' if page == HUB else f'{page}/index.html'
+
+
+def first_load(root, page, cache=None):
+    """The page and the local scripts, stylesheets and preloads it links, with their sizes"""
+    rel = page_file(page)
+    weight = PageWeight(page)
+    with open(os.path.join(root, rel), 'rb') as f:
+        html = f.read()
+    weight.files.append(FileSize(rel, *compressed_sizes(html, cache)))
+    base = os.path.dirname(rel)
+    for ref in page_assets(html.decode('utf-8')):
+        if not is_local(ref):
+            continue
+        path = os.path.normpath(os.path.join(base, ref.split('?', 1)[0])).replace(os.sep, '/')
+        try:
+            with open(os.path.join(root, path), 'rb') as f:
+                data = f.read()
+        except OSError:
+            weight.missing.append(path)
+            continue
+        weight.files.append(FileSize(path, *compressed_sizes(data, cache)))
+    return weight
+
+
+def load_budgets(path=BUDGETS_FILE):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check_budgets(weights, budgets):
+    """(page, size, budget, ok) per page, measured in the budgets' metric"""
+    metric = budgets.get('metric', 'gzip')
+    if metric == 'br' and brotli is None:
+        metric = 'gzip'
+    rows = []
+    for weight in weights:
+        budget = budgets.get('pages', {}).get(weight.page, budgets['default'])
+        size = weight.total(metric)
+        rows.append((weight.page, size, budget, size <= budget and not weight.missing))
+    return metric, rows
+
+
+def kb(n):
+    return '-' if n is None else f'{n / 1024:.1f}'
+
+
+def print_report(weights, sources=None):
+    print(f"{'page':18s} {'files':>5s} {'raw KB':>9s} {'gzip KB':>9s} {'br KB':>9s}"
+          + ("  source gzip   saved" if sources else ''))
+    for weight in weights:
+        line = (f"{weight.page:18s} {len(weight.files):5d} {kb(weight.total('raw')):>9s} "
+                f"{kb(weight.total('gzip')):>9s} "
+                f"{kb(weight.total('br') if brotli else None):>9s}")
+        if sources:
+            before = sources[weight.page].total('gzip')
+            after = weight.total('gzip')
+            line += f"  {kb(before):>11s} {(before - after) / before if before else 0:7.1%}"
+        print(line)
+        for path in weight.missing:
+            print(f"   ✗ missing {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dist', default=str(ROOT / 'dist'), help='built tree to measure')
+    parser.add_argument('--budgets', default=str(BUDGETS_FILE))
+    parser.add_argument('--source', action='store_true',
+                        help='also measure the unbuilt sources to show the savings')
+    parser.add_argument('--files', action='store_true', help='list every file')
+    parser.add_argument('--json', help='also write the sizes to this JSON file')
+    args = parser.parse_args(argv)
+
+    cache = default_cache('sizes')
+    pages = [HUB] + GAMES
+    weights = [first_load(args.dist, page, cache) for page in pages]
+    sources = {page: first_load(ROOT, page, cache) for page in pages} if args.source else None
+
+    print("=" * 70)
+    print(f"First-load size report - {args.dist}")
+    print("=" * 70)
+    print_report(weights, sources)
+    if args.files:
+        for weight in weights:
+            print(f"\n{weight.page}")
+            for f in weight.files:
+                print(f"   {f.path:45s} {kb(f.raw):>8s} {kb(f.gzip):>8s} {kb(f.br):>8s}")
+
+    budgets = load_budgets(args.budgets)
+    metric, rows = check_budgets(weights, budgets)
+    print(f"\nTransfer budgets ({metric})")
+    print("-" * 70)
+    failed = 0
+    for page, size, budget, ok in rows:
+        failed += not ok
+        print(f"{'✓ PASS' if ok else '✗ FAIL'} - {page:18s} {kb(size):>7s} / {kb(budget)} KB")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'metric': metric, 'pages': [asdict(w) for w in weights],
+                       'budgets': [dict(zip(('page', 'size', 'budget', 'ok'), row))
+                                   for row in rows]}, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Multi-game HTTP smoke runner
+Fetches the hub page, every game page in build.sh's GAMES and all of their
+local scripts and stylesheets concurrently over one keep-alive connection
+pool. Each URL is downloaded at most once per run and timed individually.
+
+Usage:
+    python3 -m tools.smoke [--base-url http://localhost:8888] [--workers 16]
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import asdict, dataclass, field
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tools.site import GAMES, game_url, page_asset_urls
+
+DEFAULT_BASE_URL = "http://localhost:8888"
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int = 0
+    size: int = 0
+    elapsed: float = 0.0
+    error: str = ''
+    text: str = field(default='', repr=False)
+
+    @property
+    def ok(self):
+        return not self.error and self.status == 200
+
+
+class Fetcher:
+    """
+    Thread-safe, de-duplicating HTTP fetcher
+    All requests share one Session (and so one urllib3 keep-alive pool).
+    Concurrent requests for the same URL wait on the first download instead
+    of issuing a second one.
+    """
+
+    def __init__(self, pool_size=16, timeout=10):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._lock = threading.Lock()
+        self._results = {}
+
+    def fetch(self, url):
+        with self._lock:
+            pending = self._results.get(url)
+            owner = pending is None
+            if owner:
+                pending = self._results[url] = Future()
+
+        if owner:
+            # Waiters block on this Future, so it must settle even on an unexpected error
+            try:
+                pending.set_result(self._download(url))
+            except BaseException as e:
+                pending.set_exception(e)
+                raise
+        return pending.result()
+
+    def _download(self, url):
+        result = FetchResult(url)
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            result.status = response.status_code
+            result.size = len(response.content)
+            result.text = response.text
+        except requests.exceptions.RequestException as e:
+            result.error = str(e)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def results(self):
+        with self._lock:
+            futures = list(self._results.values())
+        return [f.result() for f in futures if f.done() and not f.exception()]
+
+    def close(self):
+        self.session.close()
+
+
+def run_smoke(base_url=DEFAULT_BASE_URL, games=GAMES, workers=16, fetcher=None):
+    """
+    Fetch the hub and every game with its assets; returns (pages, results)
+    where pages maps a page URL to the asset URLs it references.
+    Asset downloads are submitted as soon as their page arrives, so pages
+    and assets overlap instead of running in two serial phases.
+    """
+    fetcher = fetcher or Fetcher(pool_size=workers)
+    hub_url = base_url.rstrip('/') + '/'
+    page_urls = [hub_url] + [game_url(base_url, g) for g in games]
+    pages = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        page_futures = [pool.submit(fetcher.fetch, url) for url in page_urls]
+        asset_futures = []
+        for future in as_completed(page_futures):
+            page = future.result()
+            assets = page_asset_urls(page.url, page.text) if page.ok else []
+            pages[page.url] = assets
+            asset_futures += [pool.submit(fetcher.fetch, url) for url in assets]
+        wait(asset_futures)
+
+    return pages, fetcher.results()
+
+
+def print_report(pages, results, wall_time):
+    by_url = {r.url: r for r in results}
+
+    print("\nPer-asset latency")
+    print("-" * 78)
+    for r in sorted(results, key=lambda r: r.elapsed, reverse=True):
+        mark = "✓" if r.ok else "✗"
+        status = r.error[:30] if r.error else r.status
+        print(f"  {mark} {r.elapsed * 1000:8.1f} ms {r.size:9d} B  {status!s:>5}  {r.url}")
+
+    print("\nPer-page summary")
+    print("-" * 78)
+    for page_url, assets in pages.items():
+        urls = [page_url] + assets
+        failed = [u for u in urls if not by_url[u].ok]
+        total = sum(by_url[u].size for u in urls)
+        mark = "✓" if not failed else "✗"
+        print(f"  {mark} {page_url:45s} {len(assets):2d} assets {total:9d} B")
+        for url in failed:
+            print(f"      ✗ {url}")
+
+    requested = sum(len(a) + 1 for a in pages.values())
+    serial = sum(r.elapsed for r in results)
+    print(f"\n  {len(results)} unique downloads for {requested} references")
+    print(f"  Wall time {wall_time * 1000:.0f} ms (sum of latencies {serial * 1000:.0f} ms)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--games', nargs='*', default=GAMES,
+                        help='subset of games to check (default: all of build.sh GAMES)')
+    parser.add_argument('--json', help='also write results to this JSON file')
+    args = parser.parse_args(argv)
+
+    print("=" * 50)
+    print(f"Smoke test: {len(args.games)} games at {args.base_url}")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    pages, results = run_smoke(args.base_url, args.games, args.workers)
+    wall_time = time.perf_counter() - start
+    print_report(pages, results, wall_time)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'base_url': args.base_url,
+                'wall_time': wall_time,
+                'pages': pages,
+                'results': [{k: v for k, v in asdict(r).items() if k != 'text'}
+                            for r in results],
+            }, f, indent=2)
+
+    failed = [r for r in results if not r.ok]
+    print(f"\nOverall: {len(results) - len(failed)}/{len(results)} downloads OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
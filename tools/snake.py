@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Headless snake bot: spawn and collision cost by snake length
+A bot follows a Hamiltonian cycle of the board, so it never dies and plays
+every game to the win at 95% of the cells (eatFood in snake-game/game.js).
+Per step it times the self-collision check and per food the spawn, and
+reports both by how full the board is. That is where the old code hitched:
+spawnFood retried random cells with an O(length) scan each and fell back to
+an O(board x length) rebuild of the empty cells.
+
+Engines:
+    python  a replica of the game rules with either index
+              scan  the old code: snake.some() per check, rejection sampling
+              grid  the occupancy counts and swap-remove free-cell set of
+                    snake-game/grid.js
+    node    the real SnakeGame of game.js (with grid.js) under Node with a
+            stub DOM, timing update() and spawnFood(); --compare runs the
+            same bot on another game.js, e.g. one saved with
+            `git show REV:snake-game/game.js`
+
+`verify` plays the real game.js under Node, checks after every step that
+the grid and free-cell set match the snake and that food never lands on
+it, and that the bot reaches the win.
+
+Usage:
+    python3 -m tools.snake bench [--engine python] [--size 20x20] [--games 3] \
+        [--seed 1] [--compare OLD.js] [--json out.json]
+    python3 -m tools.snake verify [--size 12x10] [--seed 1]
+"""
+
+import argparse
+import json
+import random
+import shutil
+import subprocess
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from tools.pinball_profile import percentiles
+from tools.site import ROOT
+
+GAME_DIR = ROOT / 'snake-game'
+GAME_SOURCE = GAME_DIR / 'game.js'
+GRID_SOURCE = GAME_DIR / 'grid.js'
+INDEXES = ['scan', 'grid']
+# eatFood: the game is won once the snake covers this share of the board
+WIN_FILL = 0.95
+# spawnFood's random tries before the old code rebuilt the empty-cell list
+MAX_ATTEMPTS = 500
+FILL_BUCKETS = 10
+
+
+def hamiltonian_cycle(cols, rows):
+    """Next cell index of every cell on a cycle through the whole board
+
+    Row 0 runs right, the rows below snake back and forth over columns
+    1..cols-1 and column 0 leads back up. Needs an even number of rows or
+    columns; with odd rows the board is walked transposed.
+    """
+    if rows % 2 and cols % 2:
+        raise ValueError(f'no Hamiltonian cycle on a {cols}x{rows} board')
+    transposed = rows % 2 == 1
+    if transposed:
+        cols, rows = rows, cols
+    nxt = {}
+    for y in range(rows):
+        for x in range(cols):
+            if x == 0:
+                step = (1, 0) if y == 0 else (0, -1)
+            elif y % 2 == 0:
+                step = (1, 0) if x < cols - 1 else (0, 1)
+            elif x > 1:
+                step = (-1, 0)
+            else:
+                step = (-1, 0) if y == rows - 1 else (0, 1)
+            nxt[(x, y)] = (x + step[0], y + step[1])
+    if transposed:
+        nxt = {(y, x): (ny, nx) for (x, y), (nx, ny) in nxt.items()}
+        cols, rows = rows, cols
+    return [ny * cols + nx for (nx, ny) in (nxt[(i % cols, i // cols)] for i in range(cols * rows))]
+
+
+def cycle_directions(cols, rows, head, neck):
+    """(dx, dy) per cell along the cycle, oriented so the head moves away from its neck"""
+    nxt = hamiltonian_cycle(cols, rows)
+    if nxt[head[1] * cols + head[0]] == neck[1] * cols + neck[0]:
+        prev = [0] * len(nxt)
+        for cell, after in enumerate(nxt):
+            prev[after] = cell
+        nxt = prev
+    return [(after % cols - cell % cols, after // cols - cell // cols)
+            for cell, after in enumerate(nxt)]
+
+
+def start_snake(cols, rows):
+    """The three segments reset() places, head first"""
+    cx = min(cols // 2, cols - 4)
+    cy = min(rows // 2, rows - 1)
+    return [(cx, cy), (max(cx - 1, 0), cy), (max(cx - 2, 0), cy)]
+
+
+class OccupancyGrid:
+    """Python twin of OccupancyGrid in snake-game/grid.js"""
+
+    def __init__(self, cols, rows):
+        self.cols, self.rows = cols, rows
+        size = cols * rows
+        self.counts = [0] * size
+        self.free = list(range(size))
+        self.slot = list(range(size))
+        self.free_count = size
+
+    def is_occupied(self, x, y):
+        if x < 0 or x >= self.cols or y < 0 or y >= self.rows:
+            return True
+        return self.counts[y * self.cols + x] > 0
+
+    def occupy(self, x, y):
+        cell = y * self.cols + x
+        self.counts[cell] += 1
+        if self.counts[cell] > 1:
+            return
+        slot = self.slot[cell]
+        self.free_count -= 1
+        last = self.free[self.free_count]
+        self.free[slot] = last
+        self.slot[last] = slot
+        self.slot[cell] = -1
+
+    def release(self, x, y):
+        cell = y * self.cols + x
+        self.counts[cell] -= 1
+        if self.counts[cell] > 0:
+            return
+        self.slot[cell] = self.free_count
+        self.free[self.free_count] = cell
+        self.free_count += 1
+
+    def random_free(self, random):
+        if self.free_count == 0:
+            return None
+        cell = self.free[int(random() * self.free_count)]
+        return cell % self.cols, cell // self.cols
+
+
+class SnakeGame:
+    """The rules of game.js update() / spawnFood() / eatFood() with a chosen index
+
+    Every collision check and spawn is timed and recorded with the snake's
+    length at the time, in the same shape as the Node harness reports.
+    """
+
+    def __init__(self, cols, rows, index='grid', seed=1):
+        if index not in INDEXES:
+            raise ValueError(f'unknown index {index!r}')
+        self.cols, self.rows, self.index = cols, rows, index
+        self.rng = random.Random(seed)
+        self.snake = deque(start_snake(cols, rows))
+        self.grid = OccupancyGrid(cols, rows) if index == 'grid' else None
+        if self.grid:
+            for x, y in self.snake:
+                self.grid.occupy(x, y)
+        self.checks = {'length': [], 'ns': []}
+        self.spawns = {'length': [], 'ns': []}
+        self.over = self.won = False
+        self.food = None
+        self.spawn_food()
+
+    def collides(self, x, y):
+        if self.grid:
+            return self.grid.is_occupied(x, y)
+        if x < 0 or x >= self.cols or y < 0 or y >= self.rows:
+            return True
+        return any(s == (x, y) for s in self.snake)
+
+    def _scan_spawn(self):
+        random = self.rng.random
+        for _ in range(MAX_ATTEMPTS):
+            spot = (int(random() * self.cols), int(random() * self.rows))
+            if not any(s == spot for s in self.snake):
+                return spot
+        empty = [(x, y) for x in range(self.cols) for y in range(self.rows)
+                 if not any(s == (x, y) for s in self.snake)]
+        return empty[int(random() * len(empty))] if empty else None
+
+    def spawn_food(self):
+        self.rng.random()  # the food type draw
+        start = time.perf_counter_ns()
+        spot = self.grid.random_free(self.rng.random) if self.grid else self._scan_spawn()
+        self.spawns['ns'].append(time.perf_counter_ns() - start)
+        self.spawns['length'].append(len(self.snake))
+        self.food = spot
+        if spot is None:
+            self.over = self.won = True
+
+    def step(self, dx, dy):
+        hx, hy = self.snake[0]
+        x, y = hx + dx, hy + dy
+        start = time.perf_counter_ns()
+        dead = self.collides(x, y)
+        self.checks['ns'].append(time.perf_counter_ns() - start)
+        self.checks['length'].append(len(self.snake))
+        if dead:
+            self.over = True
+            return
+        self.snake.appendleft((x, y))
+        if self.grid:
+            self.grid.occupy(x, y)
+        if (x, y) == self.food:
+            if len(self.snake) >= self.cols * self.rows * WIN_FILL:
+                self.over = self.won = True
+                return
+            self.spawn_food()
+        else:
+            tx, ty = self.snake.pop()
+            if self.grid:
+                self.grid.release(tx, ty)
+
+
+def play_game(cols, rows, index='grid', seed=1, max_steps=None):
+    game = SnakeGame(cols, rows, index, seed)
+    directions = cycle_directions(cols, rows, game.snake[0], game.snake[1])
+    max_steps = max_steps or (cols * rows) ** 2
+    steps = 0
+    while not game.over and steps < max_steps:
+        x, y = game.snake[0]
+        game.step(*directions[y * cols + x])
+        steps += 1
+    return game, steps
+
+
+def by_fill(lengths, ns, cells, buckets=FILL_BUCKETS):
+    """Percentiles (µs) of calls made at the given snake lengths, grouped by board fill"""
+    lengths = np.asarray(lengths, dtype=float)
+    us = np.asarray(ns, dtype=float) / 1e3
+    rows = []
+    for b in range(buckets):
+        lo, hi = b / buckets, (b + 1) / buckets
+        upper = lengths < hi * cells if b < buckets - 1 else lengths <= cells
+        picked = us[(lengths >= lo * cells) & upper]
+        rows.append({'fill': f'{lo:.0%}-{hi:.0%}', 'calls': len(picked), **percentiles(picked)})
+    return rows
+
+
+def merge_games(results, cells):
+    """Per-call timings of several games -> by-fill rows of checks and spawns"""
+    checks = {'length': [], 'ns': []}
+    spawns = {'length': [], 'ns': []}
+    for result in results:
+        for key in ('length', 'ns'):
+            checks[key] += result['checks'][key]
+            spawns[key] += result['spawns'][key]
+    return {'check': by_fill(checks['length'], checks['ns'], cells),
+            'spawn': by_fill(spawns['length'], spawns['ns'], cells),
+            'won': sum(r['won'] for r in results), 'games': len(results),
+            'steps': sum(r['steps'] for r in results)}
+
+
+def bench_python(cols, rows, games=3, seed=1):
+    """{index: by-fill checks and spawns} over bot games with each index"""
+    out = {}
+    for index in INDEXES:
+        results = []
+        for g in range(games):
+            game, steps = play_game(cols, rows, index, seed + g)
+            results.append({'checks': game.checks, 'spawns': game.spawns, 'won': game.won,
+                            'steps': steps})
+        out[index] = merge_games(results, cols * rows)
+    return out
+
+
+NODE_HARNESS = r"""
+const fs = require('fs');
+const input = JSON.parse(fs.readFileSync(0, 'utf8'));
+
+let state = 0x9e3779b9 ^ input.seed;
+Math.random = function () {
+    state = (state + 0x6D2B79F5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+};
+
+// Anything in the DOM: every property is another stub, calls return stubs
+function stub() {
+    const store = {};
+    return new Proxy(function () {}, {
+        get(_, key) {
+            if (key === Symbol.toPrimitive) return () => 0;
+            if (key === 'then') return undefined;
+            if (!(key in store)) store[key] = stub();
+            return store[key];
+        },
+        set(_, key, value) { store[key] = value; return true; },
+        apply: () => stub(),
+        construct: () => stub(),
+    });
+}
+const canvas = stub();
+canvas.parentElement = { getBoundingClientRect: () => ({ width: input.cols * 20, height: input.rows * 20 }) };
+globalThis.window = globalThis;
+window.addEventListener = () => {};
+globalThis.document = new Proxy(stub(), {
+    get(target, key) {
+        if (key === 'getElementById') return id => (id === 'game-canvas' ? canvas : stub());
+        return target[key];
+    },
+});
+globalThis.localStorage = { getItem: () => null, setItem() {} };
+globalThis.navigator = {};
+globalThis.requestAnimationFrame = () => 1;
+globalThis.cancelAnimationFrame = () => {};
+globalThis.setTimeout = () => 0;
+globalThis.clearTimeout = () => {};
+
+(0, eval)(input.sources.map(path => fs.readFileSync(path, 'utf8')).join('\n') +
+    '\nglobalThis.SnakeGame = SnakeGame;');
+const game = new SnakeGame();
+const cols = game.tileCountX;
+const now = process.hrtime.bigint;
+
+const spawns = { length: [], ns: [] };
+const steps = { length: [], ns: [] };
+let nested = 0n;
+const spawnFood = game.spawnFood.bind(game);
+game.spawnFood = () => {
+    const start = now();
+    spawnFood();
+    const elapsed = now() - start;
+    nested += elapsed;
+    spawns.length.push(game.snake.length);
+    spawns.ns.push(Number(elapsed));
+};
+
+// The grid and free-cell set against a recount of the snake
+function consistent() {
+    const grid = game.grid;
+    const counts = new Uint16Array(grid.counts.length);
+    for (const s of game.snake) counts[s.y * cols + s.x]++;
+    let free = 0;
+    for (let cell = 0; cell < counts.length; cell++) {
+        if (counts[cell] !== grid.counts[cell]) return false;
+        if (counts[cell] === 0) {
+            free++;
+            if (grid.free[grid.slot[cell]] !== cell || grid.slot[cell] >= grid.freeCount) return false;
+        } else if (grid.slot[cell] !== -1) return false;
+    }
+    return free === grid.freeCount;
+}
+
+let mismatches = 0;
+let foodOnSnake = 0;
+let n = 0;
+for (; n < input.max_steps && !game.state.gameOver; n++) {
+    const head = game.snake[0];
+    [game.dx, game.dy] = input.directions[head.y * cols + head.x];
+    const length = game.snake.length;
+    nested = 0n;
+    const start = now();
+    game.update();
+    steps.length.push(length);
+    steps.ns.push(Number(now() - start - nested));
+    if (input.check && !game.state.gameOver) {
+        if (!consistent()) mismatches++;
+        if (game.snake.some(s => s.x === game.food.x && s.y === game.food.y)) foodOnSnake++;
+    }
+}
+process.stdout.write(JSON.stringify({
+    steps: n, length: game.snake.length, cells: cols * game.tileCountY,
+    won: game.state.gameOver && game.snake.length >= cols * game.tileCountY * 0.95,
+    mismatches, food_on_snake: foodOnSnake, spawns, checks: steps,
+}));
+"""
+
+
+def run_node(cols, rows, seed=1, source=GAME_SOURCE, check=False, max_steps=None):
+    node = shutil.which('node')
+    if node is None:
+        raise RuntimeError('node is required to run game.js')
+    directions = cycle_directions(cols, rows, *start_snake(cols, rows)[:2])
+    payload = json.dumps({'sources': [str(GRID_SOURCE), str(source)], 'cols': cols, 'rows': rows,
+                          'seed': seed, 'directions': directions, 'check': check,
+                          'max_steps': max_steps or (cols * rows) ** 2})
+    proc = subprocess.run([node, '-e', NODE_HARNESS], input=payload, capture_output=True,
+                          text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def bench_node(cols, rows, games=3, seed=1, sources=(GAME_SOURCE,)):
+    """{source: by-fill update() and spawnFood() times} over bot games on each game.js"""
+    return {str(source): merge_games([run_node(cols, rows, seed + g, source) for g in range(games)],
+                                     cols * rows)
+            for source in sources}
+
+
+def verify(cols, rows, seed=1):
+    result = run_node(cols, rows, seed, check=True)
+    ok = result['won'] and result['mismatches'] == 0 and result['food_on_snake'] == 0
+    return ok, result
+
+
+def parse_size(text):
+    cols, rows = (int(v) for v in text.lower().split('x'))
+    return cols, rows
+
+
+def print_results(results, check_label):
+    for name, r in results.items():
+        print(f"\n{name}: {r['won']}/{r['games']} games won, {r['steps']} steps")
+        print(f"  {'fill':>9s} {check_label + ' p50/p99 µs':>20s} {'spawns':>7s} "
+              f"{'spawn p50/p99/max µs':>24s}")
+        for check, spawn in zip(r['check'], r['spawn']):
+            print(f"  {check['fill']:>9s} {check['p50']:9.3f}/{check['p99']:<10.3f} "
+                  f"{spawn['calls']:7d} {spawn['p50']:7.2f}/{spawn['p99']:<7.1f}/{spawn['max']:<8.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='\n'.join(__doc__.strip().splitlines()[1:]))
+    sub = parser.add_subparsers(dest='command', required=True)
+    bench = sub.add_parser('bench', help='play bot games and time collision checks and spawns')
+    bench.add_argument('--engine', choices=['python', 'node'], default='python')
+    bench.add_argument('--size', type=parse_size, default=(20, 20), help='COLSxROWS board')
+    bench.add_argument('--games', type=int, default=3)
+    bench.add_argument('--seed', type=int, default=1)
+    bench.add_argument('--compare', help='node engine: another game.js to run the same games on')
+    bench.add_argument('--json', help='also write the results to this JSON file')
+    check = sub.add_parser('verify', help='check the grid of the real game.js against the snake')
+    check.add_argument('--size', type=parse_size, default=(12, 10), help='COLSxROWS board')
+    check.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+    cols, rows = args.size
+
+    if args.command == 'verify':
+        ok, result = verify(cols, rows, args.seed)
+        print(f"{'✓' if ok else '✗'} {cols}x{rows}: {result['steps']} steps, length "
+              f"{result['length']}/{result['cells']}, won={result['won']}, grid mismatches "
+              f"{result['mismatches']}, food on snake {result['food_on_snake']}")
+        return 0 if ok else 1
+
+    print("=" * 70)
+    print(f"Snake bot on {cols}x{rows} ({args.engine}, {args.games} games): "
+          f"cost per call by board fill")
+    print("=" * 70)
+    if args.engine == 'node':
+        sources = [args.compare, str(GAME_SOURCE)] if args.compare else [str(GAME_SOURCE)]
+        results = bench_node(cols, rows, args.games, args.seed, sources)
+        print_results(results, 'update')
+    else:
+        results = bench_python(cols, rows, args.games, args.seed)
+        print_results(results, 'check')
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+Headless space-shooter stress test: collision cost by on-screen entity count
+The game has no waves or power-ups, so both are stood in for: wave N makes N
+spawn attempts per frame at the difficulty's enemySpawnRate, and rapid fire
+shortens the 0.2 s shot cooldown. A bot sweeps the ship across the bottom of
+the screen with the trigger held and cannot die, so the screen keeps filling
+as the wave number grows. Per frame it times the bullet and enemy update
+(movement plus every bullet/enemy/ship check) and records how many enemies
+and bullets were on screen.
+
+Engines:
+    python  a replica of the game rules with either collision pass
+              naive  the old code: every enemy against every bullet,
+                     array splice on every removal
+              grid   the bullets in a uniform grid rebuilt each frame, each
+                     enemy against the bullets in its cells, swap-remove
+                     (space-shooter/broadphase.js)
+    node    the real SpaceShooterGame of game.js (with broadphase.js) under
+            Node with a stub DOM, timing updateBullets() + updateEnemies();
+            --compare runs the same waves on another game.js, e.g. one saved
+            with `git show REV:space-shooter/game.js`
+
+Interpreted Python pays more per grid query than per rectangle check, so the
+python engine is for the rules and the entity counts; frame cost and caps
+come from the node engine.
+
+The caps report the largest enemy count whose p99 frame cost stays inside
+--budget, the numbers behind SpaceShooterGame.MAX_ENEMIES / MAX_BULLETS.
+The pool caps are lifted while benchmarking so the sweep can go past them.
+
+Usage:
+    python3 -m tools.space_shooter [--engine python] [--waves 1,5,10,20,40] \
+        [--cooldown 0.2] [--frames 600] [--budget 1.0] [--seed 1] \
+        [--compare OLD.js] [--json out.json]
+"""
+
+import argparse
+import json
+import math
+import random
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from tools.pinball_profile import percentiles
+from tools.site import ROOT
+
+GAME_DIR = ROOT / 'space-shooter'
+GAME_SOURCE = GAME_DIR / 'game.js'
+BROADPHASE_SOURCE = GAME_DIR / 'broadphase.js'
+ENGINES = ['naive', 'grid']
+WIDTH, HEIGHT = 800, 600
+DT = 1 / 60
+# game.js difficultySettings.hard and the desktop sizes
+SPAWN_RATE = 0.05
+ENEMY_SPEED = 200
+BULLET_SPEED = 500
+ENEMY_SIZE = 40
+SHIP_SIZE = 40
+BULLET_W, BULLET_H = 4, 15
+SHOT_COOLDOWN = 0.2
+GRID_CELL_SIZE = 64
+# game.js GRID_MIN_BULLETS: up to this many bullets every enemy checks them all
+GRID_MIN_BULLETS = 16
+COUNT_BUCKET = 32
+MIN_BUCKET_FRAMES = 100
+
+
+class Entity:
+    __slots__ = ('x', 'y', 'w', 'h', 's', 'id')
+
+    def __init__(self, x, y, w, h, s, id=0):
+        self.x, self.y, self.w, self.h, self.s, self.id = x, y, w, h, s, id
+
+
+def collides(a, b):
+    return a.x < b.x + b.w and a.x + a.w > b.x and a.y < b.y + b.h and a.y + a.h > b.y
+
+
+class EntityPool:
+    """broadphase.js EntityPool: a dense list with swap-remove and a free list"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.items = []
+        self.spare = []
+        self.dropped = 0
+
+    def acquire(self):
+        if len(self.items) >= self.capacity:
+            self.dropped += 1
+            return None
+        item = self.spare.pop() if self.spare else Entity(0, 0, 0, 0, 0)
+        self.items.append(item)
+        return item
+
+    def release(self, i):
+        items = self.items
+        item = items[i]
+        items[i] = items[-1]
+        items.pop()
+        self.spare.append(item)
+
+
+class UniformGrid:
+    """broadphase.js UniformGrid: indices counting-sorted into cells, deduplicated queries"""
+
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cols = self.rows = 0
+        self.cell_start = [0]
+        self.entries = []
+
+    def _span(self, x, y, w, h):
+        size, cols, rows = self.cell_size, self.cols, self.rows
+        c0 = min(cols - 1, max(0, math.floor(x / size)))
+        c1 = min(cols - 1, max(0, math.floor((x + w) / size)))
+        r0 = min(rows - 1, max(0, math.floor(y / size)))
+        r1 = min(rows - 1, max(0, math.floor((y + h) / size)))
+        return [r * cols + c for r in range(r0, r1 + 1) for c in range(c0, c1 + 1)]
+
+    def build(self, items, width, height):
+        self.cols = max(1, math.ceil(width / self.cell_size))
+        self.rows = max(1, math.ceil(height / self.cell_size))
+        cells = self.cols * self.rows
+        spans = [self._span(it.x, it.y, it.w, it.h) for it in items]
+        start = [0] * (cells + 1)
+        for span in spans:
+            for c in span:
+                start[c + 1] += 1
+        for c in range(cells):
+            start[c + 1] += start[c]
+        fill = start[:-1]
+        entries = [0] * start[-1]
+        for i, span in enumerate(spans):
+            for c in span:
+                entries[fill[c]] = i
+                fill[c] += 1
+        self.cell_start, self.entries = start, entries
+
+    def query(self, x, y, w, h):
+        found, seen = [], set()
+        for c in self._span(x, y, w, h):
+            for k in range(self.cell_start[c], self.cell_start[c + 1]):
+                i = self.entries[k]
+                if i not in seen:
+                    seen.add(i)
+                    found.append(i)
+        return found
+
+
+def collide_naive(enemies, bullets, ship, height):
+    """The old updateEnemies pass after movement: (enemy id, bullet id) hits, rammed enemy ids"""
+    hits, rammed = [], []
+    for i in range(len(enemies) - 1, -1, -1):
+        e = enemies[i]
+        if collides(ship, e):
+            rammed.append(e.id)
+            del enemies[i]
+            continue
+        for j in range(len(bullets) - 1, -1, -1):
+            if collides(bullets[j], e):
+                hits.append((e.id, bullets[j].id))
+                del enemies[i]
+                del bullets[j]
+                break
+        else:
+            if e.y > height:
+                del enemies[i]
+    return hits, rammed
+
+
+def collide_grid(enemy_pool, bullet_pool, ship, height, grid, min_bullets=GRID_MIN_BULLETS):
+    """The broadphase.js pass of the new updateEnemies, same return as collide_naive"""
+    enemies, bullets = enemy_pool.items, bullet_pool.items
+    use_grid = len(bullets) > min_bullets
+    if use_grid:
+        grid.build(bullets, WIDTH, height)
+    hit = [False] * len(bullets)
+    hits, rammed = [], []
+    for i in range(len(enemies) - 1, -1, -1):
+        e = enemies[i]
+        if collides(ship, e):
+            rammed.append(e.id)
+            enemy_pool.release(i)
+            continue
+        shot = -1
+        if use_grid:
+            for j in grid.query(e.x, e.y, e.w, e.h):
+                if j > shot and not hit[j] and collides(bullets[j], e):
+                    shot = j
+        else:
+            for j in range(len(bullets) - 1, -1, -1):
+                if not hit[j] and collides(bullets[j], e):
+                    shot = j
+                    break
+        if shot >= 0:
+            hit[shot] = True
+            hits.append((e.id, bullets[shot].id))
+            enemy_pool.release(i)
+        elif e.y > height:
+            enemy_pool.release(i)
+    for j in range(len(bullets) - 1, -1, -1):
+        if hit[j]:
+            bullet_pool.release(j)
+    return hits, rammed
+
+
+class Shooter:
+    """game.js update() rules for bullets and enemies with a chosen collision pass"""
+
+    def __init__(self, engine='grid', wave=1, cooldown=SHOT_COOLDOWN, seed=1,
+                 max_enemies=1 << 20, max_bullets=1 << 20):
+        if engine not in ENGINES:
+            raise ValueError(f'unknown engine {engine!r}')
+        self.engine, self.wave, self.cooldown = engine, wave, cooldown
+        self.rng = random.Random(seed)
+        self.ship = Entity(WIDTH / 2 - SHIP_SIZE / 2, HEIGHT - 80, SHIP_SIZE, SHIP_SIZE, 0)
+        self.enemy_pool = EntityPool(max_enemies)
+        self.bullet_pool = EntityPool(max_bullets)
+        self.grid = UniformGrid()
+        self.time = self.cd = 0.0
+        self.next_id = 0
+        self.kills = self.rams = 0
+        self.frames = {'enemies': [], 'bullets': [], 'ns': []}
+
+    def _new(self, pool, x, y, w, h, s):
+        if self.engine == 'grid':
+            item = pool.acquire()
+            if item is None:
+                return
+        else:
+            item = Entity(0, 0, 0, 0, 0)
+            pool.items.append(item)
+        item.x, item.y, item.w, item.h, item.s = x, y, w, h, s
+        item.id = self.next_id
+        self.next_id += 1
+
+    def frame(self):
+        self.time += DT
+        ship = self.ship
+        # The bot: sweep the bottom of the screen, trigger held
+        ship.x = (math.sin(self.time * 1.3) * 0.5 + 0.5) * (WIDTH - ship.w)
+        self.cd -= DT
+        if self.cd <= 0:
+            self._new(self.bullet_pool, ship.x + ship.w / 2 - BULLET_W / 2, ship.y,
+                      BULLET_W, BULLET_H, BULLET_SPEED)
+            self.cd = self.cooldown
+        for _ in range(self.wave):
+            if self.rng.random() < SPAWN_RATE:
+                self._new(self.enemy_pool, self.rng.random() * (WIDTH - ENEMY_SIZE), -50,
+                          ENEMY_SIZE, ENEMY_SIZE, ENEMY_SPEED + self.rng.random() * 50)
+
+        enemies, bullets = self.enemy_pool.items, self.bullet_pool.items
+        self.frames['enemies'].append(len(enemies))
+        self.frames['bullets'].append(len(bullets))
+        start = time.perf_counter_ns()
+        for j in range(len(bullets) - 1, -1, -1):
+            b = bullets[j]
+            b.y -= b.s * DT
+            if b.y < -20:
+                if self.engine == 'grid':
+                    self.bullet_pool.release(j)
+                else:
+                    del bullets[j]
+        for e in enemies:
+            e.y += e.s * DT
+        if self.engine == 'grid':
+            hits, rammed = collide_grid(self.enemy_pool, self.bullet_pool, ship, HEIGHT, self.grid)
+        else:
+            hits, rammed = collide_naive(enemies, bullets, ship, HEIGHT)
+        self.frames['ns'].append(time.perf_counter_ns() - start)
+        self.kills += len(hits)
+        self.rams += len(rammed)
+
+
+def wave_row(frames, settle):
+    """Counts and frame cost (µs) of one wave, skipping the first `settle` frames"""
+    enemies = np.asarray(frames['enemies'][settle:])
+    bullets = np.asarray(frames['bullets'][settle:])
+    us = np.asarray(frames['ns'][settle:], dtype=float) / 1e3
+    return {'enemies_mean': float(enemies.mean()), 'enemies_max': int(enemies.max()),
+            'bullets_mean': float(bullets.mean()), 'bullets_max': int(bullets.max()),
+            **percentiles(us)}
+
+
+def caps(runs, budget_ms, settle=0, bucket=COUNT_BUCKET, min_frames=MIN_BUCKET_FRAMES):
+    """Largest enemy count (and the bullets seen with it) whose p99 frame cost fits the budget
+
+    Frames of all waves past the first `settle` are pooled and grouped by
+    enemy count in `bucket` steps; the cap is the top of the highest bucket
+    before the first one over budget. Buckets with fewer than `min_frames`
+    frames are listed but too thin for a p99 to end the scan.
+    """
+    enemies = np.concatenate([r['enemies'][settle:] for r in runs])
+    bullets = np.concatenate([r['bullets'][settle:] for r in runs])
+    ms = np.concatenate([np.asarray(r['ns'][settle:], dtype=float) for r in runs]) / 1e6
+    cap = {'enemies': 0, 'bullets': 0, 'buckets': []}
+    for lo in range(0, int(enemies.max()) + 1, bucket):
+        picked = (enemies >= lo) & (enemies < lo + bucket)
+        if picked.sum() < min_frames:
+            continue
+        p99 = float(np.percentile(ms[picked], 99))
+        cap['buckets'].append({'enemies': f'{lo}-{lo + bucket - 1}', 'frames': int(picked.sum()),
+                               'p99_ms': p99})
+        if p99 > budget_ms:
+            break
+        cap['enemies'] = lo + bucket
+        cap['bullets'] = max(cap['bullets'], int(bullets[picked].max()))
+    return cap
+
+
+def bench_python(waves, cooldown=SHOT_COOLDOWN, frames=600, seed=1, budget_ms=1.0):
+    """{engine: per-wave rows and caps} over the same seeded waves"""
+    out = {}
+    settle = frames // 4
+    for engine in ENGINES:
+        runs, rows = [], []
+        for wave in waves:
+            game = Shooter(engine, wave, cooldown, seed)
+            for _ in range(frames):
+                game.frame()
+            runs.append(game.frames)
+            rows.append({'wave': wave, 'kills': game.kills, **wave_row(game.frames, settle)})
+        out[engine] = {'waves': rows, 'caps': caps(runs, budget_ms, settle)}
+    return out
+
+
+NODE_HARNESS = r"""
+const fs = require('fs');
+const input = JSON.parse(fs.readFileSync(0, 'utf8'));
+
+let state = 0x9e3779b9 ^ input.seed;
+Math.random = function () {
+    state = (state + 0x6D2B79F5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+};
+
+// Anything in the DOM: every property is another stub, calls return stubs
+function stub() {
+    const store = {};
+    return new Proxy(function () {}, {
+        get(_, key) {
+            if (key === Symbol.toPrimitive) return () => 0;
+            if (key === 'then') return undefined;
+            if (!(key in store)) store[key] = stub();
+            return store[key];
+        },
+        set(_, key, value) { store[key] = value; return true; },
+        apply: () => stub(),
+        construct: () => stub(),
+    });
+}
+const canvas = stub();
+canvas.parentElement = { getBoundingClientRect: () => ({ width: input.width, height: input.height }) };
+globalThis.window = globalThis;
+window.addEventListener = () => {};
+window.innerWidth = 1024;
+window.devicePixelRatio = 1;
+globalThis.document = new Proxy(stub(), {
+    get(target, key) {
+        if (key === 'getElementById') return id => (id === 'gameCanvas' ? canvas : stub());
+        return target[key];
+    },
+});
+globalThis.getComputedStyle = () => stub();
+globalThis.localStorage = { getItem: () => null, setItem() {} };
+globalThis.navigator = {};
+globalThis.requestAnimationFrame = () => 1;
+globalThis.cancelAnimationFrame = () => {};
+globalThis.setTimeout = () => 0;
+globalThis.clearTimeout = () => {};
+// game.js logs its start-up; stdout carries the results
+console.log = () => {};
+globalThis.setInterval = () => 0;
+globalThis.clearInterval = () => {};
+
+(0, eval)(input.sources.map(path => fs.readFileSync(path, 'utf8')).join('\n') +
+    '\nglobalThis.SpaceShooterGame = SpaceShooterGame;');
+// Lift the pool caps so the sweep can go past them
+if ('MAX_ENEMIES' in SpaceShooterGame) {
+    SpaceShooterGame.MAX_ENEMIES = SpaceShooterGame.MAX_BULLETS = 1 << 20;
+}
+const now = process.hrtime.bigint;
+const dt = 1 / 60;
+
+const waves = [];
+for (const wave of input.waves) {
+    const game = new SpaceShooterGame();
+    game.reset();
+    game.state.running = true;
+    game.state.difficulty = 'hard';
+    game.state.lives = Infinity;
+    game.state.soundEnabled = false;
+    game.keys.Space = true;
+
+    let spent = 0n;
+    for (const name of ['updateBullets', 'updateEnemies']) {
+        const original = game[name].bind(game);
+        game[name] = (...args) => {
+            const start = now();
+            original(...args);
+            spent += now() - start;
+        };
+    }
+
+    const frames = { enemies: [], bullets: [], ns: [] };
+    let time = 0;
+    let kills = 0;
+    for (let f = 0; f < input.frames; f++) {
+        time += dt;
+        // The bot: sweep the bottom of the screen, trigger held
+        game.player.x = (Math.sin(time * 1.3) * 0.5 + 0.5) * (game.width - game.player.w);
+        game.player.y = game.height - 80;
+        const settings = game.difficultySettings.hard;
+        for (let w = 1; w < wave; w++) game.spawnEnemies(settings);
+        frames.enemies.push(game.enemies.length);
+        frames.bullets.push(game.bullets.length);
+        const before = game.state.enemiesDestroyed;
+        spent = 0n;
+        game.update(dt);
+        game.player.cd = Math.min(game.player.cd, input.cooldown);
+        frames.ns.push(Number(spent));
+        kills += game.state.enemiesDestroyed - before;
+        // Particles are not what is measured here; keep them from piling up
+        game.particles.length = 0;
+    }
+    waves.push({ wave, kills, frames });
+}
+process.stdout.write(JSON.stringify(waves));
+"""
+
+
+def run_node(waves, cooldown=SHOT_COOLDOWN, frames=600, seed=1, source=GAME_SOURCE):
+    node = shutil.which('node')
+    if node is None:
+        raise RuntimeError('node is required to run game.js')
+    payload = json.dumps({'sources': [str(BROADPHASE_SOURCE), str(source)], 'waves': list(waves),
+                          'cooldown': cooldown, 'frames': frames, 'seed': seed,
+                          'width': WIDTH, 'height': HEIGHT})
+    proc = subprocess.run([node, '-e', NODE_HARNESS], input=payload, capture_output=True,
+                          text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def bench_node(waves, cooldown=SHOT_COOLDOWN, frames=600, seed=1, budget_ms=1.0,
+               sources=(GAME_SOURCE,)):
+    """{source: per-wave rows and caps} of the real game.js"""
+    out = {}
+    settle = frames // 4
+    for source in sources:
+        results = run_node(waves, cooldown, frames, seed, source)
+        rows = [{'wave': r['wave'], 'kills': r['kills'], **wave_row(r['frames'], settle)}
+                for r in results]
+        out[str(source)] = {'waves': rows,
+                            'caps': caps([r['frames'] for r in results], budget_ms, settle)}
+    return out
+
+
+def parse_list(text):
+    return [int(v) for v in text.split(',') if v.strip()]
+
+
+def print_results(results, budget_ms):
+    for name, r in results.items():
+        print(f"\n{name}")
+        print(f"  {'wave':>5s} {'enemies mean/max':>17s} {'bullets mean/max':>17s} {'kills':>6s} "
+              f"{'frame p50/p99/max µs':>24s}")
+        for row in r['waves']:
+            print(f"  {row['wave']:5d} {row['enemies_mean']:9.1f}/{row['enemies_max']:<7d} "
+                  f"{row['bullets_mean']:9.1f}/{row['bullets_max']:<7d} {row['kills']:6d} "
+                  f"{row['p50']:7.1f}/{row['p99']:<7.1f}/{row['max']:<8.1f}")
+        cap = r['caps']
+        print(f"  caps for p99 <= {budget_ms:g} ms: {cap['enemies']} enemies, "
+              f"{cap['bullets']} bullets")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='\n'.join(__doc__.strip().splitlines()[1:]))
+    parser.add_argument('--engine', choices=['python', 'node'], default='python')
+    parser.add_argument('--waves', type=parse_list, default=[1, 5, 10, 20, 40],
+                        help='comma-separated spawn attempts per frame')
+    parser.add_argument('--cooldown', type=float, default=SHOT_COOLDOWN,
+                        help='seconds between shots (rapid fire: below 0.2)')
+    parser.add_argument('--frames', type=int, default=600, help='frames per wave')
+    parser.add_argument('--budget', type=float, default=1.0,
+                        help='p99 ms per frame the bullet/enemy update may take')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--compare', help='node engine: another game.js to run the same waves on')
+    parser.add_argument('--json', help='also write the results to this JSON file')
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print(f"Space shooter bot ({args.engine}, waves {','.join(map(str, args.waves))}, "
+          f"cooldown {args.cooldown:g} s): bullet/enemy update cost per frame")
+    print("=" * 70)
+    if args.engine == 'node':
+        sources = [args.compare, str(GAME_SOURCE)] if args.compare else [str(GAME_SOURCE)]
+        results = bench_node(args.waves, args.cooldown, args.frames, args.seed, args.budget,
+                             sources)
+    else:
+        results = bench_python(args.waves, args.cooldown, args.frames, args.seed, args.budget)
+    print_results(results, args.budget)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Tic-tac-toe move table generator and perfect-play oracle
+Enumerates every position reachable from the empty board (X moves first),
+folds the 8 symmetries of the square into one canonical position each and
+solves them once with the scoring of minimax() in tic-tac-toe/game.js: a
+win n plies away is worth (size^2 + 1 - n) to the winner, a draw 0, so the
+solver prefers quick wins and slow losses exactly as the game does.
+
+Boards are strings of size^2 cells in row-major order, '-' empty, 'X', 'O'.
+A position's canonical form is the lexicographically smallest of its 8
+images, canonical[i] = board[perm[i]] over the permutations the table ships.
+
+`generate` writes tic-tac-toe/ai-moves.js: the permutations and, for every
+canonical position with O to move, O's best cell in canonical orientation
+(ties go to the first cell, like getBestMove). The client canonicalizes the
+board, looks the move up and maps it back - no search at move time.
+--size 4 (four in a row) solves its 1.2M canonical positions in about five
+minutes; the client ships and loads the 3x3 table only.
+
+`check` runs the AI levels of the real game.js under Node and grades them
+against the oracle: decisions that throw away the game-theoretic outcome,
+whether medium always takes a win and blocks a threat, games against a
+perfect and a random X, and think time with and without the table.
+
+Usage:
+    python3 -m tools.tictactoe generate [--size 3] [--out tic-tac-toe/ai-moves.js]
+    python3 -m tools.tictactoe check [--games 2000] [--seed 1] [--json out.json]
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import time
+
+from tools.site import ROOT
+
+GAME_DIR = ROOT / 'tic-tac-toe'
+GAME_SOURCE = GAME_DIR / 'game.js'
+TABLE_PATH = GAME_DIR / 'ai-moves.js'
+EMPTY, X, O = '-', 'X', 'O'
+LEVELS = ['easy', 'medium', 'hard']
+X_POLICIES = ['perfect', 'random']
+
+
+def symmetries(size=3):
+    """The 8 symmetries of the square as cell permutations, identity first"""
+    def index(r, c):
+        return r * size + c
+    last = size - 1
+    maps = [
+        lambda r, c: (r, c),
+        lambda r, c: (c, last - r),
+        lambda r, c: (last - r, last - c),
+        lambda r, c: (last - c, r),
+        lambda r, c: (r, last - c),
+        lambda r, c: (last - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (last - c, last - r),
+    ]
+    return [[index(*f(i // size, i % size)) for i in range(size * size)] for f in maps]
+
+
+def lines(size=3):
+    """Cell indices of every row, column and both diagonals"""
+    rows = [[r * size + c for c in range(size)] for r in range(size)]
+    cols = [[r * size + c for r in range(size)] for c in range(size)]
+    diagonals = [[i * size + i for i in range(size)], [i * size + size - 1 - i for i in range(size)]]
+    return rows + cols + diagonals
+
+
+def to_move(board):
+    return X if board.count(X) == board.count(O) else O
+
+
+class Oracle:
+    """Memoized minimax over canonical positions"""
+
+    def __init__(self, size=3):
+        self.size = size
+        self.perms = symmetries(size)
+        self.lines = lines(size)
+        self.win = size * size + 1
+        self.values = {}
+
+    def canonical(self, board):
+        """(canonical board, permutation with canonical[i] = board[perm[i]])
+
+        Ties go to the first permutation in order, as in the client's lookup.
+        """
+        images = [''.join(board[p] for p in perm) for perm in self.perms]
+        best = min(range(len(images)), key=images.__getitem__)
+        return images[best], self.perms[best]
+
+    def winner(self, board):
+        for line in self.lines:
+            first = board[line[0]]
+            if first != EMPTY and all(board[i] == first for i in line):
+                return first
+        return None
+
+    def terminal(self, board):
+        return self.winner(board) is not None or EMPTY not in board
+
+    def children(self, board):
+        player = to_move(board)
+        return [(i, board[:i] + player + board[i + 1:]) for i, v in enumerate(board) if v == EMPTY]
+
+    def value(self, board):
+        """minimax(board, 0, O to move?) of game.js: positive when O wins"""
+        key = self.canonical(board)[0]
+        cached = self.values.get(key)
+        if cached is not None:
+            return cached
+        winner = self.winner(key)
+        if winner == O:
+            result = self.win - 1
+        elif winner == X:
+            result = 1 - self.win
+        elif EMPTY not in key:
+            result = 0
+        else:
+            # One ply deeper: wins shrink towards zero
+            scores = [v - 1 if v > 0 else v + 1 if v < 0 else 0
+                      for v in (self.value(child) for _, child in self.children(key))]
+            result = max(scores) if to_move(key) == O else min(scores)
+        self.values[key] = result
+        return result
+
+    def move_scores(self, board):
+        """{cell: score of the position after the player to move plays there}"""
+        return {cell: self.value(child) for cell, child in self.children(board)}
+
+    def best_moves(self, board):
+        scores = self.move_scores(board)
+        pick = max if to_move(board) == O else min
+        best = pick(scores.values())
+        return [cell for cell, score in scores.items() if score == best]
+
+    def outcome(self, board):
+        """+1 O wins, 0 draw, -1 X wins under perfect play"""
+        v = self.value(board)
+        return (v > 0) - (v < 0)
+
+    def keeps_outcome(self, board, cell):
+        """Does playing `cell` keep the best outcome for the player to move?"""
+        player = to_move(board)
+        after = board[:cell] + player + board[cell + 1:]
+        return self.outcome(after) == self.outcome(board)
+
+
+def reachable(size=3):
+    """Every position reachable from the empty board, terminal ones included"""
+    oracle = Oracle(size)
+    seen = set()
+    stack = [EMPTY * size * size]
+    while stack:
+        board = stack.pop()
+        if board in seen:
+            continue
+        seen.add(board)
+        if not oracle.terminal(board):
+            stack.extend(child for _, child in oracle.children(board))
+    return seen
+
+
+def move_table(oracle):
+    """{canonical position with O to move: O's best cell}, reached by search from the empty board"""
+    table = {}
+    stack = [EMPTY * oracle.size * oracle.size]
+    seen = set()
+    while stack:
+        board = stack.pop()
+        if board in seen or oracle.terminal(board):
+            continue
+        seen.add(board)
+        if to_move(board) == O:
+            table[board] = oracle.best_moves(board)[0]
+        stack.extend(oracle.canonical(child)[0] for _, child in oracle.children(board))
+    return table
+
+
+def render_table(oracle, table):
+    """ai-moves.js: entries are the canonical board followed by the best cell in base 36"""
+    packed = ''.join(board + _base36(cell) for board, cell in sorted(table.items()))
+    return (
+        "/* 井字棋 AI 走法表 - 由 tools/tictactoe.py generate 生成，请勿手工修改 */\n"
+        "/* moves 按 size*size 个格子 + 一位 36 进制落子为一条，共 "
+        f"{len(table)} 条对称约简后的 O 方局面 */\n"
+        "const TTT_MOVE_TABLE = {\n"
+        f"    size: {oracle.size},\n"
+        f"    symmetries: {json.dumps(oracle.perms, separators=(',', ':'))},\n"
+        f"    moves: '{packed}'\n"
+        "};\n\n"
+        "if (typeof module !== 'undefined' && module.exports) {\n"
+        "    module.exports = { TTT_MOVE_TABLE };\n"
+        "}\n"
+    )
+
+
+def _base36(n):
+    return '0123456789abcdefghijklmnopqrstuvwxyz'[n]
+
+
+def parse_table(text):
+    """(size, symmetries, {board: cell}) back from an ai-moves.js"""
+    size = int(text.split('size:', 1)[1].split(',', 1)[0])
+    perms = json.loads(text.split('symmetries:', 1)[1].split('\n', 1)[0].rstrip(','))
+    packed = text.split("moves: '", 1)[1].split("'", 1)[0]
+    width = size * size + 1
+    entries = [packed[i:i + width] for i in range(0, len(packed), width)]
+    return size, perms, {e[:-1]: int(e[-1], 36) for e in entries}
+
+
+def generate(size=3):
+    start = time.perf_counter()
+    oracle = Oracle(size)
+    oracle.value(EMPTY * size * size)
+    table = move_table(oracle)
+    source = render_table(oracle, table)
+    return oracle, table, source, time.perf_counter() - start
+
+
+NODE_HARNESS = r"""
+const fs = require('fs');
+const input = JSON.parse(fs.readFileSync(0, 'utf8'));
+
+let state = 0x9e3779b9 ^ input.seed;
+Math.random = function () {
+    state = (state + 0x6D2B79F5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+};
+
+// Anything in the DOM: every property is another stub, calls return stubs
+function stub() {
+    const store = {};
+    return new Proxy(function () {}, {
+        get(_, key) {
+            if (key === Symbol.toPrimitive) return () => 0;
+            if (key === 'then') return undefined;
+            if (!(key in store)) store[key] = stub();
+            return store[key];
+        },
+        set(_, key, value) { store[key] = value; return true; },
+        apply: () => stub(),
+        construct: () => stub(),
+    });
+}
+globalThis.window = globalThis;
+window.addEventListener = () => {};
+globalThis.document = stub();
+globalThis.localStorage = { getItem: () => null, setItem() {} };
+globalThis.setTimeout = () => 0;
+globalThis.requestAnimationFrame = () => 0;
+
+(0, eval)(input.sources.map(path => fs.readFileSync(path, 'utf8')).join('\n') +
+    '\nglobalThis.TicTacToeGame = TicTacToeGame;');
+const game = new TicTacToeGame();
+const setBoard = board => {
+    game.board = [0, 1, 2].map(r => [...board.slice(3 * r, 3 * r + 3)].map(v => (v === '-' ? '' : v)));
+};
+const cell = move => move.r * 3 + move.c;
+const now = process.hrtime.bigint;
+
+// One decision per level at every position; think time per position is the fastest of a few passes
+const decisions = {};
+const think_us = {};
+const runs = input.levels.map(level => [level, level]);
+if (input.levels.includes('hard')) runs.push(['hard', 'minimax']);
+const boards = input.positions.map(board => {
+    setBoard(board);
+    return game.board;
+});
+for (const [level, name] of runs) {
+    game.difficulty = level;
+    TicTacToeGame.moveTable = name === 'minimax' ? null : undefined;
+    decisions[name] = boards.map(board => {
+        game.board = board;
+        return cell(game.chooseMove());
+    });
+    const best = boards.map(() => Infinity);
+    for (let pass = 0; pass < input.passes; pass++) {
+        boards.forEach((board, i) => {
+            game.board = board;
+            const start = now();
+            game.chooseMove();
+            best[i] = Math.min(best[i], Number(now() - start) / 1e3);
+        });
+    }
+    think_us[name] = best;
+}
+TicTacToeGame.moveTable = undefined;
+
+// Whole games, X to move first, against each level
+const pick = list => list[Math.floor(Math.random() * list.length)];
+const games = {};
+for (const level of input.levels) {
+    game.difficulty = level;
+    for (const policy of input.x_policies) {
+        const results = { X: 0, O: 0, draw: 0 };
+        for (let g = 0; g < input.games; g++) {
+            let board = '-'.repeat(9);
+            let winner = null;
+            for (let ply = 0; ply < 9 && !winner; ply++) {
+                let move;
+                if (ply % 2 === 0) {
+                    const empty = [...board].flatMap((v, i) => (v === '-' ? [i] : []));
+                    move = policy === 'perfect' ? pick(input.x_moves[board]) : pick(empty);
+                } else {
+                    setBoard(board);
+                    move = cell(game.chooseMove());
+                }
+                board = board.slice(0, move) + (ply % 2 === 0 ? 'X' : 'O') + board.slice(move + 1);
+                setBoard(board);
+                winner = game.checkWinner(game.board);
+            }
+            results[winner || 'draw']++;
+        }
+        games[`${level}/${policy}`] = results;
+    }
+}
+process.stdout.write(JSON.stringify({ decisions, think_us, games }));
+"""
+
+
+def run_node(positions, x_moves, games=2000, seed=1, levels=LEVELS, x_policies=X_POLICIES,
+             sources=(TABLE_PATH, GAME_SOURCE), passes=5):
+    node = shutil.which('node')
+    if node is None:
+        raise RuntimeError('node is required to run game.js')
+    payload = json.dumps({'sources': [str(p) for p in sources], 'positions': positions,
+                          'x_moves': x_moves, 'games': games, 'seed': seed, 'levels': list(levels),
+                          'x_policies': list(x_policies), 'passes': passes})
+    proc = subprocess.run([node, '-e', NODE_HARNESS], input=payload, capture_output=True,
+                          text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def immediate(oracle, board, player):
+    """Cells where `player` would complete a line right now"""
+    return {cell for cell, v in enumerate(board) if v == EMPTY
+            and oracle.winner(board[:cell] + player + board[cell + 1:]) == player}
+
+
+def grade(oracle, positions, moves):
+    """Oracle verdict on one level's move at every position"""
+    out = {'positions': len(positions), 'illegal': 0, 'outcome_lost': 0, 'optimal': 0,
+           'missed_wins': 0, 'missed_blocks': 0}
+    for board, cell in zip(positions, moves):
+        if board[cell] != EMPTY:
+            out['illegal'] += 1
+            continue
+        out['outcome_lost'] += not oracle.keeps_outcome(board, cell)
+        out['optimal'] += cell in oracle.best_moves(board)
+        wins = immediate(oracle, board, O)
+        if wins:
+            out['missed_wins'] += cell not in wins
+        else:
+            # Only a single threat can be blocked; a double threat is lost anyway
+            blocks = immediate(oracle, board, X)
+            out['missed_blocks'] += len(blocks) == 1 and cell not in blocks
+    return out
+
+
+def check(games=2000, seed=1, sources=(TABLE_PATH, GAME_SOURCE)):
+    oracle = Oracle(3)
+    boards = reachable(3)
+    positions = sorted(b for b in boards if to_move(b) == O and not oracle.terminal(b))
+    x_moves = {b: oracle.best_moves(b) for b in boards if to_move(b) == X and not oracle.terminal(b)}
+    raw = run_node(positions, x_moves, games, seed, sources=sources)
+    report = {name: grade(oracle, positions, moves) for name, moves in raw['decisions'].items()}
+    for name, us in raw['think_us'].items():
+        report[name]['think_us'] = sum(us) / len(us)
+        report[name]['think_max_us'] = max(us)
+    return {'levels': report, 'games': raw['games']}
+
+
+def print_check(result):
+    print(f"  {'level':8s} {'positions':>9s} {'optimal':>8s} {'outcome lost':>13s} "
+          f"{'missed win':>11s} {'missed block':>13s} {'think µs mean/max':>18s}")
+    for name, r in result['levels'].items():
+        print(f"  {name:8s} {r['positions']:9d} {r['optimal'] / r['positions']:8.1%} "
+              f"{r['outcome_lost']:13d} {r['missed_wins']:11d} {r['missed_blocks']:13d} "
+              f"{r['think_us']:8.2f}/{r['think_max_us']:<9.1f}")
+        if r['illegal']:
+            print(f"      ✗ {r['illegal']} moves onto occupied cells")
+    print()
+    print(f"  {'level / X player':18s} {'X wins':>7s} {'AI wins':>8s} {'draws':>7s}")
+    for name, r in result['games'].items():
+        print(f"  {name:18s} {r['X']:7d} {r['O']:8d} {r['draw']:7d}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='\n'.join(__doc__.strip().splitlines()[1:]))
+    sub = parser.add_subparsers(dest='command', required=True)
+    gen = sub.add_parser('generate', help='solve every position and write the move table')
+    gen.add_argument('--size', type=int, default=3, help='board side; the game ships 3')
+    gen.add_argument('--out', default=str(TABLE_PATH), help="output file, '-' for none")
+    chk = sub.add_parser('check', help='grade the AI levels of game.js against the oracle')
+    chk.add_argument('--games', type=int, default=2000, help='games per level and X player')
+    chk.add_argument('--seed', type=int, default=1)
+    chk.add_argument('--json', help='also write the results to this JSON file')
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    if args.command == 'generate':
+        oracle, table, source, elapsed = generate(args.size)
+        print(f"Tic-tac-toe {args.size}x{args.size}: {len(oracle.values)} canonical positions "
+              f"solved in {elapsed:.2f}s")
+        print("=" * 70)
+        empty = EMPTY * args.size * args.size
+        verdict = {1: 'O wins', 0: 'draw', -1: 'X wins'}[oracle.outcome(empty)]
+        print(f"  perfect play from the empty board: {verdict}")
+        print(f"  O-to-move table entries: {len(table)}, {len(source.encode())} bytes")
+        if args.out != '-':
+            with open(args.out, 'w', encoding='utf-8') as f:
+                f.write(source)
+            print(f"  ✓ written to {args.out}")
+        return 0
+
+    print(f"Tic-tac-toe AI levels of game.js against the perfect-play oracle")
+    print("=" * 70)
+    result = check(args.games, args.seed)
+    print_check(result)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+    hard = result['levels']['hard']
+    lost = sum(r['X'] for name, r in result['games'].items() if name.startswith('hard/'))
+    ok = hard['outcome_lost'] == 0 and hard['illegal'] == 0 and lost == 0
+    print(f"\n{'✓' if ok else '✗'} hard level {'never' if ok else 'does'} give up the outcome")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for worker.js routing
+Replays the worker's asset resolution against a built tree without
+deploying:
+  1. '/' and extensionless or trailing-slash paths map to index.html
+  2. a 404 is retried with the leading slash toggled; the alternate path is
+     resolved relative to the request URL, like `new URL(altPath, url)`
+  3. a second 404 falls back to /index.html
+and adds the worker's security headers (nosniff, DENY, X-XSS-Protection,
+CSP on HTML). Every missing asset costs three ASSETS lookups in the worker.
+RoutingTable answers each request path with its final asset in one dict
+lookup; it is built once from the tree and rebuilt when files are added or
+removed.
+
+Usage:
+    python3 -m tools.worker_routing route /snake-game /favicon.ico
+    python3 -m tools.worker_routing bench [--root dist] [--log access.log] [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass
+from urllib.parse import unquote, urljoin
+
+from tools.serve import HeaderRules, asset_path, content_type
+from tools.site import GAMES, ROOT
+
+DEFAULT_ROOT = ROOT / 'dist' if (ROOT / 'dist').is_dir() else ROOT
+# Host only used to resolve the worker's relative retry path
+ORIGIN = 'https://games.local'
+# Missing paths remembered before the memo of misses is dropped
+MAX_MISSES = 4096
+
+CSP = ("default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' "
+       "'unsafe-inline'; img-src 'self' data:; font-src 'self'; connect-src 'self';")
+WORKER_HEADERS = [
+    ('X-Content-Type-Options', 'nosniff'),
+    ('X-Frame-Options', 'DENY'),
+    ('X-XSS-Protection', '1; mode=block'),
+]
+
+STEPS = ('direct', 'retry', 'fallback', 'missing')
+
+
+@dataclass(frozen=True)
+class Resolution:
+    pathname: str
+    asset: str        # asset that answers the request; None when even the fallback is missing
+    step: str         # which of STEPS found it
+    lookups: int      # ASSETS.fetch calls the worker makes
+
+
+def route(pathname, exists):
+    """Resolve `pathname` exactly like worker.js; `exists(asset)` is one ASSETS lookup"""
+    first = asset_path(pathname)
+    if exists(first):
+        return Resolution(pathname, first, 'direct', 1)
+    alt = first[1:] if first.startswith('/') else '/' + first
+    retry = unquote(urljoin(ORIGIN + pathname, alt)[len(ORIGIN):])
+    if exists(retry):
+        return Resolution(pathname, retry, 'retry', 2)
+    if exists('/index.html'):
+        return Resolution(pathname, '/index.html', 'fallback', 3)
+    return Resolution(pathname, None, 'missing', 3)
+
+
+def worker_headers(headers, kind):
+    """Asset response `headers` with the worker's headers set on top"""
+    extra = WORKER_HEADERS + ([('Content-Security-Policy', CSP)] if 'text/html' in kind else [])
+    names = {name.lower() for name, _ in extra}
+    return [(n, v) for n, v in headers if n.lower() not in names] + extra
+
+
+def list_assets(root):
+    """Every file under `root` as a URL path"""
+    assets = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        rel = os.path.relpath(dirpath, root).replace(os.sep, '/')
+        prefix = '/' if rel == '.' else f'/{rel}/'
+        assets.update(prefix + name for name in filenames)
+    return assets
+
+
+def tree_signature(root):
+    """Directory mtimes: adding, removing or renaming a file changes its directory's"""
+    signature = []
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        signature.append((dirpath, os.stat(dirpath).st_mtime_ns))
+    return tuple(signature)
+
+
+class RoutingTable:
+    """
+    Memoized worker routing for one tree
+    Every existing asset and directory URL is resolved up front; other paths
+    are resolved on first use and remembered. The tree is re-checked at most
+    every `check_interval` seconds and the table rebuilt when it changed.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, check_interval=1.0):
+        self.root = str(root)
+        self.check_interval = check_interval
+        self.rebuilds = 0
+        self.hits = 0
+        self.misses = 0
+        self.build()
+
+    def build(self):
+        self.assets = list_assets(self.root)
+        self.signature = tree_signature(self.root)
+        self.checked = time.monotonic()
+        self.table = {}
+        self.missing = 0
+        for asset in self.assets:
+            urls = [asset]
+            if asset.endswith('/index.html'):
+                directory = asset[:-len('index.html')]
+                urls += [directory, directory.rstrip('/')] if directory != '/' else ['/']
+            for url in urls:
+                if url:
+                    self.table[url] = route(url, self.assets.__contains__)
+        self.rebuilds += 1
+
+    def invalidate(self):
+        self.build()
+
+    def refresh(self):
+        """Rebuild when the tree changed since the last check"""
+        now = time.monotonic()
+        if now - self.checked < self.check_interval:
+            return False
+        self.checked = now
+        if tree_signature(self.root) == self.signature:
+            return False
+        self.build()
+        return True
+
+    def resolve(self, pathname):
+        self.refresh()
+        resolution = self.table.get(pathname)
+        if resolution is not None:
+            self.hits += 1
+            return resolution
+        self.misses += 1
+        if self.missing >= MAX_MISSES:
+            self.build()
+        resolution = route(pathname, self.assets.__contains__)
+        self.table[pathname] = resolution
+        self.missing += 1
+        return resolution
+
+
+def disk_lookup(root):
+    """ASSETS.fetch stand-in that stats the file every time, like the worker's fetches"""
+    root = str(root)
+
+    def exists(asset):
+        return os.path.isfile(os.path.join(root, unquote(asset).lstrip('/')))
+    return exists
+
+
+def response_headers(root, resolution, rules=None):
+    """Status and headers the deployed worker would answer `resolution` with"""
+    if resolution.asset is None:
+        return 404, worker_headers([], '')
+    rules = rules or HeaderRules.load(root)
+    kind = content_type(resolution.asset)
+    headers = [('Content-Type', kind)] + rules.match(resolution.asset)
+    return 200, worker_headers(headers, kind)
+
+
+_LOG_RE = re.compile(r'"(?:GET|HEAD) (\S+)')
+
+
+def read_log(path):
+    """Request paths of an access log (common log format) or a plain path-per-line file"""
+    paths = []
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            match = _LOG_RE.search(line)
+            target = match.group(1) if match else line.strip()
+            if target.startswith('/'):
+                paths.append(target.split('?', 1)[0])
+    return paths
+
+
+def synthetic_requests(assets, seed=1):
+    """A visit mix: pretty and explicit game URLs, their assets and common misses"""
+    rng = random.Random(seed)
+    requests = ['/', '/index.html', '/favicon.ico', '/robots.txt', '/apple-touch-icon.png']
+    for game in GAMES:
+        requests += [f'/{game}', f'/{game}/', f'/{game}/index.html', f'/{game}/missing.js']
+    requests += sorted(assets)
+    rng.shuffle(requests)
+    return requests
+
+
+def benchmark(root, requests, repeat=1):
+    """ASSETS lookups and time of the worker's chain versus the memoized table"""
+    exists = disk_lookup(root)
+    counts = {step: 0 for step in STEPS}
+    lookups = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for pathname in requests:
+            resolution = route(pathname, exists)
+            counts[resolution.step] += 1
+            lookups += resolution.lookups
+    chain_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = RoutingTable(root, check_interval=float('inf'))
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for pathname in requests:
+            table.resolve(pathname)
+    table_seconds = time.perf_counter() - start
+
+    total = len(requests) * repeat
+    return {
+        'requests': total,
+        'steps': counts,
+        'lookups': lookups,
+        'lookups_per_request': lookups / total if total else 0.0,
+        'extra_lookups': lookups - total,
+        'chain_us': chain_seconds / total * 1e6 if total else 0.0,
+        'table_us': table_seconds / total * 1e6 if total else 0.0,
+        'table_build_ms': build_seconds * 1000,
+        'table_entries': len(table.table),
+        'table_hits': table.hits,
+    }
+
+
+def print_benchmark(result):
+    print(f"Requests: {result['requests']}")
+    for step in STEPS:
+        print(f"   {step:9s} {result['steps'][step]:8d}")
+    print(f"ASSETS lookups: {result['lookups']} "
+          f"({result['lookups_per_request']:.2f} per request, "
+          f"{result['extra_lookups']} spent on retries and fallbacks)")
+    print(f"Worker chain:  {result['chain_us']:8.2f} µs/request (stat per lookup)")
+    print(f"Routing table: {result['table_us']:8.2f} µs/request "
+          f"({result['table_entries']} entries, built in {result['table_build_ms']:.1f} ms, "
+          f"{result['table_hits']} hits)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--root', default=str(DEFAULT_ROOT),
+                        help='built tree to route against (default: dist/ when built)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    show = commands.add_parser('route', help='show how request paths resolve')
+    show.add_argument('paths', nargs='+')
+    bench = commands.add_parser('bench', help='replay requests through both resolvers')
+    bench.add_argument('--log', help='access log or path-per-line file to replay')
+    bench.add_argument('--repeat', type=int, default=20)
+    bench.add_argument('--json', help='also write the results to this JSON file')
+    args = parser.parse_args(argv)
+
+    if args.command == 'route':
+        rules = HeaderRules.load(args.root)
+        exists = disk_lookup(args.root)
+        for pathname in args.paths:
+            resolution = route(pathname, exists)
+            status, headers = response_headers(args.root, resolution, rules)
+            print(f"{pathname} -> {resolution.asset or '-'} "
+                  f"[{resolution.step}, {resolution.lookups} lookup(s), {status}]")
+            for name, value in headers:
+                print(f"   {name}: {value}")
+        return 0
+
+    requests = read_log(args.log) if args.log else synthetic_requests(list_assets(args.root))
+    print("=" * 60)
+    print(f"Worker routing replay - {args.root}")
+    print("=" * 60)
+    result = benchmark(args.root, requests, args.repeat)
+    print_benchmark(result)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(dict(result, root=args.root), f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())